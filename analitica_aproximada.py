@@ -0,0 +1,589 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo de analítica aproximada sobre las ventas, con estructuras probabilísticas
+de memoria fija en lugar de recorrer el historial de todos los clientes:
+- HyperLogLog: compradores distintos por película o artista
+- Space-Saving: títulos y artistas con más entradas vendidas (top-k)
+- t-digest: cuantiles del gasto por venta en cada sala y del precio por entrada
+
+Las estructuras se alimentan de los eventos VentaRealizada del BusEventos y se
+pueden fusionar, por lo que cada proceso (o sucursal) puede llevar las suyas
+y combinarlas después. Usan un hash estable (blake2b) para que dos procesos
+asignen el mismo registro al mismo comprador. Las devoluciones no se
+descuentan: los resultados describen lo vendido.
+"""
+
+import bisect
+import hashlib
+import math
+import threading
+from typing import List
+from eventos import BusEventos, VentaRealizada
+
+
+def _hash64(valor: str) -> int:
+    """Hash de 64 bits estable entre procesos."""
+    return int.from_bytes(hashlib.blake2b(valor.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HyperLogLog:
+    """
+    Clase que estima la cantidad de elementos distintos con 2^precision registros
+    de un byte. El error relativo típico es 1.04 / sqrt(2^precision).
+    """
+
+    def __init__(self, precision: int = 12):
+        """
+        Constructor del HyperLogLog.
+
+        Args:
+            precision: Bits del hash usados para elegir el registro (4 a 16)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("La precisión debe estar entre 4 y 16")
+        self._precision = precision
+        self._registros = bytearray(1 << precision)
+
+    # Property para precision
+    @property
+    def precision(self) -> int:
+        """Obtiene la precisión del estimador."""
+        return self._precision
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene los bytes de los registros."""
+        return len(self._registros)
+
+    def agregar(self, valor: str):
+        """Agrega un elemento al conjunto."""
+        h = _hash64(valor)
+        resto_bits = 64 - self._precision
+        indice = h >> resto_bits
+        resto = h & ((1 << resto_bits) - 1)
+        rango = resto_bits - resto.bit_length() + 1
+        if rango > self._registros[indice]:
+            self._registros[indice] = rango
+
+    def estimar(self) -> int:
+        """
+        Estima la cantidad de elementos distintos agregados.
+
+        Returns:
+            Cardinalidad estimada
+        """
+        m = len(self._registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimado = alfa * m * m / sum(2.0 ** -r for r in self._registros)
+        vacios = self._registros.count(0)
+        if estimado <= 2.5 * m and vacios:
+            # Corrección para cardinalidades pequeñas (conteo lineal)
+            estimado = m * math.log(m / vacios)
+        return round(estimado)
+
+    def fusionar(self, otro: "HyperLogLog"):
+        """
+        Incorpora los elementos de otro HyperLogLog de la misma precisión.
+
+        Args:
+            otro: Estimador a fusionar
+        """
+        if otro._precision != self._precision:
+            raise ValueError("Solo se pueden fusionar estimadores de la misma precisión")
+        self._registros = bytearray(map(max, self._registros, otro._registros))
+
+
+class SpaceSaving:
+    """
+    Clase que mantiene los k elementos más frecuentes con k contadores.
+    Cada conteo sobrestima el real como máximo en su error asociado.
+    """
+
+    def __init__(self, capacidad: int = 64):
+        """
+        Constructor de SpaceSaving.
+
+        Args:
+            capacidad: Cantidad de contadores
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser positiva")
+        self._capacidad = capacidad
+        self._conteos = {}
+        self._errores = {}
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene la cantidad de contadores (la memoria es proporcional)."""
+        return self._capacidad
+
+    def agregar(self, elemento: str, peso: int = 1):
+        """
+        Suma el peso de un elemento.
+
+        Args:
+            elemento: Elemento observado
+            peso: Cantidad a sumar (por ejemplo, entradas vendidas)
+        """
+        conteos = self._conteos
+        if elemento in conteos:
+            conteos[elemento] += peso
+        elif len(conteos) < self._capacidad:
+            conteos[elemento] = peso
+            self._errores[elemento] = 0
+        else:
+            # El nuevo elemento hereda el contador mínimo
+            minimo = min(conteos, key=conteos.get)
+            base = conteos.pop(minimo)
+            del self._errores[minimo]
+            conteos[elemento] = base + peso
+            self._errores[elemento] = base
+
+    def top(self, n: int = 10) -> List[tuple]:
+        """
+        Obtiene los n elementos más frecuentes.
+
+        Args:
+            n: Cantidad de elementos
+
+        Returns:
+            Lista de tuplas (elemento, conteo estimado, error máximo)
+        """
+        mayores = sorted(self._conteos.items(), key=lambda par: par[1], reverse=True)[:n]
+        return [(elemento, conteo, self._errores[elemento]) for elemento, conteo in mayores]
+
+    def fusionar(self, otro: "SpaceSaving"):
+        """
+        Incorpora los conteos de otro resumen y conserva los k mayores.
+
+        Args:
+            otro: Resumen a fusionar
+        """
+        # Un elemento ausente en un resumen lleno pudo tener hasta su mínimo
+        minimo_propio = min(self._conteos.values()) if len(self._conteos) >= self._capacidad else 0
+        minimo_otro = min(otro._conteos.values()) if len(otro._conteos) >= otro._capacidad else 0
+        conteos, errores = {}, {}
+        for elemento in self._conteos.keys() | otro._conteos.keys():
+            conteos[elemento] = (self._conteos.get(elemento, minimo_propio)
+                                 + otro._conteos.get(elemento, minimo_otro))
+            errores[elemento] = (self._errores.get(elemento, minimo_propio)
+                                 + otro._errores.get(elemento, minimo_otro))
+        mayores = sorted(conteos, key=conteos.get, reverse=True)[:self._capacidad]
+        self._conteos = {elemento: conteos[elemento] for elemento in mayores}
+        self._errores = {elemento: errores[elemento] for elemento in mayores}
+
+
+class TDigest:
+    """
+    Clase que resume una distribución en centroides (media, peso) para estimar
+    cuantiles. Los centroides son más finos en los extremos, donde está el
+    interés de los percentiles altos, y su cantidad queda acotada por la
+    compresión.
+    """
+
+    def __init__(self, compresion: int = 100):
+        """
+        Constructor del TDigest.
+
+        Args:
+            compresion: Parámetro delta; a mayor valor, más centroides y precisión
+        """
+        if compresion < 10:
+            raise ValueError("La compresión debe ser al menos 10")
+        self._compresion = compresion
+        self._centroides = []
+        self._pendientes = []
+        self._total = 0.0
+        self._minimo = math.inf
+        self._maximo = -math.inf
+
+    # Property para total
+    @property
+    def total(self) -> float:
+        """Obtiene el peso total agregado."""
+        return self._total + len(self._pendientes)
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene la cantidad de centroides tras comprimir."""
+        self._comprimir()
+        return len(self._centroides)
+
+    def agregar(self, valor: float):
+        """Agrega un valor a la distribución."""
+        self._pendientes.append(valor)
+        if valor < self._minimo:
+            self._minimo = valor
+        if valor > self._maximo:
+            self._maximo = valor
+        if len(self._pendientes) >= 5 * self._compresion:
+            self._comprimir()
+
+    def cuantil(self, q: float) -> float:
+        """
+        Estima el valor del cuantil q.
+
+        Args:
+            q: Cuantil entre 0 y 1
+
+        Returns:
+            Valor estimado (nan si no hay datos)
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("El cuantil debe estar entre 0 y 1")
+        self._comprimir()
+        if not self._centroides:
+            return math.nan
+        if len(self._centroides) == 1:
+            return self._centroides[0][0]
+        objetivo = q * self._total
+        acumulado = 0.0
+        anterior_media, anterior_centro = self._minimo, 0.0
+        for media, peso in self._centroides:
+            centro = acumulado + peso / 2
+            if objetivo < centro:
+                fraccion = (objetivo - anterior_centro) / (centro - anterior_centro)
+                return anterior_media + fraccion * (media - anterior_media)
+            anterior_media, anterior_centro = media, centro
+            acumulado += peso
+        fraccion = (objetivo - anterior_centro) / max(self._total - anterior_centro, 1e-12)
+        return anterior_media + fraccion * (self._maximo - anterior_media)
+
+    def fusionar(self, otro: "TDigest"):
+        """
+        Incorpora la distribución de otro TDigest.
+
+        Args:
+            otro: Resumen a fusionar
+        """
+        otro._comprimir()
+        self._comprimir(otro._centroides)
+        self._minimo = min(self._minimo, otro._minimo)
+        self._maximo = max(self._maximo, otro._maximo)
+
+    def _comprimir(self, adicionales: list = ()):
+        """Fusiona los pendientes con los centroides respetando la escala k1."""
+        if not self._pendientes and not adicionales:
+            return
+        puntos = self._centroides + [[valor, 1.0] for valor in self._pendientes]
+        puntos += [list(c) for c in adicionales]
+        puntos.sort(key=lambda c: c[0])
+        total = sum(peso for _, peso in puntos)
+        escala = self._compresion / (2 * math.pi)
+
+        def k(q):
+            return escala * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+        centroides = [puntos[0]]
+        acumulado = 0.0
+        limite = k(0.0) + 1
+        for media, peso in puntos[1:]:
+            actual = centroides[-1]
+            if k((acumulado + actual[1] + peso) / total) <= limite:
+                nuevo_peso = actual[1] + peso
+                actual[0] += (media - actual[0]) * peso / nuevo_peso
+                actual[1] = nuevo_peso
+            else:
+                acumulado += actual[1]
+                limite = k(acumulado / total) + 1
+                centroides.append([media, peso])
+        self._centroides = centroides
+        self._pendientes = []
+        self._total = total
+
+
+class AnaliticaAproximada:
+    """
+    Clase que agrupa las estructuras de analítica de ventas.
+    Todas usan memoria acotada por sus parámetros y por la cantidad de
+    títulos y salas del catálogo, no por la cantidad de ventas o clientes.
+    """
+
+    def __init__(self, precision: int = 10, top_k: int = 64, compresion: int = 100):
+        """
+        Constructor de AnaliticaAproximada.
+
+        Args:
+            precision: Precisión de los HyperLogLog por título
+            top_k: Contadores de los resúmenes Space-Saving
+            compresion: Compresión de los t-digest
+        """
+        self._precision = precision
+        self._top_k = top_k
+        self._compresion = compresion
+        self._compradores = {}
+        self._compradores_total = HyperLogLog(min(precision + 4, 16))
+        self._peliculas = SpaceSaving(top_k)
+        self._artistas = SpaceSaving(top_k)
+        self._gasto_sala = {}
+        self._precio_entrada = TDigest(compresion)
+        self._ventas = 0
+        self._suscriptor = None
+        # Conectada al bus, las ventas se registran en el hilo del suscriptor:
+        # registrar, consultar (t-digest compacta al leer) y fusionar se excluyen
+        self._cerrojo = threading.Lock()
+
+    # Property para ventas
+    @property
+    def ventas(self) -> int:
+        """Obtiene la cantidad de ventas registradas."""
+        return self._ventas
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene los bytes aproximados de las estructuras (16 por contador o centroide)."""
+        with self._cerrojo:
+            registros = (self._compradores_total.memoria
+                         + sum(h.memoria for h in self._compradores.values()))
+            contadores = 16 * (self._peliculas.memoria + self._artistas.memoria)
+            centroides = 16 * (self._precio_entrada.memoria
+                               + sum(t.memoria for t in self._gasto_sala.values()))
+        return registros + contadores + centroides
+
+    def conectar(self, bus: BusEventos, capacidad: int = 4096):
+        """
+        Suscribe la analítica a las ventas del bus en un hilo propio,
+        para que no agregue latencia a realizar_venta.
+
+        Args:
+            bus: Bus de eventos del gestor
+            capacidad: Máximo de ventas pendientes de procesar
+        """
+        self._suscriptor = bus.suscribir_asincrono(self._registrar_lote, (VentaRealizada,),
+                                                   capacidad=capacidad, tam_lote=256)
+
+    def registrar(self, venta: VentaRealizada):
+        """
+        Incorpora una venta a todas las estructuras.
+
+        Args:
+            venta: Evento de la venta
+        """
+        with self._cerrojo:
+            self._incorporar(venta)
+
+    def _incorporar(self, venta: VentaRealizada):
+        """Incorpora una venta (con el cerrojo tomado)."""
+        self._ventas += 1
+        compradores = self._compradores.get(venta.titulo)
+        if compradores is None:
+            compradores = self._compradores[venta.titulo] = HyperLogLog(self._precision)
+        compradores.agregar(venta.cedula)
+        self._compradores_total.agregar(venta.cedula)
+        if venta.tipo == "Cine":
+            self._peliculas.agregar(venta.titulo, venta.cantidad)
+        else:
+            self._artistas.agregar(venta.titulo, venta.cantidad)
+        gasto = self._gasto_sala.get(venta.sala)
+        if gasto is None:
+            gasto = self._gasto_sala[venta.sala] = TDigest(self._compresion)
+        gasto.agregar(venta.total)
+        self._precio_entrada.agregar(venta.total / venta.cantidad)
+
+    def compradores_unicos(self, titulo: str = None) -> int:
+        """
+        Estima los compradores distintos de una película o artista.
+
+        Args:
+            titulo: Película o artista (None para todos los servicios)
+
+        Returns:
+            Cantidad estimada de clientes distintos
+        """
+        with self._cerrojo:
+            if titulo is None:
+                return self._compradores_total.estimar()
+            compradores = self._compradores.get(titulo)
+            return compradores.estimar() if compradores else 0
+
+    def top_peliculas(self, n: int = 5) -> List[tuple]:
+        """Películas con más entradas vendidas: (título, entradas, error máximo)."""
+        with self._cerrojo:
+            return self._peliculas.top(n)
+
+    def top_artistas(self, n: int = 5) -> List[tuple]:
+        """Artistas con más entradas vendidas: (artista, entradas, error máximo)."""
+        with self._cerrojo:
+            return self._artistas.top(n)
+
+    def cuantiles_sala(self, sala: str, cuantiles=(0.5, 0.9, 0.99)) -> dict:
+        """
+        Estima cuantiles del gasto por venta en una sala (o zona de evento).
+
+        Args:
+            sala: Sala tal como aparece en los eventos ("Sala 3", "VIP", ...)
+            cuantiles: Cuantiles a estimar
+
+        Returns:
+            Diccionario cuantil -> gasto estimado
+        """
+        with self._cerrojo:
+            gasto = self._gasto_sala.get(sala)
+            if gasto is None:
+                return {}
+            return {q: round(gasto.cuantil(q), 2) for q in cuantiles}
+
+    def cuantil_precio(self, q: float) -> float:
+        """Estima el cuantil q del precio pagado por entrada."""
+        with self._cerrojo:
+            return round(self._precio_entrada.cuantil(q), 2)
+
+    def fusionar(self, otra: "AnaliticaAproximada"):
+        """
+        Incorpora las estructuras de otra analítica (por ejemplo, de otra sucursal).
+
+        Args:
+            otra: Analítica con los mismos parámetros
+        """
+        with otra._cerrojo, self._cerrojo:
+            self._fusionar(otra)
+
+    def _fusionar(self, otra: "AnaliticaAproximada"):
+        """Incorpora otra analítica (con los cerrojos de ambas tomados)."""
+        for titulo, compradores in otra._compradores.items():
+            propio = self._compradores.get(titulo)
+            if propio is None:
+                propio = self._compradores[titulo] = HyperLogLog(self._precision)
+            propio.fusionar(compradores)
+        self._compradores_total.fusionar(otra._compradores_total)
+        self._peliculas.fusionar(otra._peliculas)
+        self._artistas.fusionar(otra._artistas)
+        for sala, gasto in otra._gasto_sala.items():
+            propio = self._gasto_sala.get(sala)
+            if propio is None:
+                propio = self._gasto_sala[sala] = TDigest(self._compresion)
+            propio.fusionar(gasto)
+        self._precio_entrada.fusionar(otra._precio_entrada)
+        self._ventas += otra._ventas
+
+    def _registrar_lote(self, ventas: list):
+        """Registra un lote de ventas entregado por el bus."""
+        with self._cerrojo:
+            for venta in ventas:
+                self._incorporar(venta)
+
+    def __str__(self) -> str:
+        """Representación en string de la analítica."""
+        return (f"AnaliticaAproximada: {self._ventas} ventas | {len(self._compradores)} títulos | "
+                f"{len(self._gasto_sala)} salas | {self.memoria / 1024:.1f} KiB")
+
+
+def evaluar_precision(ventas: List[VentaRealizada], configuraciones: list) -> List[dict]:
+    """
+    Compara las estimaciones con los valores exactos para varias configuraciones.
+
+    Args:
+        ventas: Eventos de venta
+        configuraciones: Lista de tuplas (precision, top_k, compresion)
+
+    Returns:
+        Lista de filas con la memoria, el error relativo medio de los
+        HyperLogLog, los aciertos del top 5 y el error de rango máximo de los cuantiles
+    """
+    exactos_compradores = {}
+    exactos_entradas = {}
+    gastos = {}
+    for venta in ventas:
+        exactos_compradores.setdefault(venta.titulo, set()).add(venta.cedula)
+        exactos_entradas[venta.titulo] = exactos_entradas.get(venta.titulo, 0) + venta.cantidad
+        gastos.setdefault(venta.sala, []).append(venta.total)
+    for valores in gastos.values():
+        valores.sort()
+    top_exacto = sorted(exactos_entradas, key=exactos_entradas.get, reverse=True)[:5]
+
+    filas = []
+    for precision, top_k, compresion in configuraciones:
+        analitica = AnaliticaAproximada(precision, top_k, compresion)
+        for venta in ventas:
+            analitica.registrar(venta)
+        error_hll = sum(abs(analitica.compradores_unicos(t) - len(c)) / len(c)
+                        for t, c in exactos_compradores.items()) / len(exactos_compradores)
+        estimados = analitica.top_peliculas(top_k) + analitica.top_artistas(top_k)
+        top_estimado = [t for t, _, _ in sorted(estimados, key=lambda e: e[1], reverse=True)[:5]]
+        # Error de rango: distancia entre q y la fracción real de valores bajo la estimación
+        error_cuantil = 0.0
+        for sala, valores in gastos.items():
+            for q, estimado in analitica.cuantiles_sala(sala).items():
+                debajo = (bisect.bisect_left(valores, estimado) + bisect.bisect_right(valores, estimado)) / 2
+                error_cuantil = max(error_cuantil, abs(debajo / len(valores) - q))
+        filas.append({"precision": precision, "top_k": top_k, "compresion": compresion,
+                      "memoria": analitica.memoria, "error_compradores": error_hll,
+                      "top5_aciertos": len(set(top_estimado) & set(top_exacto)),
+                      "error_cuantiles": error_cuantil})
+    return filas
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import random
+    import sys
+    from eventos import ahora
+
+    print("PRUEBA DE LA ANALÍTICA APROXIMADA")
+
+    aleatorio = random.Random(11)
+    peliculas = [f"Película {i}" for i in range(40)]
+    artistas = [f"Artista {i}" for i in range(25)]
+    # Popularidad con cola larga: pocos títulos concentran las ventas
+    pesos_peliculas = [1 / (i + 1) for i in range(len(peliculas))]
+    pesos_artistas = [1 / (i + 1) for i in range(len(artistas))]
+
+    def venta_aleatoria():
+        cedula = f"09{int(aleatorio.paretovariate(1.2) * 1000) % 60_000:08d}"
+        cantidad = aleatorio.randint(1, 6)
+        if aleatorio.random() < 0.7:
+            titulo = aleatorio.choices(peliculas, pesos_peliculas)[0]
+            sala = f"Sala {aleatorio.randint(1, 12)}"
+            precio = aleatorio.choice([6.8, 8.5, 11.5, 13.5, 16.5])
+            return VentaRealizada("C", "Cine", titulo, sala, cedula, cantidad,
+                                  round(precio * cantidad, 2), ahora())
+        titulo = aleatorio.choices(artistas, pesos_artistas)[0]
+        zona = aleatorio.choice(["General", "Preferencial", "VIP"])
+        precio = aleatorio.uniform(30, 180)
+        return VentaRealizada("E", "Evento", titulo, zona, cedula, cantidad,
+                              round(precio * cantidad, 2), ahora())
+
+    ventas = [venta_aleatoria() for _ in range(100_000)]
+
+    print("\n1. Alimentada desde el bus (suscriptor asíncrono):")
+    bus = BusEventos()
+    analitica = AnaliticaAproximada()
+    analitica.conectar(bus)
+    for venta in ventas[:50_000]:
+        bus.publicar(venta)
+    bus.vaciar()
+    print(f"   {analitica}")
+
+    print("\n2. Fusión con otra sucursal:")
+    sucursal = AnaliticaAproximada()
+    for venta in ventas[50_000:]:
+        sucursal.registrar(venta)
+    analitica.fusionar(sucursal)
+    exactos = len({v.cedula for v in ventas})
+    print(f"   Compradores distintos: {analitica.compradores_unicos()} (exacto {exactos})")
+    titulo = peliculas[0]
+    exactos = len({v.cedula for v in ventas if v.titulo == titulo})
+    print(f"   Compradores de '{titulo}': {analitica.compradores_unicos(titulo)} (exacto {exactos})")
+    print(f"   Top 3 artistas: {analitica.top_artistas(3)}")
+    print(f"   Gasto en Sala 1 (p50, p90, p99): {analitica.cuantiles_sala('Sala 1')}")
+    print(f"   Gasto en VIP (p50, p90, p99): {analitica.cuantiles_sala('VIP')}")
+    print(f"   Mediana del precio por entrada: ${analitica.cuantil_precio(0.5):.2f}")
+    bus.cerrar()
+
+    print("\n3. Precisión frente a memoria (contra valores exactos):")
+    print(f"   {'precision':>9} {'top_k':>5} {'compr.':>6} {'memoria':>10} "
+          f"{'err. HLL':>9} {'top5':>5} {'err. rango':>10}")
+    for fila in evaluar_precision(ventas, [(6, 16, 25), (8, 32, 50), (10, 64, 100), (12, 128, 200)]):
+        print(f"   {fila['precision']:>9} {fila['top_k']:>5} {fila['compresion']:>6} "
+              f"{fila['memoria'] / 1024:>8.1f}KB {fila['error_compradores']:>8.1%} "
+              f"{fila['top5_aciertos']:>3}/5 {fila['error_cuantiles']:>9.2%}")
+    sys.stdout.flush()
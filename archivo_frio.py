@@ -0,0 +1,359 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el ArchivoFrio: almacenamiento en disco de lo histórico.
+Los servicios que ya pasaron y las compras antiguas salen de la memoria
+(GestorServicios._servicios y Cliente._historial_compras) y se guardan en
+bloques comprimidos con zlib dentro de un archivo de solo agregado. Cada
+bloque lleva un resumen (rango de fechas, totales y claves) que se mantiene en
+memoria como índice, de modo que las consultas solo descomprimen los bloques
+que pueden contener resultados.
+
+Formato de cada bloque:
+    marco (magico, tipo, largo del resumen, largo de los datos) |
+    resumen JSON comprimido | registros JSON comprimidos
+"""
+
+import json
+import os
+import struct
+import zlib
+from datetime import datetime
+from typing import List
+from gestor_servicios import GestorServicios
+from cliente import Cliente
+
+MAGICO = b"CMXB"
+MARCO = struct.Struct("<4sBII")
+TIPO_SERVICIOS = 0
+TIPO_COMPRAS = 1
+
+
+class ArchivoFrio:
+    """
+    Clase que archiva servicios pasados y compras antiguas en bloques comprimidos.
+    Al abrirse solo lee los resúmenes de los bloques; los registros se
+    descomprimen al consultarse.
+    """
+
+    def __init__(self, ruta: str, tam_bloque: int = 1000, nivel_compresion: int = 6):
+        """
+        Constructor del ArchivoFrio.
+
+        Args:
+            ruta: Ruta del archivo (se crea si no existe)
+            tam_bloque: Máximo de registros por bloque
+            nivel_compresion: Nivel de zlib (1 a 9)
+        """
+        if tam_bloque < 1:
+            raise ValueError("El tamaño de bloque debe ser positivo")
+        self._ruta = ruta
+        self._tam_bloque = tam_bloque
+        self._nivel = nivel_compresion
+        # Índice de bloques: (tipo, desplazamiento de los datos, largo, resumen)
+        self._bloques = []
+        self._bloques_leidos = 0
+        if os.path.exists(ruta):
+            self._cargar_indice()
+
+    # Property para bloques
+    @property
+    def bloques(self) -> int:
+        """Obtiene la cantidad de bloques del archivo."""
+        return len(self._bloques)
+
+    # Property para bloques_leidos
+    @property
+    def bloques_leidos(self) -> int:
+        """Obtiene cuántos bloques se han descomprimido en las consultas."""
+        return self._bloques_leidos
+
+    def archivar_servicios(self, gestor: GestorServicios, antes_de: datetime) -> int:
+        """
+        Mueve al archivo los servicios anteriores a una fecha y los quita del gestor.
+        Los servicios con entradas retenidas se conservan hasta que se resuelvan.
+
+        Args:
+            gestor: Gestor del que se archivan los servicios
+            antes_de: Se archivan los servicios con fecha anterior a esta
+
+        Returns:
+            Cantidad de servicios archivados
+        """
+        pasados = [s for s in gestor._servicios
+                   if s.fecha < antes_de and not getattr(s, 'asientos_retenidos',
+                                                         getattr(s, 'entradas_retenidas', 0))]
+        if not pasados:
+            return 0
+        self._escribir(TIPO_SERVICIOS, [self._registro_servicio(s) for s in pasados])
+        gestor.retirar_servicios(pasados)
+        return len(pasados)
+
+    def archivar_compras(self, gestor: GestorServicios, antes_de: datetime) -> int:
+        """
+        Mueve al archivo las compras de servicios anteriores a una fecha.
+        Las compras de servicios que siguen en el gestor se conservan: el
+        índice de compradores las cuenta y todavía se pueden devolver.
+
+        Args:
+            gestor: Gestor cuyos clientes se recorren
+            antes_de: Se archivan las compras con fecha anterior a esta
+
+        Returns:
+            Cantidad de compras archivadas
+        """
+        vigentes = {servicio.codigo for servicio in gestor._servicios}
+        registros = []
+        for cliente in gestor._clientes:
+            for compra in cliente.archivar_compras(antes_de, vigentes):
+                registros.append({**compra, "cedula": cliente.cedula,
+                                  "fecha": compra["fecha"].isoformat()})
+        if registros:
+            self._escribir(TIPO_COMPRAS, registros)
+        return len(registros)
+
+    def servicios_archivados(self, desde: datetime = None, hasta: datetime = None) -> List[dict]:
+        """
+        Servicios archivados con fecha en un rango.
+
+        Args:
+            desde: Inicio del rango (incluido, None sin límite)
+            hasta: Fin del rango (excluido, None sin límite)
+
+        Returns:
+            Lista de registros de servicio en orden cronológico
+        """
+        resultado = []
+        for bloque in self._bloques_en_rango(TIPO_SERVICIOS, desde, hasta):
+            resultado.extend(r for r in self._leer(bloque) if self._en_rango(r["fecha"], desde, hasta))
+        resultado.sort(key=lambda r: r["fecha"])
+        return resultado
+
+    def ingresos_historicos(self, desde: datetime = None, hasta: datetime = None) -> float:
+        """
+        Ingresos de los servicios archivados en un rango.
+        Los bloques contenidos por completo en el rango se suman con su resumen,
+        sin descomprimirlos.
+
+        Args:
+            desde: Inicio del rango (incluido, None sin límite)
+            hasta: Fin del rango (excluido, None sin límite)
+
+        Returns:
+            Total de ingresos archivados
+        """
+        total = 0.0
+        for bloque in self._bloques_en_rango(TIPO_SERVICIOS, desde, hasta):
+            resumen = bloque[3]
+            if ((desde is None or resumen["desde"] >= desde)
+                    and (hasta is None or resumen["hasta"] < hasta)):
+                total += resumen["ingresos"]
+            else:
+                total += sum(r["ingresos"] for r in self._leer(bloque)
+                             if self._en_rango(r["fecha"], desde, hasta))
+        return round(total, 2)
+
+    def ingresos_totales(self, gestor: GestorServicios, desde: datetime = None,
+                         hasta: datetime = None) -> float:
+        """
+        Ingresos de un rango sumando los servicios en memoria y los archivados.
+
+        Args:
+            gestor: Gestor con los servicios en memoria
+            desde: Inicio del rango (incluido, None sin límite)
+            hasta: Fin del rango (excluido, None sin límite)
+
+        Returns:
+            Total de ingresos
+        """
+        vigentes = [s for s in gestor._servicios
+                    if (desde is None or s.fecha >= desde) and (hasta is None or s.fecha < hasta)]
+        return round(gestor.calcular_ingresos_totales(vigentes)
+                     + self.ingresos_historicos(desde, hasta), 2)
+
+    def historial_cliente(self, cedula: str) -> List[dict]:
+        """
+        Compras archivadas de un cliente, leyendo solo los bloques que lo incluyen.
+
+        Args:
+            cedula: Cédula del cliente
+
+        Returns:
+            Lista de compras con el mismo formato que el historial en memoria
+        """
+        compras = []
+        for bloque in self._bloques:
+            if bloque[0] == TIPO_COMPRAS and cedula in bloque[3]["cedulas"]:
+                for registro in self._leer(bloque):
+                    if registro.pop("cedula") == cedula:
+                        registro["fecha"] = datetime.fromisoformat(registro["fecha"])
+                        compras.append(registro)
+        compras.sort(key=lambda c: c["fecha"])
+        return compras
+
+    def historial_completo(self, cliente: Cliente) -> List[dict]:
+        """
+        Historial de un cliente con las compras archivadas y las que están en memoria.
+
+        Args:
+            cliente: Cliente a consultar
+
+        Returns:
+            Lista de compras, primero las archivadas
+        """
+        if not cliente.compras_archivadas:
+            return cliente.obtener_historial()
+        return self.historial_cliente(cliente.cedula) + cliente.obtener_historial()
+
+    def _registro_servicio(self, servicio) -> dict:
+        """Convierte un servicio en un registro serializable."""
+        if hasattr(servicio, '_asientos_vendidos'):
+            tipo, titulo, lugar = "Cine", servicio.pelicula, f"Sala {servicio.sala}"
+            vendidas = servicio.asientos_vendidos
+        else:
+            tipo, titulo, lugar = "Evento", servicio.artista, servicio.zona
+            vendidas = servicio.entradas_vendidas
+        precio = servicio.calcular_precio_total()
+        return {"codigo": servicio.codigo, "tipo": tipo, "nombre": servicio.nombre,
+                "titulo": titulo, "lugar": lugar, "fecha": servicio.fecha.isoformat(),
+                "precio_total": precio, "vendidas": vendidas,
+                "capacidad": servicio._capacidad_total, "estado": servicio.estado,
+                "ingresos": servicio.calcular_ingresos()}
+
+    def _escribir(self, tipo: int, registros: List[dict]):
+        """Agrega los registros al archivo en bloques ordenados por fecha."""
+        registros.sort(key=lambda r: r["fecha"])
+        with open(self._ruta, "ab") as archivo:
+            for inicio in range(0, len(registros), self._tam_bloque):
+                lote = registros[inicio:inicio + self._tam_bloque]
+                resumen = {"n": len(lote), "desde": lote[0]["fecha"], "hasta": lote[-1]["fecha"]}
+                if tipo == TIPO_SERVICIOS:
+                    resumen["ingresos"] = sum(r["ingresos"] for r in lote)
+                else:
+                    resumen["total"] = sum(r["total"] for r in lote)
+                    resumen["cedulas"] = sorted({r["cedula"] for r in lote})
+                resumen_bytes = zlib.compress(json.dumps(resumen).encode("utf-8"), self._nivel)
+                datos = zlib.compress(json.dumps(lote).encode("utf-8"), self._nivel)
+                archivo.write(MARCO.pack(MAGICO, tipo, len(resumen_bytes), len(datos)))
+                archivo.write(resumen_bytes)
+                desplazamiento = archivo.tell()
+                archivo.write(datos)
+                self._bloques.append((tipo, desplazamiento, len(datos), self._preparar(resumen)))
+
+    def _cargar_indice(self):
+        """Lee los resúmenes de todos los bloques, saltando sus datos."""
+        with open(self._ruta, "rb") as archivo:
+            while True:
+                marco = archivo.read(MARCO.size)
+                if len(marco) < MARCO.size:
+                    break
+                magico, tipo, largo_resumen, largo_datos = MARCO.unpack(marco)
+                if magico != MAGICO:
+                    raise ValueError(f"'{self._ruta}' no es un archivo frío válido")
+                resumen = json.loads(zlib.decompress(archivo.read(largo_resumen)))
+                desplazamiento = archivo.tell()
+                archivo.seek(largo_datos, os.SEEK_CUR)
+                self._bloques.append((tipo, desplazamiento, largo_datos, self._preparar(resumen)))
+
+    @staticmethod
+    def _preparar(resumen: dict) -> dict:
+        """Convierte las fechas del resumen y las cédulas a estructuras de consulta."""
+        resumen["desde"] = datetime.fromisoformat(resumen["desde"])
+        resumen["hasta"] = datetime.fromisoformat(resumen["hasta"])
+        if "cedulas" in resumen:
+            resumen["cedulas"] = frozenset(resumen["cedulas"])
+        return resumen
+
+    def _bloques_en_rango(self, tipo: int, desde: datetime, hasta: datetime) -> list:
+        """Bloques de un tipo cuyo rango de fechas se cruza con el consultado."""
+        return [b for b in self._bloques
+                if b[0] == tipo and (desde is None or b[3]["hasta"] >= desde)
+                and (hasta is None or b[3]["desde"] < hasta)]
+
+    def _leer(self, bloque: tuple) -> List[dict]:
+        """Descomprime los registros de un bloque."""
+        self._bloques_leidos += 1
+        with open(self._ruta, "rb") as archivo:
+            archivo.seek(bloque[1])
+            return json.loads(zlib.decompress(archivo.read(bloque[2])))
+
+    @staticmethod
+    def _en_rango(fecha: str, desde: datetime, hasta: datetime) -> bool:
+        """Indica si una fecha ISO está dentro del rango."""
+        valor = datetime.fromisoformat(fecha)
+        return (desde is None or valor >= desde) and (hasta is None or valor < hasta)
+
+    def __str__(self) -> str:
+        """Representación en string del archivo."""
+        servicios = sum(b[3]["n"] for b in self._bloques if b[0] == TIPO_SERVICIOS)
+        compras = sum(b[3]["n"] for b in self._bloques if b[0] == TIPO_COMPRAS)
+        tamano = os.path.getsize(self._ruta) if os.path.exists(self._ruta) else 0
+        return (f"ArchivoFrio: {servicios} servicios | {compras} compras | "
+                f"{len(self._bloques)} bloques | {tamano / 1024:.1f} KiB")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import random
+    import tempfile
+    from contextlib import redirect_stdout
+    from datetime import timedelta
+    from servicio_cine import ServicioCine
+
+    print("PRUEBA DEL ARCHIVO FRÍO")
+
+    aleatorio = random.Random(3)
+    gestor = GestorServicios("CineMax Entertainment")
+    with redirect_stdout(io.StringIO()):
+        for i in range(8_000):
+            fecha = datetime(2024, 1, 1, 10, 0) + timedelta(hours=i)
+            gestor.agregar_servicio(ServicioCine(f"C{i:05d}", f"Función {i}", fecha, 8.5,
+                                                 f"Película {i % 200}", i % 10 + 1))
+        for i in range(200):
+            gestor.agregar_cliente(Cliente(f"09{i:08d}", "Cliente", f"N{i}",
+                                           f"c{i}@email.com", "0987654321"))
+        for _ in range(12_000):
+            gestor.realizar_venta(f"C{aleatorio.randrange(8_000):05d}",
+                                  f"09{aleatorio.randrange(200):08d}", aleatorio.randint(1, 4))
+
+    cliente = gestor.buscar_cliente("0900000007")
+    historial_antes = cliente.obtener_historial()
+    ingresos_antes = gestor.calcular_ingresos_totales(gestor._servicios)
+    ingresos_2024 = gestor.calcular_ingresos_totales(
+        [s for s in gestor._servicios if s.fecha < datetime(2024, 6, 1)])
+    print(f"\n1. En memoria: {len(gestor._servicios)} servicios | "
+          f"{sum(len(c.obtener_historial()) for c in gestor._clientes)} compras")
+
+    ruta = os.path.join(tempfile.gettempdir(), "cinemax_archivo.cmx")
+    if os.path.exists(ruta):
+        os.remove(ruta)
+    archivo = ArchivoFrio(ruta)
+    corte = datetime(2024, 8, 1)
+    print(f"\n2. Archivando lo anterior al {corte:%d/%m/%Y}:")
+    print(f"   Servicios archivados: {archivo.archivar_servicios(gestor, corte)}")
+    print(f"   Compras archivadas: {archivo.archivar_compras(gestor, corte)}")
+    print(f"   En memoria: {len(gestor._servicios)} servicios | "
+          f"{sum(len(c.obtener_historial()) for c in gestor._clientes)} compras")
+    print(f"   {archivo}")
+
+    print("\n3. Consultas transparentes:")
+    archivo = ArchivoFrio(ruta)
+    print(f"   Reabierto: {archivo}")
+    print(f"   Ingresos totales: ${archivo.ingresos_totales(gestor):,.2f} "
+          f"(antes ${ingresos_antes:,.2f})")
+    print(f"   Ingresos hasta mayo de 2024: ${archivo.ingresos_totales(gestor, hasta=datetime(2024, 6, 1)):,.2f} "
+          f"(antes ${ingresos_2024:,.2f}) | bloques leídos: {archivo.bloques_leidos}")
+    leidos = archivo.bloques_leidos
+    marzo = archivo.servicios_archivados(datetime(2024, 3, 1), datetime(2024, 3, 2))
+    print(f"   Funciones del 01/03/2024: {len(marzo)} | bloques leídos: {archivo.bloques_leidos - leidos}")
+    completo = archivo.historial_completo(cliente)
+    orden = lambda c: (c["fecha"], c["codigo"], c["cantidad"])
+    print(f"   Historial de {cliente.nombre_completo()}: {len(completo)} compras "
+          f"(idéntico: {sorted(completo, key=orden) == sorted(historial_antes, key=orden)}) | compras totales: {cliente.total_compras()}")
+
+    os.remove(ruta)
@@ -0,0 +1,360 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo de benchmarks reproducibles del sistema de cine/eventos.
+Genera datos sintéticos con semilla fija, mide ventas, búsquedas, ingresos,
+reportes, estadísticas y memoria por objeto, guarda los resultados en JSON
+y compara dos ejecuciones para detectar regresiones.
+
+Uso:
+    python benchmarks.py --escalas 1000 10000 --salida base.json
+    python benchmarks.py --escalas 1000 10000 --comparar base.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from servicio_cine import ServicioCine
+from servicio_evento import ServicioEvento
+from cliente import Cliente
+from gestor_servicios import GestorServicios
+
+PELICULAS = ["Dune: Part Two", "Avatar 3", "Moana 2", "Oppenheimer", "Wicked", "Gladiator II"]
+ARTISTAS = ["Los Rockeros", "Compañía Nacional de Opera", "Comediantes Unidos", "Ballet Nacional"]
+NOMBRES = ["Juan", "María", "José", "Lucía", "Andrés", "Sofía", "Martín", "Valeria"]
+APELLIDOS = ["Pérez", "González", "Castillo", "Santamaría", "Soriano", "Gómez"]
+FECHA_BASE = datetime(2025, 1, 6, 10, 0)
+
+
+class _Sumidero:
+    """Salida que descarta el texto impreso por las operaciones medidas."""
+
+    def write(self, texto: str) -> int:
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+# ========== GENERADORES DE DATOS SINTÉTICOS ==========
+
+def generar_servicios_cine(cantidad: int, semilla: int = 0) -> list:
+    """
+    Genera funciones de cine sintéticas.
+
+    Args:
+        cantidad: Número de funciones
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de ServicioCine
+    """
+    generador = random.Random(semilla)
+    return [ServicioCine(f"C{i:07d}", f"Función {i}",
+                         FECHA_BASE + timedelta(minutes=30 * generador.randrange(2000)),
+                         round(generador.uniform(5, 12), 2), generador.choice(PELICULAS),
+                         generador.randint(1, 20), generador.random() < 0.3, generador.random() < 0.1)
+            for i in range(cantidad)]
+
+
+def generar_servicios_evento(cantidad: int, semilla: int = 0) -> list:
+    """
+    Genera eventos sintéticos.
+
+    Args:
+        cantidad: Número de eventos
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de ServicioEvento
+    """
+    generador = random.Random(semilla + 1)
+    return [ServicioEvento(f"E{i:07d}", f"Evento {i}",
+                           FECHA_BASE + timedelta(hours=generador.randrange(2000)),
+                           round(generador.uniform(20, 80), 2), generador.choice(ARTISTAS),
+                           generador.choice(ServicioEvento.TIPOS_EVENTO),
+                           generador.choice([1.5, 2.0, 2.5, 3.5]),
+                           generador.choice(["General", "Preferencial", "VIP"]))
+            for i in range(cantidad)]
+
+
+def generar_clientes(cantidad: int, semilla: int = 0) -> list:
+    """
+    Genera clientes sintéticos.
+
+    Args:
+        cantidad: Número de clientes
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        Lista de Cliente
+    """
+    generador = random.Random(semilla + 2)
+    return [Cliente(f"{i:010d}", generador.choice(NOMBRES), generador.choice(APELLIDOS),
+                    f"cliente{i}@email.com", f"09{i:08d}")
+            for i in range(cantidad)]
+
+
+def construir_gestor(escala: int, semilla: int = 0) -> GestorServicios:
+    """
+    Construye un gestor con `escala` servicios (mitad cine, mitad eventos)
+    y `escala` clientes, usando los métodos públicos de alta.
+
+    Args:
+        escala: Cantidad de servicios y de clientes
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        GestorServicios cargado
+    """
+    gestor = GestorServicios("Benchmark")
+    with redirect_stdout(_Sumidero()):
+        for servicio in generar_servicios_cine(escala // 2, semilla):
+            gestor.agregar_servicio(servicio)
+        for servicio in generar_servicios_evento(escala - escala // 2, semilla):
+            gestor.agregar_servicio(servicio)
+        for cliente in generar_clientes(escala, semilla):
+            gestor.agregar_cliente(cliente)
+    return gestor
+
+
+# ========== CASOS DE BENCHMARK ==========
+# Cada caso recibe (gestor, escala, generador) y retorna (funcion, operaciones)
+# o (funcion, operaciones, preparar): funcion() ejecuta `operaciones` operaciones
+# y se cronometra completa; preparar(), si existe, corre antes de cada repetición
+# sin cronometrarse.
+
+def caso_realizar_venta(gestor, escala, generador):
+    """Throughput de realizar_venta con servicios y clientes aleatorios."""
+    operaciones = 200
+    pedidos = [(gestor._servicios[generador.randrange(len(gestor._servicios))].codigo,
+                gestor._clientes[generador.randrange(len(gestor._clientes))].cedula)
+               for _ in range(operaciones)]
+
+    def funcion():
+        for codigo, cedula in pedidos:
+            gestor.realizar_venta(codigo, cedula, 1)
+    return funcion, operaciones
+
+
+def caso_buscar_servicio(gestor, escala, generador):
+    """Latencia de buscar_servicio por código."""
+    operaciones = 200
+    codigos = [gestor._servicios[generador.randrange(len(gestor._servicios))].codigo
+               for _ in range(operaciones)]
+
+    def funcion():
+        for codigo in codigos:
+            gestor.buscar_servicio(codigo)
+    return funcion, operaciones
+
+
+def caso_buscar_cliente(gestor, escala, generador):
+    """Latencia de buscar_cliente por cédula."""
+    operaciones = 200
+    cedulas = [gestor._clientes[generador.randrange(len(gestor._clientes))].cedula
+               for _ in range(operaciones)]
+
+    def funcion():
+        for cedula in cedulas:
+            gestor.buscar_cliente(cedula)
+    return funcion, operaciones
+
+
+def caso_calcular_ingresos(gestor, escala, generador):
+    """calcular_ingresos_totales sobre todo el catálogo."""
+    return (lambda: gestor.calcular_ingresos_totales(gestor._servicios)), 1
+
+
+def caso_generar_reporte(gestor, escala, generador):
+    """generar_reporte_servicios sobre todo el catálogo."""
+    return (lambda: gestor.generar_reporte_servicios(gestor._servicios)), 1
+
+
+def caso_obtener_estadisticas(gestor, escala, generador):
+    """obtener_estadisticas del gestor."""
+    return gestor.obtener_estadisticas, 1
+
+
+def caso_lista_espera_tormenta(gestor, escala, generador):
+    """Tormenta de asignaciones: se liberan 500 entradas con la lista de espera llena."""
+    from lista_espera import GestorListaEspera
+
+    estado = {}
+
+    def preparar():
+        clientes = generar_clientes(1000)
+        local = GestorServicios("Tormenta")
+        local.agregar_servicio(generar_servicios_evento(1)[0])
+        for cliente in clientes:
+            local.agregar_cliente(cliente)
+        codigo = local._servicios[0].codigo
+        local.realizar_venta(codigo, clientes[0].cedula, 500)
+        espera = GestorListaEspera(local)
+        for i in range(min(escala, 100_000)):
+            espera.inscribir(codigo, clientes[1 + i % 999].cedula, 1)
+        estado.update(gestor=local, codigo=codigo, titular=clientes[0].cedula)
+
+    def funcion():
+        estado["gestor"].cancelar_venta(estado["codigo"], estado["titular"], 500)
+    return funcion, 500, preparar
+
+
+CASOS = {
+    "realizar_venta": caso_realizar_venta,
+    "buscar_servicio": caso_buscar_servicio,
+    "buscar_cliente": caso_buscar_cliente,
+    "calcular_ingresos_totales": caso_calcular_ingresos,
+    "generar_reporte_servicios": caso_generar_reporte,
+    "obtener_estadisticas": caso_obtener_estadisticas,
+    "lista_espera_tormenta": caso_lista_espera_tormenta,
+}
+
+
+def medir_memoria_por_objeto(cantidad: int = 10_000) -> dict:
+    """
+    Mide los bytes asignados por objeto de cada clase con tracemalloc.
+
+    Args:
+        cantidad: Objetos creados por clase
+
+    Returns:
+        Diccionario clase -> bytes por objeto
+    """
+    resultado = {}
+    for nombre, generador in (("ServicioCine", generar_servicios_cine),
+                              ("ServicioEvento", generar_servicios_evento),
+                              ("Cliente", generar_clientes)):
+        tracemalloc.start()
+        antes = tracemalloc.get_traced_memory()[0]
+        objetos = generador(cantidad)
+        despues = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        resultado[nombre] = round((despues - antes) / len(objetos), 1)
+    return resultado
+
+
+def ejecutar(escalas: list, repeticiones: int = 5, semilla: int = 0, casos: list = None) -> dict:
+    """
+    Ejecuta los benchmarks.
+
+    Args:
+        escalas: Tamaños de catálogo a probar
+        repeticiones: Repeticiones por caso (se reporta la mediana)
+        semilla: Semilla de los datos sintéticos
+        casos: Nombres de casos a ejecutar (todos si es None)
+
+    Returns:
+        Diccionario con metadatos y resultados
+    """
+    resultados = {}
+    for escala in escalas:
+        for nombre in casos or CASOS:
+            # Un gestor nuevo por caso: las ventas no contaminan otros casos
+            gestor = construir_gestor(escala, semilla)
+            caso = CASOS[nombre](gestor, escala, random.Random(semilla))
+            funcion, operaciones = caso[:2]
+            preparar = caso[2] if len(caso) > 2 else None
+            tiempos = []
+            with redirect_stdout(_Sumidero()):
+                for _ in range(repeticiones):
+                    if preparar is not None:
+                        preparar()
+                    inicio = time.perf_counter()
+                    funcion()
+                    tiempos.append((time.perf_counter() - inicio) / operaciones)
+            mediana = statistics.median(tiempos)
+            resultados[f"{nombre}@{escala}"] = {
+                "mediana_s": mediana,
+                "minimo_s": min(tiempos),
+                "maximo_s": max(tiempos),
+                "ops_por_s": 1 / mediana if mediana > 0 else None,
+            }
+            print(f"   {nombre:<28} escala={escala:<9} {mediana * 1e6:>12.2f} µs/op")
+
+    return {
+        "metadatos": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "semilla": semilla,
+            "repeticiones": repeticiones,
+            "escalas": escalas,
+        },
+        "resultados": resultados,
+        "memoria_bytes_por_objeto": medir_memoria_por_objeto(),
+    }
+
+
+def comparar(base: dict, actual: dict, umbral: float = 0.10) -> list:
+    """
+    Compara dos ejecuciones y detecta regresiones.
+
+    Args:
+        base: Resultados de referencia
+        actual: Resultados nuevos
+        umbral: Aumento relativo de la mediana considerado regresión
+
+    Returns:
+        Lista de tuplas (caso, mediana base, mediana actual, cambio relativo)
+    """
+    regresiones = []
+    for caso, medicion in actual["resultados"].items():
+        anterior = base["resultados"].get(caso)
+        if anterior is None or anterior["mediana_s"] == 0:
+            continue
+        cambio = medicion["mediana_s"] / anterior["mediana_s"] - 1
+        if cambio > umbral:
+            regresiones.append((caso, anterior["mediana_s"], medicion["mediana_s"], cambio))
+    return regresiones
+
+
+def main(argumentos=None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema de cine/eventos")
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1000, 10000],
+                        help="tamaños de catálogo (10^3 a 10^6)")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), default=None)
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="archivo JSON de referencia para detectar regresiones")
+    parser.add_argument("--umbral", type=float, default=0.10,
+                        help="aumento relativo considerado regresión (0.10 = 10%%)")
+    opciones = parser.parse_args(argumentos)
+
+    print("BENCHMARKS DEL SISTEMA DE CINE/EVENTOS")
+    resultados = ejecutar(opciones.escalas, opciones.repeticiones, opciones.semilla, opciones.casos)
+    print(f"   Memoria por objeto (bytes): {resultados['memoria_bytes_por_objeto']}")
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"   Resultados guardados en {opciones.salida}")
+
+    if opciones.comparar:
+        with open(opciones.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base, resultados, opciones.umbral)
+        if regresiones:
+            print(f"\n   REGRESIONES (umbral {opciones.umbral:.0%}):")
+            for caso, anterior, actual, cambio in regresiones:
+                print(f"   {caso:<40} {anterior * 1e6:.2f} -> {actual * 1e6:.2f} µs/op ({cambio:+.0%})")
+            return 1
+        print("\n   Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el EmisorBoletos: un boleto por asiento, con validación en puerta.
+Cada boleto es un código de 24 caracteres en base32 que empaqueta el número
+del servicio dentro del emisor, el número de serie del asiento y una firma
+HMAC-SHA256 truncada. Los identificadores no colisionan porque el par
+(servicio, serie) es único, y no se pueden falsificar sin la clave.
+Para validar en puerta no hay búsquedas: se verifica la firma y se marca el bit
+del boleto en el mapa de bits de usados del servicio.
+"""
+
+import base64
+import binascii
+import hmac
+import struct
+import threading
+from typing import List
+from eventos import BusEventos, VentaRealizada, VentaCancelada
+
+# servicio (uint32) | serie (uint32) | firma (7 bytes) = 15 bytes = 24 caracteres base32
+CUERPO = struct.Struct("<II")
+LARGO_FIRMA = 7
+LARGO_BOLETO = 24
+
+# Resultados de la validación
+VALIDO = "Válido"
+YA_USADO = "Ya usado"
+ANULADO = "Anulado"
+OTRO_SERVICIO = "Otro servicio"
+INVALIDO = "Inválido"
+
+
+class _Mapa:
+    """Boletos de un servicio: contador de series, bits de usados y anulados."""
+
+    __slots__ = ("codigo", "emitidos", "usados", "anulados", "cerrojo")
+
+    def __init__(self, codigo: str):
+        self.codigo = codigo
+        self.emitidos = 0
+        self.usados = bytearray()
+        self.anulados = bytearray()
+        self.cerrojo = threading.Lock()
+
+
+class EmisorBoletos:
+    """
+    Clase que emite y valida boletos firmados.
+    Se conecta al BusEventos del gestor: emite boletos con cada VentaRealizada
+    y anula los del cliente con cada VentaCancelada.
+    """
+
+    def __init__(self, clave: bytes):
+        """
+        Constructor del EmisorBoletos.
+
+        Args:
+            clave: Clave secreta del HMAC (al menos 16 bytes)
+        """
+        if len(clave) < 16:
+            raise ValueError("La clave debe tener al menos 16 bytes")
+        self._clave = clave
+        self._mapas = []
+        self._indices = {}
+        # (número de servicio, cédula) -> series emitidas al cliente
+        self._titulares = {}
+        self._validaciones = 0
+
+    # Property para emitidos
+    @property
+    def emitidos(self) -> int:
+        """Obtiene la cantidad total de boletos emitidos."""
+        return sum(mapa.emitidos for mapa in self._mapas)
+
+    # Property para validaciones
+    @property
+    def validaciones(self) -> int:
+        """Obtiene la cantidad de validaciones realizadas."""
+        return self._validaciones
+
+    def conectar(self, bus: BusEventos):
+        """
+        Suscribe el emisor a las ventas y cancelaciones del bus.
+
+        Args:
+            bus: Bus de eventos del gestor
+        """
+        bus.suscribir(self._al_vender, (VentaRealizada,))
+        bus.suscribir(self._al_cancelar, (VentaCancelada,))
+
+    def emitir(self, codigo_servicio: str, cedula: str, cantidad: int) -> List[str]:
+        """
+        Emite un boleto por asiento.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula: Cédula del titular
+            cantidad: Cantidad de boletos
+
+        Returns:
+            Lista de códigos de boleto
+        """
+        if cantidad < 1:
+            raise ValueError("La cantidad debe ser positiva")
+        indice = self._indices.get(codigo_servicio)
+        if indice is None:
+            indice = len(self._mapas)
+            self._indices[codigo_servicio] = indice
+            self._mapas.append(_Mapa(codigo_servicio))
+        mapa = self._mapas[indice]
+        with mapa.cerrojo:
+            primera = mapa.emitidos
+            mapa.emitidos += cantidad
+            faltan = (mapa.emitidos + 7) // 8 - len(mapa.usados)
+            if faltan > 0:
+                mapa.usados.extend(bytes(faltan))
+                mapa.anulados.extend(bytes(faltan))
+        series = range(primera, primera + cantidad)
+        self._titulares.setdefault((indice, cedula), []).extend(series)
+        return [self._codificar(indice, serie) for serie in series]
+
+    def validar(self, boleto: str, codigo_servicio: str = None) -> str:
+        """
+        Valida un boleto en puerta y lo marca como usado.
+
+        Args:
+            boleto: Código leído por el escáner
+            codigo_servicio: Servicio de la puerta (None acepta cualquiera)
+
+        Returns:
+            VALIDO, YA_USADO, ANULADO, OTRO_SERVICIO o INVALIDO
+        """
+        self._validaciones += 1
+        datos = self._decodificar(boleto)
+        if datos is None:
+            return INVALIDO
+        indice, serie = datos
+        mapa = self._mapas[indice]
+        if codigo_servicio is not None and mapa.codigo != codigo_servicio:
+            return OTRO_SERVICIO
+        byte, bit = serie >> 3, 1 << (serie & 7)
+        if mapa.anulados[byte] & bit:
+            return ANULADO
+        # Solo la prueba y marca del bit va bajo el cerrojo del servicio
+        with mapa.cerrojo:
+            if mapa.usados[byte] & bit:
+                return YA_USADO
+            mapa.usados[byte] |= bit
+        return VALIDO
+
+    def consultar(self, boleto: str) -> str:
+        """
+        Estado de un boleto sin marcarlo como usado.
+
+        Args:
+            boleto: Código del boleto
+
+        Returns:
+            VALIDO (sin usar), YA_USADO, ANULADO o INVALIDO
+        """
+        datos = self._decodificar(boleto)
+        if datos is None:
+            return INVALIDO
+        indice, serie = datos
+        mapa = self._mapas[indice]
+        byte, bit = serie >> 3, 1 << (serie & 7)
+        if mapa.anulados[byte] & bit:
+            return ANULADO
+        return YA_USADO if mapa.usados[byte] & bit else VALIDO
+
+    def boletos_de(self, codigo_servicio: str, cedula: str) -> List[str]:
+        """
+        Boletos vigentes (no anulados) de un cliente para un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula: Cédula del titular
+
+        Returns:
+            Lista de códigos de boleto
+        """
+        indice = self._indices.get(codigo_servicio)
+        if indice is None:
+            return []
+        anulados = self._mapas[indice].anulados
+        return [self._codificar(indice, serie)
+                for serie in self._titulares.get((indice, cedula), [])
+                if not anulados[serie >> 3] & (1 << (serie & 7))]
+
+    def anular(self, codigo_servicio: str, cedula: str, cantidad: int) -> int:
+        """
+        Anula boletos de un cliente, empezando por los últimos emitidos sin usar.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula: Cédula del titular
+            cantidad: Cantidad de boletos a anular
+
+        Returns:
+            Cantidad de boletos anulados
+        """
+        indice = self._indices.get(codigo_servicio)
+        series = self._titulares.get((indice, cedula))
+        if not series:
+            return 0
+        mapa = self._mapas[indice]
+        with mapa.cerrojo:
+            sin_usar = [s for s in series if not mapa.usados[s >> 3] & (1 << (s & 7))]
+            usadas = [s for s in series if mapa.usados[s >> 3] & (1 << (s & 7))]
+            # Los sin usar quedan al final para anularse primero
+            orden = usadas + sin_usar
+            anuladas = orden[len(orden) - min(cantidad, len(orden)):]
+            for serie in anuladas:
+                mapa.anulados[serie >> 3] |= 1 << (serie & 7)
+            del orden[len(orden) - len(anuladas):]
+            series[:] = sorted(orden)
+        return len(anuladas)
+
+    def ocupacion(self, codigo_servicio: str) -> tuple:
+        """
+        Boletos usados y vigentes de un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+
+        Returns:
+            Tupla (usados, vigentes)
+        """
+        indice = self._indices.get(codigo_servicio)
+        if indice is None:
+            return 0, 0
+        mapa = self._mapas[indice]
+        anulados = sum(bin(b).count("1") for b in mapa.anulados)
+        usados = sum(bin(u & ~a).count("1") for u, a in zip(mapa.usados, mapa.anulados))
+        return usados, mapa.emitidos - anulados
+
+    def _al_vender(self, evento: VentaRealizada):
+        """Emite los boletos de una venta publicada en el bus."""
+        self.emitir(evento.codigo, evento.cedula, evento.cantidad)
+
+    def _al_cancelar(self, evento: VentaCancelada):
+        """Anula los boletos de una cancelación publicada en el bus."""
+        self.anular(evento.codigo, evento.cedula, evento.cantidad)
+
+    def _firma(self, cuerpo: bytes) -> bytes:
+        """Firma HMAC-SHA256 truncada del cuerpo del boleto."""
+        return hmac.digest(self._clave, cuerpo, "sha256")[:LARGO_FIRMA]
+
+    def _codificar(self, indice: int, serie: int) -> str:
+        """Arma el código base32 del boleto."""
+        cuerpo = CUERPO.pack(indice, serie)
+        return base64.b32encode(cuerpo + self._firma(cuerpo)).decode("ascii")
+
+    def _decodificar(self, boleto: str):
+        """Verifica la firma y devuelve (índice, serie), o None si no es válido."""
+        if len(boleto) != LARGO_BOLETO:
+            return None
+        try:
+            crudo = base64.b32decode(boleto)
+        except (binascii.Error, ValueError):
+            return None
+        cuerpo = crudo[:CUERPO.size]
+        if not hmac.compare_digest(crudo[CUERPO.size:], self._firma(cuerpo)):
+            return None
+        indice, serie = CUERPO.unpack(cuerpo)
+        # Una firma correcta con serie no emitida solo puede venir de otra clave
+        if indice >= len(self._mapas) or serie >= self._mapas[indice].emitidos:
+            return None
+        return indice, serie
+
+    def __str__(self) -> str:
+        """Representación en string del emisor."""
+        return (f"EmisorBoletos: {len(self._mapas)} servicios | {self.emitidos} boletos | "
+                f"{self._validaciones} validaciones")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import os
+    import time
+    from contextlib import redirect_stdout
+    from datetime import datetime
+    from cliente import Cliente
+    from gestor_servicios import GestorServicios
+    from servicio_evento import ServicioEvento
+
+    print("PRUEBA DEL EMISOR DE BOLETOS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    gestor.bus = BusEventos()
+    emisor = EmisorBoletos(os.urandom(32))
+    emisor.conectar(gestor.bus)
+
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_servicio(ServicioEvento("E001", "Rock Fest", datetime(2025, 12, 20, 20, 0),
+                                               50.0, "Los Rockeros", "Concierto", 3))
+        gestor.agregar_servicio(ServicioEvento("E002", "Comedia", datetime(2025, 12, 21, 21, 0),
+                                               30.0, "Humoristas", "Teatro", 2))
+        for i in range(125):
+            gestor.agregar_cliente(Cliente(f"09{i:08d}", "Cliente", f"N{i}",
+                                           f"c{i}@email.com", "0987654321"))
+        for i in range(125):
+            gestor.realizar_venta("E001", f"09{i:08d}", 4)
+        gestor.realizar_venta("E002", "0900000000", 2)
+
+    print(f"\n1. Emisión: {emisor}")
+    boletos = emisor.boletos_de("E001", "0900000000")
+    print(f"   Boletos del cliente 0900000000: {boletos[:2]} ...")
+
+    print("\n2. Validación en puerta:")
+    print(f"   Primera lectura: {emisor.validar(boletos[0], 'E001')}")
+    print(f"   Segunda lectura: {emisor.validar(boletos[0], 'E001')}")
+    print(f"   Puerta equivocada: {emisor.validar(emisor.boletos_de('E002', '0900000000')[0], 'E001')}")
+    falso = boletos[1][:-1] + ("A" if boletos[1][-1] != "A" else "B")
+    print(f"   Boleto alterado: {emisor.validar(falso, 'E001')}")
+
+    print("\n3. Cancelación:")
+    with redirect_stdout(io.StringIO()):
+        gestor.cancelar_venta("E001", "0900000000", 2)
+    print(f"   Boleto devuelto: {emisor.validar(boletos[3], 'E001')}")
+    print(f"   Vigentes del cliente: {len(emisor.boletos_de('E001', '0900000000'))}")
+
+    print("\n4. Apertura de puertas (500 boletos, 4 puertas):")
+    todos = [b for i in range(1, 125) for b in emisor.boletos_de("E001", f"09{i:08d}")]
+    resultados = []
+
+    def puerta(lote):
+        resultados.extend(emisor.validar(b, "E001") for b in lote)
+
+    inicio = time.perf_counter()
+    puertas = [threading.Thread(target=puerta, args=(todos[i::4] + todos[:10],)) for i in range(4)]
+    for hilo in puertas:
+        hilo.start()
+    for hilo in puertas:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    print(f"   Válidos: {resultados.count(VALIDO)} | repetidos: {resultados.count(YA_USADO)} | "
+          f"{len(resultados) / duracion:,.0f} validaciones/s")
+    print(f"   Ocupación (usados, vigentes): {emisor.ocupacion('E001')}")
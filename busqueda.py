@@ -0,0 +1,384 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la búsqueda por texto sobre servicios y clientes.
+Implementa un índice invertido con búsqueda exacta, por prefijo y difusa
+(por trigramas), insensible a mayúsculas y tildes ("Pérez" = "Perez").
+"""
+
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from gestor_servicios import GestorServicios
+
+_PATRON_PALABRA = re.compile(r"\w+")
+
+
+def normalizar(texto: str) -> str:
+    """
+    Normaliza un texto quitando tildes y diferencias de mayúsculas.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Texto normalizado
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def tokenizar(texto: str) -> list:
+    """
+    Divide un texto normalizado en palabras.
+
+    Args:
+        texto: Texto original
+
+    Returns:
+        Lista de palabras normalizadas
+    """
+    return _PATRON_PALABRA.findall(normalizar(texto))
+
+
+def trigramas(palabra: str) -> set:
+    """
+    Obtiene los trigramas de una palabra (con bordes marcados).
+
+    Args:
+        palabra: Palabra normalizada
+
+    Returns:
+        Conjunto de trigramas
+    """
+    marcada = f"${palabra}$"
+    return {marcada[i:i + 3] for i in range(len(marcada) - 2)}
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido palabra -> documentos, con vocabulario ordenado para
+    búsquedas por prefijo y un índice de trigramas para búsquedas difusas.
+    Se actualiza de forma incremental al indexar o eliminar documentos.
+    """
+
+    MAX_EXPANSION = 64  # palabras máximas consideradas por prefijo o similitud
+
+    def __init__(self):
+        """Constructor del IndiceBusqueda."""
+        self._documentos = {}  # clave -> (objeto, palabras)
+        self._invertido = {}  # palabra -> claves
+        self._vocabulario = []  # palabras ordenadas
+        self._trigramas = {}  # trigrama -> palabras
+        self._num_trigramas = {}  # palabra -> cantidad de trigramas distintos
+
+    def __len__(self) -> int:
+        """Cantidad de documentos indexados."""
+        return len(self._documentos)
+
+    def indexar(self, clave, objeto, textos: list):
+        """
+        Indexa (o reindexa) un documento.
+
+        Args:
+            clave: Identificador único del documento
+            objeto: Objeto que se retorna en las búsquedas
+            textos: Textos a indexar
+        """
+        if clave in self._documentos:
+            self.eliminar(clave)
+
+        palabras = set()
+        for texto in textos:
+            if texto:
+                palabras.update(tokenizar(texto))
+        self._documentos[clave] = (objeto, palabras)
+
+        for palabra in palabras:
+            claves = self._invertido.get(palabra)
+            if claves is None:
+                claves = self._invertido[palabra] = set()
+                insort(self._vocabulario, palabra)
+                propios = trigramas(palabra)
+                self._num_trigramas[palabra] = len(propios)
+                for trigrama in propios:
+                    self._trigramas.setdefault(trigrama, set()).add(palabra)
+            claves.add(clave)
+
+    def eliminar(self, clave) -> bool:
+        """
+        Elimina un documento del índice.
+
+        Args:
+            clave: Identificador del documento
+
+        Returns:
+            True si el documento estaba indexado
+        """
+        documento = self._documentos.pop(clave, None)
+        if documento is None:
+            return False
+
+        for palabra in documento[1]:
+            claves = self._invertido[palabra]
+            claves.discard(clave)
+            if not claves:
+                del self._invertido[palabra]
+                del self._vocabulario[bisect_left(self._vocabulario, palabra)]
+                del self._num_trigramas[palabra]
+                for trigrama in trigramas(palabra):
+                    palabras = self._trigramas[trigrama]
+                    palabras.discard(palabra)
+                    if not palabras:
+                        del self._trigramas[trigrama]
+        return True
+
+    def buscar(self, consulta: str, limite: int = 20) -> list:
+        """
+        Búsqueda exacta: documentos que contienen todas las palabras.
+
+        Args:
+            consulta: Texto a buscar
+            limite: Cantidad máxima de resultados
+
+        Returns:
+            Lista de objetos encontrados
+        """
+        grupos = [[palabra] for palabra in tokenizar(consulta)]
+        return self._combinar(grupos, limite)
+
+    def buscar_prefijo(self, consulta: str, limite: int = 20) -> list:
+        """
+        Búsqueda mientras se escribe: la última palabra se trata como prefijo.
+
+        Args:
+            consulta: Texto a buscar
+            limite: Cantidad máxima de resultados
+
+        Returns:
+            Lista de objetos encontrados
+        """
+        palabras = tokenizar(consulta)
+        if not palabras:
+            return []
+        grupos = [[palabra] for palabra in palabras[:-1]]
+        grupos.append(self._expandir_prefijo(palabras[-1]))
+        return self._combinar(grupos, limite)
+
+    def buscar_difuso(self, consulta: str, limite: int = 20, similitud_minima: float = 0.4) -> list:
+        """
+        Búsqueda tolerante a errores de escritura usando trigramas.
+
+        Args:
+            consulta: Texto a buscar
+            limite: Cantidad máxima de resultados
+            similitud_minima: Similitud (Jaccard de trigramas) mínima por palabra
+
+        Returns:
+            Lista de objetos encontrados, los más parecidos primero
+        """
+        grupos = [self._similares(palabra, similitud_minima) for palabra in tokenizar(consulta)]
+        return self._combinar(grupos, limite)
+
+    def _expandir_prefijo(self, prefijo: str) -> list:
+        """Palabras del vocabulario que empiezan con el prefijo."""
+        inicio = bisect_left(self._vocabulario, prefijo)
+        fin = min(bisect_left(self._vocabulario, prefijo + "\uffff"), inicio + self.MAX_EXPANSION)
+        return self._vocabulario[inicio:fin]
+
+    def _similares(self, palabra: str, similitud_minima: float) -> list:
+        """Palabras del vocabulario parecidas, ordenadas por similitud."""
+        if palabra in self._invertido:
+            return [palabra]
+
+        propios = trigramas(palabra)
+        comunes = {}
+        for trigrama in propios:
+            for candidata in self._trigramas.get(trigrama, ()):
+                comunes[candidata] = comunes.get(candidata, 0) + 1
+
+        puntuadas = []
+        num_trigramas = self._num_trigramas
+        for candidata, compartidos in comunes.items():
+            similitud = compartidos / (len(propios) + num_trigramas[candidata] - compartidos)
+            if similitud >= similitud_minima:
+                puntuadas.append((similitud, candidata))
+        puntuadas.sort(reverse=True)
+        return [candidata for _, candidata in puntuadas[:self.MAX_EXPANSION]]
+
+    def _combinar(self, grupos: list, limite: int) -> list:
+        """
+        Intersecta los grupos de palabras: un documento debe contener al menos
+        una palabra de cada grupo. Recorre solo hasta alcanzar el límite.
+        """
+        if not grupos or any(not grupo for grupo in grupos):
+            return []
+
+        conjuntos = [[self._invertido[p] for p in grupo if p in self._invertido] for grupo in grupos]
+        # El primer grupo más selectivo dirige el recorrido
+        conjuntos.sort(key=lambda grupo: sum(len(c) for c in grupo))
+        guia, resto = conjuntos[0], conjuntos[1:]
+
+        resultados = []
+        vistos = set()
+        for claves in guia:
+            for clave in claves:
+                if clave in vistos:
+                    continue
+                vistos.add(clave)
+                if all(any(clave in c for c in grupo) for grupo in resto):
+                    resultados.append(self._documentos[clave][0])
+                    if len(resultados) >= limite:
+                        return resultados
+        return resultados
+
+
+class IndiceCatalogo:
+    """
+    Índices de búsqueda para los servicios y clientes de un GestorServicios.
+    Se mantiene al día con las altas del gestor y con los setters de nombre,
+    película, artista y email de cada objeto.
+    """
+
+    MODOS = ("exacto", "prefijo", "difuso")
+    CAMPOS_SERVICIO = frozenset({"nombre", "pelicula", "artista"})
+    CAMPOS_CLIENTE = frozenset({"nombre", "apellido", "email"})
+
+    def __init__(self, gestor: GestorServicios):
+        """
+        Constructor del IndiceCatalogo.
+
+        Args:
+            gestor: Gestor cuyos servicios y clientes se indexan
+        """
+        self._servicios = IndiceBusqueda()
+        self._clientes = IndiceBusqueda()
+
+        for servicio in gestor._servicios:
+            self._agregar(servicio)
+        for cliente in gestor._clientes:
+            self._agregar(cliente)
+        gestor.suscribir_altas(self._agregar)
+        gestor.suscribir_bajas(self._retirar)
+
+    def buscar_servicios(self, consulta: str, modo: str = "prefijo", limite: int = 20) -> list:
+        """
+        Busca servicios por nombre, película o artista.
+
+        Args:
+            consulta: Texto a buscar
+            modo: "exacto", "prefijo" o "difuso"
+            limite: Cantidad máxima de resultados
+
+        Returns:
+            Lista de servicios encontrados
+        """
+        return self._buscar(self._servicios, consulta, modo, limite)
+
+    def buscar_clientes(self, consulta: str, modo: str = "prefijo", limite: int = 20) -> list:
+        """
+        Busca clientes por nombre completo o email.
+
+        Args:
+            consulta: Texto a buscar
+            modo: "exacto", "prefijo" o "difuso"
+            limite: Cantidad máxima de resultados
+
+        Returns:
+            Lista de clientes encontrados
+        """
+        return self._buscar(self._clientes, consulta, modo, limite)
+
+    def _buscar(self, indice: IndiceBusqueda, consulta: str, modo: str, limite: int) -> list:
+        """Despacha la búsqueda según el modo."""
+        if modo == "exacto":
+            return indice.buscar(consulta, limite)
+        if modo == "prefijo":
+            return indice.buscar_prefijo(consulta, limite)
+        if modo == "difuso":
+            return indice.buscar_difuso(consulta, limite)
+        raise ValueError(f"El modo debe ser uno de: {self.MODOS}")
+
+    def _agregar(self, objeto):
+        """Indexa un servicio o cliente y se suscribe a sus cambios."""
+        self._indexar(objeto)
+        objeto.suscribir_cambios(self._al_cambiar)
+
+    def _retirar(self, servicios: list):
+        """Quita del índice los servicios quitados del gestor."""
+        for servicio in servicios:
+            self._servicios.eliminar(id(servicio))
+            servicio.cancelar_suscripcion(self._al_cambiar)
+
+    def _indexar(self, objeto):
+        """Indexa los textos buscables de un servicio o cliente."""
+        if hasattr(objeto, 'nombre_completo'):
+            self._clientes.indexar(id(objeto), objeto,
+                                   [objeto.nombre_completo(), objeto.email])
+        else:
+            self._servicios.indexar(id(objeto), objeto,
+                                    [objeto.nombre, getattr(objeto, 'pelicula', None),
+                                     getattr(objeto, 'artista', None)])
+
+    def _al_cambiar(self, objeto, atributo: str, anterior, nuevo):
+        """Reindexa el objeto si cambió un campo buscable."""
+        campos = self.CAMPOS_CLIENTE if hasattr(objeto, 'nombre_completo') else self.CAMPOS_SERVICIO
+        if atributo in campos:
+            self._indexar(objeto)
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import random
+    import time
+    from datetime import datetime
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+    from cliente import Cliente
+
+    print("PRUEBA DEL ÍNDICE DE BÚSQUEDA")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    gestor.agregar_servicio(ServicioCine("C001", "Estreno", datetime(2024, 12, 15, 20, 0),
+                                         8.50, "Dune: Part Two", 1))
+    gestor.agregar_servicio(ServicioEvento("E001", "Noche de Ópera", datetime(2024, 12, 22, 19, 30),
+                                           65.00, "Compañía Nacional de Opera", "Opera", 3.5))
+    juan = Cliente("0912345678", "Juan Carlos", "Pérez López", "juan.perez@email.com", "0987654321")
+    gestor.agregar_cliente(juan)
+
+    catalogo = IndiceCatalogo(gestor)
+
+    print("\n1. Búsqueda sin tildes: 'perez'")
+    print(f"   {[c.nombre_completo() for c in catalogo.buscar_clientes('perez', 'exacto')]}")
+
+    print("\n2. Búsqueda por prefijo: 'du'")
+    print(f"   {[s.codigo for s in catalogo.buscar_servicios('du')]}")
+
+    print("\n3. Búsqueda difusa con error: 'compania nacinal'")
+    print(f"   {[s.codigo for s in catalogo.buscar_servicios('compania nacinal', 'difuso')]}")
+
+    print("\n4. Actualización incremental por setter: apellido -> 'Gómez'")
+    juan.apellido = "Gómez"
+    print(f"   'lopez': {len(catalogo.buscar_clientes('lopez', 'exacto'))} resultado(s)")
+    print(f"   'gomez': {len(catalogo.buscar_clientes('gomez', 'exacto'))} resultado(s)")
+
+    print("\n5. Índice con 1,000,000 de clientes...")
+    generador = random.Random(9)
+    nombres = ["Juan", "María", "José", "Lucía", "Andrés", "Sofía", "Martín", "Valeria"]
+    apellidos = [f"Apellido{i}" for i in range(20_000)] + ["Pérez", "González", "Castillo"]
+    indice = IndiceBusqueda()
+    inicio = time.perf_counter()
+    for i in range(1_000_000):
+        indice.indexar(i, i, [f"{generador.choice(nombres)} {generador.choice(apellidos)}"])
+    print(f"   Indexado en {time.perf_counter() - inicio:.1f} s")
+    for descripcion, funcion, consulta in (("exacta", indice.buscar, "maria perez"),
+                                           ("prefijo", indice.buscar_prefijo, "sofia apellido123"),
+                                           ("difusa", indice.buscar_difuso, "lucia gonzales")):
+        inicio = time.perf_counter()
+        resultados = funcion(consulta)
+        print(f"   Búsqueda {descripcion} '{consulta}': {len(resultados)} resultados en "
+              f"{(time.perf_counter() - inicio) * 1000:.3f} ms")
@@ -0,0 +1,328 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la CacheConsultas del GestorServicios.
+Guarda los resultados de reportes, estadísticas y listas filtradas, con
+desalojo LRU, vencimiento por tiempo (TTL) y un límite de memoria. Cada
+resultado se asocia a las versiones de los datos de los que depende, y esas
+versiones avanzan con las notificaciones de cambio del gestor, los servicios
+y los clientes, así que un cambio solo invalida las consultas afectadas.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from gestor_servicios import GestorServicios
+
+# Datos de los que depende cada consulta
+DEPENDENCIAS = {
+    "reporte_servicios": ("servicios", "gestor"),
+    "estadisticas": ("servicios", "clientes", "gestor"),
+    "servicios_disponibles": ("servicios",),
+}
+
+
+def _tamano(valor) -> int:
+    """Estima los bytes que ocupa un resultado (las listas no incluyen sus objetos)."""
+    return sys.getsizeof(valor)
+
+
+class CacheConsultas:
+    """
+    Clase que guarda los resultados de las consultas costosas del gestor.
+    La clave de cada entrada es (consulta, parámetros, versiones); al cambiar
+    una versión, la entrada anterior de la misma consulta se descarta.
+    """
+
+    def __init__(self, gestor: GestorServicios, max_entradas: int = 256,
+                 max_bytes: int = 8 * 1024 * 1024, ttl_segundos: float = 60.0,
+                 reloj=time.monotonic):
+        """
+        Constructor de la CacheConsultas.
+
+        Args:
+            gestor: Gestor cuyas consultas se guardan
+            max_entradas: Máximo de resultados guardados
+            max_bytes: Máximo aproximado de memoria de los resultados
+            ttl_segundos: Tiempo de vida de un resultado (los reportes llevan la hora)
+            reloj: Función que retorna el tiempo actual en segundos
+        """
+        if max_entradas < 1 or max_bytes < 1 or ttl_segundos <= 0:
+            raise ValueError("Los límites de la caché deben ser positivos")
+        self._gestor = gestor
+        self._max_entradas = max_entradas
+        self._max_bytes = max_bytes
+        self._ttl = ttl_segundos
+        self._reloj = reloj
+        # clave -> (resultado, vence, bytes), en orden de uso (el último es el más reciente)
+        self._entradas = OrderedDict()
+        self._clave_vigente = {}
+        self._bytes = 0
+        self._versiones = {"servicios": 0, "clientes": 0, "gestor": 0}
+        self._aciertos = 0
+        self._fallos = 0
+        self._expirados = 0
+        self._desalojos = 0
+
+        gestor.suscribir_cambios(self._al_cambiar_gestor)
+        for servicio in gestor._servicios:
+            servicio.suscribir_cambios(self._al_cambiar_servicio)
+        for cliente in gestor._clientes:
+            cliente.suscribir_cambios(self._al_cambiar_cliente)
+        gestor.suscribir_altas(self._al_agregar)
+        gestor.suscribir_bajas(self._al_retirar)
+
+    # Property para aciertos
+    @property
+    def aciertos(self) -> int:
+        """Obtiene la cantidad de consultas respondidas desde la caché."""
+        return self._aciertos
+
+    # Property para fallos
+    @property
+    def fallos(self) -> int:
+        """Obtiene la cantidad de consultas que tuvieron que calcularse."""
+        return self._fallos
+
+    # Property para expirados
+    @property
+    def expirados(self) -> int:
+        """Obtiene la cantidad de resultados descartados por vencimiento."""
+        return self._expirados
+
+    # Property para tasa_aciertos
+    @property
+    def tasa_aciertos(self) -> float:
+        """Obtiene la proporción de aciertos (0 si no hubo consultas)."""
+        consultas = self._aciertos + self._fallos
+        return self._aciertos / consultas if consultas else 0.0
+
+    # Property para bytes_usados
+    @property
+    def bytes_usados(self) -> int:
+        """Obtiene la memoria aproximada de los resultados guardados."""
+        return self._bytes
+
+    def __len__(self) -> int:
+        """Cantidad de resultados guardados."""
+        return len(self._entradas)
+
+    def reporte_servicios(self, codigos: tuple = None) -> str:
+        """
+        Equivale a gestor.generar_reporte_servicios con los servicios indicados.
+
+        Args:
+            codigos: Códigos de los servicios a incluir (None incluye todos)
+
+        Returns:
+            String con el reporte formateado
+        """
+        def calcular():
+            servicios = self._gestor._servicios
+            if codigos is not None:
+                servicios = [s for s in map(self._gestor.buscar_servicio, codigos) if s]
+            return self._gestor.generar_reporte_servicios(servicios)
+
+        parametros = None if codigos is None else tuple(codigos)
+        return self.obtener("reporte_servicios", parametros, calcular)
+
+    def estadisticas(self) -> str:
+        """
+        Equivale a gestor.obtener_estadisticas.
+
+        Returns:
+            String con las estadísticas
+        """
+        return self.obtener("estadisticas", None, self._gestor.obtener_estadisticas)
+
+    def servicios_disponibles(self) -> list:
+        """
+        Equivale a gestor.listar_servicios_disponibles.
+
+        Returns:
+            Copia de la lista de servicios disponibles
+        """
+        return list(self.obtener("servicios_disponibles", None,
+                                 self._gestor.listar_servicios_disponibles))
+
+    def obtener(self, consulta: str, parametros, calcular):
+        """
+        Retorna el resultado guardado o lo calcula y lo guarda.
+
+        Args:
+            consulta: Nombre de la consulta (clave de DEPENDENCIAS)
+            parametros: Valor hashable con los parámetros de la consulta
+            calcular: Función sin argumentos que calcula el resultado
+
+        Returns:
+            Resultado de la consulta
+        """
+        versiones = tuple(self._versiones[d] for d in DEPENDENCIAS[consulta])
+        clave = (consulta, parametros, versiones)
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            if entrada[1] > self._reloj():
+                self._entradas.move_to_end(clave)
+                self._aciertos += 1
+                return entrada[0]
+            self._expirados += 1
+            self._descartar(clave)
+
+        self._fallos += 1
+        resultado = calcular()
+        self._guardar(clave, resultado)
+        return resultado
+
+    def invalidar(self):
+        """Descarta todos los resultados guardados."""
+        self._entradas.clear()
+        self._clave_vigente.clear()
+        self._bytes = 0
+
+    def registrar_metricas(self, registro):
+        """
+        Registra medidores de la caché en un RegistroMetricas.
+
+        Args:
+            registro: Registro de métricas donde se agregan los medidores
+        """
+        registro.registrar_medidor("cache_consultas_aciertos_total", lambda: self._aciertos,
+                                   "Consultas respondidas desde la caché")
+        registro.registrar_medidor("cache_consultas_fallos_total", lambda: self._fallos,
+                                   "Consultas que tuvieron que calcularse")
+        registro.registrar_medidor("cache_consultas_tasa_aciertos", lambda: self.tasa_aciertos,
+                                   "Proporción de consultas respondidas desde la caché")
+        registro.registrar_medidor("cache_consultas_bytes", lambda: self._bytes,
+                                   "Memoria aproximada de los resultados guardados")
+        registro.registrar_medidor("cache_consultas_desalojos_total", lambda: self._desalojos,
+                                   "Resultados descartados por los límites de la caché")
+
+    def _guardar(self, clave: tuple, resultado):
+        """Guarda un resultado y aplica los límites de entradas y memoria."""
+        tamano = _tamano(resultado)
+        if tamano > self._max_bytes:
+            return
+        consulta = clave[:2]
+        anterior = self._clave_vigente.get(consulta)
+        if anterior is not None and anterior in self._entradas:
+            # El resultado de una versión anterior ya no puede volver a pedirse
+            self._descartar(anterior)
+        self._entradas[clave] = (resultado, self._reloj() + self._ttl, tamano)
+        self._clave_vigente[consulta] = clave
+        self._bytes += tamano
+        while len(self._entradas) > self._max_entradas or self._bytes > self._max_bytes:
+            self._descartar(next(iter(self._entradas)))
+            self._desalojos += 1
+
+    def _descartar(self, clave: tuple):
+        """Elimina una entrada y descuenta su memoria."""
+        _, _, tamano = self._entradas.pop(clave)
+        self._bytes -= tamano
+        if self._clave_vigente.get(clave[:2]) == clave:
+            del self._clave_vigente[clave[:2]]
+
+    def _al_agregar(self, objeto):
+        """Observa el servicio o cliente agregado y avanza su versión."""
+        if hasattr(objeto, 'calcular_precio_total'):
+            objeto.suscribir_cambios(self._al_cambiar_servicio)
+            self._versiones["servicios"] += 1
+        else:
+            objeto.suscribir_cambios(self._al_cambiar_cliente)
+            self._versiones["clientes"] += 1
+
+    def _al_retirar(self, servicios: list):
+        """Deja de observar los servicios quitados y avanza la versión."""
+        for servicio in servicios:
+            servicio.cancelar_suscripcion(self._al_cambiar_servicio)
+        self._versiones["servicios"] += 1
+
+    def _al_cambiar_servicio(self, servicio, atributo: str, anterior, nuevo):
+        """Avanza la versión de los servicios."""
+        self._versiones["servicios"] += 1
+
+    def _al_cambiar_cliente(self, cliente, atributo: str, anterior, nuevo):
+        """Avanza la versión de los clientes."""
+        self._versiones["clientes"] += 1
+
+    def _al_cambiar_gestor(self, gestor, atributo: str, anterior, nuevo):
+        """Avanza la versión de los datos propios del gestor."""
+        self._versiones["gestor"] += 1
+
+    def __str__(self) -> str:
+        """Representación en string de la caché."""
+        return (f"CacheConsultas: {len(self._entradas)}/{self._max_entradas} entradas | "
+                f"{self._bytes / 1024:.1f} KiB | aciertos {self.tasa_aciertos:.1%} "
+                f"({self._aciertos}/{self._aciertos + self._fallos})")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    from contextlib import redirect_stdout
+    from datetime import datetime, timedelta
+    from servicio_cine import ServicioCine
+    from cliente import Cliente
+    from metricas import RegistroMetricas
+
+    print("PRUEBA DE LA CACHÉ DE CONSULTAS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    with redirect_stdout(io.StringIO()):
+        for i in range(2000):
+            gestor.agregar_servicio(ServicioCine(f"C{i:04d}", f"Función {i}",
+                                                 datetime(2024, 12, 1, 10, 0) + timedelta(hours=i),
+                                                 8.5, f"Película {i}", i % 10 + 1))
+        gestor.agregar_cliente(Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321"))
+
+    ahora = [0.0]
+    cache = CacheConsultas(gestor, ttl_segundos=60, reloj=lambda: ahora[0])
+
+    print("\n1. Consultas repetidas sin cambios:")
+    for consulta in (cache.reporte_servicios, cache.estadisticas, cache.servicios_disponibles):
+        inicio = time.perf_counter()
+        consulta()
+        primera = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        consulta()
+        segunda = time.perf_counter() - inicio
+        print(f"   {consulta.__name__}: {primera * 1000:.2f} ms -> {segunda * 1000:.3f} ms")
+    print(f"   {cache}")
+
+    print("\n2. Cambio de un cliente (solo se invalidan las estadísticas):")
+    gestor.buscar_cliente("0912345678").telefono = "0999999999"
+    cache.reporte_servicios()
+    cache.servicios_disponibles()
+    cache.estadisticas()
+    print(f"   {cache}")
+
+    print("\n3. Venta (se invalidan las consultas de servicios):")
+    with redirect_stdout(io.StringIO()):
+        gestor.realizar_venta("C0000", "0912345678", 2)
+    reporte = cache.reporte_servicios()
+    print(f"   Reporte actualizado: {reporte == gestor.generar_reporte_servicios(gestor._servicios)}")
+    print(f"   Estadísticas actualizadas: {cache.estadisticas() == gestor.obtener_estadisticas()}")
+    print(f"   {cache}")
+
+    print("\n4. Reporte parcial por parámetros y vencimiento por TTL:")
+    cache.reporte_servicios(("C0001", "C0002"))
+    cache.reporte_servicios(("C0001", "C0002"))
+    ahora[0] += 61
+    cache.reporte_servicios(("C0001", "C0002"))
+    print(f"   Expirados: {cache.expirados} | {cache}")
+
+    print("\n5. Límite de memoria (64 KiB):")
+    pequena = CacheConsultas(gestor, max_bytes=64 * 1024)
+    pequena.reporte_servicios()
+    pequena.reporte_servicios(("C0001",))
+    print(f"   {pequena}")
+
+    print("\n6. Métricas expuestas:")
+    registro = RegistroMetricas()
+    cache.registrar_metricas(registro)
+    for linea in registro.exportar_prometheus().splitlines():
+        if not linea.startswith("#"):
+            print(f"   {linea}")
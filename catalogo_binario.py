@@ -0,0 +1,488 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define las instantáneas binarias del catálogo.
+Los servicios y clientes se guardan como registros de ancho fijo con una
+tabla de cadenas y un índice ordenado por código/cédula. El archivo se abre
+con mmap en modo lectura, así que abrirlo no construye ningún objeto y varios
+procesos que lo lean comparten las mismas páginas del sistema operativo.
+Los Servicio y Cliente completos se construyen solo al pedirlos.
+
+Formato (little-endian):
+    encabezado | servicios (64 B c/u) | clientes (52 B c/u) |
+    índice de servicios (uint32 por código) | índice de clientes | cadenas UTF-8
+"""
+
+import mmap
+import struct
+from array import array
+from datetime import datetime, timedelta
+from servicio_cine import ServicioCine
+from servicio_evento import ServicioEvento
+from cliente import Cliente
+
+MAGICO = b"CINEMAX1"
+VERSION = 1
+EPOCA = datetime(1970, 1, 1)
+
+ESTADOS = ("Disponible", "Agotado", "Cancelado", "En proceso")
+ZONAS = ("General", "Preferencial", "VIP")
+TIPO_CINE = 0
+TIPO_EVENTO = 1
+
+# Banderas del registro de servicio
+BANDERA_3D = 1
+BANDERA_VIP = 2
+BANDERA_MEET_AND_GREET = 4
+
+# magico, version, reservado, servicios, clientes, y los desplazamientos de
+# servicios, clientes, índice de servicios, índice de clientes y cadenas
+ENCABEZADO = struct.Struct("<8sHHIIQQQQQ")
+# tipo, banderas, estado, zona, tipo_evento, sala, fecha (s desde EPOCA),
+# precio_base, duracion_horas, vendidas, capacidad, (desplazamiento, largo) x3
+REGISTRO_SERVICIO = struct.Struct("<BBBBBxHqddII6I")
+# premium, puntos, compras, (desplazamiento, largo) x5
+REGISTRO_CLIENTE = struct.Struct("<B3xII10I")
+
+
+class _TablaCadenas:
+    """Acumula cadenas UTF-8 sin repetir y entrega su posición en la tabla."""
+
+    def __init__(self):
+        self._posiciones = {}
+        self._datos = bytearray()
+
+    def agregar(self, texto: str) -> tuple:
+        """Retorna (desplazamiento, largo) del texto dentro de la tabla."""
+        posicion = self._posiciones.get(texto)
+        if posicion is None:
+            codificado = texto.encode("utf-8")
+            posicion = (len(self._datos), len(codificado))
+            self._datos += codificado
+            self._posiciones[texto] = posicion
+        return posicion
+
+    @property
+    def datos(self) -> bytearray:
+        """Bytes de la tabla."""
+        return self._datos
+
+
+def guardar_catalogo(ruta: str, servicios, clientes) -> int:
+    """
+    Escribe una instantánea binaria del catálogo.
+    Las reservas pendientes y el historial de compras no forman parte del
+    catálogo: de los clientes se guardan los puntos, el tipo y la cantidad
+    de compras, que al cargarse cuentan como compras archivadas. Los eventos
+    con inventario por zona no tienen representación en el formato.
+
+    Args:
+        ruta: Ruta del archivo a escribir
+        servicios: Servicios de cine o evento
+        clientes: Clientes registrados
+
+    Returns:
+        Tamaño del archivo en bytes
+    """
+    servicios = list(servicios)
+    clientes = list(clientes)
+    cadenas = _TablaCadenas()
+
+    desp_servicios = ENCABEZADO.size
+    desp_clientes = desp_servicios + REGISTRO_SERVICIO.size * len(servicios)
+    desp_indice_servicios = desp_clientes + REGISTRO_CLIENTE.size * len(clientes)
+    desp_indice_clientes = desp_indice_servicios + 4 * len(servicios)
+    desp_cadenas = desp_indice_clientes + 4 * len(clientes)
+    contenido = bytearray(desp_cadenas)
+
+    for i, servicio in enumerate(servicios):
+        fecha = (servicio.fecha - EPOCA) // timedelta(seconds=1)
+        codigo = cadenas.agregar(servicio.codigo)
+        nombre = cadenas.agregar(servicio.nombre)
+        if hasattr(servicio, '_asientos_vendidos'):
+            banderas = (BANDERA_3D if servicio.es_3d else 0) | (BANDERA_VIP if servicio.es_vip else 0)
+            titulo = cadenas.agregar(servicio.pelicula)
+            REGISTRO_SERVICIO.pack_into(
+                contenido, desp_servicios + i * REGISTRO_SERVICIO.size,
+                TIPO_CINE, banderas, ESTADOS.index(servicio.estado), 0, 0, servicio.sala,
+                fecha, servicio.precio_base, 0.0, servicio.asientos_vendidos,
+                servicio._capacidad_total, *codigo, *nombre, *titulo)
+        else:
+            if servicio.es_multizona:
+                raise ValueError(f"El catálogo binario no admite eventos con zonas ({servicio.codigo})")
+            banderas = BANDERA_MEET_AND_GREET if servicio.incluye_meet_and_greet else 0
+            titulo = cadenas.agregar(servicio.artista)
+            REGISTRO_SERVICIO.pack_into(
+                contenido, desp_servicios + i * REGISTRO_SERVICIO.size,
+                TIPO_EVENTO, banderas, ESTADOS.index(servicio.estado), ZONAS.index(servicio.zona),
+                ServicioEvento.TIPOS_EVENTO.index(servicio.tipo_evento), 0,
+                fecha, servicio.precio_base, servicio.duracion_horas, servicio.entradas_vendidas,
+                servicio._capacidad_total, *codigo, *nombre, *titulo)
+
+    for i, cliente in enumerate(clientes):
+        campos = []
+        for texto in (cliente.cedula, cliente.nombre, cliente.apellido, cliente.email, cliente.telefono):
+            campos.extend(cadenas.agregar(texto))
+        REGISTRO_CLIENTE.pack_into(contenido, desp_clientes + i * REGISTRO_CLIENTE.size,
+                                   cliente.es_premium, cliente.puntos_acumulados,
+                                   cliente.total_compras(), *campos)
+
+    # Índices: números de registro ordenados por código y por cédula
+    indice_servicios = array("I", sorted(range(len(servicios)), key=lambda i: servicios[i].codigo))
+    indice_clientes = array("I", sorted(range(len(clientes)), key=lambda i: clientes[i].cedula))
+    contenido[desp_indice_servicios:desp_indice_clientes] = indice_servicios.tobytes()
+    contenido[desp_indice_clientes:desp_cadenas] = indice_clientes.tobytes()
+
+    ENCABEZADO.pack_into(contenido, 0, MAGICO, VERSION, 0, len(servicios), len(clientes),
+                         desp_servicios, desp_clientes, desp_indice_servicios,
+                         desp_indice_clientes, desp_cadenas)
+
+    with open(ruta, "wb") as archivo:
+        archivo.write(contenido)
+        archivo.write(cadenas.datos)
+    return len(contenido) + len(cadenas.datos)
+
+
+class ProxyServicio:
+    """
+    Clase que representa un servicio de la instantánea sin construirlo.
+    Los datos básicos se leen directamente del archivo mientras el servicio
+    no se haya construido; cualquier otro atributo o método construye el
+    servicio completo y lo delega, y desde entonces se leen de él.
+    """
+
+    __slots__ = ("_catalogo", "_numero")
+
+    def __init__(self, catalogo, numero: int):
+        """
+        Constructor del ProxyServicio.
+
+        Args:
+            catalogo: CatalogoBinario de origen
+            numero: Número de registro del servicio
+        """
+        self._catalogo = catalogo
+        self._numero = numero
+
+    def _registro(self) -> tuple:
+        """Lee el registro de ancho fijo del servicio."""
+        return self._catalogo._registro_servicio(self._numero)
+
+    @property
+    def codigo(self) -> str:
+        """Obtiene el código del servicio."""
+        construido = self._catalogo._servicios.get(self._numero)
+        if construido is not None:
+            return construido.codigo
+        return self._catalogo._cadena(*self._registro()[11:13])
+
+    @property
+    def nombre(self) -> str:
+        """Obtiene el nombre del servicio."""
+        construido = self._catalogo._servicios.get(self._numero)
+        if construido is not None:
+            return construido.nombre
+        return self._catalogo._cadena(*self._registro()[13:15])
+
+    @property
+    def fecha(self) -> datetime:
+        """Obtiene la fecha del servicio."""
+        construido = self._catalogo._servicios.get(self._numero)
+        if construido is not None:
+            return construido.fecha
+        return EPOCA + timedelta(seconds=self._registro()[6])
+
+    @property
+    def estado(self) -> str:
+        """Obtiene el estado del servicio."""
+        construido = self._catalogo._servicios.get(self._numero)
+        if construido is not None:
+            return construido.estado
+        return ESTADOS[self._registro()[2]]
+
+    def materializar(self):
+        """Construye (una sola vez) el ServicioCine o ServicioEvento completo."""
+        return self._catalogo.servicio(self._numero)
+
+    def __getattr__(self, nombre: str):
+        """Delegar al servicio completo lo que no se lee del registro."""
+        return getattr(self.materializar(), nombre)
+
+    def __str__(self) -> str:
+        """Representación en string del proxy."""
+        return f"ProxyServicio: {self.codigo} | {self.nombre} | Estado: {self.estado}"
+
+
+class CatalogoBinario:
+    """
+    Clase que abre una instantánea del catálogo con mmap.
+    Abrir el archivo solo valida el encabezado; los registros se leen al
+    consultarse y los objetos construidos se conservan para reutilizarlos.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Constructor del CatalogoBinario.
+
+        Args:
+            ruta: Ruta de una instantánea escrita con guardar_catalogo
+        """
+        with open(ruta, "rb") as archivo:
+            self._mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        (magico, version, _, self._num_servicios, self._num_clientes,
+         self._desp_servicios, self._desp_clientes, desp_indice_servicios,
+         desp_indice_clientes, self._desp_cadenas) = ENCABEZADO.unpack_from(self._mapa, 0)
+        if magico != MAGICO or version != VERSION:
+            self._mapa.close()
+            raise ValueError(f"'{ruta}' no es una instantánea de catálogo válida")
+        vista = memoryview(self._mapa)
+        # Vistas sin copia sobre los índices del archivo
+        self._indice_servicios = vista[desp_indice_servicios:desp_indice_clientes].cast("I")
+        self._indice_clientes = vista[desp_indice_clientes:self._desp_cadenas].cast("I")
+        self._servicios = {}
+        self._clientes = {}
+
+    # Property para num_servicios
+    @property
+    def num_servicios(self) -> int:
+        """Obtiene la cantidad de servicios de la instantánea."""
+        return self._num_servicios
+
+    # Property para num_clientes
+    @property
+    def num_clientes(self) -> int:
+        """Obtiene la cantidad de clientes de la instantánea."""
+        return self._num_clientes
+
+    # Property para materializados
+    @property
+    def materializados(self) -> int:
+        """Obtiene cuántos servicios y clientes se han construido."""
+        return len(self._servicios) + len(self._clientes)
+
+    def proxy(self, numero: int) -> ProxyServicio:
+        """
+        Obtiene un proxy del servicio sin construirlo.
+
+        Args:
+            numero: Número de registro (0 a num_servicios - 1)
+        """
+        if not 0 <= numero < self._num_servicios:
+            raise IndexError("Número de servicio fuera de rango")
+        return ProxyServicio(self, numero)
+
+    def proxies(self):
+        """Itera los servicios como proxies, en el orden en que se guardaron."""
+        return (ProxyServicio(self, numero) for numero in range(self._num_servicios))
+
+    def servicio(self, numero: int):
+        """
+        Obtiene el servicio completo de un registro, construyéndolo si hace falta.
+
+        Args:
+            numero: Número de registro del servicio
+        """
+        servicio = self._servicios.get(numero)
+        if servicio is None:
+            servicio = self._servicios[numero] = self._construir_servicio(numero)
+        return servicio
+
+    def cliente(self, numero: int) -> Cliente:
+        """
+        Obtiene el cliente completo de un registro, construyéndolo si hace falta.
+
+        Args:
+            numero: Número de registro del cliente
+        """
+        cliente = self._clientes.get(numero)
+        if cliente is None:
+            cliente = self._clientes[numero] = self._construir_cliente(numero)
+        return cliente
+
+    def buscar_servicio(self, codigo: str):
+        """
+        Busca un servicio por código con búsqueda binaria en el índice.
+
+        Args:
+            codigo: Código del servicio
+
+        Returns:
+            ProxyServicio encontrado o None
+        """
+        numero = self._buscar(self._indice_servicios, codigo,
+                              lambda n: self._cadena(*self._registro_servicio(n)[11:13]))
+        return None if numero is None else ProxyServicio(self, numero)
+
+    def buscar_cliente(self, cedula: str) -> Cliente:
+        """
+        Busca un cliente por cédula con búsqueda binaria en el índice.
+
+        Args:
+            cedula: Cédula del cliente
+
+        Returns:
+            Cliente encontrado o None
+        """
+        numero = self._buscar(self._indice_clientes, cedula,
+                              lambda n: self._cadena(*self._registro_cliente(n)[3:5]))
+        return None if numero is None else self.cliente(numero)
+
+    def cargar_en_gestor(self, gestor):
+        """
+        Construye todos los servicios y clientes y los agrega a un gestor.
+
+        Args:
+            gestor: GestorServicios que recibe el catálogo
+        """
+        for numero in range(self._num_servicios):
+            gestor.agregar_servicio(self.servicio(numero))
+        for numero in range(self._num_clientes):
+            gestor.agregar_cliente(self.cliente(numero))
+
+    def cerrar(self):
+        """Libera el mapeo del archivo (los objetos construidos siguen válidos)."""
+        self._indice_servicios.release()
+        self._indice_clientes.release()
+        self._mapa.close()
+
+    def __enter__(self):
+        """Permite usar el catálogo con la sentencia with."""
+        return self
+
+    def __exit__(self, *excepcion):
+        """Cierra el catálogo al salir del bloque with."""
+        self.cerrar()
+
+    def _buscar(self, indice, clave: str, clave_de):
+        """Búsqueda binaria sobre un índice de números de registro."""
+        bajo, alto = 0, len(indice)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if clave_de(indice[medio]) < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < len(indice) and clave_de(indice[bajo]) == clave:
+            return indice[bajo]
+        return None
+
+    def _cadena(self, desplazamiento: int, largo: int) -> str:
+        """Lee una cadena de la tabla."""
+        inicio = self._desp_cadenas + desplazamiento
+        return self._mapa[inicio:inicio + largo].decode("utf-8")
+
+    def _registro_servicio(self, numero: int) -> tuple:
+        """Lee el registro de ancho fijo de un servicio."""
+        return REGISTRO_SERVICIO.unpack_from(self._mapa,
+                                             self._desp_servicios + numero * REGISTRO_SERVICIO.size)
+
+    def _registro_cliente(self, numero: int) -> tuple:
+        """Lee el registro de ancho fijo de un cliente."""
+        return REGISTRO_CLIENTE.unpack_from(self._mapa,
+                                            self._desp_clientes + numero * REGISTRO_CLIENTE.size)
+
+    def _construir_servicio(self, numero: int):
+        """Construye el servicio de un registro."""
+        (tipo, banderas, estado, zona, tipo_evento, sala, fecha, precio_base, duracion,
+         vendidas, capacidad, *cadenas) = self._registro_servicio(numero)
+        codigo = self._cadena(cadenas[0], cadenas[1])
+        nombre = self._cadena(cadenas[2], cadenas[3])
+        titulo = self._cadena(cadenas[4], cadenas[5])
+        fecha = EPOCA + timedelta(seconds=fecha)
+        if tipo == TIPO_CINE:
+            servicio = ServicioCine(codigo, nombre, fecha, precio_base, titulo, sala,
+                                    bool(banderas & BANDERA_3D), bool(banderas & BANDERA_VIP))
+            servicio._asientos_vendidos = vendidas
+        else:
+            servicio = ServicioEvento(codigo, nombre, fecha, precio_base, titulo,
+                                      ServicioEvento.TIPOS_EVENTO[tipo_evento], duracion, ZONAS[zona])
+            servicio._incluye_meet_and_greet = bool(banderas & BANDERA_MEET_AND_GREET)
+            servicio._entradas_vendidas = vendidas
+        # El objeto es nuevo y no tiene suscriptores, así que se asigna sin notificar
+        servicio._capacidad_total = capacidad
+        servicio._estado = ESTADOS[estado]
+        return servicio
+
+    def _construir_cliente(self, numero: int) -> Cliente:
+        """Construye el cliente de un registro."""
+        premium, puntos, compras, *cadenas = self._registro_cliente(numero)
+        textos = [self._cadena(cadenas[i], cadenas[i + 1]) for i in range(0, 10, 2)]
+        cliente = Cliente(*textos)
+        cliente._es_premium = bool(premium)
+        cliente._puntos_acumulados = puntos
+        # El historial no está en la instantánea: sus compras cuentan como archivadas
+        cliente._compras_archivadas = compras
+        return cliente
+
+    def __len__(self) -> int:
+        """Cantidad de servicios de la instantánea."""
+        return self._num_servicios
+
+    def __str__(self) -> str:
+        """Representación en string del catálogo."""
+        return (f"CatalogoBinario: {self._num_servicios} servicios | "
+                f"{self._num_clientes} clientes | {self.materializados} construidos")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    print("PRUEBA DE LAS INSTANTÁNEAS BINARIAS DEL CATÁLOGO")
+
+    print("\n1. Generando 200000 servicios y 50000 clientes...")
+    inicio_fechas = datetime(2024, 12, 1, 10, 0)
+    servicios = []
+    for i in range(200_000):
+        fecha = inicio_fechas + timedelta(minutes=30 * i)
+        if i % 3:
+            servicio = ServicioCine(f"C{i:07d}", f"Función {i}", fecha, 8.5,
+                                    f"Película {i % 500}", i % 12 + 1, i % 2 == 0, i % 5 == 0)
+            servicio.vender_entradas(i % 100)
+        else:
+            servicio = ServicioEvento(f"E{i:07d}", f"Evento {i}", fecha, 45.0, f"Artista {i % 300}",
+                                      "Concierto", 2.5 + i % 3, ZONAS[i % 3])
+            servicio.vender_entradas(i % 500)
+        servicios.append(servicio)
+    clientes = [Cliente(f"09{i:08d}", f"Nombre{i % 100}", f"Apellido{i % 200}",
+                        f"cliente{i}@email.com", "0987654321") for i in range(50_000)]
+
+    ruta = os.path.join(tempfile.gettempdir(), "cinemax_catalogo.bin")
+    inicio = time.perf_counter()
+    tamano = guardar_catalogo(ruta, servicios, clientes)
+    print(f"   Instantánea escrita: {tamano / 1024 / 1024:.1f} MiB "
+          f"en {time.perf_counter() - inicio:.2f} s")
+
+    print("\n2. Abriendo la instantánea:")
+    inicio = time.perf_counter()
+    catalogo = CatalogoBinario(ruta)
+    print(f"   Abierta en {(time.perf_counter() - inicio) * 1000:.3f} ms | {catalogo}")
+
+    print("\n3. Búsquedas por el índice:")
+    inicio = time.perf_counter()
+    proxy = catalogo.buscar_servicio("E0123456")
+    print(f"   {proxy} ({(time.perf_counter() - inicio) * 1e6:.0f} µs)")
+    print(f"   Aún sin construir: {catalogo}")
+    print(f"   Precio total (construye el servicio): ${proxy.calcular_precio_total():.2f}")
+    print(f"   {catalogo}")
+    proxy.vender_entradas(proxy.entradas_disponibles())
+    print(f"   Después de vender todo: {proxy}")
+    cliente = catalogo.buscar_cliente("0900049999")
+    print(f"   {cliente}")
+    print(f"   Código inexistente: {catalogo.buscar_servicio('X0000000')}")
+
+    print("\n4. Verificando que los objetos construidos coinciden:")
+    iguales = all(catalogo.servicio(n).mostrar_info() == servicios[n].mostrar_info()
+                  for n in range(0, 200_000, 997))
+    iguales = iguales and all(catalogo.cliente(n).mostrar_info() == clientes[n].mostrar_info()
+                              for n in range(0, 50_000, 499))
+    print(f"   Servicios y clientes idénticos: {iguales}")
+
+    catalogo.cerrar()
+    os.remove(ruta)
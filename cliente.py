@@ -10,8 +10,10 @@ Módulo que define la clase Cliente para el sistema de gestión de cine/eventos.
 Representa a los clientes que compran servicios.
 """
 
+from observable import Observable
 
-class Cliente:
+
+class Cliente(Observable):
     """
     Clase que representa a un cliente del sistema de cine/eventos.
     Implementa encapsulamiento y manejo de compras.
@@ -39,6 +41,9 @@ class Cliente:
         self._telefono = telefono
         self._es_premium = False
         self._historial_compras = []
+        self._compras_archivadas = 0
+        self._monto_archivado = 0.0
+        self._ultima_compra_archivada = None
         self._puntos_acumulados = 0
 
     # Property para cedula
@@ -52,7 +57,10 @@ class Cliente:
         """Establece la cédula con validación."""
         if not valor or len(valor) < 10:
             raise ValueError("La cédula debe tener al menos 10 caracteres")
+        anterior = self._cedula
         self._cedula = valor
+        if self._observadores:
+            self._notificar_cambio("cedula", anterior, valor)
 
     # Property para nombre
     @property
@@ -65,7 +73,10 @@ class Cliente:
         """Establece el nombre con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El nombre debe ser una cadena no vacía")
+        anterior = self._nombre
         self._nombre = valor
+        if self._observadores:
+            self._notificar_cambio("nombre", anterior, valor)
 
     # Property para apellido
     @property
@@ -78,7 +89,10 @@ class Cliente:
         """Establece el apellido con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El apellido debe ser una cadena no vacía")
+        anterior = self._apellido
         self._apellido = valor
+        if self._observadores:
+            self._notificar_cambio("apellido", anterior, valor)
 
     # Property para email
     @property
@@ -91,7 +105,10 @@ class Cliente:
         """Establece el email con validación."""
         if not valor or "@" not in valor:
             raise ValueError("El email debe ser válido y contener @")
+        anterior = self._email
         self._email = valor
+        if self._observadores:
+            self._notificar_cambio("email", anterior, valor)
 
     # Property para telefono
     @property
@@ -104,7 +121,10 @@ class Cliente:
         """Establece el teléfono con validación."""
         if not valor or len(valor) < 10:
             raise ValueError("El teléfono debe tener al menos 10 dígitos")
+        anterior = self._telefono
         self._telefono = valor
+        if self._observadores:
+            self._notificar_cambio("telefono", anterior, valor)
 
     # Property para es_premium
     @property
@@ -115,7 +135,10 @@ class Cliente:
     @es_premium.setter
     def es_premium(self, valor: bool):
         """Establece el estado premium del cliente."""
+        anterior = self._es_premium
         self._es_premium = valor
+        if self._observadores:
+            self._notificar_cambio("es_premium", anterior, valor)
 
     # Property para puntos_acumulados
     @property
@@ -128,9 +151,40 @@ class Cliente:
         """Establece los puntos acumulados con validación."""
         if valor < 0:
             raise ValueError("Los puntos no pueden ser negativos")
+        anterior = self._puntos_acumulados
         self._puntos_acumulados = valor
+        if self._observadores:
+            self._notificar_cambio("puntos_acumulados", anterior, valor)
+
+    # Property para compras_archivadas (solo lectura)
+    @property
+    def compras_archivadas(self) -> int:
+        """Obtiene la cantidad de compras movidas al archivo frío."""
+        return self._compras_archivadas
+
+    # Property para monto_archivado (solo lectura)
+    @property
+    def monto_archivado(self) -> float:
+        """Obtiene el monto total de las compras movidas al archivo frío."""
+        return self._monto_archivado
 
-    def registrar_compra(self, servicio, cantidad_entradas: int, precio_total: float):
+    # Property para ultima_compra_archivada (solo lectura)
+    @property
+    def ultima_compra_archivada(self):
+        """Obtiene la fecha más reciente de las compras archivadas (None si no hay)."""
+        return self._ultima_compra_archivada
+
+    def total_compras(self) -> int:
+        """
+        Cuenta las compras del cliente, incluidas las archivadas.
+
+        Returns:
+            Número total de compras
+        """
+        return len(self._historial_compras) + self._compras_archivadas
+
+    def registrar_compra(self, servicio, cantidad_entradas: int, precio_total: float,
+                         zona: str = None):
         """
         Registra una compra en el historial del cliente.
 
@@ -138,6 +192,7 @@ class Cliente:
             servicio: Objeto del servicio comprado
             cantidad_entradas: Número de entradas compradas
             precio_total: Monto total pagado
+            zona: Zona de las entradas en un evento con zonas
         """
         compra = {
             "servicio": servicio.nombre,
@@ -146,16 +201,139 @@ class Cliente:
             "total": precio_total,
             "fecha": servicio.fecha
         }
+        if zona is not None:
+            compra["zona"] = zona
         self._historial_compras.append(compra)
 
         # Acumular puntos (1 punto por cada dólar gastado)
         self._puntos_acumulados += int(precio_total)
+        if self._observadores:
+            self._notificar_cambio("historial_compras", len(self._historial_compras) - 1,
+                                   len(self._historial_compras))
 
         # Verificar si califica para premium
-        if len(self._historial_compras) >= self.COMPRAS_PARA_PREMIUM and not self._es_premium:
-            self._es_premium = True
+        if self.total_compras() >= self.COMPRAS_PARA_PREMIUM and not self._es_premium:
+            self.es_premium = True
             print(f"   ¡Felicitaciones! {self.nombre_completo()} ahora es cliente PREMIUM")
 
+    def entradas_compradas(self, codigo_servicio: str) -> int:
+        """
+        Cuenta las entradas vigentes del cliente para un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+
+        Returns:
+            Número de entradas compradas y no devueltas
+        """
+        return sum(c["cantidad"] for c in self._historial_compras
+                   if c["codigo"] == codigo_servicio)
+
+    def zonas_compradas(self, codigo_servicio: str, cantidad_entradas: int) -> dict:
+        """
+        Indica de qué zonas salen las entradas que revertiría registrar_devolucion.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cantidad_entradas: Número de entradas a devolver
+
+        Returns:
+            Diccionario zona -> cantidad de entradas
+        """
+        zonas = {}
+        pendientes = cantidad_entradas
+        for compra in reversed(self._historial_compras):
+            if pendientes == 0:
+                break
+            if compra["codigo"] != codigo_servicio:
+                continue
+            devueltas = min(pendientes, compra["cantidad"])
+            zona = compra.get("zona")
+            zonas[zona] = zonas.get(zona, 0) + devueltas
+            pendientes -= devueltas
+        return zonas
+
+    def registrar_devolucion(self, codigo_servicio: str, cantidad_entradas: int) -> float:
+        """
+        Registra la devolución de entradas, revirtiendo las compras más recientes
+        del servicio, los puntos acumulados y, si corresponde, el estado premium.
+
+        Args:
+            codigo_servicio: Código del servicio devuelto
+            cantidad_entradas: Número de entradas a devolver
+
+        Returns:
+            Monto reembolsado al cliente
+        """
+        if cantidad_entradas < 1 or cantidad_entradas > self.entradas_compradas(codigo_servicio):
+            raise ValueError("El cliente no tiene suficientes entradas para devolver")
+
+        reembolso = 0.0
+        puntos_revertidos = 0
+        pendientes = cantidad_entradas
+        compras_previas = len(self._historial_compras)
+
+        for i in range(len(self._historial_compras) - 1, -1, -1):
+            compra = self._historial_compras[i]
+            if compra["codigo"] != codigo_servicio:
+                continue
+
+            devueltas = min(pendientes, compra["cantidad"])
+            monto = compra["total"] * devueltas / compra["cantidad"]
+            restante = compra["total"] - monto
+            reembolso += monto
+            puntos_revertidos += int(compra["total"]) - int(restante)
+
+            if devueltas == compra["cantidad"]:
+                del self._historial_compras[i]
+            else:
+                # Se reemplaza el registro para no alterar copias ya entregadas
+                self._historial_compras[i] = {**compra, "cantidad": compra["cantidad"] - devueltas,
+                                              "total": restante}
+
+            pendientes -= devueltas
+            if pendientes == 0:
+                break
+
+        self._puntos_acumulados = max(0, self._puntos_acumulados - puntos_revertidos)
+        if self._observadores:
+            self._notificar_cambio("historial_compras", compras_previas, len(self._historial_compras))
+
+        # Revisar si sigue calificando para premium
+        if self._es_premium and self.total_compras() < self.COMPRAS_PARA_PREMIUM:
+            self.es_premium = False
+            print(f"   {self.nombre_completo()} ya no califica como cliente PREMIUM")
+
+        return round(reembolso, 2)
+
+    def archivar_compras(self, antes_de, conservar=frozenset()) -> list:
+        """
+        Quita del historial las compras de servicios anteriores a una fecha,
+        para guardarlas en el archivo frío. Siguen contando para premium.
+
+        Args:
+            antes_de: Se archivan las compras con fecha anterior a esta
+            conservar: Códigos de servicios cuyas compras se mantienen
+                (los que aún admiten devoluciones)
+
+        Returns:
+            Lista de compras quitadas del historial
+        """
+        archivadas = [c for c in self._historial_compras
+                      if c["fecha"] < antes_de and c["codigo"] not in conservar]
+        if archivadas:
+            anterior = len(self._historial_compras)
+            self._historial_compras = [c for c in self._historial_compras
+                                       if c["fecha"] >= antes_de or c["codigo"] in conservar]
+            self._compras_archivadas += len(archivadas)
+            self._monto_archivado += sum(c["total"] for c in archivadas)
+            ultima = max(c["fecha"] for c in archivadas)
+            if self._ultima_compra_archivada is None or ultima > self._ultima_compra_archivada:
+                self._ultima_compra_archivada = ultima
+            if self._observadores:
+                self._notificar_cambio("historial_compras", anterior, len(self._historial_compras))
+        return archivadas
+
     def nombre_completo(self) -> str:
         """
         Obtiene el nombre completo del cliente.
@@ -204,7 +382,7 @@ class Cliente:
         info += f"Teléfono: {self._telefono}\n"
         info += f"Tipo: {'PREMIUM' if self._es_premium else 'Regular'}\n"
         info += f"Puntos acumulados: {self._puntos_acumulados}\n"
-        info += f"Compras realizadas: {len(self._historial_compras)}\n"
+        info += f"Compras realizadas: {self.total_compras()}\n"
         info += f"{'=' * 50}\n"
         return info
 
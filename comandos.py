@@ -0,0 +1,609 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la BitacoraComandos: registro de cada operación que modifica
+un GestorServicios (altas, bajas, ventas y cancelaciones) y de cada asignación
+hecha con los setters de Servicio, Cliente y del gestor.
+Los comandos son datos (se pueden guardar en JSON Lines), así que una sesión
+grabada se puede deshacer paso a paso o reproducir sobre otro gestor, por
+ejemplo para repetir exactamente la misma carga en dos versiones del código.
+"""
+
+import json
+from datetime import datetime
+from functools import wraps
+from typing import List, NamedTuple
+from servicio import Servicio
+from servicio_cine import ServicioCine
+from servicio_evento import ServicioEvento
+from cliente import Cliente
+from gestor_servicios import GestorServicios
+
+# Setters registrados como comandos "asignar"
+SETTERS = (
+    (Servicio, "codigo"), (Servicio, "nombre"), (Servicio, "fecha"),
+    (Servicio, "precio_base"), (Servicio, "estado"),
+    (ServicioCine, "pelicula"), (ServicioCine, "sala"), (ServicioCine, "es_3d"),
+    (ServicioCine, "es_vip"), (ServicioCine, "asientos_vendidos"),
+    (ServicioEvento, "artista"), (ServicioEvento, "tipo_evento"),
+    (ServicioEvento, "duracion_horas"), (ServicioEvento, "zona"),
+    (ServicioEvento, "entradas_vendidas"), (ServicioEvento, "incluye_meet_and_greet"),
+    (Cliente, "cedula"), (Cliente, "nombre"), (Cliente, "apellido"), (Cliente, "email"),
+    (Cliente, "telefono"), (Cliente, "es_premium"), (Cliente, "puntos_acumulados"),
+    (GestorServicios, "nombre_empresa"),
+)
+
+# Atributo que identifica a cada tipo de objeto en los comandos "asignar"
+CLAVES = {"servicio": "codigo", "cliente": "cedula", "gestor": None}
+
+# Operaciones que no se pueden deshacer (el gestor no tiene la operación inversa)
+IRREVERSIBLES = ("agregar_cliente", "cancelar_servicio")
+
+
+class Comando(NamedTuple):
+    """Operación registrada en la bitácora."""
+    numero: int
+    operacion: str
+    argumentos: tuple
+    resultado: object
+
+
+# ========== DESCRIPCIÓN DE OBJETOS ==========
+
+def describir_servicio(servicio: Servicio) -> dict:
+    """
+    Obtiene los datos necesarios para volver a crear un servicio.
+
+    Args:
+        servicio: ServicioCine o ServicioEvento
+
+    Returns:
+        Diccionario con el tipo y los argumentos del constructor
+    """
+    datos = {"codigo": servicio.codigo, "nombre": servicio.nombre, "fecha": servicio.fecha,
+             "precio_base": servicio.precio_base, "estado": servicio.estado}
+    if hasattr(servicio, '_asientos_vendidos'):
+        datos.update(tipo="cine", pelicula=servicio.pelicula, sala=servicio.sala,
+                     es_3d=servicio.es_3d, es_vip=servicio.es_vip)
+    else:
+        capacidades = ({zona: inventario[0] for zona, inventario in servicio._zonas.items()}
+                       if servicio.es_multizona else None)
+        datos.update(tipo="evento", artista=servicio.artista, tipo_evento=servicio.tipo_evento,
+                     duracion_horas=servicio.duracion_horas, zona=servicio.zona,
+                     capacidades=capacidades,
+                     incluye_meet_and_greet=servicio.incluye_meet_and_greet)
+    return datos
+
+
+def crear_servicio(datos: dict) -> Servicio:
+    """
+    Crea un servicio a partir de describir_servicio.
+
+    Args:
+        datos: Diccionario con el tipo y los argumentos del constructor
+
+    Returns:
+        ServicioCine o ServicioEvento nuevo (sin entradas vendidas)
+    """
+    if datos["tipo"] == "cine":
+        servicio = ServicioCine(datos["codigo"], datos["nombre"], datos["fecha"], datos["precio_base"],
+                                datos["pelicula"], datos["sala"], datos["es_3d"], datos["es_vip"])
+    elif datos["tipo"] == "evento":
+        servicio = ServicioEvento(datos["codigo"], datos["nombre"], datos["fecha"], datos["precio_base"],
+                                  datos["artista"], datos["tipo_evento"], datos["duracion_horas"],
+                                  datos["zona"], datos["capacidades"])
+        if datos["incluye_meet_and_greet"]:
+            servicio.incluye_meet_and_greet = True
+    else:
+        raise ValueError(f"Tipo de servicio desconocido: {datos['tipo']}")
+    if datos["estado"] != servicio.estado:
+        servicio.estado = datos["estado"]
+    return servicio
+
+
+def describir_cliente(cliente: Cliente) -> dict:
+    """
+    Obtiene los datos necesarios para volver a crear un cliente.
+
+    Args:
+        cliente: Cliente a describir
+
+    Returns:
+        Diccionario con los argumentos del constructor
+    """
+    return {"cedula": cliente.cedula, "nombre": cliente.nombre, "apellido": cliente.apellido,
+            "email": cliente.email, "telefono": cliente.telefono}
+
+
+def crear_cliente(datos: dict) -> Cliente:
+    """
+    Crea un cliente a partir de describir_cliente.
+
+    Args:
+        datos: Diccionario con los argumentos del constructor
+
+    Returns:
+        Cliente nuevo (sin compras)
+    """
+    return Cliente(datos["cedula"], datos["nombre"], datos["apellido"], datos["email"],
+                   datos["telefono"])
+
+
+# ========== APLICACIÓN Y REPRODUCCIÓN ==========
+
+def aplicar(gestor: GestorServicios, comando: Comando):
+    """
+    Ejecuta un comando sobre un gestor.
+
+    Args:
+        gestor: Gestor sobre el que se aplica
+        comando: Comando a ejecutar
+
+    Returns:
+        Lo que retorna la operación del gestor (None en las asignaciones)
+    """
+    operacion, argumentos = comando.operacion, comando.argumentos
+    if operacion == "realizar_venta":
+        return gestor.realizar_venta(*argumentos)
+    if operacion == "cancelar_venta":
+        return gestor.cancelar_venta(*argumentos)
+    if operacion == "cancelar_servicio":
+        return gestor.cancelar_servicio(*argumentos)
+    if operacion == "agregar_servicio":
+        return gestor.agregar_servicio(crear_servicio(argumentos[0]))
+    if operacion == "agregar_cliente":
+        return gestor.agregar_cliente(crear_cliente(argumentos[0]))
+    if operacion == "retirar_servicios":
+        servicios = [gestor.buscar_servicio(codigo) for codigo in argumentos]
+        return gestor.retirar_servicios([s for s in servicios if s is not None])
+    if operacion == "asignar":
+        tipo, clave, atributo, _, nuevo = argumentos
+        setattr(_buscar_objeto(gestor, tipo, clave), atributo, nuevo)
+        return None
+    raise ValueError(f"Operación desconocida: {operacion}")
+
+
+def reproducir(gestor: GestorServicios, comandos: List[Comando]) -> List[tuple]:
+    """
+    Aplica una secuencia de comandos y compara los resultados con los grabados.
+
+    Args:
+        gestor: Gestor sobre el que se reproduce (normalmente vacío)
+        comandos: Comandos a aplicar, en orden
+
+    Returns:
+        Lista de tuplas (comando, resultado obtenido) que no coinciden con lo grabado
+    """
+    diferencias = []
+    for comando in comandos:
+        resultado = aplicar(gestor, comando)
+        if comando.resultado is not None and resultado != comando.resultado:
+            diferencias.append((comando, resultado))
+    return diferencias
+
+
+def guardar_comandos(comandos: List[Comando], ruta: str) -> int:
+    """
+    Guarda comandos en JSON Lines (una lista [numero, operacion, argumentos, resultado] por línea).
+
+    Args:
+        comandos: Comandos a guardar
+        ruta: Archivo de destino
+
+    Returns:
+        Cantidad de comandos guardados
+    """
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for comando in comandos:
+            archivo.write(json.dumps(list(comando), ensure_ascii=False, default=_a_json))
+            archivo.write("\n")
+    return len(comandos)
+
+
+def cargar_comandos(ruta: str) -> List[Comando]:
+    """
+    Lee comandos guardados con guardar_comandos.
+
+    Args:
+        ruta: Archivo JSON Lines
+
+    Returns:
+        Lista de comandos
+    """
+    comandos = []
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            if linea.strip():
+                numero, operacion, argumentos, resultado = json.loads(linea, object_hook=_desde_json)
+                comandos.append(Comando(numero, operacion, tuple(argumentos), resultado))
+    return comandos
+
+
+def _a_json(valor):
+    """Convierte las fechas para json.dumps."""
+    if isinstance(valor, datetime):
+        return {"$fecha": valor.isoformat()}
+    raise TypeError(f"No se puede guardar un {type(valor).__name__}")
+
+
+def _desde_json(objeto: dict):
+    """Recupera las fechas guardadas por _a_json."""
+    if len(objeto) == 1 and "$fecha" in objeto:
+        return datetime.fromisoformat(objeto["$fecha"])
+    return objeto
+
+
+def _tipo_objeto(objeto) -> str:
+    """Tipo usado en los comandos "asignar"."""
+    if isinstance(objeto, Servicio):
+        return "servicio"
+    if isinstance(objeto, Cliente):
+        return "cliente"
+    return "gestor"
+
+
+def _buscar_objeto(gestor: GestorServicios, tipo: str, clave: str):
+    """Localiza el objeto de un comando "asignar"."""
+    if tipo == "gestor":
+        return gestor
+    objeto = gestor.buscar_servicio(clave) if tipo == "servicio" else gestor.buscar_cliente(clave)
+    if objeto is None:
+        raise ValueError(f"No se encontró el {tipo} '{clave}'")
+    return objeto
+
+
+class BitacoraComandos:
+    """
+    Clase que graba los comandos de un gestor y permite deshacerlos.
+    Los métodos del gestor se envuelven en la instancia (solo se graba ese
+    gestor); los setters se envuelven en las clases, como en el Trazador, y
+    solo se graban las asignaciones a objetos del gestor. Las asignaciones y
+    operaciones hechas dentro de otra operación no se graban: las vuelve a
+    hacer la operación que las contiene al reproducirla.
+    """
+
+    def __init__(self, gestor: GestorServicios):
+        """
+        Constructor de la BitacoraComandos.
+
+        Args:
+            gestor: Gestor cuyas operaciones se graban
+        """
+        self._gestor = gestor
+        self._comandos = []
+        self._rehacer = []
+        # Servicios quitados por cada retirar_servicios, para poder deshacerlo
+        self._retirados = {}
+        self._numeros = 0
+        self._profundidad = 0
+        self._conocidos = set()
+        self._originales = []
+        self._activa = False
+        gestor.suscribir_altas(self._al_agregar)
+        gestor.suscribir_bajas(self._al_retirar)
+
+    # Property para activa
+    @property
+    def activa(self) -> bool:
+        """Indica si la bitácora está grabando."""
+        return self._activa
+
+    # Property para comandos
+    @property
+    def comandos(self) -> List[Comando]:
+        """Obtiene una copia de los comandos grabados (sin los deshechos)."""
+        return list(self._comandos)
+
+    def __len__(self) -> int:
+        """Cantidad de comandos grabados."""
+        return len(self._comandos)
+
+    def activar(self):
+        """Empieza a grabar: envuelve los métodos del gestor y los SETTERS."""
+        if self._activa:
+            return
+        gestor = self._gestor
+        self._conocidos = {id(gestor)} | {id(s) for s in gestor._servicios} \
+            | {id(c) for c in gestor._clientes}
+        for nombre, describir in (
+                ("agregar_servicio", lambda servicio: (describir_servicio(servicio),)),
+                ("agregar_cliente", lambda cliente: (describir_cliente(cliente),)),
+                ("retirar_servicios", lambda servicios: tuple(s.codigo for s in servicios
+                                                              if id(s) in self._conocidos)),
+                ("realizar_venta", lambda codigo, cedula, cantidad, zona=None:
+                    (codigo, cedula, cantidad, zona)),
+                ("cancelar_venta", lambda codigo, cedula, cantidad: (codigo, cedula, cantidad)),
+                ("cancelar_servicio", lambda codigo: (codigo,))):
+            setattr(gestor, nombre, self._envolver_operacion(nombre, nombre, describir))
+        # Las ventas con objetos ya encontrados (listas de espera) se graban como realizar_venta
+        gestor._vender = self._envolver_operacion(
+            "realizar_venta", "_vender",
+            lambda servicio, cliente, cantidad, zona=None: (servicio.codigo, cliente.cedula,
+                                                            cantidad, zona))
+        for clase, atributo in SETTERS:
+            original = clase.__dict__[atributo]
+            setattr(clase, atributo, property(original.fget, self._envolver_setter(atributo, original),
+                                              original.fdel, original.__doc__))
+            self._originales.append((clase, atributo, original))
+        self._activa = True
+
+    def desactivar(self):
+        """Deja de grabar y restaura los métodos y setters originales."""
+        if not self._activa:
+            return
+        for nombre in ("agregar_servicio", "agregar_cliente", "retirar_servicios",
+                       "realizar_venta", "_vender", "cancelar_venta", "cancelar_servicio"):
+            delattr(self._gestor, nombre)
+        for clase, atributo, original in reversed(self._originales):
+            setattr(clase, atributo, original)
+        self._originales.clear()
+        self._activa = False
+
+    def limpiar(self):
+        """Descarta los comandos grabados y los deshechos."""
+        self._comandos.clear()
+        self._rehacer.clear()
+        self._retirados.clear()
+
+    def deshacer(self, cantidad: int = 1) -> List[Comando]:
+        """
+        Revierte los últimos comandos, del más reciente al más antiguo.
+        Las operaciones que fallaron se quitan sin hacer nada; deshacer una
+        cancelación vuelve a vender las entradas al precio actual, y un
+        servicio retirado vuelve al final de la lista del gestor.
+
+        Args:
+            cantidad: Cantidad de comandos a deshacer
+
+        Returns:
+            Comandos deshechos
+        """
+        deshechos = []
+        while self._comandos and len(deshechos) < cantidad:
+            comando = self._comandos[-1]
+            if comando.operacion in IRREVERSIBLES:
+                raise ValueError(f"La operación '{comando.operacion}' no se puede deshacer")
+            self._profundidad += 1
+            try:
+                self._revertir(comando)
+            finally:
+                self._profundidad -= 1
+            self._comandos.pop()
+            self._rehacer.append(comando)
+            deshechos.append(comando)
+        return deshechos
+
+    def rehacer(self, cantidad: int = 1) -> List[Comando]:
+        """
+        Vuelve a aplicar los últimos comandos deshechos (se graban de nuevo).
+
+        Args:
+            cantidad: Cantidad de comandos a rehacer
+
+        Returns:
+            Comandos grabados al rehacer
+        """
+        rehechos = []
+        while self._rehacer and len(rehechos) < cantidad:
+            comando = self._rehacer[-1]
+            if comando.operacion == "retirar_servicios":
+                retirados = [s for s in map(self._gestor.buscar_servicio, comando.argumentos) if s]
+            self._profundidad += 1
+            try:
+                resultado = aplicar(self._gestor, comando)
+            finally:
+                self._profundidad -= 1
+            self._rehacer.pop()
+            nuevo = self._registrar(comando.operacion, comando.argumentos, resultado)
+            if comando.operacion == "retirar_servicios" and resultado:
+                self._retirados[nuevo.numero] = retirados
+            rehechos.append(nuevo)
+        return rehechos
+
+    def guardar(self, ruta: str) -> int:
+        """
+        Guarda los comandos grabados en JSON Lines.
+
+        Args:
+            ruta: Archivo de destino
+
+        Returns:
+            Cantidad de comandos guardados
+        """
+        return guardar_comandos(self._comandos, ruta)
+
+    def _revertir(self, comando: Comando):
+        """Aplica la operación inversa de un comando."""
+        gestor = self._gestor
+        operacion, argumentos = comando.operacion, comando.argumentos
+        if operacion == "realizar_venta" and comando.resultado:
+            gestor.cancelar_venta(*argumentos[:3])
+        elif operacion == "cancelar_venta" and comando.resultado:
+            gestor.realizar_venta(*argumentos)
+        elif operacion == "agregar_servicio":
+            gestor.retirar_servicios([gestor.buscar_servicio(argumentos[0]["codigo"])])
+        elif operacion == "retirar_servicios":
+            for servicio in self._retirados.pop(comando.numero, []):
+                gestor.agregar_servicio(servicio)
+        elif operacion == "asignar":
+            tipo, clave, atributo, anterior, nuevo = argumentos
+            # Si lo asignado fue la clave, el objeto ahora se encuentra por el valor nuevo
+            clave = nuevo if atributo == CLAVES[tipo] else clave
+            setattr(_buscar_objeto(gestor, tipo, clave), atributo, anterior)
+
+    def _registrar(self, operacion: str, argumentos: tuple, resultado) -> Comando:
+        """Agrega un comando a la bitácora."""
+        self._numeros += 1
+        comando = Comando(self._numeros, operacion, argumentos, resultado)
+        self._comandos.append(comando)
+        return comando
+
+    def _envolver_operacion(self, nombre: str, metodo: str, describir):
+        """
+        Crea la envoltura que graba una operación del gestor.
+        El método se busca en la clase en cada llamada, para no saltarse las
+        envolturas que se pongan después en ella (métricas, trazas).
+        """
+        gestor = self._gestor
+        clase = type(gestor)
+
+        def original(*args, **kwargs):
+            return getattr(clase, metodo)(gestor, *args, **kwargs)
+
+        @wraps(getattr(clase, metodo))
+        def envoltura(*args, **kwargs):
+            if self._profundidad:
+                return original(*args, **kwargs)
+            argumentos = describir(*args, **kwargs)
+            if nombre == "retirar_servicios":
+                retirados = [s for s in args[0] if id(s) in self._conocidos]
+            self._profundidad += 1
+            try:
+                resultado = original(*args, **kwargs)
+            finally:
+                self._profundidad -= 1
+            comando = self._registrar(nombre, argumentos, resultado)
+            self._rehacer.clear()
+            if nombre == "retirar_servicios" and resultado:
+                self._retirados[comando.numero] = retirados
+            return resultado
+
+        return envoltura
+
+    def _envolver_setter(self, atributo: str, original: property):
+        """Crea el setter que graba las asignaciones a objetos del gestor."""
+        fget, fset = original.fget, original.fset
+
+        @wraps(fset)
+        def envoltura(objeto, valor):
+            if self._profundidad or id(objeto) not in self._conocidos:
+                return fset(objeto, valor)
+            tipo = _tipo_objeto(objeto)
+            anterior = fget(objeto)
+            clave = anterior if atributo == CLAVES[tipo] else (
+                getattr(objeto, CLAVES[tipo]) if CLAVES[tipo] else None)
+            # Los cambios que haga el propio setter (por ejemplo, el estado) no se graban
+            self._profundidad += 1
+            try:
+                fset(objeto, valor)
+            finally:
+                self._profundidad -= 1
+            self._registrar("asignar", (tipo, clave, atributo, anterior, valor), None)
+            self._rehacer.clear()
+
+        return envoltura
+
+    def _al_agregar(self, objeto):
+        """Empieza a grabar las asignaciones de un objeto agregado al gestor."""
+        if self._activa:
+            self._conocidos.add(id(objeto))
+
+    def _al_retirar(self, servicios: list):
+        """Deja de grabar las asignaciones de los servicios retirados."""
+        if self._activa:
+            for servicio in servicios:
+                self._conocidos.discard(id(servicio))
+
+    def __str__(self) -> str:
+        """Representación en string de la bitácora."""
+        estado = "activa" if self._activa else "inactiva"
+        return (f"BitacoraComandos ({estado}): {len(self._comandos)} comandos | "
+                f"{len(self._rehacer)} para rehacer")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import os
+    import tempfile
+    from contextlib import redirect_stdout
+    from datetime import timedelta
+
+    print("PRUEBA DE LA BITÁCORA DE COMANDOS")
+
+    def estado_gestor(gestor: GestorServicios) -> tuple:
+        """Resumen comparable del estado de un gestor."""
+        servicios = tuple((s.codigo, s.nombre, s.estado, s.precio_base, s.calcular_ingresos(),
+                           s.asientos_vendidos if hasattr(s, '_asientos_vendidos')
+                           else s.entradas_vendidas)
+                          for s in sorted(gestor._servicios, key=lambda s: s.codigo))
+        clientes = tuple((c.cedula, c.email, c.es_premium, c.puntos_acumulados, c.total_compras())
+                         for c in gestor._clientes)
+        return gestor.nombre_empresa, round(gestor.ventas_totales, 2), servicios, clientes
+
+    def construir() -> GestorServicios:
+        """Gestor inicial con tres servicios y dos clientes."""
+        gestor = GestorServicios("CineMax Entertainment")
+        fecha = datetime(2025, 5, 2, 19, 0)
+        gestor.agregar_servicio(ServicioCine("C001", "Estreno Dune", fecha, 8.5, "Dune", 1, True))
+        gestor.agregar_servicio(ServicioCine("C002", "Matiné Moana", fecha - timedelta(hours=8),
+                                             5.0, "Moana 2", 2))
+        gestor.agregar_servicio(ServicioEvento("E001", "Rock Fest", fecha + timedelta(days=1), 40.0,
+                                               "Los Rockeros", "Concierto", 3.0, "General",
+                                               {"General": 300, "VIP": 40}))
+        gestor.agregar_cliente(Cliente("0912345678", "Ana", "Pérez", "ana@email.com", "0987654321"))
+        gestor.agregar_cliente(Cliente("0923456789", "Luis", "Soto", "luis@email.com", "0987654322"))
+        return gestor
+
+    with redirect_stdout(io.StringIO()):
+        gestor = construir()
+    bitacora = BitacoraComandos(gestor)
+    inicial = estado_gestor(gestor)
+
+    print("\n1. Sesión grabada:")
+    bitacora.activar()
+    with redirect_stdout(io.StringIO()):
+        gestor.realizar_venta("C001", "0912345678", 3)
+        gestor.realizar_venta("E001", "0923456789", 2, "VIP")
+        gestor.realizar_venta("C002", "0912345678", 200)
+        gestor.buscar_servicio("C001").precio_base = 9.5
+        gestor.realizar_venta("C001", "0923456789", 4)
+        gestor.cancelar_venta("C001", "0912345678", 1)
+        gestor.buscar_servicio("E001").incluye_meet_and_greet = True
+        gestor.buscar_cliente("0912345678").email = "ana.perez@email.com"
+        gestor.nombre_empresa = "CineMax Ecuador"
+        gestor.agregar_servicio(ServicioCine("C003", "Función extra", datetime(2025, 5, 3, 21, 0),
+                                             8.5, "Dune", 3))
+        gestor.realizar_venta("C003", "0912345678", 2)
+        gestor.retirar_servicios([gestor.buscar_servicio("C002")])
+    bitacora.desactivar()
+    for comando in bitacora.comandos:
+        print(f"   {comando.numero:>2}. {comando.operacion:<18} {comando.argumentos} -> {comando.resultado}")
+    print(f"   {bitacora}")
+    final = estado_gestor(gestor)
+
+    print("\n2. Reproducción sobre un gestor nuevo (desde JSON Lines):")
+    ruta = os.path.join(tempfile.mkdtemp(), "sesion.jsonl")
+    print(f"   Guardados: {bitacora.guardar(ruta)} comandos")
+    with redirect_stdout(io.StringIO()):
+        copia = construir()
+        diferencias = reproducir(copia, cargar_comandos(ruta))
+    print(f"   Resultados distintos: {len(diferencias)}")
+    print(f"   Estado final idéntico: {estado_gestor(copia) == final}")
+
+    print("\n3. Deshacer y rehacer:")
+    with redirect_stdout(io.StringIO()):
+        deshechos = bitacora.deshacer(len(bitacora))
+    print(f"   Deshechos: {len(deshechos)} | estado inicial recuperado: {estado_gestor(gestor) == inicial}")
+    with redirect_stdout(io.StringIO()):
+        rehechos = bitacora.rehacer(len(deshechos))
+    print(f"   Rehechos: {len(rehechos)} | estado final recuperado: {estado_gestor(gestor) == final}")
+    print(f"   {bitacora}")
+
+    print("\n4. Validaciones:")
+    bitacora.activar()
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_cliente(Cliente("0934567890", "Eva", "Ríos", "eva@email.com", "0987654323"))
+    try:
+        bitacora.deshacer()
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
+    bitacora.desactivar()
+    try:
+        aplicar(gestor, Comando(0, "asignar", ("servicio", "X999", "nombre", None, "Nada"), None))
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
@@ -0,0 +1,365 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define los eventos del sistema y el BusEventos.
+Cada cambio de estado hecho por el GestorServicios se publica como un evento
+inmutable y tipado. Los suscriptores pueden ser síncronos (se llaman en el
+mismo hilo de la venta) o asíncronos (reciben lotes en su propio hilo, con una
+cola acotada), para que los consumidores lentos no agreguen latencia a la venta.
+"""
+
+import queue
+import threading
+import time
+from typing import NamedTuple
+
+
+class VentaRealizada(NamedTuple):
+    """Evento publicado después de una venta exitosa."""
+    codigo: str
+    tipo: str
+    titulo: str
+    sala: str
+    cedula: str
+    cantidad: int
+    total: float
+    instante: float
+
+
+class VentaCancelada(NamedTuple):
+    """Evento publicado después de reembolsar entradas a un cliente."""
+    codigo: str
+    cedula: str
+    cantidad: int
+    reembolso: float
+    instante: float
+
+
+class ServicioAgregado(NamedTuple):
+    """Evento publicado al agregar un servicio al gestor."""
+    codigo: str
+    tipo: str
+    titulo: str
+    sala: str
+    fecha: object
+    precio_base: float
+    instante: float
+
+
+class CambioEstado(NamedTuple):
+    """Evento publicado cuando cambia el estado de un servicio."""
+    codigo: str
+    anterior: str
+    nuevo: str
+    instante: float
+
+
+class ClienteAgregado(NamedTuple):
+    """Evento publicado al registrar un cliente en el gestor."""
+    cedula: str
+    nombre: str
+    email: str
+    instante: float
+
+
+class AscensoPremium(NamedTuple):
+    """Evento publicado cuando un cliente pasa a ser premium."""
+    cedula: str
+    compras: int
+    puntos: int
+    instante: float
+
+
+def datos_servicio(servicio, zona: str = None) -> tuple:
+    """
+    Obtiene el tipo, título y sala de un servicio para los eventos.
+
+    Args:
+        servicio: Servicio de cine o evento
+        zona: Zona vendida en un evento con zonas (None para la zona del evento)
+
+    Returns:
+        Tupla (tipo, titulo, sala)
+    """
+    if hasattr(servicio, '_asientos_vendidos'):
+        return "Cine", servicio.pelicula, f"Sala {servicio.sala}"
+    return "Evento", servicio.artista, zona or servicio.zona
+
+
+# Marca que detiene el hilo de un suscriptor asíncrono
+_FIN = object()
+
+
+class SuscriptorAsincrono:
+    """
+    Clase que entrega eventos por lotes a una función en un hilo propio.
+    La cola es acotada: al llenarse, publicar bloquea al productor
+    (contrapresión) o descarta el evento, según `bloquear`.
+    """
+
+    def __init__(self, funcion, tipos=None, capacidad: int = 1024,
+                 tam_lote: int = 64, bloquear: bool = True):
+        """
+        Constructor del SuscriptorAsincrono.
+
+        Args:
+            funcion: Función que recibe una lista de eventos
+            tipos: Clases de eventos a recibir (None recibe todos)
+            capacidad: Máximo de eventos pendientes en la cola
+            tam_lote: Máximo de eventos por llamada a la función
+            bloquear: True para esperar si la cola está llena, False para descartar
+        """
+        if capacidad < 1 or tam_lote < 1:
+            raise ValueError("La capacidad y el tamaño de lote deben ser positivos")
+        self._funcion = funcion
+        self._tipos = frozenset(tipos) if tipos else None
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._tam_lote = tam_lote
+        self._bloquear = bloquear
+        self._entregados = 0
+        self._lotes = 0
+        self._descartados = 0
+        self._errores = 0
+        self._hilo = threading.Thread(target=self._procesar, daemon=True,
+                                      name=f"suscriptor-{getattr(funcion, '__name__', 'evento')}")
+        self._hilo.start()
+
+    # Property para entregados
+    @property
+    def entregados(self) -> int:
+        """Obtiene la cantidad de eventos entregados."""
+        return self._entregados
+
+    # Property para lotes
+    @property
+    def lotes(self) -> int:
+        """Obtiene la cantidad de lotes entregados."""
+        return self._lotes
+
+    # Property para descartados
+    @property
+    def descartados(self) -> int:
+        """Obtiene la cantidad de eventos descartados por cola llena."""
+        return self._descartados
+
+    # Property para errores
+    @property
+    def errores(self) -> int:
+        """Obtiene la cantidad de lotes en los que la función lanzó una excepción."""
+        return self._errores
+
+    # Property para pendientes
+    @property
+    def pendientes(self) -> int:
+        """Obtiene la cantidad aproximada de eventos en cola."""
+        return self._cola.qsize()
+
+    def acepta(self, evento) -> bool:
+        """Indica si el suscriptor recibe este tipo de evento."""
+        return self._tipos is None or type(evento) in self._tipos
+
+    def encolar(self, evento):
+        """
+        Agrega un evento a la cola respetando la política de contrapresión.
+
+        Args:
+            evento: Evento a entregar
+        """
+        if self._bloquear:
+            self._cola.put(evento)
+        else:
+            try:
+                self._cola.put_nowait(evento)
+            except queue.Full:
+                self._descartados += 1
+
+    def vaciar(self):
+        """Espera a que se entreguen todos los eventos encolados."""
+        self._cola.join()
+
+    def cerrar(self):
+        """Entrega los eventos pendientes y detiene el hilo."""
+        if self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join()
+
+    def _procesar(self):
+        """Bucle del hilo: toma un lote de la cola y lo entrega."""
+        cola = self._cola
+        while True:
+            lote = [cola.get()]
+            while len(lote) < self._tam_lote:
+                try:
+                    lote.append(cola.get_nowait())
+                except queue.Empty:
+                    break
+            fin = lote[-1] is _FIN
+            if fin:
+                lote.pop()
+            if lote:
+                try:
+                    self._funcion(lote)
+                except Exception:
+                    # Un consumidor con fallas no debe detener la entrega
+                    self._errores += 1
+                self._entregados += len(lote)
+                self._lotes += 1
+            for _ in range(len(lote) + fin):
+                cola.task_done()
+            if fin:
+                return
+
+
+class BusEventos:
+    """
+    Clase que distribuye los eventos publicados a sus suscriptores.
+    Sin suscriptores, publicar solo recorre dos listas vacías.
+    """
+
+    def __init__(self):
+        """Constructor del BusEventos."""
+        self._sincronos = []
+        self._asincronos = []
+        self._publicados = 0
+
+    # Property para publicados
+    @property
+    def publicados(self) -> int:
+        """Obtiene la cantidad de eventos publicados."""
+        return self._publicados
+
+    def suscribir(self, funcion, tipos=None):
+        """
+        Registra una función que se llama en el hilo que publica.
+        Debe ser rápida, porque su tiempo se suma al de la operación.
+
+        Args:
+            funcion: Función que recibe un evento
+            tipos: Clases de eventos a recibir (None recibe todos)
+        """
+        self._sincronos.append((funcion, frozenset(tipos) if tipos else None))
+
+    def suscribir_asincrono(self, funcion, tipos=None, capacidad: int = 1024,
+                            tam_lote: int = 64, bloquear: bool = True) -> SuscriptorAsincrono:
+        """
+        Registra una función que recibe lotes de eventos en un hilo propio.
+
+        Args:
+            funcion: Función que recibe una lista de eventos
+            tipos: Clases de eventos a recibir (None recibe todos)
+            capacidad: Máximo de eventos pendientes en la cola
+            tam_lote: Máximo de eventos por lote
+            bloquear: True para contrapresión, False para descartar si está llena
+
+        Returns:
+            El suscriptor creado (para consultar sus contadores)
+        """
+        suscriptor = SuscriptorAsincrono(funcion, tipos, capacidad, tam_lote, bloquear)
+        self._asincronos.append(suscriptor)
+        return suscriptor
+
+    def publicar(self, evento):
+        """
+        Publica un evento a todos los suscriptores interesados.
+
+        Args:
+            evento: Evento inmutable a publicar
+        """
+        self._publicados += 1
+        tipo = type(evento)
+        for funcion, tipos in self._sincronos:
+            if tipos is None or tipo in tipos:
+                funcion(evento)
+        for suscriptor in self._asincronos:
+            if suscriptor.acepta(evento):
+                suscriptor.encolar(evento)
+
+    def vaciar(self):
+        """Espera a que los suscriptores asíncronos procesen lo encolado."""
+        for suscriptor in self._asincronos:
+            suscriptor.vaciar()
+
+    def cerrar(self):
+        """Entrega lo pendiente y detiene los hilos de los suscriptores."""
+        for suscriptor in self._asincronos:
+            suscriptor.cerrar()
+        self._asincronos.clear()
+
+    def __str__(self) -> str:
+        """Representación en string del bus."""
+        return (f"BusEventos: {self._publicados} publicados | "
+                f"{len(self._sincronos)} síncronos | {len(self._asincronos)} asíncronos")
+
+
+def ahora() -> float:
+    """Instante actual usado en los eventos (segundos desde la época)."""
+    return time.time()
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    from contextlib import redirect_stdout
+    from datetime import datetime
+    from collections import Counter
+    from servicio_cine import ServicioCine
+    from cliente import Cliente
+    from gestor_servicios import GestorServicios
+    import eventos
+
+    print("PRUEBA DEL BUS DE EVENTOS")
+
+    bus = eventos.BusEventos()
+    gestor = GestorServicios("CineMax Entertainment")
+    gestor.bus = bus
+
+    print("\n1. Suscriptor síncrono (solo ascensos premium):")
+    bus.suscribir(lambda evento: print(f"   Nuevo premium: {evento.cedula}"),
+                  tipos=[eventos.AscensoPremium])
+
+    conteo = Counter()
+    ingresos = []
+
+    def analitica(lote):
+        """Consumidor lento que cuenta eventos por tipo."""
+        time.sleep(0.01)
+        conteo.update(type(evento).__name__ for evento in lote)
+        ingresos.extend(evento.total for evento in lote
+                        if isinstance(evento, eventos.VentaRealizada))
+
+    analitica_sub = bus.suscribir_asincrono(analitica, capacidad=256, tam_lote=32)
+
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_servicio(ServicioCine("C001", "Estreno", datetime(2024, 12, 15, 20, 0),
+                                             8.50, "Dune: Part Two", 1))
+        gestor.agregar_cliente(Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321"))
+
+    print("\n2. Intentando 150 ventas de 1 entrada (sala de 100 asientos):")
+    inicio = time.perf_counter()
+    salida = io.StringIO()
+    with redirect_stdout(salida):
+        for _ in range(150):
+            gestor.realizar_venta("C001", "0912345678", 1)
+    print("".join(l + "\n" for l in salida.getvalue().splitlines() if "premium" in l), end="")
+    print(f"   Tiempo de ventas: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    bus.vaciar()
+    print("\n3. Consumidor asíncrono:")
+    print(f"   Eventos por tipo: {dict(conteo)}")
+    print(f"   Entregados en {analitica_sub.lotes} lotes | Ingresos: ${sum(ingresos):.2f}")
+    print(f"   Ventas totales del gestor: ${gestor.ventas_totales:.2f}")
+
+    print("\n4. Cancelando el servicio (eventos de cambio de estado):")
+    cambios = []
+    bus.suscribir(cambios.append, tipos=[eventos.CambioEstado, eventos.VentaCancelada])
+    with redirect_stdout(io.StringIO()):
+        gestor.cancelar_servicio("C001")
+    for evento in cambios:
+        print(f"   {type(evento).__name__}: {evento[1:-1]}")
+
+    bus.cerrar()
+    print(f"\n5. {bus}")
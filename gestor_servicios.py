@@ -13,9 +13,13 @@ from datetime import datetime
 from typing import List
 from servicio import Servicio
 from cliente import Cliente
+from indice_compradores import IndiceCompradores
+from observable import Observable
+from eventos import (VentaRealizada, VentaCancelada, ServicioAgregado, CambioEstado,
+                     ClienteAgregado, AscensoPremium, datos_servicio, ahora)
 
 
-class GestorServicios:
+class GestorServicios(Observable):
     """
     Clase que gestiona servicios y clientes del sistema.
     Implementa métodos polimórficos para operaciones sobre listas de servicios.
@@ -33,6 +37,13 @@ class GestorServicios:
         self._clientes = []
         self._ventas_totales = 0.0
         self._fecha_creacion = datetime.now()
+        self._indice_compradores = IndiceCompradores()
+        self._oyentes_liberacion = []
+        self._oyentes_altas = []
+        self._oyentes_bajas = []
+        self._oyentes_confirmacion = []
+        self._planificador = None
+        self._bus = None
 
     # Property para nombre_empresa
     @property
@@ -45,7 +56,10 @@ class GestorServicios:
         """Establece el nombre de la empresa con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El nombre de la empresa debe ser una cadena no vacía")
+        anterior = self._nombre_empresa
         self._nombre_empresa = valor
+        if self._observadores:
+            self._notificar_cambio("nombre_empresa", anterior, valor)
 
     # Property para ventas_totales
     @property
@@ -53,6 +67,43 @@ class GestorServicios:
         """Obtiene el total de ventas."""
         return self._ventas_totales
 
+    # Property para indice_compradores (solo lectura)
+    @property
+    def indice_compradores(self) -> IndiceCompradores:
+        """Obtiene el índice inverso de compradores por servicio."""
+        return self._indice_compradores
+
+    # Property para planificador
+    @property
+    def planificador(self):
+        """Obtiene el planificador de salas (None si no se valida el horario)."""
+        return self._planificador
+
+    @planificador.setter
+    def planificador(self, valor):
+        """Establece el planificador y registra en él los servicios existentes."""
+        if valor is not None:
+            for servicio in self._servicios:
+                valor.registrar(servicio, permitir_conflictos=True)
+        self._planificador = valor
+
+    # Property para bus
+    @property
+    def bus(self):
+        """Obtiene el bus de eventos (None si no se publican eventos)."""
+        return self._bus
+
+    @bus.setter
+    def bus(self, valor):
+        """Establece el bus y observa el estado de los servicios existentes."""
+        if self._bus is not None:
+            for servicio in self._servicios:
+                servicio.cancelar_suscripcion(self._al_cambiar_servicio)
+        if valor is not None:
+            for servicio in self._servicios:
+                servicio.suscribir_cambios(self._al_cambiar_servicio)
+        self._bus = valor
+
     def agregar_servicio(self, servicio: Servicio):
         """
         Agrega un servicio a la lista de servicios.
@@ -62,7 +113,18 @@ class GestorServicios:
         """
         if not isinstance(servicio, Servicio):
             raise ValueError("Debe ser una instancia de Servicio")
+        if self._planificador is not None:
+            # Lanza ValueError si la función se solapa con otra de su sala
+            self._planificador.registrar(servicio)
         self._servicios.append(servicio)
+        for funcion in self._oyentes_altas:
+            funcion(servicio)
+        if self._bus is not None:
+            servicio.suscribir_cambios(self._al_cambiar_servicio)
+            tipo, titulo, sala = datos_servicio(servicio)
+            self._bus.publicar(ServicioAgregado(servicio.codigo, tipo, titulo, sala, servicio.fecha,
+                                                servicio.precio_base, ahora()))
+        self.confirmar_operacion()
         print(f"   Servicio '{servicio.nombre}' agregado exitosamente")
 
     def agregar_cliente(self, cliente: Cliente):
@@ -75,8 +137,42 @@ class GestorServicios:
         if not isinstance(cliente, Cliente):
             raise ValueError("Debe ser una instancia de Cliente")
         self._clientes.append(cliente)
+        self._indice_compradores.registrar_cliente(cliente)
+        for funcion in self._oyentes_altas:
+            funcion(cliente)
+        if self._bus is not None:
+            self._bus.publicar(ClienteAgregado(cliente.cedula, cliente.nombre_completo(),
+                                               cliente.email, ahora()))
+        self.confirmar_operacion()
         print(f"   Cliente '{cliente.nombre_completo()}' registrado exitosamente")
 
+    def retirar_servicios(self, servicios: List[Servicio]) -> int:
+        """
+        Quita servicios del gestor (por ejemplo, al archivarlos).
+        Las entradas vendidas y las ventas totales no se modifican.
+
+        Args:
+            servicios: Servicios a quitar
+
+        Returns:
+            Cantidad de servicios quitados
+        """
+        ids = {id(servicio) for servicio in servicios}
+        retirados = [s for s in self._servicios if id(s) in ids]
+        if not retirados:
+            return 0
+        # Se modifica la lista en su lugar porque otros componentes la recorren
+        self._servicios[:] = [s for s in self._servicios if id(s) not in ids]
+        for servicio in retirados:
+            if self._planificador is not None:
+                self._planificador.retirar(servicio)
+            if self._bus is not None:
+                servicio.cancelar_suscripcion(self._al_cambiar_servicio)
+        for funcion in self._oyentes_bajas:
+            funcion(retirados)
+        self.confirmar_operacion()
+        return len(retirados)
+
     def buscar_servicio(self, codigo: str) -> Servicio:
         """
         Busca un servicio por su código.
@@ -122,19 +218,9 @@ class GestorServicios:
         """
         total = 0.0
         for servicio in servicios:
-            # Polimorfismo: llama al método calcular_precio_total()
-            # sin importar si es ServicioCine o ServicioEvento
-            precio = servicio.calcular_precio_total()
-
-            # Obtener entradas vendidas (asumiendo que tienen este atributo)
-            if hasattr(servicio, '_asientos_vendidos'):
-                entradas = servicio._asientos_vendidos
-            elif hasattr(servicio, '_entradas_vendidas'):
-                entradas = servicio._entradas_vendidas
-            else:
-                entradas = 0
-
-            total += precio * entradas
+            # Polimorfismo: llama al método calcular_ingresos()
+            # sin importar si es ServicioCine o ServicioEvento (con o sin zonas)
+            total += servicio.calcular_ingresos()
 
         return round(total, 2)
 
@@ -149,10 +235,7 @@ class GestorServicios:
         Returns:
             String con el reporte formateado
         """
-        reporte = f"\n{'=' * 70}\n"
-        reporte += f"REPORTE DE SERVICIOS - {self._nombre_empresa}\n"
-        reporte += f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
-        reporte += f"{'=' * 70}\n\n"
+        reporte = self._encabezado_reporte()
 
         if not servicios:
             reporte += "No hay servicios registrados.\n"
@@ -161,33 +244,50 @@ class GestorServicios:
         total_ingresos = 0.0
 
         for i, servicio in enumerate(servicios, 1):
-            # Polimorfismo: llama a mostrar_info() sin importar el tipo
-            reporte += f"{i}. {servicio.mostrar_info()}\n"
-
-            # Calcular ingresos de este servicio
-            precio = servicio.calcular_precio_total()
-            if hasattr(servicio, '_asientos_vendidos'):
-                entradas = servicio._asientos_vendidos
-            elif hasattr(servicio, '_entradas_vendidas'):
-                entradas = servicio._entradas_vendidas
-            else:
-                entradas = 0
-
-            ingresos_servicio = precio * entradas
+            bloque, ingresos_servicio = self._bloque_reporte(servicio)
             total_ingresos += ingresos_servicio
-            reporte += f"   Ingresos generados: ${ingresos_servicio:.2f}\n"
-            reporte += f"   {'-' * 50}\n"
+            reporte += f"{i}. {bloque}"
 
-        reporte += f"\n{'=' * 70}\n"
-        reporte += f"TOTAL DE SERVICIOS: {len(servicios)}\n"
-        reporte += f"INGRESOS TOTALES: ${total_ingresos:.2f}\n"
-        reporte += f"{'=' * 70}\n"
+        reporte += self._pie_reporte(len(servicios), total_ingresos)
 
         return reporte
 
+    def _encabezado_reporte(self) -> str:
+        """Genera el encabezado del reporte de servicios."""
+        encabezado = f"\n{'=' * 70}\n"
+        encabezado += f"REPORTE DE SERVICIOS - {self._nombre_empresa}\n"
+        encabezado += f"Fecha: {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
+        encabezado += f"{'=' * 70}\n\n"
+        return encabezado
+
+    def _bloque_reporte(self, servicio: Servicio) -> tuple:
+        """
+        Genera el bloque de un servicio en el reporte (sin su número).
+
+        Returns:
+            Tupla (texto del bloque, ingresos del servicio)
+        """
+        # Polimorfismo: llama a mostrar_info() sin importar el tipo
+        bloque = f"{servicio.mostrar_info()}\n"
+
+        # Calcular ingresos de este servicio
+        ingresos_servicio = servicio.calcular_ingresos()
+        bloque += f"   Ingresos generados: ${ingresos_servicio:.2f}\n"
+        bloque += f"   {'-' * 50}\n"
+        return bloque, ingresos_servicio
+
+    def _pie_reporte(self, cantidad_servicios: int, total_ingresos: float) -> str:
+        """Genera el pie del reporte con los totales."""
+        pie = f"\n{'=' * 70}\n"
+        pie += f"TOTAL DE SERVICIOS: {cantidad_servicios}\n"
+        pie += f"INGRESOS TOTALES: ${total_ingresos:.2f}\n"
+        pie += f"{'=' * 70}\n"
+        return pie
+
     # ========== MÉTODOS ADICIONALES ==========
 
-    def realizar_venta(self, codigo_servicio: str, cedula_cliente: str, cantidad: int) -> bool:
+    def realizar_venta(self, codigo_servicio: str, cedula_cliente: str, cantidad: int,
+                       zona: str = None) -> bool:
         """
         Realiza una venta de entradas.
 
@@ -195,6 +295,7 @@ class GestorServicios:
             codigo_servicio: Código del servicio
             cedula_cliente: Cédula del cliente
             cantidad: Cantidad de entradas a vender
+            zona: Zona pedida en un evento con zonas (None asigna la mejor disponible)
 
         Returns:
             True si la venta fue exitosa, False en caso contrario
@@ -210,19 +311,60 @@ class GestorServicios:
             print(f"   Cliente con cédula '{cedula_cliente}' no encontrado")
             return False
 
+        return self._vender(servicio, cliente, cantidad, zona)
+
+    def _vender(self, servicio: Servicio, cliente: Cliente, cantidad: int, zona: str = None) -> bool:
+        """
+        Realiza una venta con el servicio y el cliente ya encontrados
+        (sin las búsquedas lineales de realizar_venta). Lo usan realizar_venta
+        y las listas de espera; métricas, trazas y bitácora también lo envuelven.
+
+        Args:
+            servicio: Servicio del gestor
+            cliente: Cliente del gestor
+            cantidad: Cantidad de entradas a vender
+            zona: Zona pedida en un evento con zonas (None asigna la mejor disponible)
+
+        Returns:
+            True si la venta fue exitosa, False en caso contrario
+        """
+        if servicio.estado == "Cancelado":
+            print(f"   El servicio '{servicio.nombre}' está cancelado")
+            return False
+
         # Intentar vender entradas
         if hasattr(servicio, 'vender_entradas'):
-            if servicio.vender_entradas(cantidad):
-                precio_total = servicio.calcular_precio_total() * cantidad
+            era_premium = cliente.es_premium
+            if getattr(servicio, 'es_multizona', False):
+                if zona is None:
+                    zona = servicio.mejor_zona(cantidad)
+                vendida = zona is not None and servicio.vender_entradas(cantidad, zona)
+            else:
+                zona = None
+                vendida = servicio.vender_entradas(cantidad)
+            if vendida:
+                precio_unitario = (servicio.precio_zona(zona) if zona
+                                   else servicio.calcular_precio_total())
+                precio_total = precio_unitario * cantidad
                 precio_final = cliente.calcular_descuento(precio_total)
 
-                cliente.registrar_compra(servicio, cantidad, precio_final)
+                cliente.registrar_compra(servicio, cantidad, precio_final, zona)
                 self._ventas_totales += precio_final
+                if self._observadores:
+                    self._notificar_cambio("ventas_totales", self._ventas_totales - precio_final,
+                                           self._ventas_totales)
+                self._indice_compradores.registrar_compra(servicio.codigo, cliente, cantidad)
+                if self._bus is not None:
+                    self._publicar_venta(servicio, cliente, cantidad, precio_final, era_premium,
+                                         zona)
+                self.confirmar_operacion()
 
                 print(f"   Venta exitosa!")
                 print(f"   Cliente: {cliente.nombre_completo()}")
                 print(f"   Servicio: {servicio.nombre}")
                 print(f"   Cantidad: {cantidad} entrada(s)")
+                if zona:
+                    print(f"   Zona: {zona}")
                 print(f"   Total: ${precio_final:.2f}")
                 return True
             else:
@@ -232,14 +374,206 @@ class GestorServicios:
             print(f"   El servicio no permite venta de entradas")
             return False
 
+    def cancelar_venta(self, codigo_servicio: str, cedula_cliente: str, cantidad: int) -> bool:
+        """
+        Cancela entradas vendidas y reembolsa al cliente.
+        Revierte asientos, estado, puntos, premium y ventas totales.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas a cancelar
+
+        Returns:
+            True si la cancelación fue exitosa, False en caso contrario
+        """
+        servicio = self.buscar_servicio(codigo_servicio)
+        cliente = self.buscar_cliente(cedula_cliente)
+
+        if not servicio:
+            print(f"   Servicio '{codigo_servicio}' no encontrado")
+            return False
+
+        if not cliente:
+            print(f"   Cliente con cédula '{cedula_cliente}' no encontrado")
+            return False
+
+        if not hasattr(servicio, 'devolver_entradas'):
+            print(f"   El servicio no permite devolución de entradas")
+            return False
+
+        # Validar todo antes de modificar el estado (operación atómica)
+        compradas = self._indice_compradores.cantidad(servicio.codigo, cliente)
+        if cantidad < 1 or cantidad > compradas:
+            print(f"   El cliente tiene {compradas} entrada(s) de este servicio")
+            return False
+
+        reembolso = self._reembolsar(servicio, cliente, cantidad)
+        self.confirmar_operacion()
+
+        print(f"   Cancelación exitosa!")
+        print(f"   Cliente: {cliente.nombre_completo()}")
+        print(f"   Servicio: {servicio.nombre}")
+        print(f"   Cantidad: {cantidad} entrada(s)")
+        print(f"   Reembolso: ${reembolso:.2f}")
+
+        self.notificar_liberacion(servicio)
+        return True
+
+    def cancelar_servicio(self, codigo_servicio: str) -> float:
+        """
+        Cancela un servicio completo y reembolsa a todos sus compradores,
+        recorriendo solo el índice de compradores del servicio.
+
+        Args:
+            codigo_servicio: Código del servicio a cancelar
+
+        Returns:
+            Monto total reembolsado
+        """
+        servicio = self.buscar_servicio(codigo_servicio)
+        if not servicio:
+            print(f"   Servicio '{codigo_servicio}' no encontrado")
+            return 0.0
+
+        # Validar todo antes de modificar el estado (operación atómica)
+        compradores = self._indice_compradores.compradores(servicio.codigo)
+        for cliente, cantidad in compradores:
+            if cliente.entradas_compradas(servicio.codigo) < cantidad:
+                print(f"   El historial de {cliente.nombre_completo()} no tiene las "
+                      f"{cantidad} entrada(s) a reembolsar")
+                return 0.0
+
+        servicio.estado = "Cancelado"
+
+        total_reembolsado = 0.0
+        for cliente, cantidad in compradores:
+            total_reembolsado += self._reembolsar(servicio, cliente, cantidad)
+        self.confirmar_operacion()
+
+        print(f"   Servicio '{servicio.nombre}' cancelado")
+        print(f"   Clientes reembolsados: {len(compradores)}")
+        print(f"   Total reembolsado: ${total_reembolsado:.2f}")
+        return round(total_reembolsado, 2)
+
+    def _reembolsar(self, servicio: Servicio, cliente: Cliente, cantidad: int) -> float:
+        """Aplica la devolución ya validada sobre servicio, cliente y contadores."""
+        if getattr(servicio, 'es_multizona', False):
+            zonas = cliente.zonas_compradas(servicio.codigo, cantidad)
+            reembolso = cliente.registrar_devolucion(servicio.codigo, cantidad)
+            for zona, entradas in zonas.items():
+                servicio.devolver_entradas(entradas, zona)
+        else:
+            reembolso = cliente.registrar_devolucion(servicio.codigo, cantidad)
+            servicio.devolver_entradas(cantidad)
+        self._ventas_totales -= reembolso
+        if self._observadores:
+            self._notificar_cambio("ventas_totales", self._ventas_totales + reembolso,
+                                   self._ventas_totales)
+        self._indice_compradores.registrar_devolucion(servicio.codigo, cliente, cantidad)
+        if self._bus is not None:
+            self._bus.publicar(VentaCancelada(servicio.codigo, cliente.cedula, cantidad,
+                                              reembolso, ahora()))
+        return reembolso
+
+    def _publicar_venta(self, servicio: Servicio, cliente: Cliente, cantidad: int,
+                        total: float, era_premium: bool, zona: str = None):
+        """Publica los eventos de una venta ya aplicada."""
+        instante = ahora()
+        tipo, titulo, sala = datos_servicio(servicio, zona)
+        self._bus.publicar(VentaRealizada(servicio.codigo, tipo, titulo, sala, cliente.cedula,
+                                          cantidad, total, instante))
+        if cliente.es_premium and not era_premium:
+            self._bus.publicar(AscensoPremium(cliente.cedula, cliente.total_compras(),
+                                              cliente.puntos_acumulados, instante))
+
+    def _al_cambiar_servicio(self, servicio: Servicio, atributo: str, anterior, nuevo):
+        """Publica los cambios de estado del servicio (incluidos agotado y disponible)."""
+        if atributo == "estado" and self._bus is not None:
+            self._bus.publicar(CambioEstado(servicio.codigo, anterior, nuevo, ahora()))
+
+    def suscribir_altas(self, funcion):
+        """
+        Registra una función que se llama al agregar un servicio o un cliente.
+
+        Args:
+            funcion: Función que recibe el servicio o cliente agregado
+        """
+        self._oyentes_altas.append(funcion)
+
+    def suscribir_bajas(self, funcion):
+        """
+        Registra una función que se llama al quitar servicios del gestor.
+
+        Args:
+            funcion: Función que recibe la lista de servicios quitados
+        """
+        self._oyentes_bajas.append(funcion)
+
+    def suscribir_confirmaciones(self, funcion):
+        """
+        Registra una función que se llama al terminar cada operación que
+        modifica el gestor (altas, bajas, ventas, cancelaciones y reservas), cuando todos
+        sus cambios ya están aplicados.
+
+        Args:
+            funcion: Función sin argumentos
+        """
+        self._oyentes_confirmacion.append(funcion)
+
+    def confirmar_operacion(self):
+        """
+        Avisa a los oyentes que terminó una operación. El gestor lo llama al
+        final de las suyas; los módulos que cambian servicios por su cuenta
+        (por ejemplo, las reservas) lo llaman al terminar sus cambios.
+        """
+        for funcion in self._oyentes_confirmacion:
+            funcion()
+
+    def suscribir_liberacion(self, funcion):
+        """
+        Registra una función que se llama cuando un servicio libera capacidad
+        (cancelaciones o reservas vencidas).
+
+        Args:
+            funcion: Función que recibe el servicio liberado
+        """
+        self._oyentes_liberacion.append(funcion)
+
+    def notificar_liberacion(self, servicio: Servicio):
+        """
+        Avisa a los oyentes que un servicio tiene capacidad liberada.
+
+        Args:
+            servicio: Servicio con entradas liberadas
+        """
+        for funcion in self._oyentes_liberacion:
+            funcion(servicio)
+
+    def obtener_compradores(self, codigo_servicio: str) -> List[Cliente]:
+        """
+        Obtiene los clientes con entradas vigentes de un servicio,
+        usando el índice inverso en lugar de recorrer los historiales.
+
+        Args:
+            codigo_servicio: Código del servicio
+
+        Returns:
+            Lista de clientes compradores
+        """
+        return [cliente for cliente, _ in self._indice_compradores.compradores(codigo_servicio)]
+
     def listar_servicios_disponibles(self) -> List[Servicio]:
         """
         Retorna una lista de servicios disponibles.
 
         Returns:
-            Lista de servicios con estado 'Disponible'
+            Lista de servicios con estado 'Disponible' que no están
+            completamente retenidos por reservas pendientes
         """
-        return [s for s in self._servicios if s.estado == "Disponible"]
+        return [s for s in self._servicios
+                if s.estado == "Disponible"
+                and (not hasattr(s, 'entradas_disponibles') or s.entradas_disponibles() > 0)]
 
     def obtener_estadisticas(self) -> str:
         """
@@ -248,14 +582,18 @@ class GestorServicios:
         Returns:
             String con las estadísticas
         """
+        clientes_premium = sum(1 for c in self._clientes if c.es_premium)
+        return self._formatear_estadisticas(len(self.listar_servicios_disponibles()),
+                                            clientes_premium)
+
+    def _formatear_estadisticas(self, servicios_disponibles: int, clientes_premium: int) -> str:
+        """Da formato a las estadísticas a partir de los contadores."""
         stats = f"\n{'=' * 60}\n"
         stats += f"ESTADÍSTICAS - {self._nombre_empresa}\n"
         stats += f"{'=' * 60}\n"
         stats += f"Total de servicios: {len(self._servicios)}\n"
-        stats += f"Servicios disponibles: {len(self.listar_servicios_disponibles())}\n"
+        stats += f"Servicios disponibles: {servicios_disponibles}\n"
         stats += f"Total de clientes: {len(self._clientes)}\n"
-
-        clientes_premium = sum(1 for c in self._clientes if c.es_premium)
         stats += f"Clientes premium: {clientes_premium}\n"
         stats += f"Ventas totales: ${self._ventas_totales:.2f}\n"
 
@@ -338,3 +676,16 @@ if __name__ == "__main__":
     servicio_encontrado = gestor.buscar_servicio("C001")
     if servicio_encontrado:
         print(f"   Servicio encontrado: {servicio_encontrado}")
+
+    # Cancelaciones y reembolsos
+    print("\n9. Compradores de C001:")
+    for comprador in gestor.obtener_compradores("C001"):
+        print(f"   {comprador}")
+
+    print("\n10. Cancelando 1 entrada de C001...")
+    gestor.cancelar_venta("C001", "0912345678", 1)
+
+    print("\n11. Cancelando el evento E001 completo...")
+    gestor.cancelar_servicio("E001")
+    print(f"   Estado de E001: {evento1.estado}")
+    print(f"   Ventas totales: ${gestor.ventas_totales:.2f}")
@@ -0,0 +1,227 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el índice inverso de compradores por servicio.
+Permite saber quién compró entradas de un servicio sin recorrer el
+historial de todos los clientes.
+"""
+
+from typing import Callable, List, Tuple
+from cliente import Cliente
+
+
+class IndiceCompradores:
+    """
+    Índice inverso codigo de servicio -> compradores y cantidades.
+    Cada cliente se identifica con un ID entero compacto, de modo que el
+    índice solo guarda enteros pequeños en lugar de referencias o cédulas.
+    """
+
+    def __init__(self):
+        """Constructor del IndiceCompradores."""
+        self._clientes = []  # ID -> Cliente
+        self._ids = {}  # id(Cliente) -> ID
+        # cedula -> IDs: la cédula se puede cambiar a una ya usada por otro cliente
+        self._por_cedula = {}
+        self._por_servicio = {}  # codigo -> {ID: cantidad}
+
+    # Property para total_clientes
+    @property
+    def total_clientes(self) -> int:
+        """Obtiene la cantidad de clientes con ID asignado."""
+        return len(self._clientes)
+
+    def registrar_cliente(self, cliente: Cliente) -> int:
+        """
+        Asigna un ID compacto a un cliente (idempotente).
+
+        Args:
+            cliente: Cliente a registrar
+
+        Returns:
+            ID entero del cliente
+        """
+        clave = id(cliente)
+        id_cliente = self._ids.get(clave)
+        if id_cliente is None:
+            id_cliente = len(self._clientes)
+            self._clientes.append(cliente)
+            self._ids[clave] = id_cliente
+            self._por_cedula.setdefault(cliente.cedula, []).append(id_cliente)
+            # La cédula puede cambiar con su setter
+            cliente.suscribir_cambios(self._al_cambiar_cliente)
+        return id_cliente
+
+    def obtener_cliente(self, id_cliente: int) -> Cliente:
+        """
+        Obtiene el cliente asociado a un ID compacto.
+
+        Args:
+            id_cliente: ID entero del cliente
+
+        Returns:
+            Cliente correspondiente
+        """
+        return self._clientes[id_cliente]
+
+    def registrar_compra(self, codigo_servicio: str, cliente: Cliente, cantidad: int):
+        """
+        Suma entradas compradas por un cliente para un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cliente: Cliente comprador
+            cantidad: Número de entradas compradas
+        """
+        id_cliente = self.registrar_cliente(cliente)
+        compradores = self._por_servicio.setdefault(codigo_servicio, {})
+        compradores[id_cliente] = compradores.get(id_cliente, 0) + cantidad
+
+    def registrar_devolucion(self, codigo_servicio: str, cliente: Cliente, cantidad: int):
+        """
+        Resta entradas devueltas por un cliente para un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cliente: Cliente que devuelve
+            cantidad: Número de entradas devueltas
+        """
+        id_cliente = self._ids[id(cliente)]
+        compradores = self._por_servicio[codigo_servicio]
+        restantes = compradores[id_cliente] - cantidad
+        if restantes < 0:
+            raise ValueError("No se pueden devolver más entradas de las compradas")
+        if restantes == 0:
+            del compradores[id_cliente]
+            if not compradores:
+                del self._por_servicio[codigo_servicio]
+        else:
+            compradores[id_cliente] = restantes
+
+    def cantidad(self, codigo_servicio: str, cliente: Cliente) -> int:
+        """
+        Obtiene las entradas vigentes de un cliente para un servicio en O(1).
+
+        Args:
+            codigo_servicio: Código del servicio
+            cliente: Cliente a consultar
+
+        Returns:
+            Número de entradas compradas
+        """
+        id_cliente = self._ids.get(id(cliente))
+        if id_cliente is None:
+            return 0
+        return self._por_servicio.get(codigo_servicio, {}).get(id_cliente, 0)
+
+    def cantidad_cedula(self, codigo_servicio: str, cedula: str) -> int:
+        """
+        Obtiene las entradas vigentes de un cliente, dado por su cédula, en O(1).
+        Si varios clientes comparten la cédula se suman las de todos.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula: Cédula del cliente
+
+        Returns:
+            Número de entradas compradas (0 si el cliente nunca compró)
+        """
+        compradores = self._por_servicio.get(codigo_servicio)
+        if not compradores:
+            return 0
+        return sum(compradores.get(id_cliente, 0) for id_cliente in self._por_cedula.get(cedula, ()))
+
+    def compradores(self, codigo_servicio: str) -> List[Tuple[Cliente, int]]:
+        """
+        Lista los compradores de un servicio con sus cantidades.
+
+        Args:
+            codigo_servicio: Código del servicio
+
+        Returns:
+            Lista de tuplas (cliente, cantidad)
+        """
+        return [(self._clientes[id_cliente], cantidad)
+                for id_cliente, cantidad in self._por_servicio.get(codigo_servicio, {}).items()]
+
+    def total_compradores(self, codigo_servicio: str) -> int:
+        """Cantidad de clientes distintos con entradas del servicio."""
+        return len(self._por_servicio.get(codigo_servicio, ()))
+
+    def total_entradas(self, codigo_servicio: str) -> int:
+        """Cantidad de entradas vendidas a clientes registrados del servicio."""
+        return sum(self._por_servicio.get(codigo_servicio, {}).values())
+
+    def notificar(self, codigo_servicio: str, funcion: Callable[[Cliente, int], None]) -> int:
+        """
+        Envía una notificación a cada comprador de un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+            funcion: Función que recibe (cliente, cantidad)
+
+        Returns:
+            Número de clientes notificados
+        """
+        compradores = self.compradores(codigo_servicio)
+        for cliente, cantidad in compradores:
+            funcion(cliente, cantidad)
+        return len(compradores)
+
+    def _al_cambiar_cliente(self, cliente: Cliente, atributo: str, anterior, nuevo):
+        """Mantiene el acceso por cédula cuando un cliente la cambia."""
+        if atributo == "cedula":
+            id_cliente = self._ids[id(cliente)]
+            ids = self._por_cedula[anterior]
+            ids.remove(id_cliente)
+            if not ids:
+                del self._por_cedula[anterior]
+            self._por_cedula.setdefault(nuevo, []).append(id_cliente)
+
+    def __str__(self) -> str:
+        """Representación en string del índice."""
+        return (f"IndiceCompradores: {len(self._clientes)} clientes | "
+                f"{len(self._por_servicio)} servicios con ventas")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import time
+
+    print("PRUEBA DEL ÍNDICE DE COMPRADORES")
+
+    indice = IndiceCompradores()
+    juan = Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321")
+    maria = Cliente("0923456789", "María", "González", "maria@email.com", "0976543210")
+
+    print("\n1. Registrando compras...")
+    indice.registrar_compra("C001", juan, 2)
+    indice.registrar_compra("C001", maria, 3)
+    indice.registrar_compra("C001", juan, 1)
+    print(f"   {indice}")
+
+    print("\n2. ¿Quién compró entradas de C001?")
+    for cliente, cantidad in indice.compradores("C001"):
+        print(f"   {cliente.nombre_completo()}: {cantidad} entrada(s)")
+
+    print("\n3. Notificando a los asistentes de C001...")
+    indice.notificar("C001", lambda c, n: print(f"   Aviso enviado a {c.email}"))
+
+    print("\n4. Devolviendo las 3 entradas de María...")
+    indice.registrar_devolucion("C001", maria, 3)
+    print(f"   Compradores de C001: {indice.total_compradores('C001')}")
+
+    print("\n5. Probando 1,000,000 de compras sobre 100,000 clientes...")
+    clientes = [Cliente(f"{i:010d}", "N", "A", "a@b.com", "0999999999") for i in range(100_000)]
+    inicio = time.perf_counter()
+    for i in range(1_000_000):
+        indice.registrar_compra(f"S{i % 1000:04d}", clientes[(i * 7) % len(clientes)], 1)
+    print(f"   Tiempo de carga: {time.perf_counter() - inicio:.2f} s")
+    inicio = time.perf_counter()
+    asistentes = indice.compradores("S0500")
+    print(f"   {len(asistentes)} asistentes de S0500 en "
+          f"{(time.perf_counter() - inicio) * 1000:.3f} ms")
@@ -0,0 +1,439 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el GestorVersiones: instantáneas inmutables del estado del
+GestorServicios para reportes, estadísticas y exportaciones.
+Cada vez que un servicio o cliente notifica un cambio se guarda una copia
+congelada del objeto (una nueva versión del registro), y al terminar la
+operación del gestor las versiones pendientes se publican juntas. Una
+instantánea solo ve operaciones completas: nunca una venta a medias.
+Los registros se guardan en bloques que se copian al escribir, así que tomar
+una instantánea cuesta un bloque por cada 64 objetos, y las instantáneas
+comparten los bloques que no cambiaron.
+"""
+
+import copy
+import threading
+from datetime import datetime
+from typing import List
+from gestor_servicios import GestorServicios
+
+TAM_BLOQUE = 64
+
+
+def _congelar(objeto):
+    """Copia un servicio o cliente sin suscriptores ni estructuras compartidas."""
+    copia = copy.copy(objeto)
+    estado = copia.__dict__
+    estado.pop("_observadores", None)
+    if "_historial_compras" in estado:
+        # Los registros del historial se reemplazan, nunca se modifican: basta copiar la lista
+        copia._historial_compras = list(objeto._historial_compras)
+    if estado.get("_zonas"):
+        copia._zonas = {zona: list(inventario) for zona, inventario in objeto._zonas.items()}
+    return copia
+
+
+class _VectorBloques:
+    """Lista por bloques con copia al escribir: congelar no copia los registros."""
+
+    def __init__(self):
+        self._bloques = []
+        self._compartidos = set()
+        self._largo = 0
+
+    def __len__(self) -> int:
+        return self._largo
+
+    def agregar(self, registro):
+        """Agrega un registro al final."""
+        if self._largo % TAM_BLOQUE == 0:
+            self._bloques.append([])
+        else:
+            self._propio(len(self._bloques) - 1)
+        self._bloques[-1].append(registro)
+        self._largo += 1
+
+    def asignar(self, posicion: int, registro):
+        """Reemplaza un registro, copiando antes su bloque si está compartido."""
+        bloque = self._propio(posicion // TAM_BLOQUE)
+        bloque[posicion % TAM_BLOQUE] = registro
+
+    def congelar(self) -> tuple:
+        """Entrega los bloques actuales; desde ahora quedan compartidos."""
+        self._compartidos = set(range(len(self._bloques)))
+        return tuple(self._bloques)
+
+    def reemplazar(self, registros: list):
+        """Vuelve a armar el vector completo (tras quitar registros)."""
+        self._bloques = [registros[i:i + TAM_BLOQUE] for i in range(0, len(registros), TAM_BLOQUE)]
+        self._compartidos = set()
+        self._largo = len(registros)
+
+    def registros(self) -> list:
+        """Todos los registros en orden."""
+        return [registro for bloque in self._bloques for registro in bloque]
+
+    def _propio(self, numero: int) -> list:
+        """Obtiene un bloque que se puede modificar."""
+        if numero in self._compartidos:
+            self._bloques[numero] = list(self._bloques[numero])
+            self._compartidos.discard(numero)
+        return self._bloques[numero]
+
+
+class _GestorConsulta(GestorServicios):
+    """GestorServicios de una instantánea: rechaza las operaciones que modifican el estado."""
+
+    def _rechazar(self, *args, **kwargs):
+        raise ValueError("La instantánea es de solo consulta")
+
+    agregar_servicio = agregar_cliente = retirar_servicios = _rechazar
+    realizar_venta = _vender = cancelar_venta = cancelar_servicio = _rechazar
+
+    # Property para nombre_empresa (solo lectura)
+    @property
+    def nombre_empresa(self) -> str:
+        """Obtiene el nombre de la empresa."""
+        return self._nombre_empresa
+
+
+class Instantanea:
+    """
+    Clase que representa una vista inmutable del gestor en una versión dada.
+    Los servicios y clientes son copias congeladas: se pueden consultar con los
+    mismos métodos que los originales, pero no están conectados al gestor.
+    Las copias se comparten con las demás instantáneas que no las vieron
+    cambiar, por lo que sus setters y métodos de venta no deben usarse.
+    """
+
+    def __init__(self, version: int, nombre_empresa: str, ventas_totales: float,
+                 bloques_servicios: tuple, bloques_clientes: tuple):
+        """
+        Constructor de la Instantanea.
+
+        Args:
+            version: Número de versión publicada
+            nombre_empresa: Nombre de la empresa en esa versión
+            ventas_totales: Ventas totales en esa versión
+            bloques_servicios: Bloques de servicios congelados
+            bloques_clientes: Bloques de clientes congelados
+        """
+        self._version = version
+        self._instante = datetime.now()
+        self._nombre_empresa = nombre_empresa
+        self._ventas_totales = ventas_totales
+        self._bloques_servicios = bloques_servicios
+        self._bloques_clientes = bloques_clientes
+        self._gestor = None
+
+    # Property para version
+    @property
+    def version(self) -> int:
+        """Obtiene el número de versión de la instantánea."""
+        return self._version
+
+    # Property para instante
+    @property
+    def instante(self) -> datetime:
+        """Obtiene el momento en que se tomó la instantánea."""
+        return self._instante
+
+    # Property para ventas_totales
+    @property
+    def ventas_totales(self) -> float:
+        """Obtiene las ventas totales en esta versión."""
+        return self._ventas_totales
+
+    # Property para servicios
+    @property
+    def servicios(self) -> list:
+        """Obtiene los servicios congelados."""
+        return self.gestor()._servicios
+
+    # Property para clientes
+    @property
+    def clientes(self) -> list:
+        """Obtiene los clientes congelados."""
+        return self.gestor()._clientes
+
+    def gestor(self) -> GestorServicios:
+        """
+        Obtiene un GestorServicios de solo consulta armado con la instantánea.
+        Se crea al primer uso y sirve para reportes, estadísticas y búsquedas;
+        sus operaciones de alta, baja, venta y cancelación lanzan ValueError.
+
+        Returns:
+            Gestor desconectado del original
+        """
+        if self._gestor is None:
+            gestor = _GestorConsulta(self._nombre_empresa)
+            gestor._servicios = [s for bloque in self._bloques_servicios for s in bloque]
+            gestor._clientes = [c for bloque in self._bloques_clientes for c in bloque]
+            gestor._ventas_totales = self._ventas_totales
+            self._gestor = gestor
+        return self._gestor
+
+    def generar_reporte_servicios(self) -> str:
+        """Reporte de servicios de la versión (mismo formato que el gestor)."""
+        return self.gestor().generar_reporte_servicios(self.servicios)
+
+    def calcular_ingresos_totales(self) -> float:
+        """Ingresos de todos los servicios de la versión."""
+        return self.gestor().calcular_ingresos_totales(self.servicios)
+
+    def obtener_estadisticas(self) -> str:
+        """Estadísticas del gestor en la versión."""
+        return self.gestor().obtener_estadisticas()
+
+    def listar_servicios_disponibles(self) -> List:
+        """Servicios disponibles en la versión."""
+        return self.gestor().listar_servicios_disponibles()
+
+    def __str__(self) -> str:
+        """Representación en string de la instantánea."""
+        servicios = sum(len(b) for b in self._bloques_servicios)
+        clientes = sum(len(b) for b in self._bloques_clientes)
+        return (f"Instantanea v{self._version}: {servicios} servicios | {clientes} clientes | "
+                f"ventas ${self._ventas_totales:,.2f}")
+
+
+class GestorVersiones:
+    """
+    Clase que mantiene las versiones publicadas del estado de un GestorServicios.
+    Las ventas no esperan a los lectores: publicar una versión y tomar una
+    instantánea solo comparten un cerrojo durante el intercambio de bloques.
+    """
+
+    def __init__(self, gestor: GestorServicios):
+        """
+        Constructor del GestorVersiones.
+
+        Args:
+            gestor: Gestor cuyos cambios se versionan
+        """
+        self._gestor = gestor
+        self._cerrojo = threading.Lock()
+        self._servicios = _VectorBloques()
+        self._clientes = _VectorBloques()
+        self._vivos_servicios = []
+        self._posicion_servicio = {}
+        self._posicion_cliente = {}
+        # Cambios de la operación en curso: altas y objetos modificados (id -> objeto)
+        self._altas = []
+        self._pendientes = {}
+        self._version = 0
+        self._ventas_totales = gestor.ventas_totales
+        self._nombre_empresa = gestor.nombre_empresa
+        self._ultima = None
+
+        for objeto in gestor._servicios + gestor._clientes:
+            self._agregar(objeto, _congelar(objeto))
+        gestor.suscribir_altas(self._al_agregar)
+        gestor.suscribir_bajas(self._al_retirar)
+        gestor.suscribir_confirmaciones(self.confirmar)
+
+    # Property para version
+    @property
+    def version(self) -> int:
+        """Obtiene el número de la última versión publicada."""
+        return self._version
+
+    # Property para pendientes
+    @property
+    def pendientes(self) -> int:
+        """Obtiene la cantidad de objetos con cambios sin publicar."""
+        return len(self._pendientes) + len(self._altas)
+
+    def instantanea(self) -> Instantanea:
+        """
+        Obtiene una vista inmutable de la última versión publicada.
+        Si no hubo cambios desde la anterior, devuelve la misma instantánea.
+
+        Returns:
+            Instantanea de la versión actual
+        """
+        with self._cerrojo:
+            if self._ultima is None or self._ultima.version != self._version:
+                self._ultima = Instantanea(self._version, self._nombre_empresa, self._ventas_totales,
+                                           self._servicios.congelar(), self._clientes.congelar())
+            return self._ultima
+
+    def confirmar(self):
+        """
+        Publica los cambios pendientes como una nueva versión.
+        El gestor lo llama al terminar cada operación; los cambios hechos
+        directamente con los setters se publican en la siguiente operación o
+        llamando a este método.
+        """
+        if not self._pendientes and not self._altas and self._ventas_totales == self._gestor.ventas_totales \
+                and self._nombre_empresa == self._gestor.nombre_empresa:
+            return
+        # Las copias se hacen fuera del cerrojo para no demorar a los lectores
+        altas = [(objeto, _congelar(objeto)) for objeto in self._altas]
+        copias = [(objeto, _congelar(objeto)) for objeto in self._pendientes.values()]
+        self._altas.clear()
+        self._pendientes.clear()
+        with self._cerrojo:
+            for objeto, copia in altas:
+                self._agregar(objeto, copia)
+            for objeto, copia in copias:
+                posicion = self._posicion_servicio.get(id(objeto))
+                if posicion is not None:
+                    self._servicios.asignar(posicion, copia)
+                else:
+                    posicion = self._posicion_cliente.get(id(objeto))
+                    if posicion is not None:
+                        self._clientes.asignar(posicion, copia)
+            self._ventas_totales = self._gestor.ventas_totales
+            self._nombre_empresa = self._gestor.nombre_empresa
+            self._version += 1
+
+    def _agregar(self, objeto, copia):
+        """Agrega la primera versión de un objeto y empieza a observarlo."""
+        if hasattr(objeto, 'calcular_precio_total'):
+            self._posicion_servicio[id(objeto)] = len(self._servicios)
+            self._vivos_servicios.append(objeto)
+            self._servicios.agregar(copia)
+        else:
+            self._posicion_cliente[id(objeto)] = len(self._clientes)
+            self._clientes.agregar(copia)
+        objeto.suscribir_cambios(self._al_cambiar)
+
+    def _al_cambiar(self, objeto, atributo: str, anterior, nuevo):
+        """Marca el objeto para copiarlo al confirmar la operación."""
+        self._pendientes[id(objeto)] = objeto
+
+    def _al_agregar(self, objeto):
+        """Deja el servicio o cliente agregado para la próxima versión."""
+        self._altas.append(objeto)
+
+    def _al_retirar(self, servicios: list):
+        """Quita los servicios retirados de las próximas versiones."""
+        for servicio in servicios:
+            servicio.cancelar_suscripcion(self._al_cambiar)
+            self._pendientes.pop(id(servicio), None)
+        quitar = {self._posicion_servicio.pop(id(s)) for s in servicios if id(s) in self._posicion_servicio}
+        quedan = [p for p in range(len(self._vivos_servicios)) if p not in quitar]
+        with self._cerrojo:
+            registros = self._servicios.registros()
+            self._servicios.reemplazar([registros[p] for p in quedan])
+        self._vivos_servicios = [self._vivos_servicios[p] for p in quedan]
+        self._posicion_servicio = {id(s): p for p, s in enumerate(self._vivos_servicios)}
+
+    def __str__(self) -> str:
+        """Representación en string del gestor de versiones."""
+        return (f"GestorVersiones: v{self._version} | {len(self._servicios)} servicios | "
+                f"{len(self._clientes)} clientes | {self.pendientes} pendientes")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import random
+    import time
+    from contextlib import redirect_stdout
+    from datetime import timedelta
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+    from cliente import Cliente
+
+    print("PRUEBA DE LAS INSTANTÁNEAS VERSIONADAS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    inicio_fechas = datetime(2025, 6, 1, 10, 0)
+    with redirect_stdout(io.StringIO()):
+        for i in range(400):
+            fecha = inicio_fechas + timedelta(hours=i)
+            if i % 2:
+                gestor.agregar_servicio(ServicioEvento(f"E{i:04d}", f"Evento {i}", fecha, 45.0,
+                                                       f"Artista {i}", "Concierto", 2.5, "VIP"))
+            else:
+                gestor.agregar_servicio(ServicioCine(f"C{i:04d}", f"Función {i}", fecha, 8.5,
+                                                     f"Película {i}", i % 10 + 1))
+        for i in range(300):
+            gestor.agregar_cliente(Cliente(f"09{i:08d}", "Cliente", f"N{i}",
+                                           f"c{i}@email.com", "0987654321"))
+
+    versiones = GestorVersiones(gestor)
+    print(f"\n1. {versiones}")
+    primera = versiones.instantanea()
+    print(f"   {primera}")
+
+    print("\n2. Ventas en un hilo mientras otro toma instantáneas:")
+
+    def vender():
+        aleatorio = random.Random(3)
+        with redirect_stdout(io.StringIO()):
+            for _ in range(3000):
+                servicio = gestor._servicios[aleatorio.randrange(400)]
+                gestor.realizar_venta(servicio.codigo, f"09{aleatorio.randrange(300):08d}",
+                                      aleatorio.randint(1, 3))
+
+    def consistente(foto: Instantanea) -> bool:
+        vendidas = sum(s.entradas_vendidas if hasattr(s, 'entradas_vendidas') else s.asientos_vendidos
+                       for s in foto.servicios)
+        compradas = sum(compra["cantidad"] for c in foto.clientes for compra in c._historial_compras)
+        gastado = sum(compra["total"] for c in foto.clientes for compra in c._historial_compras)
+        return vendidas == compradas and abs(gastado - foto.ventas_totales) < 1e-6
+
+    hilo = threading.Thread(target=vender)
+    hilo.start()
+    tomadas = inconsistentes = 0
+    while hilo.is_alive():
+        foto = versiones.instantanea()
+        tomadas += 1
+        inconsistentes += not consistente(foto)
+    hilo.join()
+    print(f"   Instantáneas revisadas: {tomadas} | inconsistentes: {inconsistentes}")
+    print(f"   {versiones}")
+
+    print("\n3. Una instantánea no cambia con las ventas posteriores:")
+    ultima = versiones.instantanea()
+    antes = ultima.generar_reporte_servicios()
+    with redirect_stdout(io.StringIO()):
+        for i in range(0, 40, 2):
+            gestor.realizar_venta(f"C{i:04d}", "0900000000", 1)
+    print(f"   Reporte igual al anterior: {ultima.generar_reporte_servicios() == antes}")
+    nueva = versiones.instantanea()
+    print(f"   {ultima}")
+    print(f"   {nueva}")
+    print(f"   Primera versión sin ventas: {primera.ventas_totales == 0 and consistente(primera)}")
+    print(f"   Reporte de la nueva igual al del gestor: "
+          f"{nueva.generar_reporte_servicios() == gestor.generar_reporte_servicios(gestor._servicios)}")
+
+    print("\n4. Bajas y altas:")
+    with redirect_stdout(io.StringIO()):
+        retirados = gestor.retirar_servicios(gestor._servicios[:50])
+        gestor.agregar_servicio(ServicioCine("C9999", "Función extra", inicio_fechas, 8.5, "Extra", 1))
+    foto = versiones.instantanea()
+    print(f"   Retirados: {retirados} | {foto}")
+    print(f"   Mismos códigos que el gestor: "
+          f"{[s.codigo for s in foto.servicios] == [s.codigo for s in gestor._servicios]}")
+    print(f"   La instantánea anterior conserva {len(ultima.servicios)} servicios")
+
+    print("\n5. Costo de tomar una instantánea tras una venta:")
+    for n in (1_000, 10_000, 50_000):
+        grande = GestorServicios("CineMax Entertainment")
+        with redirect_stdout(io.StringIO()):
+            for i in range(n):
+                grande._servicios.append(ServicioCine(f"C{i:05d}", f"Función {i}", inicio_fechas,
+                                                      8.5, f"Película {i}", i % 10 + 1))
+            grande.agregar_cliente(Cliente("0900000000", "Ana", "Pérez", "ana@email.com", "0987654321"))
+        versiones_grande = GestorVersiones(grande)
+        repeticiones = 200
+        inicio = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            for r in range(repeticiones):
+                grande.realizar_venta(f"C{r:05d}", "0900000000", 1)
+                versiones_grande.instantanea()
+        por_ciclo = (time.perf_counter() - inicio) / repeticiones
+        inicio = time.perf_counter()
+        [_congelar(s) for s in grande._servicios]
+        copia_total = time.perf_counter() - inicio
+        print(f"   {n:>6} servicios: venta + instantánea {por_ciclo * 1e6:.0f} µs | "
+              f"copia completa {copia_total * 1e6:.0f} µs")
@@ -0,0 +1,367 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el LimitadorVentas, que se ubica delante de
+GestorServicios.realizar_venta para frenar bots y compras abusivas.
+Cada venta debe pasar cuatro controles:
+- una cubeta de tokens por cliente
+- una cubeta por servicio
+- una cubeta global
+- el tope de entradas por cliente y servicio
+
+Las cubetas por cliente y por servicio comparten una tabla fija de celdas,
+como un count-min sketch. Cada clave usa una celda por fila y puede consumir
+solo si todas sus celdas tienen tokens. Una colisión solo vuelve el límite
+más estricto, nunca más permisivo, y la memoria no crece con la cantidad de
+clientes o servicios.
+"""
+
+import time
+from array import array
+from gestor_servicios import GestorServicios
+
+
+class CubetaTokens:
+    """
+    Clase que representa una cubeta de tokens: permite ráfagas de hasta
+    `capacidad` operaciones y un ritmo sostenido de `tasa` por segundo.
+    """
+
+    def __init__(self, capacidad: float, tasa: float, reloj=time.monotonic):
+        """
+        Constructor de la CubetaTokens.
+
+        Args:
+            capacidad: Máximo de tokens acumulables (ráfaga)
+            tasa: Tokens repuestos por segundo
+            reloj: Función que retorna el instante actual en segundos
+        """
+        if capacidad <= 0 or tasa <= 0:
+            raise ValueError("La capacidad y la tasa deben ser positivas")
+        self._capacidad = capacidad
+        self._tasa = tasa
+        self._reloj = reloj
+        self._tokens = capacidad
+        self._ultimo = reloj()
+
+    # Property para tokens
+    @property
+    def tokens(self) -> float:
+        """Obtiene los tokens disponibles en este instante."""
+        self._reponer(self._reloj())
+        return self._tokens
+
+    def disponible(self, cantidad: float = 1, ahora: float = None) -> bool:
+        """Indica si hay tokens suficientes sin consumirlos."""
+        self._reponer(self._reloj() if ahora is None else ahora)
+        return self._tokens >= cantidad
+
+    def consumir(self, cantidad: float = 1, ahora: float = None) -> bool:
+        """
+        Consume tokens si hay suficientes.
+
+        Args:
+            cantidad: Tokens a consumir
+            ahora: Instante actual (None lo toma del reloj)
+
+        Returns:
+            True si se consumieron, False si no alcanzaban
+        """
+        if not self.disponible(cantidad, ahora):
+            return False
+        self._tokens -= cantidad
+        return True
+
+    def _reponer(self, ahora: float):
+        """Suma los tokens generados desde la última consulta."""
+        if ahora > self._ultimo:
+            self._tokens = min(self._capacidad, self._tokens + (ahora - self._ultimo) * self._tasa)
+            self._ultimo = ahora
+
+
+class CubetasAproximadas:
+    """
+    Clase que mantiene una cubeta de tokens por clave en memoria fija.
+    Las celdas se organizan como un count-min sketch de `profundidad` filas por
+    `ancho` columnas; los tokens de una clave son el mínimo de sus celdas.
+    """
+
+    def __init__(self, capacidad: float, tasa: float, ancho: int = 2048,
+                 profundidad: int = 4, reloj=time.monotonic):
+        """
+        Constructor de CubetasAproximadas.
+
+        Args:
+            capacidad: Máximo de tokens por clave (ráfaga)
+            tasa: Tokens repuestos por segundo a cada clave
+            ancho: Celdas por fila (a más ancho, menos colisiones)
+            profundidad: Cantidad de filas
+            reloj: Función que retorna el instante actual en segundos
+        """
+        if capacidad <= 0 or tasa <= 0:
+            raise ValueError("La capacidad y la tasa deben ser positivas")
+        if ancho < 1 or profundidad < 1:
+            raise ValueError("El ancho y la profundidad deben ser positivos")
+        self._capacidad = capacidad
+        self._tasa = tasa
+        self._ancho = ancho
+        self._profundidad = profundidad
+        self._reloj = reloj
+        celdas = ancho * profundidad
+        self._tokens = array("d", [capacidad]) * celdas
+        self._ultimo = array("d", [reloj()]) * celdas
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene los bytes ocupados por las celdas."""
+        return (self._tokens.itemsize + self._ultimo.itemsize) * len(self._tokens)
+
+    def disponibles(self, clave, ahora: float = None) -> float:
+        """
+        Estima los tokens disponibles de una clave (nunca por encima del real).
+
+        Args:
+            clave: Cédula, código de servicio u otra clave hashable
+            ahora: Instante actual (None lo toma del reloj)
+
+        Returns:
+            Tokens disponibles
+        """
+        return self._refrescar(self._celdas(clave), self._reloj() if ahora is None else ahora)
+
+    def consumir(self, clave, cantidad: float = 1, ahora: float = None) -> bool:
+        """
+        Consume tokens de una clave si todas sus celdas tienen suficientes.
+
+        Args:
+            clave: Cédula, código de servicio u otra clave hashable
+            cantidad: Tokens a consumir
+            ahora: Instante actual (None lo toma del reloj)
+
+        Returns:
+            True si se consumieron, False si no alcanzaban
+        """
+        celdas = self._celdas(clave)
+        if self._refrescar(celdas, self._reloj() if ahora is None else ahora) < cantidad:
+            return False
+        tokens = self._tokens
+        for celda in celdas:
+            tokens[celda] -= cantidad
+        return True
+
+    def _celdas(self, clave) -> list:
+        """Posición de la celda de la clave en cada fila (doble hash)."""
+        h = hash(clave)
+        paso = (h >> 17) | 1
+        ancho = self._ancho
+        return [fila * ancho + (h + fila * paso) % ancho for fila in range(self._profundidad)]
+
+    def _refrescar(self, celdas: list, ahora: float) -> float:
+        """Repone los tokens de las celdas y retorna el mínimo."""
+        tokens, ultimo = self._tokens, self._ultimo
+        capacidad, tasa = self._capacidad, self._tasa
+        minimo = capacidad
+        for celda in celdas:
+            transcurrido = ahora - ultimo[celda]
+            if transcurrido > 0:
+                tokens[celda] = min(capacidad, tokens[celda] + transcurrido * tasa)
+                ultimo[celda] = ahora
+            if tokens[celda] < minimo:
+                minimo = tokens[celda]
+        return minimo
+
+
+class LimitadorVentas:
+    """
+    Clase que controla el ritmo y el volumen de compras antes de delegar
+    la venta en un GestorServicios.
+    """
+
+    MOTIVOS = ("cliente", "servicio", "global", "tope")
+
+    def __init__(self, gestor: GestorServicios, rafaga_cliente: float = 5, tasa_cliente: float = 0.2,
+                 rafaga_servicio: float = 100, tasa_servicio: float = 20.0,
+                 rafaga_global: float = 1000, tasa_global: float = 200.0,
+                 max_entradas_cliente: int = 10, ancho: int = 2048, reloj=time.monotonic):
+        """
+        Constructor del LimitadorVentas.
+
+        Args:
+            gestor: Gestor que realiza las ventas permitidas
+            rafaga_cliente: Intentos seguidos permitidos a un cliente
+            tasa_cliente: Intentos por segundo sostenidos por cliente
+            rafaga_servicio: Intentos seguidos permitidos sobre un servicio
+            tasa_servicio: Intentos por segundo sostenidos por servicio
+            rafaga_global: Intentos seguidos permitidos en total
+            tasa_global: Intentos por segundo sostenidos en total
+            max_entradas_cliente: Tope de entradas de un cliente para un mismo servicio
+            ancho: Celdas por fila de las cubetas aproximadas
+            reloj: Función que retorna el instante actual en segundos
+        """
+        if max_entradas_cliente < 1:
+            raise ValueError("El tope de entradas debe ser positivo")
+        self._gestor = gestor
+        self._reloj = reloj
+        self._clientes = CubetasAproximadas(rafaga_cliente, tasa_cliente, ancho, reloj=reloj)
+        self._servicios = CubetasAproximadas(rafaga_servicio, tasa_servicio, ancho, reloj=reloj)
+        self._global = CubetaTokens(rafaga_global, tasa_global, reloj)
+        self._max_entradas_cliente = max_entradas_cliente
+        self._rechazos = dict.fromkeys(self.MOTIVOS, 0)
+
+    # Property para max_entradas_cliente
+    @property
+    def max_entradas_cliente(self) -> int:
+        """Obtiene el tope de entradas por cliente y servicio."""
+        return self._max_entradas_cliente
+
+    @max_entradas_cliente.setter
+    def max_entradas_cliente(self, valor: int):
+        """Establece el tope de entradas con validación."""
+        if valor < 1:
+            raise ValueError("El tope de entradas debe ser positivo")
+        self._max_entradas_cliente = valor
+
+    # Property para rechazos
+    @property
+    def rechazos(self) -> dict:
+        """Obtiene la cantidad de intentos rechazados por motivo."""
+        return dict(self._rechazos)
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene los bytes ocupados por las cubetas aproximadas."""
+        return self._clientes.memoria + self._servicios.memoria
+
+    def permitir(self, codigo_servicio: str, cedula_cliente: str, cantidad: int):
+        """
+        Aplica los controles y, si pasan todos, consume los tokens del intento.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas pedidas
+
+        Returns:
+            None si el intento está permitido, o el motivo del rechazo
+        """
+        ahora = self._reloj()
+        motivo = None
+        if self._clientes.disponibles(cedula_cliente, ahora) < 1:
+            motivo = "cliente"
+        elif self._servicios.disponibles(codigo_servicio, ahora) < 1:
+            motivo = "servicio"
+        elif not self._global.disponible(1, ahora):
+            motivo = "global"
+        elif self.excede_tope(codigo_servicio, cedula_cliente, cantidad):
+            motivo = "tope"
+        if motivo is not None:
+            self._rechazos[motivo] += 1
+            return motivo
+        self._clientes.consumir(cedula_cliente, 1, ahora)
+        self._servicios.consumir(codigo_servicio, 1, ahora)
+        self._global.consumir(1, ahora)
+        return None
+
+    def excede_tope(self, codigo_servicio: str, cedula_cliente: str, cantidad: int) -> bool:
+        """
+        Indica si el cliente superaría el tope de entradas del servicio (sin consumir tokens).
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas pedidas
+
+        Returns:
+            True si la compra supera el tope
+        """
+        compradas = self._gestor.indice_compradores.cantidad_cedula(codigo_servicio, cedula_cliente)
+        return compradas + cantidad > self._max_entradas_cliente
+
+    def realizar_venta(self, codigo_servicio: str, cedula_cliente: str, cantidad: int,
+                       zona: str = None) -> bool:
+        """
+        Realiza la venta en el gestor si el intento pasa los controles.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas a vender
+            zona: Zona pedida en un evento con zonas
+
+        Returns:
+            True si la venta fue exitosa, False en caso contrario
+        """
+        motivo = self.permitir(codigo_servicio, cedula_cliente, cantidad)
+        if motivo == "tope":
+            print(f"   El cliente superaría el tope de {self._max_entradas_cliente} "
+                  f"entradas para este servicio")
+            return False
+        if motivo is not None:
+            print(f"   Demasiados intentos de compra ({motivo}); intente más tarde")
+            return False
+        return self._gestor.realizar_venta(codigo_servicio, cedula_cliente, cantidad, zona)
+
+    def __str__(self) -> str:
+        """Representación en string del limitador."""
+        rechazos = ", ".join(f"{motivo}: {n}" for motivo, n in self._rechazos.items())
+        return f"LimitadorVentas: {self.memoria / 1024:.0f} KiB | rechazos ({rechazos})"
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    from contextlib import redirect_stdout
+    from datetime import datetime
+    from cliente import Cliente
+    from servicio_evento import ServicioEvento
+
+    print("PRUEBA DEL LIMITADOR DE VENTAS")
+
+    # Reloj simulado: cada llamada avanza 1 ms
+    instante = [0.0]
+
+    def reloj():
+        instante[0] += 0.001
+        return instante[0]
+
+    gestor = GestorServicios("CineMax Entertainment")
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_servicio(ServicioEvento("E001", "Rock Fest", datetime(2025, 12, 20, 20, 0),
+                                               50.0, "Los Rockeros", "Concierto", 3))
+        gestor.agregar_servicio(ServicioEvento("E002", "Comedia", datetime(2025, 12, 21, 21, 0),
+                                               30.0, "Humoristas", "Stand-up Comedy", 2))
+        for i in range(300):
+            gestor.agregar_cliente(Cliente(f"09{i:08d}", "Cliente", f"N{i}",
+                                           f"c{i}@email.com", "0987654321"))
+    limitador = LimitadorVentas(gestor, reloj=reloj)
+
+    print("\n1. Un bot con una sola cédula:")
+    with redirect_stdout(io.StringIO()):
+        vendidas = sum(limitador.realizar_venta("E001", "0900000000", 1) for _ in range(200))
+    print(f"   200 intentos -> {vendidas} ventas | {limitador}")
+
+    print("\n2. Tope de entradas por cliente:")
+    instante[0] += 60
+    limitador.realizar_venta("E002", "0900000001", 8)
+    limitador.realizar_venta("E002", "0900000001", 4)
+
+    print("\n3. Muchas cédulas sobre la misma función:")
+    instante[0] += 60
+    with redirect_stdout(io.StringIO()):
+        vendidas = sum(limitador.realizar_venta("E001", f"09{i:08d}", 2) for i in range(2, 300))
+    print(f"   298 intentos -> {vendidas} ventas | {limitador}")
+
+    print("\n4. Costo del control por intento:")
+    rapido = LimitadorVentas(gestor)
+    repeticiones = 20_000
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        rapido.permitir("E002", f"09{i % 300:08d}", 1)
+    duracion = time.perf_counter() - inicio
+    print(f"   {duracion / repeticiones * 1e6:.1f} µs por intento (incluye el tope por cliente, en O(1))")
@@ -0,0 +1,332 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define las listas de espera para servicios agotados.
+Cuando un servicio libera capacidad (cancelaciones o reservas vencidas),
+las entradas se asignan automáticamente a los clientes en espera.
+"""
+
+import heapq
+from servicio import Servicio
+from gestor_servicios import GestorServicios
+
+
+class ListaEspera:
+    """
+    Cola de prioridad de solicitudes de un servicio.
+    Ordena por prioridad y, dentro de la misma prioridad, por orden de llegada
+    (FIFO). Agregar y extraer cuestan O(log n).
+    """
+
+    PRIORIDAD_PREMIUM = 0
+    PRIORIDAD_REGULAR = 1
+
+    def __init__(self, codigo_servicio: str):
+        """
+        Constructor de la ListaEspera.
+
+        Args:
+            codigo_servicio: Código del servicio en espera
+        """
+        self._codigo_servicio = codigo_servicio
+        self._monticulo = []
+        self._pendientes = set()
+        self._retiradas = set()
+        self._secuencia = 0
+
+    # Property para codigo_servicio
+    @property
+    def codigo_servicio(self) -> str:
+        """Obtiene el código del servicio de la lista."""
+        return self._codigo_servicio
+
+    def __len__(self) -> int:
+        """Cantidad de solicitudes pendientes."""
+        return len(self._pendientes)
+
+    def agregar(self, cedula_cliente: str, cantidad: int, prioridad: int = PRIORIDAD_REGULAR) -> int:
+        """
+        Agrega una solicitud a la lista.
+
+        Args:
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas solicitadas
+            prioridad: Prioridad (menor valor se atiende antes)
+
+        Returns:
+            Identificador de la solicitud
+        """
+        if cantidad < 1:
+            raise ValueError("La cantidad solicitada debe ser positiva")
+        self._secuencia += 1
+        heapq.heappush(self._monticulo, (prioridad, self._secuencia, cedula_cliente, cantidad))
+        self._pendientes.add(self._secuencia)
+        return self._secuencia
+
+    def retirar(self, id_solicitud: int) -> bool:
+        """
+        Retira una solicitud pendiente (eliminación diferida).
+
+        Args:
+            id_solicitud: Identificador de la solicitud
+
+        Returns:
+            True si la solicitud estaba pendiente
+        """
+        if id_solicitud not in self._pendientes:
+            return False
+        self._pendientes.discard(id_solicitud)
+        self._retiradas.add(id_solicitud)
+        return True
+
+    def primero(self):
+        """
+        Consulta la próxima solicitud sin extraerla.
+
+        Returns:
+            Tupla (prioridad, id, cedula, cantidad) o None si está vacía
+        """
+        while self._monticulo and self._monticulo[0][1] in self._retiradas:
+            self._retiradas.discard(heapq.heappop(self._monticulo)[1])
+        return self._monticulo[0] if self._monticulo else None
+
+    def extraer(self):
+        """
+        Extrae la próxima solicitud.
+
+        Returns:
+            Tupla (prioridad, id, cedula, cantidad) o None si está vacía
+        """
+        if self.primero() is None:
+            return None
+        solicitud = heapq.heappop(self._monticulo)
+        self._pendientes.discard(solicitud[1])
+        return solicitud
+
+
+class GestorListaEspera:
+    """
+    Clase que administra las listas de espera de un GestorServicios.
+    Se suscribe a las liberaciones de capacidad del gestor para asignar
+    automáticamente las entradas a los clientes en espera.
+    """
+
+    def __init__(self, gestor: GestorServicios, prioridad_premium: bool = True, limitador=None):
+        """
+        Constructor del GestorListaEspera.
+
+        Args:
+            gestor: Gestor de servicios a vigilar
+            prioridad_premium: Si los clientes premium se atienden primero
+            limitador: LimitadorVentas cuyo tope de entradas por cliente también
+                se aplica a las asignaciones (None para no aplicarlo)
+        """
+        self._gestor = gestor
+        self._limitador = limitador
+        self._prioridad_premium = prioridad_premium
+        self._listas = {}
+        self._clientes = {}  # cedula -> Cliente inscrito
+        self._rechazadas = []
+        self._asignaciones = 0
+        gestor.suscribir_liberacion(self.asignar)
+
+    # Property para prioridad_premium
+    @property
+    def prioridad_premium(self) -> bool:
+        """Indica si los clientes premium tienen prioridad."""
+        return self._prioridad_premium
+
+    @prioridad_premium.setter
+    def prioridad_premium(self, valor: bool):
+        """Establece si los clientes premium tienen prioridad."""
+        self._prioridad_premium = valor
+
+    # Property para asignaciones
+    @property
+    def asignaciones(self) -> int:
+        """Obtiene el total de solicitudes atendidas automáticamente."""
+        return self._asignaciones
+
+    # Property para rechazadas
+    @property
+    def rechazadas(self) -> list:
+        """Obtiene las solicitudes cuya venta falló al asignarlas: (codigo, cedula, cantidad)."""
+        return list(self._rechazadas)
+
+    def inscribir(self, codigo_servicio: str, cedula_cliente: str, cantidad: int):
+        """
+        Inscribe a un cliente en la lista de espera de un servicio.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas deseadas
+
+        Returns:
+            Identificador de la solicitud o None si no fue posible
+        """
+        servicio = self._gestor.buscar_servicio(codigo_servicio)
+        cliente = self._gestor.buscar_cliente(cedula_cliente)
+
+        if not servicio or not hasattr(servicio, 'entradas_disponibles'):
+            print(f"   Servicio '{codigo_servicio}' no admite lista de espera")
+            return None
+        if not cliente:
+            print(f"   Cliente con cédula '{cedula_cliente}' no encontrado")
+            return None
+        if servicio.estado == "Cancelado":
+            print(f"   El servicio '{servicio.nombre}' está cancelado")
+            return None
+
+        prioridad = ListaEspera.PRIORIDAD_REGULAR
+        if self._prioridad_premium and cliente.es_premium:
+            prioridad = ListaEspera.PRIORIDAD_PREMIUM
+
+        lista = self._listas.get(servicio.codigo)
+        if lista is None:
+            lista = self._listas[servicio.codigo] = ListaEspera(servicio.codigo)
+        id_solicitud = lista.agregar(cedula_cliente, cantidad, prioridad)
+        self._clientes[cedula_cliente] = cliente
+        return id_solicitud
+
+    def cancelar(self, codigo_servicio: str, id_solicitud: int) -> bool:
+        """
+        Cancela una solicitud de la lista de espera.
+
+        Args:
+            codigo_servicio: Código del servicio
+            id_solicitud: Identificador de la solicitud
+
+        Returns:
+            True si la solicitud fue retirada
+        """
+        lista = self._listas.get(codigo_servicio)
+        return lista is not None and lista.retirar(id_solicitud)
+
+    def en_espera(self, codigo_servicio: str) -> int:
+        """Cantidad de solicitudes pendientes de un servicio."""
+        lista = self._listas.get(codigo_servicio)
+        return len(lista) if lista is not None else 0
+
+    def asignar(self, servicio: Servicio) -> int:
+        """
+        Asigna la capacidad libre de un servicio a su lista de espera.
+        Se atiende en orden estricto: si la primera solicitud no cabe,
+        la asignación se detiene para no saltarse a nadie. Cada venta usa el
+        servicio y el cliente ya encontrados, por lo que cuesta O(log n);
+        las solicitudes que superan el tope del limitador o cuya venta falla
+        quedan en `rechazadas`. No consume los tokens de ritmo del limitador:
+        la asignación no la inicia el cliente.
+
+        Args:
+            servicio: Servicio con capacidad liberada
+
+        Returns:
+            Número de solicitudes atendidas
+        """
+        lista = self._listas.get(servicio.codigo)
+        if not lista or servicio.estado == "Cancelado":
+            return 0
+
+        atendidas = 0
+        while True:
+            solicitud = lista.primero()
+            if solicitud is None:
+                break
+            # Se vende en la misma zona en la que se comprobó el lugar
+            zona = self._zona_libre(servicio, solicitud[3])
+            if zona is False:
+                break
+            _, _, cedula, cantidad = lista.extraer()
+            excede = (self._limitador is not None
+                      and self._limitador.excede_tope(servicio.codigo, cedula, cantidad))
+            if not excede and self._gestor._vender(servicio, self._clientes[cedula], cantidad, zona):
+                atendidas += 1
+            else:
+                self._rechazadas.append((servicio.codigo, cedula, cantidad))
+
+        if not lista:
+            del self._listas[servicio.codigo]
+        self._asignaciones += atendidas
+        return atendidas
+
+    @staticmethod
+    def _zona_libre(servicio: Servicio, cantidad: int):
+        """
+        Zona con lugar para una solicitud: la mejor zona de un evento con zonas
+        o None (zona única). Retorna False si no hay lugar.
+        """
+        if getattr(servicio, 'es_multizona', False):
+            zona = servicio.mejor_zona(cantidad)
+            return False if zona is None else zona
+        return None if cantidad <= servicio.entradas_disponibles() else False
+
+    def __str__(self) -> str:
+        """Representación en string del gestor de listas de espera."""
+        pendientes = sum(len(lista) for lista in self._listas.values())
+        return (f"GestorListaEspera: {len(self._listas)} listas | "
+                f"{pendientes} solicitudes pendientes")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import time
+    from contextlib import redirect_stdout
+    from datetime import datetime
+    from servicio_evento import ServicioEvento
+    from cliente import Cliente
+
+    print("PRUEBA DE LAS LISTAS DE ESPERA")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    evento = ServicioEvento("E001", "Rock en Vivo", datetime(2024, 12, 20, 20, 0),
+                            45.00, "Los Rockeros", "Concierto", 2.5)
+    gestor.agregar_servicio(evento)
+    juan = Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321")
+    maria = Cliente("0923456789", "María", "González", "maria@email.com", "0976543210")
+    maria.es_premium = True
+    gestor.agregar_cliente(juan)
+    gestor.agregar_cliente(maria)
+    espera = GestorListaEspera(gestor)
+
+    print("\n1. Agotando el evento...")
+    gestor.realizar_venta("E001", "0912345678", 500)
+    print(f"   Estado: {evento.estado}")
+
+    print("\n2. Inscribiendo clientes en la lista de espera...")
+    espera.inscribir("E001", "0912345678", 2)
+    espera.inscribir("E001", "0923456789", 3)
+    print(f"   {espera}")
+
+    print("\n3. Juan cancela 4 entradas (María es premium y se atiende primero)...")
+    gestor.cancelar_venta("E001", "0912345678", 4)
+    print(f"   Solicitudes atendidas: {espera.asignaciones}")
+    print(f"   En espera para E001: {espera.en_espera('E001')}")
+
+    print("\n4. Tormenta de asignaciones: 100,000 solicitudes y liberación de 500 entradas...")
+    gestor2 = GestorServicios("Storm")
+    with redirect_stdout(io.StringIO()):
+        evento2 = ServicioEvento("E002", "Festival", datetime(2024, 12, 21, 20, 0),
+                                 30.00, "Varios", "Concierto", 2.0)
+        gestor2.agregar_servicio(evento2)
+        gestor2.agregar_cliente(juan)
+        gestor2.realizar_venta("E002", "0912345678", 500)
+    espera2 = GestorListaEspera(gestor2)
+    clientes = [Cliente(f"{i:010d}", "Cliente", str(i), "c@email.com", "0999999999")
+                for i in range(1000)]
+    with redirect_stdout(io.StringIO()):
+        for cliente in clientes:
+            gestor2.agregar_cliente(cliente)
+        for i in range(100_000):
+            espera2.inscribir("E002", clientes[i % 1000].cedula, 1)
+        inicio = time.perf_counter()
+        gestor2.cancelar_venta("E002", "0912345678", 500)
+        duracion = time.perf_counter() - inicio
+    print(f"   Asignadas {espera2.asignaciones} solicitudes en {duracion * 1000:.1f} ms "
+          f"({duracion / max(espera2.asignaciones, 1) * 1e6:.1f} µs por asignación)")
+    print(f"   En espera para E002: {espera2.en_espera('E002')}")
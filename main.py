@@ -12,12 +12,17 @@ Este programa integra todas las clases y demuestra:
 - Polimorfismo (métodos que trabajan con listas de objetos de la superclase)
 """
 
+import os
 from datetime import datetime
 from servicio import Servicio
 from servicio_cine import ServicioCine
 from servicio_evento import ServicioEvento
 from cliente import Cliente
 from gestor_servicios import GestorServicios
+from metricas import REGISTRO
+from trazas import Trazador
+from vistas import VistasMaterializadas
+from cache_consultas import CacheConsultas
 
 
 def mostrar_menu():
@@ -263,9 +268,36 @@ def main():
     # Crear instancia del gestor
     gestor = GestorServicios("CineMax Entertainment")
 
+    # Métricas opcionales: CINEMAX_METRICAS=ruta.prom habilita el registro
+    ruta_metricas = os.environ.get("CINEMAX_METRICAS")
+    if ruta_metricas:
+        REGISTRO.habilitar()
+        REGISTRO.observar_gestor(gestor)
+
+    # Trazas opcionales: CINEMAX_TRAZAS=ruta.json (CINEMAX_MUESTREO=N traza 1 de cada N)
+    ruta_trazas = os.environ.get("CINEMAX_TRAZAS")
+    trazador = None
+    if ruta_trazas:
+        try:
+            muestreo = int(os.environ.get("CINEMAX_MUESTREO", "1"))
+            if muestreo < 1:
+                raise ValueError
+        except ValueError:
+            print("Advertencia: CINEMAX_MUESTREO debe ser un entero mayor o igual a 1; "
+                  "se traza cada operación")
+            muestreo = 1
+        trazador = Trazador(muestreo=muestreo)
+        trazador.activar()
+
     # Cargar datos de ejemplo
     crear_datos_ejemplo(gestor)
 
+    # Vistas del menú: solo se regenera lo que cambió desde la última consulta
+    vistas = VistasMaterializadas(gestor)
+    cache = CacheConsultas(gestor)
+    if ruta_metricas:
+        cache.registrar_metricas(REGISTRO)
+
     # Demostraciones de conceptos POO
     print("\n\n" + " DEMOSTRACIONES DE CONCEPTOS POO ".center(70, "="))
 
@@ -286,19 +318,20 @@ def main():
         if opcion == "1":
             # Ver todos los servicios
             print("TODOS LOS SERVICIOS")
-            for servicio in gestor._servicios:
-                print(servicio.mostrar_info())
+            with REGISTRO.medir("menu_ver_servicios_segundos"):
+                print(vistas.texto_servicios())
             input("\nPresiona ENTER para continuar...")
 
         elif opcion == "2":
             # Ver servicios disponibles
-            disponibles = gestor.listar_servicios_disponibles()
-            print("SERVICIOS DISPONIBLES")
-            if disponibles:
-                for serv in disponibles:
-                    print(f"\n{serv}")
-            else:
-                print("\nNo hay servicios disponibles en este momento.")
+            with REGISTRO.medir("menu_ver_disponibles_segundos"):
+                disponibles = cache.servicios_disponibles()
+                print("SERVICIOS DISPONIBLES")
+                if disponibles:
+                    for serv in disponibles:
+                        print(f"\n{serv}")
+                else:
+                    print("\nNo hay servicios disponibles en este momento.")
             input("\nPresiona ENTER para continuar...")
 
         elif opcion == "3":
@@ -316,7 +349,8 @@ def main():
             cedula = input("Ingresa la cédula del cliente: ")
             try:
                 cantidad = int(input("Ingresa la cantidad de entradas: "))
-                gestor.realizar_venta(codigo, cedula, cantidad)
+                with REGISTRO.medir("menu_realizar_venta_segundos"):
+                    gestor.realizar_venta(codigo, cedula, cantidad)
             except ValueError:
                 print("   Cantidad inválida")
 
@@ -325,27 +359,30 @@ def main():
         elif opcion == "4":
             # Ver clientes
             print("CLIENTES REGISTRADOS")
-            for cliente in gestor._clientes:
-                print(cliente.mostrar_info())
+            with REGISTRO.medir("menu_ver_clientes_segundos"):
+                print(vistas.texto_clientes())
             input("\nPresiona ENTER para continuar...")
 
         elif opcion == "5":
             # Generar reporte (Polimorfismo)
             print("\n Usando método polimórfico generar_reporte_servicios()...")
-            reporte = gestor.generar_reporte_servicios(gestor._servicios)
-            print(reporte)
+            with REGISTRO.medir("menu_generar_reporte_segundos"):
+                reporte = vistas.reporte_servicios()
+                print(reporte)
             input("\nPresiona ENTER para continuar...")
 
         elif opcion == "6":
             # Calcular ingresos (Polimorfismo)
             print("\n Usando método polimórfico calcular_ingresos_totales()...")
-            ingresos = gestor.calcular_ingresos_totales(gestor._servicios)
-            print(f"\n INGRESOS TOTALES CALCULADOS: ${ingresos:,.2f}")
+            with REGISTRO.medir("menu_calcular_ingresos_segundos"):
+                ingresos = gestor.calcular_ingresos_totales(gestor._servicios)
+                print(f"\n INGRESOS TOTALES CALCULADOS: ${ingresos:,.2f}")
             input("\nPresiona ENTER para continuar...")
 
         elif opcion == "7":
             # Ver estadísticas
-            print(gestor.obtener_estadisticas())
+            with REGISTRO.medir("menu_ver_estadisticas_segundos"):
+                print(vistas.estadisticas())
             input("\nPresiona ENTER para continuar...")
 
         elif opcion == "8":
@@ -353,6 +390,12 @@ def main():
             print("\n" + "=" * 70)
             print("¡Gracias por usar el Sistema de Gestión de Cine/Eventos!")
             print("=" * 70)
+            if ruta_metricas:
+                REGISTRO.guardar_prometheus(ruta_metricas)
+                print(f"Métricas guardadas en {ruta_metricas}")
+            if trazador is not None:
+                trazador.volcar_chrome(ruta_trazas)
+                print(f"Trazas guardadas en {ruta_trazas}")
             break
 
         else:
@@ -0,0 +1,435 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el registro de métricas del sistema de cine/eventos.
+Ofrece contadores, histogramas de latencia con cubetas fijas y medidores,
+y exporta instantáneas en formato de texto de Prometheus.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from servicio_cine import ServicioCine
+from servicio_evento import ServicioEvento
+from gestor_servicios import GestorServicios
+
+# Cubetas de latencia en segundos: de 1 µs a 1 s
+LIMITES_LATENCIA = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+# Métodos instrumentados al habilitar el registro:
+# (clase, método, histograma de latencia, contador de llamadas que retornan False)
+PUNTOS_INSTRUMENTADOS = (
+    (GestorServicios, "realizar_venta", "gestor_realizar_venta_segundos",
+     "gestor_ventas_fallidas_total"),
+    # Venta con objetos ya encontrados: la de realizar_venta y la de las listas de espera
+    (GestorServicios, "_vender", "gestor_vender_segundos", None),
+    (GestorServicios, "generar_reporte_servicios", "gestor_generar_reporte_segundos", None),
+    (GestorServicios, "calcular_ingresos_totales", "gestor_calcular_ingresos_segundos", None),
+    (GestorServicios, "obtener_estadisticas", "gestor_obtener_estadisticas_segundos", None),
+    (ServicioCine, "calcular_precio_total", "cine_calcular_precio_segundos", None),
+    (ServicioEvento, "calcular_precio_total", "evento_calcular_precio_segundos", None),
+)
+
+
+def quitar_envoltura(clase: type, metodo: str, envoltura):
+    """
+    Quita una envoltura de la cadena de un método de clase, aunque después se
+    hayan puesto otras encima. Cada envoltura de la cadena debe llamar al
+    método interior a través de su atributo __wrapped__.
+
+    Args:
+        clase: Clase instrumentada
+        metodo: Nombre del método
+        envoltura: Envoltura a quitar
+    """
+    actual = clase.__dict__.get(metodo)
+    if actual is envoltura:
+        setattr(clase, metodo, envoltura.__wrapped__)
+        return
+    while actual is not None:
+        interior = getattr(actual, "__wrapped__", None)
+        if interior is envoltura:
+            actual.__wrapped__ = envoltura.__wrapped__
+            return
+        actual = interior
+
+
+class Contador:
+    """Métrica que solo puede aumentar."""
+
+    __slots__ = ("_valor",)
+
+    def __init__(self):
+        """Constructor del Contador."""
+        self._valor = 0
+
+    @property
+    def valor(self) -> float:
+        """Obtiene el valor acumulado."""
+        return self._valor
+
+    def incrementar(self, cantidad: float = 1):
+        """
+        Incrementa el contador.
+
+        Args:
+            cantidad: Valor a sumar (no negativo)
+        """
+        if cantidad < 0:
+            raise ValueError("Un contador no puede disminuir")
+        self._valor += cantidad
+
+
+class Histograma:
+    """Histograma con cubetas fijas; registrar una observación es O(log cubetas)."""
+
+    __slots__ = ("_limites", "_conteos", "_suma", "_total")
+
+    def __init__(self, limites: tuple = LIMITES_LATENCIA):
+        """
+        Constructor del Histograma.
+
+        Args:
+            limites: Límites superiores de las cubetas, en orden creciente
+        """
+        if list(limites) != sorted(limites):
+            raise ValueError("Los límites deben estar en orden creciente")
+        self._limites = tuple(limites)
+        self._conteos = [0] * (len(limites) + 1)
+        self._suma = 0.0
+        self._total = 0
+
+    @property
+    def total(self) -> int:
+        """Obtiene la cantidad de observaciones."""
+        return self._total
+
+    @property
+    def suma(self) -> float:
+        """Obtiene la suma de las observaciones."""
+        return self._suma
+
+    def observar(self, valor: float):
+        """
+        Registra una observación.
+
+        Args:
+            valor: Valor observado
+        """
+        self._conteos[bisect_left(self._limites, valor)] += 1
+        self._suma += valor
+        self._total += 1
+
+    def cubetas(self) -> list:
+        """
+        Obtiene las cubetas acumuladas.
+
+        Returns:
+            Lista de tuplas (límite, conteo acumulado); el último límite es infinito
+        """
+        acumulado = 0
+        resultado = []
+        for limite, conteo in zip(self._limites + (float("inf"),), self._conteos):
+            acumulado += conteo
+            resultado.append((limite, acumulado))
+        return resultado
+
+    def percentil(self, p: float) -> float:
+        """
+        Estima un percentil como el límite de la cubeta que lo contiene.
+
+        Args:
+            p: Percentil entre 0 y 100
+
+        Returns:
+            Límite superior de la cubeta del percentil
+        """
+        if self._total == 0:
+            return 0.0
+        objetivo = self._total * p / 100
+        for limite, acumulado in self.cubetas():
+            if acumulado >= objetivo:
+                return limite
+        return float("inf")
+
+
+class _Cronometro:
+    """Administrador de contexto que registra la duración en un histograma."""
+
+    __slots__ = ("_histograma", "_inicio")
+
+    def __init__(self, histograma: Histograma):
+        self._histograma = histograma
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        self._histograma.observar(time.perf_counter() - self._inicio)
+        return False
+
+
+class RegistroMetricas:
+    """
+    Clase que agrupa las métricas del sistema.
+    Deshabilitado no tiene costo: los métodos instrumentados se envuelven al
+    habilitarlo y se restauran al deshabilitarlo.
+    """
+
+    _NULO = nullcontext()
+
+    def __init__(self):
+        """Constructor del RegistroMetricas."""
+        self._contadores = {}
+        self._histogramas = {}
+        self._medidores = {}  # nombre -> (funcion, etiqueta)
+        self._ayudas = {}
+        self._envolturas = []
+        self._habilitado = False
+
+    # Property para habilitado
+    @property
+    def habilitado(self) -> bool:
+        """Indica si el registro está recolectando métricas."""
+        return self._habilitado
+
+    def contador(self, nombre: str, ayuda: str = "") -> Contador:
+        """Obtiene (o crea) un contador."""
+        if nombre not in self._contadores:
+            self._contadores[nombre] = Contador()
+            self._ayudas[nombre] = ayuda
+        return self._contadores[nombre]
+
+    def histograma(self, nombre: str, limites: tuple = LIMITES_LATENCIA, ayuda: str = "") -> Histograma:
+        """Obtiene (o crea) un histograma."""
+        if nombre not in self._histogramas:
+            self._histogramas[nombre] = Histograma(limites)
+            self._ayudas[nombre] = ayuda
+        return self._histogramas[nombre]
+
+    def registrar_medidor(self, nombre: str, funcion, ayuda: str = "", etiqueta: str = None):
+        """
+        Registra un medidor que se evalúa al tomar la instantánea,
+        por lo que no agrega costo a las operaciones.
+
+        Args:
+            nombre: Nombre de la métrica
+            funcion: Función sin argumentos que retorna el valor, o un
+                diccionario {valor_etiqueta: valor} si se indica etiqueta
+            ayuda: Descripción de la métrica
+            etiqueta: Nombre de la etiqueta para medidores con varias series
+        """
+        self._medidores[nombre] = (funcion, etiqueta)
+        self._ayudas[nombre] = ayuda
+
+    def observar_gestor(self, gestor: GestorServicios):
+        """
+        Registra los medidores de ventas totales y ocupación por servicio.
+
+        Args:
+            gestor: Gestor a observar
+        """
+        def ocupacion():
+            valores = {}
+            for servicio in gestor._servicios:
+                if hasattr(servicio, '_asientos_vendidos'):
+                    vendidas = servicio._asientos_vendidos
+                elif hasattr(servicio, '_entradas_vendidas'):
+                    vendidas = servicio._entradas_vendidas
+                else:
+                    continue
+                valores[servicio.codigo] = vendidas / servicio._capacidad_total
+            return valores
+
+        self.registrar_medidor("gestor_ventas_totales", lambda: gestor.ventas_totales,
+                               "Monto acumulado de ventas")
+        self.registrar_medidor("servicio_ocupacion_ratio", ocupacion,
+                               "Fracción de la capacidad vendida", etiqueta="codigo")
+
+    def habilitar(self):
+        """Habilita el registro e instrumenta los métodos de PUNTOS_INSTRUMENTADOS."""
+        if self._habilitado:
+            return
+        for clase, metodo, nombre, nombre_fallos in PUNTOS_INSTRUMENTADOS:
+            original = clase.__dict__[metodo]
+            histograma = self.histograma(nombre, ayuda=f"Latencia de {clase.__name__}.{metodo}")
+            fallos = None
+            if nombre_fallos is not None:
+                fallos = self.contador(nombre_fallos, f"Llamadas fallidas de {clase.__name__}.{metodo}")
+            envoltura = self._envolver(original, histograma, fallos)
+            setattr(clase, metodo, envoltura)
+            self._envolturas.append((clase, metodo, envoltura))
+        self._habilitado = True
+
+    def deshabilitar(self):
+        """
+        Deshabilita el registro y quita sus envolturas, sin tocar las que otras
+        capas (trazas) hayan puesto antes o después.
+        """
+        for clase, metodo, envoltura in reversed(self._envolturas):
+            quitar_envoltura(clase, metodo, envoltura)
+        self._envolturas.clear()
+        self._habilitado = False
+
+    def medir(self, nombre: str):
+        """
+        Mide la duración de un bloque de código.
+
+        Args:
+            nombre: Nombre del histograma
+
+        Returns:
+            Administrador de contexto (sin efecto si el registro está deshabilitado)
+        """
+        if not self._habilitado:
+            return self._NULO
+        return _Cronometro(self.histograma(nombre))
+
+    def instantanea(self) -> dict:
+        """
+        Obtiene una copia de todas las métricas.
+
+        Returns:
+            Diccionario con contadores, histogramas y medidores
+        """
+        return {
+            "contadores": {nombre: c.valor for nombre, c in self._contadores.items()},
+            "histogramas": {nombre: {"total": h.total, "suma": h.suma,
+                                     "p50": h.percentil(50), "p99": h.percentil(99)}
+                            for nombre, h in self._histogramas.items()},
+            "medidores": {nombre: funcion() for nombre, (funcion, _) in self._medidores.items()},
+        }
+
+    def exportar_prometheus(self) -> str:
+        """
+        Genera el texto de exposición de Prometheus.
+
+        Returns:
+            String en formato de texto de Prometheus
+        """
+        lineas = []
+        for nombre, contador in self._contadores.items():
+            lineas.append(f"# HELP {nombre} {self._ayudas[nombre]}")
+            lineas.append(f"# TYPE {nombre} counter")
+            lineas.append(f"{nombre} {contador.valor}")
+        for nombre, (funcion, etiqueta) in self._medidores.items():
+            lineas.append(f"# HELP {nombre} {self._ayudas[nombre]}")
+            lineas.append(f"# TYPE {nombre} gauge")
+            valor = funcion()
+            if etiqueta is None:
+                lineas.append(f"{nombre} {valor}")
+            else:
+                for clave, dato in valor.items():
+                    lineas.append(f'{nombre}{{{etiqueta}="{clave}"}} {dato}')
+        for nombre, histograma in self._histogramas.items():
+            lineas.append(f"# HELP {nombre} {self._ayudas[nombre]}")
+            lineas.append(f"# TYPE {nombre} histogram")
+            for limite, acumulado in histograma.cubetas():
+                le = "+Inf" if limite == float("inf") else repr(limite)
+                lineas.append(f'{nombre}_bucket{{le="{le}"}} {acumulado}')
+            lineas.append(f"{nombre}_sum {histograma.suma}")
+            lineas.append(f"{nombre}_count {histograma.total}")
+        return "\n".join(lineas) + "\n"
+
+    def guardar_prometheus(self, ruta: str):
+        """
+        Escribe la exposición de Prometheus en un archivo.
+
+        Args:
+            ruta: Ruta del archivo de salida
+        """
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(self.exportar_prometheus())
+
+    @staticmethod
+    def _envolver(original, histograma: Histograma, fallos: Contador = None):
+        """Crea la envoltura que mide la latencia (y los fallos) de un método."""
+        reloj = time.perf_counter
+        observar = histograma.observar
+
+        @wraps(original)
+        def envoltura(*args, **kwargs):
+            inicio = reloj()
+            try:
+                # Por __wrapped__: otra capa puede quitarse de debajo (quitar_envoltura)
+                resultado = envoltura.__wrapped__(*args, **kwargs)
+            finally:
+                observar(reloj() - inicio)
+            if resultado is False and fallos is not None:
+                fallos.incrementar()
+            return resultado
+
+        return envoltura
+
+    def __str__(self) -> str:
+        """Representación en string del registro."""
+        estado = "habilitado" if self._habilitado else "deshabilitado"
+        return (f"RegistroMetricas ({estado}): {len(self._contadores)} contadores | "
+                f"{len(self._histogramas)} histogramas | {len(self._medidores)} medidores")
+
+
+# Registro global del sistema
+REGISTRO = RegistroMetricas()
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import os
+    import tempfile
+    from contextlib import redirect_stdout
+    from datetime import datetime
+    from cliente import Cliente
+
+    print("PRUEBA DEL REGISTRO DE MÉTRICAS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_servicio(ServicioEvento("E001", "Rock", datetime(2024, 12, 20, 20, 0),
+                                               45.00, "Los Rockeros", "Concierto", 2.5))
+        gestor.agregar_cliente(Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321"))
+
+    cine = ServicioCine("C001", "Estreno", datetime(2024, 12, 15, 20, 0), 8.50, "Dune", 1)
+
+    print("\n1. Costo de calcular_precio_total() con el registro deshabilitado...")
+    inicio = time.perf_counter()
+    for _ in range(200_000):
+        cine.calcular_precio_total()
+    base = (time.perf_counter() - inicio) / 200_000
+    print(f"   {base * 1e9:.0f} ns por llamada")
+
+    print("\n2. Habilitando el registro...")
+    REGISTRO.habilitar()
+    REGISTRO.observar_gestor(gestor)
+    inicio = time.perf_counter()
+    for _ in range(200_000):
+        cine.calcular_precio_total()
+    medido = (time.perf_counter() - inicio) / 200_000
+    print(f"   {medido * 1e9:.0f} ns por llamada (sobrecarga: {(medido - base) * 1e9:.0f} ns)")
+
+    print("\n3. Registrando ventas y un bloque medido...")
+    with redirect_stdout(io.StringIO()):
+        for _ in range(100):
+            gestor.realizar_venta("E001", "0912345678", 1)
+        gestor.realizar_venta("X999", "0912345678", 1)
+    with REGISTRO.medir("demo_bloque_segundos"):
+        gestor.generar_reporte_servicios(gestor._servicios)
+
+    print(f"\n4. {REGISTRO}")
+    instantanea = REGISTRO.instantanea()
+    print(f"   Ventas medidas: {instantanea['histogramas']['gestor_realizar_venta_segundos']['total']}")
+    print(f"   Medidores: {instantanea['medidores']}")
+
+    ruta = os.path.join(tempfile.gettempdir(), "cinemax_metricas.prom")
+    REGISTRO.guardar_prometheus(ruta)
+    print(f"\n5. Exposición de Prometheus guardada en {ruta}")
+
+    REGISTRO.deshabilitar()
+    print(f"   {REGISTRO}")
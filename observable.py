@@ -0,0 +1,50 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la clase Observable.
+Permite que otros componentes (índices, vistas, cachés) se enteren de los
+cambios hechos a través de los setters de Servicio y Cliente.
+"""
+
+
+class Observable:
+    """
+    Clase base que notifica los cambios de atributos a sus suscriptores.
+    Mientras no haya suscriptores, notificar un cambio solo cuesta una
+    comprobación, por lo que no afecta a los setters.
+    """
+
+    # Tupla vacía compartida; la lista propia se crea al primer suscriptor
+    _observadores = ()
+
+    def suscribir_cambios(self, funcion):
+        """
+        Registra una función que se llama después de cada cambio.
+
+        Args:
+            funcion: Función que recibe (objeto, atributo, anterior, nuevo)
+        """
+        if not self._observadores:
+            self._observadores = []
+        self._observadores.append(funcion)
+
+    def cancelar_suscripcion(self, funcion):
+        """
+        Elimina una función previamente registrada.
+
+        Args:
+            funcion: Función a eliminar
+        """
+        if funcion in self._observadores:
+            self._observadores.remove(funcion)
+
+    def _notificar_cambio(self, atributo: str, anterior, nuevo):
+        """Avisa a los suscriptores que un atributo cambió."""
+        # Se recorre una copia: un suscriptor puede suscribir o cancelar
+        # funciones mientras se notifica
+        for funcion in tuple(self._observadores):
+            funcion(self, atributo, anterior, nuevo)
@@ -0,0 +1,358 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el ProgramaDiario: un índice temporal de los servicios.
+Mantiene arreglos ordenados por fecha (uno general, uno por película y uno
+por tipo de evento) para responder consultas por rango de tiempo con
+búsqueda binaria en O(log n + k). Los servicios que ya pasaron se retiran
+en bloque a un archivo histórico, separado de las estructuras de consulta.
+"""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from itertools import count
+from typing import Dict, List
+from servicio import Servicio
+from programacion_salas import PlanificadorSalas
+
+
+def _sala_de(servicio: Servicio) -> str:
+    """Sala del servicio, con el mismo criterio que PlanificadorSalas."""
+    if hasattr(servicio, 'sala'):
+        return f"Sala {servicio.sala}"
+    return PlanificadorSalas.ESCENARIO_EVENTOS
+
+
+class ProgramaDiario:
+    """
+    Clase que indexa los servicios por fecha.
+    Cada índice es una lista ordenada de claves (fecha, secuencia); la
+    secuencia desempata funciones a la misma hora y apunta al servicio.
+    """
+
+    def __init__(self, gestor=None):
+        """
+        Constructor del ProgramaDiario.
+
+        Args:
+            gestor: GestorServicios cuyos servicios se indexan (opcional)
+        """
+        self._claves = []
+        self._por_pelicula = defaultdict(list)
+        self._por_tipo_evento = defaultdict(list)
+        self._servicios = {}
+        self._clave_de = {}
+        self._secuencia = count()
+        self._archivo = []
+        self._archivo_claves = []
+
+        if gestor is not None:
+            for servicio in gestor._servicios:
+                self.agregar(servicio)
+            gestor.suscribir_altas(self._al_agregar)
+            gestor.suscribir_bajas(self._al_retirar)
+
+    def __len__(self) -> int:
+        """Cantidad de servicios en las estructuras de consulta."""
+        return len(self._claves)
+
+    # Property para archivados
+    @property
+    def archivados(self) -> int:
+        """Obtiene la cantidad de servicios en el archivo histórico."""
+        return len(self._archivo)
+
+    def agregar(self, servicio: Servicio):
+        """
+        Indexa un servicio y lo observa para mantener el índice al día.
+
+        Args:
+            servicio: Servicio a indexar
+        """
+        if id(servicio) in self._clave_de:
+            return
+        self._indexar(servicio)
+        servicio.suscribir_cambios(self._al_cambiar)
+
+    def retirar(self, servicio: Servicio) -> bool:
+        """
+        Quita un servicio del índice.
+
+        Args:
+            servicio: Servicio a quitar
+
+        Returns:
+            True si estaba indexado
+        """
+        if id(servicio) not in self._clave_de:
+            return False
+        self._desindexar(servicio)
+        servicio.cancelar_suscripcion(self._al_cambiar)
+        return True
+
+    def en_rango(self, desde: datetime, hasta: datetime) -> List[Servicio]:
+        """
+        Servicios que empiezan entre dos instantes, en orden cronológico.
+
+        Args:
+            desde: Inicio del rango (incluido)
+            hasta: Fin del rango (excluido)
+
+        Returns:
+            Lista de servicios no cancelados
+        """
+        return self._rango(self._claves, desde, hasta)
+
+    def proxima_funcion(self, pelicula: str, despues_de: datetime) -> Servicio:
+        """
+        Próxima función de una película a partir de un instante.
+
+        Args:
+            pelicula: Nombre de la película
+            despues_de: Instante desde el que se busca (incluido)
+
+        Returns:
+            Servicio encontrado o None
+        """
+        claves = self._por_pelicula.get(pelicula, ())
+        for i in range(bisect_left(claves, (despues_de, -1)), len(claves)):
+            servicio = self._servicios[claves[i][1]]
+            if servicio.estado != "Cancelado":
+                return servicio
+        return None
+
+    def programa_del_dia(self, dia: date) -> Dict[str, List[Servicio]]:
+        """
+        Programa de un día agrupado por sala.
+
+        Args:
+            dia: Día a consultar
+
+        Returns:
+            Diccionario {sala: servicios en orden cronológico}, con las salas ordenadas
+        """
+        inicio = datetime.combine(dia, time.min)
+        programa = defaultdict(list)
+        for servicio in self.en_rango(inicio, inicio + timedelta(days=1)):
+            programa[_sala_de(servicio)].append(servicio)
+        return dict(sorted(programa.items()))
+
+    def eventos_fin_de_semana(self, referencia: date, tipo_evento: str = None) -> Dict[str, List[Servicio]]:
+        """
+        Eventos del fin de semana (sábado y domingo) agrupados por tipo.
+        Si la referencia cae en fin de semana, se usa ese mismo fin de semana.
+
+        Args:
+            referencia: Día desde el que se busca el fin de semana
+            tipo_evento: Tipo de evento a consultar (None incluye todos)
+
+        Returns:
+            Diccionario {tipo_evento: eventos en orden cronológico}
+        """
+        sabado = referencia + timedelta(days=(5 - referencia.weekday()) % 7)
+        if referencia.weekday() == 6:
+            sabado = referencia - timedelta(days=1)
+        desde = datetime.combine(sabado, time.min)
+        hasta = desde + timedelta(days=2)
+        tipos = [tipo_evento] if tipo_evento else sorted(self._por_tipo_evento)
+        resultado = {}
+        for tipo in tipos:
+            eventos = self._rango(self._por_tipo_evento.get(tipo, []), desde, hasta)
+            if eventos:
+                resultado[tipo] = eventos
+        return resultado
+
+    def archivar_pasados(self, ahora: datetime) -> int:
+        """
+        Mueve al archivo histórico, en bloque, los servicios anteriores a un instante.
+
+        Args:
+            ahora: Los servicios que empiezan antes de este instante se archivan
+
+        Returns:
+            Cantidad de servicios archivados
+        """
+        corte = bisect_left(self._claves, (ahora, -1))
+        if corte == 0:
+            return 0
+        pasados = self._claves[:corte]
+        del self._claves[:corte]
+        for indice in (self._por_pelicula, self._por_tipo_evento):
+            for nombre in list(indice):
+                claves = indice[nombre]
+                fin = bisect_left(claves, (ahora, -1))
+                if fin:
+                    del claves[:fin]
+                    if not claves:
+                        del indice[nombre]
+
+        for clave in pasados:
+            servicio = self._servicios.pop(clave[1])
+            del self._clave_de[id(servicio)]
+            servicio.cancelar_suscripcion(self._al_cambiar)
+            self._insertar_archivo(clave, servicio)
+        return corte
+
+    def historial(self, desde: datetime, hasta: datetime) -> List[Servicio]:
+        """
+        Servicios archivados que empezaron entre dos instantes.
+
+        Args:
+            desde: Inicio del rango (incluido)
+            hasta: Fin del rango (excluido)
+
+        Returns:
+            Lista de servicios archivados en orden cronológico
+        """
+        inicio = bisect_left(self._archivo_claves, (desde, -1))
+        fin = bisect_left(self._archivo_claves, (hasta, -1))
+        return self._archivo[inicio:fin]
+
+    def _insertar_archivo(self, clave: tuple, servicio: Servicio):
+        """Agrega un servicio al archivo manteniendo el orden por fecha."""
+        if not self._archivo_claves or self._archivo_claves[-1] < clave:
+            # Caso habitual: se archiva en orden cronológico
+            self._archivo_claves.append(clave)
+            self._archivo.append(servicio)
+        else:
+            posicion = bisect_left(self._archivo_claves, clave)
+            self._archivo_claves.insert(posicion, clave)
+            self._archivo.insert(posicion, servicio)
+
+    def _rango(self, claves: list, desde: datetime, hasta: datetime) -> List[Servicio]:
+        """Servicios no cancelados de un índice entre dos instantes."""
+        inicio = bisect_left(claves, (desde, -1))
+        fin = bisect_left(claves, (hasta, -1), inicio)
+        servicios = self._servicios
+        return [servicio for servicio in (servicios[clave[1]] for clave in claves[inicio:fin])
+                if servicio.estado != "Cancelado"]
+
+    def _indexar(self, servicio: Servicio):
+        """Inserta las claves del servicio en los índices."""
+        clave = (servicio.fecha, next(self._secuencia))
+        self._servicios[clave[1]] = servicio
+        self._clave_de[id(servicio)] = clave
+        insort(self._claves, clave)
+        if hasattr(servicio, 'pelicula'):
+            insort(self._por_pelicula[servicio.pelicula], clave)
+        else:
+            insort(self._por_tipo_evento[servicio.tipo_evento], clave)
+
+    def _desindexar(self, servicio: Servicio, pelicula: str = None, tipo_evento: str = None):
+        """Quita las claves del servicio (con los valores anteriores si cambiaron)."""
+        clave = self._clave_de.pop(id(servicio))
+        del self._servicios[clave[1]]
+        self._quitar(self._claves, clave)
+        if hasattr(servicio, 'pelicula'):
+            self._quitar_de(self._por_pelicula, pelicula or servicio.pelicula, clave)
+        else:
+            self._quitar_de(self._por_tipo_evento, tipo_evento or servicio.tipo_evento, clave)
+
+    @staticmethod
+    def _quitar(claves: list, clave: tuple):
+        """Elimina una clave de una lista ordenada."""
+        posicion = bisect_left(claves, clave)
+        if posicion < len(claves) and claves[posicion] == clave:
+            del claves[posicion]
+
+    def _quitar_de(self, indice: dict, nombre: str, clave: tuple):
+        """Elimina una clave del índice secundario y la entrada si queda vacía."""
+        claves = indice.get(nombre)
+        if claves is not None:
+            self._quitar(claves, clave)
+            if not claves:
+                del indice[nombre]
+
+    def _al_agregar(self, objeto):
+        """Indexa los servicios agregados al gestor."""
+        if isinstance(objeto, Servicio):
+            self.agregar(objeto)
+
+    def _al_retirar(self, servicios: list):
+        """Quita del índice los servicios quitados del gestor."""
+        for servicio in servicios:
+            self.retirar(servicio)
+
+    def _al_cambiar(self, servicio: Servicio, atributo: str, anterior, nuevo):
+        """Reubica el servicio si cambió algún campo indexado."""
+        if atributo == "fecha":
+            self._desindexar(servicio)
+            self._indexar(servicio)
+        elif atributo == "pelicula":
+            self._desindexar(servicio, pelicula=anterior)
+            self._indexar(servicio)
+        elif atributo == "tipo_evento":
+            self._desindexar(servicio, tipo_evento=anterior)
+            self._indexar(servicio)
+
+    def __str__(self) -> str:
+        """Representación en string del programa."""
+        return (f"ProgramaDiario: {len(self._claves)} servicios vigentes | "
+                f"{len(self._por_pelicula)} películas | {len(self._archivo)} archivados")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import random
+    import time as reloj
+    from contextlib import redirect_stdout
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+    from gestor_servicios import GestorServicios
+
+    print("PRUEBA DEL PROGRAMA DIARIO")
+
+    aleatorio = random.Random(7)
+    gestor = GestorServicios("CineMax Entertainment")
+    inicio_fechas = datetime(2024, 12, 1)
+    programa = ProgramaDiario(gestor)
+    with redirect_stdout(io.StringIO()):
+        for i in range(100_000):
+            fecha = inicio_fechas + timedelta(days=aleatorio.randrange(365),
+                                              hours=aleatorio.randrange(10, 23),
+                                              minutes=aleatorio.choice((0, 30)))
+            if i % 10:
+                gestor.agregar_servicio(ServicioCine(f"C{i:06d}", f"Función {i}", fecha, 8.5,
+                                                     f"Película {i % 300}", i % 12 + 1))
+            else:
+                tipo = ServicioEvento.TIPOS_EVENTO[(i // 10) % len(ServicioEvento.TIPOS_EVENTO)]
+                gestor.agregar_servicio(ServicioEvento(f"E{i:06d}", f"Evento {i}", fecha, 45.0,
+                                                       f"Artista {i % 50}", tipo, 2.5))
+    print(f"\n1. {programa}")
+
+    print("\n2. ¿Qué hay entre el 24/12/2024 18:00 y 19:00?")
+    inicio = reloj.perf_counter()
+    resultado = programa.en_rango(datetime(2024, 12, 24, 18, 0), datetime(2024, 12, 24, 19, 0))
+    print(f"   {len(resultado)} servicios ({(reloj.perf_counter() - inicio) * 1e6:.0f} µs)")
+    for servicio in resultado[:3]:
+        print(f"   {servicio.fecha:%H:%M} {servicio.codigo} {servicio.nombre}")
+
+    print("\n3. Próxima función de 'Película 42' después del 01/06/2025:")
+    print(f"   {programa.proxima_funcion('Película 42', datetime(2025, 6, 1))}")
+
+    print("\n4. Programa del 15/12/2024 por sala (primeras 3 salas):")
+    for sala, servicios in list(programa.programa_del_dia(date(2024, 12, 15)).items())[:3]:
+        horas = ", ".join(f"{s.fecha:%H:%M}" for s in servicios[:6])
+        print(f"   {sala}: {len(servicios)} funciones ({horas}...)")
+
+    print("\n5. Eventos del fin de semana del 11/12/2024 por tipo:")
+    for tipo, eventos in programa.eventos_fin_de_semana(date(2024, 12, 11)).items():
+        print(f"   {tipo}: {len(eventos)}")
+
+    print("\n6. Cambio de fecha de una función (se reubica en el índice):")
+    servicio = resultado[0]
+    servicio.fecha = datetime(2026, 1, 1, 20, 0)
+    print(f"   Sigue en el rango original: {servicio in programa.en_rango(datetime(2024, 12, 24, 18, 0), datetime(2024, 12, 24, 19, 0))}")
+    print(f"   Aparece en su nueva fecha: {servicio in programa.en_rango(datetime(2026, 1, 1), datetime(2026, 1, 2))}")
+
+    print("\n7. Archivando lo anterior al 01/06/2025:")
+    inicio = reloj.perf_counter()
+    archivados = programa.archivar_pasados(datetime(2025, 6, 1))
+    print(f"   {archivados} archivados en {(reloj.perf_counter() - inicio) * 1000:.1f} ms | {programa}")
+    print(f"   Historial del 24/12/2024: {len(programa.historial(datetime(2024, 12, 24), datetime(2024, 12, 25)))} servicios")
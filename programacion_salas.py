@@ -0,0 +1,451 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la programación de salas del sistema de cine/eventos.
+Detecta funciones que se solapan en la misma sala usando un árbol de
+intervalos por sala, busca horarios libres y valida programas completos.
+"""
+
+import heapq
+import random
+from datetime import datetime, timedelta
+from typing import List, Tuple
+from servicio import Servicio
+
+
+class _Nodo:
+    """Nodo del árbol de intervalos (treap aumentado con el fin máximo)."""
+
+    __slots__ = ("clave", "inicio", "fin", "dato", "prioridad", "izq", "der", "max_fin")
+
+    def __init__(self, clave, inicio, fin, dato):
+        self.clave = clave
+        self.inicio = inicio
+        self.fin = fin
+        self.dato = dato
+        self.prioridad = random.random()
+        self.izq = None
+        self.der = None
+        self.max_fin = fin
+
+    def actualizar(self):
+        """Recalcula el fin máximo del subárbol."""
+        maximo = self.fin
+        if self.izq is not None and self.izq.max_fin > maximo:
+            maximo = self.izq.max_fin
+        if self.der is not None and self.der.max_fin > maximo:
+            maximo = self.der.max_fin
+        self.max_fin = maximo
+
+
+class ArbolIntervalos:
+    """
+    Árbol de intervalos semiabiertos [inicio, fin).
+    Es un treap ordenado por inicio y aumentado con el fin máximo de cada
+    subárbol: insertar, eliminar y encontrar un solapamiento cuestan O(log n)
+    esperado; listar k solapamientos cuesta O(log n + k).
+    """
+
+    def __init__(self):
+        """Constructor del ArbolIntervalos."""
+        self._raiz = None
+        self._tamano = 0
+        self._contador = 0
+
+    def __len__(self) -> int:
+        """Cantidad de intervalos almacenados."""
+        return self._tamano
+
+    def insertar(self, inicio, fin, dato) -> tuple:
+        """
+        Inserta un intervalo.
+
+        Args:
+            inicio: Inicio del intervalo
+            fin: Fin del intervalo (excluido)
+            dato: Dato asociado
+
+        Returns:
+            Clave del intervalo, necesaria para eliminarlo
+        """
+        if not inicio < fin:
+            raise ValueError("El inicio del intervalo debe ser anterior a su fin")
+        self._contador += 1
+        clave = (inicio, self._contador)
+        self._raiz = self._insertar(self._raiz, _Nodo(clave, inicio, fin, dato))
+        self._tamano += 1
+        return clave
+
+    def eliminar(self, clave: tuple) -> bool:
+        """
+        Elimina un intervalo por su clave.
+
+        Args:
+            clave: Clave retornada por insertar()
+
+        Returns:
+            True si el intervalo existía
+        """
+        tamano = self._tamano
+        self._raiz = self._eliminar(self._raiz, clave)
+        return self._tamano < tamano
+
+    def primer_solapamiento(self, inicio, fin):
+        """
+        Busca un intervalo que se solape con [inicio, fin) en O(log n).
+
+        Returns:
+            Tupla (inicio, fin, dato) o None si no hay solapamiento
+        """
+        nodo = self._raiz
+        while nodo is not None:
+            if nodo.inicio < fin and nodo.fin > inicio:
+                return (nodo.inicio, nodo.fin, nodo.dato)
+            # Si el subárbol izquierdo llega más allá del inicio y no contiene
+            # un solapamiento, tampoco lo contiene el derecho
+            if nodo.izq is not None and nodo.izq.max_fin > inicio:
+                nodo = nodo.izq
+            else:
+                nodo = nodo.der
+        return None
+
+    def solapamientos(self, inicio, fin) -> list:
+        """
+        Lista los intervalos que se solapan con [inicio, fin), ordenados.
+
+        Returns:
+            Lista de tuplas (inicio, fin, dato)
+        """
+        resultado = []
+        self._recolectar(self._raiz, inicio, fin, resultado)
+        return resultado
+
+    def _recolectar(self, nodo, inicio, fin, resultado: list):
+        """Recorrido en orden que poda subárboles sin solapamientos."""
+        if nodo is None or nodo.max_fin <= inicio:
+            return
+        self._recolectar(nodo.izq, inicio, fin, resultado)
+        if nodo.inicio < fin:
+            if nodo.fin > inicio:
+                resultado.append((nodo.inicio, nodo.fin, nodo.dato))
+            self._recolectar(nodo.der, inicio, fin, resultado)
+
+    def _insertar(self, nodo, nuevo):
+        """Inserción recursiva con rotaciones para mantener el treap."""
+        if nodo is None:
+            return nuevo
+        if nuevo.clave < nodo.clave:
+            nodo.izq = self._insertar(nodo.izq, nuevo)
+            if nodo.izq.prioridad > nodo.prioridad:
+                nodo = self._rotar_derecha(nodo)
+        else:
+            nodo.der = self._insertar(nodo.der, nuevo)
+            if nodo.der.prioridad > nodo.prioridad:
+                nodo = self._rotar_izquierda(nodo)
+        nodo.actualizar()
+        return nodo
+
+    def _eliminar(self, nodo, clave):
+        """Eliminación recursiva: el nodo baja por rotaciones hasta ser hoja."""
+        if nodo is None:
+            return None
+        if clave < nodo.clave:
+            nodo.izq = self._eliminar(nodo.izq, clave)
+        elif clave > nodo.clave:
+            nodo.der = self._eliminar(nodo.der, clave)
+        else:
+            if nodo.izq is None or nodo.der is None:
+                self._tamano -= 1
+                return nodo.izq if nodo.izq is not None else nodo.der
+            if nodo.izq.prioridad > nodo.der.prioridad:
+                nodo = self._rotar_derecha(nodo)
+                nodo.der = self._eliminar(nodo.der, clave)
+            else:
+                nodo = self._rotar_izquierda(nodo)
+                nodo.izq = self._eliminar(nodo.izq, clave)
+        nodo.actualizar()
+        return nodo
+
+    @staticmethod
+    def _rotar_derecha(nodo):
+        hijo = nodo.izq
+        nodo.izq = hijo.der
+        hijo.der = nodo
+        nodo.actualizar()
+        hijo.actualizar()
+        return hijo
+
+    @staticmethod
+    def _rotar_izquierda(nodo):
+        hijo = nodo.der
+        nodo.der = hijo.izq
+        hijo.izq = nodo
+        nodo.actualizar()
+        hijo.actualizar()
+        return hijo
+
+
+class PlanificadorSalas:
+    """
+    Clase que mantiene un árbol de intervalos por sala y rechaza (o reporta)
+    funciones que se solapan. Las funciones de cine ocupan su sala durante
+    DURACION_CINE_HORAS; los eventos, que no tienen sala, comparten el
+    escenario principal durante su duracion_horas.
+    """
+
+    DURACION_CINE_HORAS = 2.5
+    ESCENARIO_EVENTOS = "Escenario principal"
+
+    def __init__(self, margen_minutos: int = 0):
+        """
+        Constructor del PlanificadorSalas.
+
+        Args:
+            margen_minutos: Tiempo de limpieza exigido entre funciones
+        """
+        self._margen = timedelta(minutes=margen_minutos)
+        self._arboles = {}  # sala -> ArbolIntervalos
+        self._registrados = {}  # id(servicio) -> (sala, clave)
+
+    # Property para margen_minutos
+    @property
+    def margen_minutos(self) -> float:
+        """Obtiene el tiempo de limpieza entre funciones."""
+        return self._margen.total_seconds() / 60
+
+    def sala_de(self, servicio: Servicio) -> str:
+        """
+        Obtiene la sala que ocupa un servicio.
+
+        Args:
+            servicio: Servicio a ubicar
+
+        Returns:
+            Nombre de la sala
+        """
+        if hasattr(servicio, 'sala'):
+            return f"Sala {servicio.sala}"
+        return self.ESCENARIO_EVENTOS
+
+    def intervalo_de(self, servicio: Servicio) -> Tuple[datetime, datetime]:
+        """
+        Calcula el intervalo que ocupa un servicio, incluido el margen.
+
+        Args:
+            servicio: Servicio a ubicar
+
+        Returns:
+            Tupla (inicio, fin)
+        """
+        horas = getattr(servicio, 'duracion_horas', self.DURACION_CINE_HORAS)
+        return servicio.fecha, servicio.fecha + timedelta(hours=horas) + self._margen
+
+    def conflictos(self, servicio: Servicio) -> List[Servicio]:
+        """
+        Lista los servicios registrados que se solapan con uno dado.
+
+        Args:
+            servicio: Servicio a comprobar
+
+        Returns:
+            Lista de servicios en conflicto
+        """
+        arbol = self._arboles.get(self.sala_de(servicio))
+        if arbol is None:
+            return []
+        inicio, fin = self.intervalo_de(servicio)
+        return [dato for _, _, dato in arbol.solapamientos(inicio, fin) if dato is not servicio]
+
+    def registrar(self, servicio: Servicio, permitir_conflictos: bool = False) -> List[Servicio]:
+        """
+        Registra un servicio en el programa de su sala.
+
+        Args:
+            servicio: Servicio a registrar
+            permitir_conflictos: Si True, registra y reporta los solapamientos
+
+        Returns:
+            Lista de servicios en conflicto (vacía si no hay)
+
+        Raises:
+            ValueError: Si hay solapamiento y no se permiten conflictos
+        """
+        conflictos = self._ubicar(servicio, permitir_conflictos)
+        servicio.suscribir_cambios(self._al_cambiar)
+        return conflictos
+
+    def _ubicar(self, servicio: Servicio, permitir_conflictos: bool) -> List[Servicio]:
+        """Inserta el servicio en el árbol de su sala (sin suscribirse a sus cambios)."""
+        sala = self.sala_de(servicio)
+        inicio, fin = self.intervalo_de(servicio)
+        arbol = self._arboles.setdefault(sala, ArbolIntervalos())
+
+        if permitir_conflictos:
+            conflictos = [dato for _, _, dato in arbol.solapamientos(inicio, fin)]
+        else:
+            choque = arbol.primer_solapamiento(inicio, fin)
+            if choque is not None:
+                raise ValueError(f"'{servicio.codigo}' se solapa en {sala} con "
+                                 f"'{choque[2].codigo}' ({choque[0].strftime('%d/%m/%Y %H:%M')})")
+            conflictos = []
+
+        clave = arbol.insertar(inicio, fin, servicio)
+        self._registrados[id(servicio)] = (sala, clave)
+        return conflictos
+
+    def retirar(self, servicio: Servicio) -> bool:
+        """
+        Retira un servicio del programa.
+
+        Args:
+            servicio: Servicio a retirar
+
+        Returns:
+            True si estaba registrado
+        """
+        registro = self._registrados.pop(id(servicio), None)
+        if registro is None:
+            return False
+        sala, clave = registro
+        self._arboles[sala].eliminar(clave)
+        servicio.cancelar_suscripcion(self._al_cambiar)
+        return True
+
+    def buscar_horarios_libres(self, sala: str, duracion: timedelta, desde: datetime,
+                               hasta: datetime, limite: int = 10) -> List[datetime]:
+        """
+        Busca horarios de inicio libres en una sala.
+
+        Args:
+            sala: Nombre de la sala (ver sala_de)
+            duracion: Duración requerida
+            desde: Inicio de la ventana de búsqueda
+            hasta: Fin de la ventana de búsqueda
+            limite: Cantidad máxima de horarios
+
+        Returns:
+            Lista de horarios de inicio (el comienzo de cada hueco libre)
+        """
+        requerido = duracion + self._margen
+        arbol = self._arboles.get(sala)
+        ocupados = arbol.solapamientos(desde, hasta) if arbol is not None else []
+
+        libres = []
+        cursor = desde
+        for inicio, fin, _ in ocupados:
+            if inicio - cursor >= requerido:
+                libres.append(cursor)
+                if len(libres) >= limite:
+                    return libres
+            cursor = max(cursor, fin)
+        if hasta - cursor >= requerido and len(libres) < limite:
+            libres.append(cursor)
+        return libres
+
+    def validar_programa(self, servicios: List[Servicio],
+                         incluir_registrados: bool = True) -> List[Tuple[str, str]]:
+        """
+        Valida un programa completo en una sola pasada (barrido por sala).
+
+        Args:
+            servicios: Servicios del programa a validar
+            incluir_registrados: Si también se compara con el programa vigente
+
+        Returns:
+            Lista de pares (codigo, codigo) que se solapan
+        """
+        intervalos = []
+        for servicio in servicios:
+            inicio, fin = self.intervalo_de(servicio)
+            intervalos.append((self.sala_de(servicio), inicio, fin, servicio.codigo))
+        intervalos.sort()
+
+        conflictos = []
+        sala_actual = None
+        activos = []  # montículo de (fin, codigo)
+        for sala, inicio, fin, codigo in intervalos:
+            if sala != sala_actual:
+                sala_actual, activos = sala, []
+            while activos and activos[0][0] <= inicio:
+                heapq.heappop(activos)
+            conflictos.extend((otro, codigo) for _, otro in activos)
+            heapq.heappush(activos, (fin, codigo))
+
+            if incluir_registrados and sala in self._arboles:
+                conflictos.extend((dato.codigo, codigo)
+                                  for _, _, dato in self._arboles[sala].solapamientos(inicio, fin)
+                                  if dato.codigo != codigo)
+        return conflictos
+
+    def _al_cambiar(self, servicio: Servicio, atributo: str, anterior, nuevo):
+        """Reubica el servicio si cambió su horario o sala; lo libera si se cancela."""
+        if atributo == "estado" and nuevo == "Cancelado":
+            self.retirar(servicio)
+        elif atributo in ("fecha", "sala", "duracion_horas"):
+            # Se mueve entre árboles sin tocar la suscripción: este método se
+            # ejecuta mientras el servicio recorre a sus suscriptores
+            registro = self._registrados.pop(id(servicio), None)
+            if registro is not None:
+                sala, clave = registro
+                self._arboles[sala].eliminar(clave)
+            if servicio.estado == "Cancelado":
+                return
+            conflictos = self._ubicar(servicio, permitir_conflictos=True)
+            if conflictos:
+                print(f"   Advertencia: '{servicio.codigo}' ahora se solapa con "
+                      f"{[otro.codigo for otro in conflictos]}")
+
+    def __str__(self) -> str:
+        """Representación en string del planificador."""
+        return (f"PlanificadorSalas: {len(self._arboles)} salas | "
+                f"{len(self._registrados)} funciones programadas")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import time
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+    from gestor_servicios import GestorServicios
+
+    print("PRUEBA DE LA PROGRAMACIÓN DE SALAS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    gestor.planificador = PlanificadorSalas(margen_minutos=15)
+
+    print("\n1. Programando funciones...")
+    gestor.agregar_servicio(ServicioCine("C001", "Estreno", datetime(2024, 12, 15, 18, 0),
+                                         8.50, "Dune: Part Two", 1))
+    gestor.agregar_servicio(ServicioCine("C002", "Noche", datetime(2024, 12, 15, 21, 0),
+                                         8.50, "Avatar 3", 1))
+    gestor.agregar_servicio(ServicioEvento("E001", "Rock", datetime(2024, 12, 15, 20, 0),
+                                           45.00, "Los Rockeros", "Concierto", 2.5))
+
+    print("\n2. Intentando programar una función solapada en la Sala 1...")
+    try:
+        gestor.agregar_servicio(ServicioCine("C003", "Choque", datetime(2024, 12, 15, 20, 0),
+                                             8.50, "Oppenheimer", 1))
+    except ValueError as e:
+        print(f"   Rechazada: {e}")
+
+    print("\n3. Horarios libres de 2 horas en la Sala 1 (15/12, 10:00 a 24:00):")
+    for horario in gestor.planificador.buscar_horarios_libres(
+            "Sala 1", timedelta(hours=2), datetime(2024, 12, 15, 10, 0), datetime(2024, 12, 16, 0, 0)):
+        print(f"   {horario.strftime('%H:%M')}")
+
+    print("\n4. Validando un programa semanal de 5,000 funciones en 20 salas...")
+    generador = random.Random(31)
+    programa = []
+    for i in range(5000):
+        inicio_funcion = datetime(2025, 1, 6, 10, 0) + timedelta(minutes=generador.randrange(0, 7 * 24 * 60, 30))
+        programa.append(ServicioCine(f"P{i:05d}", "Función", inicio_funcion, 8.50, "Película",
+                                     generador.randint(1, 20)))
+    inicio = time.perf_counter()
+    conflictos = gestor.planificador.validar_programa(programa)
+    print(f"   {len(conflictos)} conflictos encontrados en "
+          f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+    print(f"   {gestor.planificador}")
@@ -0,0 +1,341 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el MotorRecomendaciones: "quienes compraron X también compraron Y".
+Los elementos son las películas (ServicioCine.pelicula) y los artistas
+(ServicioEvento.artista). El motor mantiene una matriz dispersa de
+coocurrencias (cuántos clientes compraron ambos elementos) que se actualiza con
+cada VentaRealizada y VentaCancelada del bus, y guarda los N vecinos más
+similares de cada elemento. reconstruir y precalcular dejan todos los vecinos
+calculados; una venta solo marca las filas que cambió, que se recalculan en su
+próxima consulta (recalcularlas en cada venta costaría una fila por elemento
+del cliente), así que la consulta normal devuelve una lista ya calculada.
+"""
+
+import heapq
+import math
+from typing import List
+from eventos import BusEventos, VentaRealizada, VentaCancelada
+from gestor_servicios import GestorServicios
+
+
+class MotorRecomendaciones:
+    """
+    Clase que calcula recomendaciones por coocurrencia de compras.
+    La similitud entre dos elementos es el coseno: clientes en común dividido
+    por la raíz del producto de los compradores de cada uno.
+    """
+
+    def __init__(self, vecinos: int = 10, max_elementos_cliente: int = 50):
+        """
+        Constructor del MotorRecomendaciones.
+
+        Args:
+            vecinos: Cantidad de vecinos guardados por elemento
+            max_elementos_cliente: Elementos distintos que se recuerdan por cliente
+                (acota los pares generados por clientes con historiales enormes)
+        """
+        if vecinos < 1 or max_elementos_cliente < 1:
+            raise ValueError("Los vecinos y el máximo por cliente deben ser positivos")
+        self._n_vecinos = vecinos
+        self._max_elementos_cliente = max_elementos_cliente
+        self._reiniciar()
+
+    # Property para elementos
+    @property
+    def elementos(self) -> int:
+        """Obtiene la cantidad de películas y artistas conocidos."""
+        return len(self._titulos)
+
+    # Property para pares
+    @property
+    def pares(self) -> int:
+        """Obtiene la cantidad de celdas no nulas de la matriz de coocurrencias."""
+        return sum(len(fila) for fila in self._coocurrencias)
+
+    def conectar(self, bus: BusEventos):
+        """
+        Suscribe el motor a las ventas y devoluciones del bus.
+
+        Args:
+            bus: Bus de eventos del gestor
+        """
+        bus.suscribir(self._al_vender, (VentaRealizada,))
+        bus.suscribir(self._al_cancelar, (VentaCancelada,))
+
+    def reconstruir(self, gestor: GestorServicios) -> int:
+        """
+        Reconstruye la matriz a partir de los historiales de todos los clientes.
+        Las compras de servicios que ya no están en el gestor se ignoran.
+
+        Args:
+            gestor: Gestor con clientes y servicios
+
+        Returns:
+            Cantidad de compras procesadas
+        """
+        titulos = {}
+        for servicio in gestor._servicios:
+            titulos[servicio.codigo] = (servicio.pelicula if hasattr(servicio, '_asientos_vendidos')
+                                        else servicio.artista)
+        self._reiniciar()
+        self._titulo_de.update(titulos)
+        procesadas = 0
+        for cliente in gestor._clientes:
+            # Elementos distintos del cliente con sus entradas, conservando los más recientes
+            propios = {}
+            for compra in cliente._historial_compras:
+                titulo = titulos.get(compra["codigo"])
+                if titulo is not None:
+                    propios[titulo] = propios.pop(titulo, 0) + compra["cantidad"]
+                    procesadas += 1
+            if not propios:
+                continue
+            for titulo, entradas in propios.items():
+                self._entradas[(cliente.cedula, self._id(titulo))] = entradas
+            ids = [self._id(t) for t in list(propios)[-self._max_elementos_cliente:]]
+            for i in ids:
+                self._compradores[i] += 1
+                fila = self._coocurrencias[i]
+                for j in ids:
+                    if j != i:
+                        fila[j] = fila.get(j, 0) + 1
+            self._por_cliente[cliente.cedula] = ids
+        self._pendientes = set(range(len(self._titulos)))
+        self.precalcular()
+        return procesadas
+
+    def precalcular(self):
+        """Recalcula los vecinos de todos los elementos con cambios pendientes."""
+        for i in list(self._pendientes):
+            self._calcular_vecinos(i)
+
+    def registrar(self, cedula: str, titulo: str, cantidad: int = 1):
+        """
+        Incorpora una compra: si el elemento es nuevo para el cliente, suma una
+        coocurrencia con cada elemento que ya tenía. Al superar el máximo por
+        cliente se descuenta el elemento más antiguo, igual que en reconstruir.
+
+        Args:
+            cedula: Cédula del comprador
+            titulo: Película o artista comprado
+            cantidad: Entradas compradas
+        """
+        i = self._id(titulo)
+        self._entradas[(cedula, i)] = self._entradas.get((cedula, i), 0) + cantidad
+        propios = self._por_cliente.setdefault(cedula, [])
+        if i in propios:
+            # Repetido: pasa a ser el más reciente
+            propios.remove(i)
+            propios.append(i)
+            return
+        self._compradores[i] += 1
+        fila = self._coocurrencias[i]
+        for j in propios:
+            fila[j] = fila.get(j, 0) + 1
+            otra = self._coocurrencias[j]
+            otra[i] = otra.get(i, 0) + 1
+            self._pendientes.add(j)
+        self._pendientes.add(i)
+        propios.append(i)
+        if len(propios) > self._max_elementos_cliente:
+            self._olvidar(propios.pop(0), propios)
+
+    def registrar_devolucion(self, cedula: str, titulo: str, cantidad: int):
+        """
+        Descuenta entradas devueltas: si el cliente ya no tiene entradas del
+        elemento, se quitan sus coocurrencias como al salir de su ventana.
+
+        Args:
+            cedula: Cédula del cliente
+            titulo: Película o artista devuelto
+            cantidad: Entradas devueltas
+        """
+        i = self._ids.get(titulo)
+        clave = (cedula, i)
+        if i is None or clave not in self._entradas:
+            return
+        restantes = self._entradas[clave] - cantidad
+        if restantes > 0:
+            self._entradas[clave] = restantes
+            return
+        del self._entradas[clave]
+        propios = self._por_cliente.get(cedula, [])
+        if i in propios:
+            propios.remove(i)
+            self._olvidar(i, propios)
+
+    def _olvidar(self, i: int, propios: list):
+        """Descuenta un elemento que sale de la ventana de un cliente."""
+        self._compradores[i] -= 1
+        fila = self._coocurrencias[i]
+        for j in propios:
+            for origen, destino in ((fila, j), (self._coocurrencias[j], i)):
+                if origen[destino] == 1:
+                    del origen[destino]
+                else:
+                    origen[destino] -= 1
+            self._pendientes.add(j)
+        self._pendientes.add(i)
+
+    def recomendar(self, titulo: str, n: int = 5) -> List[tuple]:
+        """
+        Obtiene los elementos más comprados junto con uno dado.
+
+        Args:
+            titulo: Película o artista
+            n: Cantidad de recomendaciones (como máximo los vecinos guardados)
+
+        Returns:
+            Lista de tuplas (título, similitud)
+        """
+        i = self._ids.get(titulo)
+        if i is None:
+            return []
+        if i in self._pendientes:
+            self._calcular_vecinos(i)
+        return self._vecinos[i][:n]
+
+    def recomendar_cliente(self, cedula: str, n: int = 5) -> List[tuple]:
+        """
+        Recomienda a un cliente sumando los vecinos de lo que ya compró.
+
+        Args:
+            cedula: Cédula del cliente
+            n: Cantidad de recomendaciones
+
+        Returns:
+            Lista de tuplas (título, puntaje), sin elementos ya comprados
+        """
+        propios = self._por_cliente.get(cedula, [])
+        comprados = {self._titulos[i] for i in propios}
+        puntajes = {}
+        for i in propios:
+            for titulo, similitud in self.recomendar(self._titulos[i], self._n_vecinos):
+                if titulo not in comprados:
+                    puntajes[titulo] = puntajes.get(titulo, 0.0) + similitud
+        return heapq.nlargest(n, puntajes.items(), key=lambda par: par[1])
+
+    def _al_vender(self, venta: VentaRealizada):
+        """Registra la venta publicada en el bus."""
+        self._titulo_de[venta.codigo] = venta.titulo
+        self.registrar(venta.cedula, venta.titulo, venta.cantidad)
+
+    def _al_cancelar(self, cancelacion: VentaCancelada):
+        """Registra la devolución publicada en el bus."""
+        titulo = self._titulo_de.get(cancelacion.codigo)
+        if titulo is not None:
+            self.registrar_devolucion(cancelacion.cedula, titulo, cancelacion.cantidad)
+
+    def _id(self, titulo: str) -> int:
+        """Obtiene (o asigna) el número de un elemento."""
+        i = self._ids.get(titulo)
+        if i is None:
+            i = self._ids[titulo] = len(self._titulos)
+            self._titulos.append(titulo)
+            self._compradores.append(0)
+            self._coocurrencias.append({})
+            self._vecinos.append([])
+        return i
+
+    def _calcular_vecinos(self, i: int):
+        """Recalcula los vecinos de un elemento a partir de su fila."""
+        compradores = self._compradores
+        base = compradores[i]
+        similitudes = ((j, comunes / math.sqrt(base * compradores[j]))
+                       for j, comunes in self._coocurrencias[i].items())
+        mejores = heapq.nlargest(self._n_vecinos, similitudes, key=lambda par: par[1])
+        self._vecinos[i] = [(self._titulos[j], round(similitud, 4)) for j, similitud in mejores]
+        self._pendientes.discard(i)
+
+    def _reiniciar(self):
+        """Deja el motor vacío."""
+        self._ids = {}
+        self._titulos = []
+        self._compradores = []
+        # Fila dispersa por elemento: número de otro elemento -> clientes en común
+        self._coocurrencias = []
+        self._vecinos = []
+        self._pendientes = set()
+        self._por_cliente = {}
+        # Entradas vigentes por (cédula, elemento) y título de cada código de servicio
+        self._entradas = {}
+        self._titulo_de = {}
+
+    def __str__(self) -> str:
+        """Representación en string del motor."""
+        return (f"MotorRecomendaciones: {self.elementos} elementos | {self.pares} pares | "
+                f"{len(self._por_cliente)} clientes | {len(self._pendientes)} pendientes")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import random
+    import time
+    from contextlib import redirect_stdout
+    from datetime import datetime, timedelta
+    from cliente import Cliente
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+
+    print("PRUEBA DEL MOTOR DE RECOMENDACIONES")
+
+    aleatorio = random.Random(8)
+    gestor = GestorServicios("CineMax Entertainment")
+    # Dos "gustos": acción + rock y animación + comedia
+    grupos = [["Dune", "Gladiator II", "Mad Max", "Los Rockeros", "Metal Andino"],
+              ["Moana 2", "Wicked", "Intensamente 2", "Comediantes Unidos", "Ballet Nacional"]]
+    artistas = {"Los Rockeros", "Metal Andino", "Comediantes Unidos", "Ballet Nacional"}
+    fecha = datetime(2025, 3, 1, 18, 0)
+    por_titulo = {}
+    for i, titulo in enumerate(t for grupo in grupos for t in grupo):
+        if titulo in artistas:
+            servicio = ServicioEvento(f"E{i:03d}", f"Show {titulo}", fecha + timedelta(days=i),
+                                      40.0, titulo, "Concierto", 2.0)
+        else:
+            servicio = ServicioCine(f"C{i:03d}", f"Función {titulo}", fecha + timedelta(days=i),
+                                    8.5, titulo, i % 10 + 1)
+        gestor._servicios.append(servicio)
+        por_titulo[titulo] = servicio
+
+    for i in range(20_000):
+        cliente = Cliente(f"09{i:08d}", "Cliente", f"N{i}", f"c{i}@email.com", "0987654321")
+        gusto = grupos[i % 2]
+        for _ in range(aleatorio.randint(1, 6)):
+            grupo = gusto if aleatorio.random() < 0.85 else grupos[1 - i % 2]
+            servicio = por_titulo[aleatorio.choice(grupo)]
+            cliente._historial_compras.append({"servicio": servicio.nombre, "codigo": servicio.codigo,
+                                               "cantidad": 1, "total": 8.5, "fecha": servicio.fecha})
+        gestor._clientes.append(cliente)
+
+    print("\n1. Reconstrucción completa:")
+    motor = MotorRecomendaciones()
+    inicio = time.perf_counter()
+    compras = motor.reconstruir(gestor)
+    print(f"   {compras} compras en {time.perf_counter() - inicio:.2f} s | {motor}")
+    print(f"   Quienes compraron 'Dune' también compraron: {motor.recomendar('Dune', 3)}")
+    print(f"   Quienes vieron a 'Comediantes Unidos': {motor.recomendar('Comediantes Unidos', 3)}")
+
+    print("\n2. Actualización incremental desde el bus:")
+    gestor.bus = BusEventos()
+    motor.conectar(gestor.bus)
+    nuevo = Cliente("0999999999", "Ana", "Nueva", "ana@email.com", "0987654321")
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_cliente(nuevo)
+        gestor.realizar_venta("C000", nuevo.cedula, 2)
+    print(f"   Tras comprar 'Dune': {motor.recomendar_cliente(nuevo.cedula, 3)}")
+    with redirect_stdout(io.StringIO()):
+        gestor.realizar_venta("E003", nuevo.cedula, 1)
+    print(f"   Tras ver a 'Los Rockeros': {motor.recomendar_cliente(nuevo.cedula, 3)}")
+
+    print("\n3. Costo de la consulta:")
+    repeticiones = 100_000
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        motor.recomendar("Wicked")
+    print(f"   {(time.perf_counter() - inicio) / repeticiones * 1e6:.2f} µs por consulta")
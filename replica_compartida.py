@@ -0,0 +1,320 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la réplica de solo lectura en memoria compartida.
+El proceso de ventas publica los contadores y precios de cada servicio en un
+bloque de multiprocessing.shared_memory, y los procesos de reportes los leen
+sin bloqueos usando un seqlock: el escritor deja el contador de secuencia en
+impar mientras escribe, y el lector reintenta si la secuencia era impar o
+cambió durante su copia. Así los reportes pesados corren en otros núcleos sin
+competir por el intérprete del proceso de ventas.
+
+Los lectores deben ser procesos hijos del escritor (o usar Python 3.13+),
+porque antes de esa versión cada proceso que abre el bloque lo registra en el
+rastreador de recursos de multiprocessing.
+"""
+
+import struct
+from multiprocessing import shared_memory
+from gestor_servicios import GestorServicios
+
+ESTADOS = ("Disponible", "Agotado", "Cancelado", "En proceso")
+TIPOS = ("Cine", "Evento")
+LARGO_CODIGO = 16
+
+# secuencia, capacidad, servicios publicados, ventas totales
+ENCABEZADO = struct.Struct("<QIId")
+# código, precio por entrada, vendidas, capacidad, estado, tipo
+REGISTRO = struct.Struct(f"<{LARGO_CODIGO}sdIIBB6x")
+
+
+def _abrir_memoria(nombre: str):
+    """Abre un bloque existente sin que este proceso se haga cargo de eliminarlo."""
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Antes de Python 3.13 no existe el parámetro track
+        return shared_memory.SharedMemory(name=nombre)
+
+
+class PublicadorReplica:
+    """
+    Clase que publica el estado de ventas del gestor en memoria compartida.
+    Observa los servicios y, en cada publicación, solo reescribe los
+    registros de los servicios que cambiaron desde la anterior.
+    """
+
+    def __init__(self, gestor: GestorServicios, capacidad: int = None, nombre: str = None):
+        """
+        Constructor del PublicadorReplica.
+
+        Args:
+            gestor: Gestor de ventas cuyo estado se publica
+            capacidad: Máximo de servicios del bloque (por defecto el doble de los actuales)
+            nombre: Nombre del bloque compartido (por defecto lo elige el sistema)
+        """
+        if capacidad is None:
+            capacidad = max(1024, 2 * len(gestor._servicios))
+        if capacidad < len(gestor._servicios):
+            raise ValueError("La capacidad no alcanza para los servicios actuales")
+        self._gestor = gestor
+        self._capacidad = capacidad
+        self._memoria = shared_memory.SharedMemory(
+            name=nombre, create=True, size=ENCABEZADO.size + REGISTRO.size * capacidad)
+        self._secuencia = 0
+        self._servicios = []
+        self._posicion = {}
+        self._sucios = set()
+        ENCABEZADO.pack_into(self._memoria.buf, 0, 0, capacidad, 0, 0.0)
+
+        for servicio in gestor._servicios:
+            self._agregar(servicio)
+        gestor.suscribir_altas(self._al_agregar)
+        gestor.suscribir_bajas(self._al_retirar)
+        self.publicar()
+
+    # Property para nombre
+    @property
+    def nombre(self) -> str:
+        """Obtiene el nombre del bloque compartido (para abrir lectores)."""
+        return self._memoria.name
+
+    # Property para version
+    @property
+    def version(self) -> int:
+        """Obtiene la versión de la última publicación."""
+        return self._secuencia // 2
+
+    def publicar(self) -> int:
+        """
+        Escribe en el bloque los servicios que cambiaron y las ventas totales.
+
+        Returns:
+            Cantidad de registros reescritos
+        """
+        if len(self._servicios) > self._capacidad:
+            raise ValueError(f"La réplica admite {self._capacidad} servicios; "
+                             f"cree un publicador con más capacidad")
+        buf = self._memoria.buf
+        # Secuencia impar: los lectores saben que hay una escritura en curso
+        self._secuencia += 1
+        struct.pack_into("<Q", buf, 0, self._secuencia)
+        for posicion in self._sucios:
+            servicio = self._servicios[posicion]
+            if hasattr(servicio, '_asientos_vendidos'):
+                vendidas, tipo = servicio._asientos_vendidos, 0
+            else:
+                vendidas, tipo = servicio._entradas_vendidas, 1
+            precio = servicio.calcular_precio_total()
+            if vendidas and getattr(servicio, 'es_multizona', False):
+                # Precio promedio, para que precio * vendidas dé los ingresos por zona
+                precio = servicio.calcular_ingresos() / vendidas
+            REGISTRO.pack_into(buf, ENCABEZADO.size + posicion * REGISTRO.size,
+                               servicio.codigo.encode("utf-8")[:LARGO_CODIGO],
+                               precio, vendidas,
+                               servicio._capacidad_total, ESTADOS.index(servicio.estado), tipo)
+        reescritos = len(self._sucios)
+        self._sucios.clear()
+        ENCABEZADO.pack_into(buf, 0, self._secuencia, self._capacidad, len(self._servicios),
+                             self._gestor.ventas_totales)
+        # Secuencia par: la copia es consistente
+        self._secuencia += 1
+        struct.pack_into("<Q", buf, 0, self._secuencia)
+        return reescritos
+
+    def cerrar(self):
+        """Cierra y elimina el bloque compartido."""
+        for servicio in self._servicios:
+            servicio.cancelar_suscripcion(self._al_cambiar)
+        self._memoria.close()
+        self._memoria.unlink()
+
+    def _agregar(self, servicio):
+        """Reserva el registro del servicio y empieza a observarlo."""
+        posicion = len(self._servicios)
+        self._servicios.append(servicio)
+        self._posicion[id(servicio)] = posicion
+        self._sucios.add(posicion)
+        servicio.suscribir_cambios(self._al_cambiar)
+
+    def _al_agregar(self, objeto):
+        """Incorpora los servicios agregados al gestor."""
+        if hasattr(objeto, 'calcular_precio_total'):
+            self._agregar(objeto)
+
+    def _al_retirar(self, servicios: list):
+        """Compacta los registros; la próxima publicación reescribe todos."""
+        ids = {id(servicio) for servicio in servicios}
+        for servicio in servicios:
+            servicio.cancelar_suscripcion(self._al_cambiar)
+        self._servicios = [s for s in self._servicios if id(s) not in ids]
+        self._posicion = {id(s): p for p, s in enumerate(self._servicios)}
+        self._sucios = set(range(len(self._servicios)))
+
+    def _al_cambiar(self, servicio, atributo: str, anterior, nuevo):
+        """Marca el registro del servicio para la próxima publicación."""
+        self._sucios.add(self._posicion[id(servicio)])
+
+    def __str__(self) -> str:
+        """Representación en string del publicador."""
+        return (f"PublicadorReplica '{self.nombre}': versión {self.version} | "
+                f"{len(self._servicios)}/{self._capacidad} servicios | "
+                f"{len(self._sucios)} pendientes")
+
+
+class LectorReplica:
+    """
+    Clase que lee la réplica desde otro proceso sin bloquear al escritor.
+    Cada lectura copia el bloque completo y la descarta si el escritor la
+    modificó mientras se copiaba.
+    """
+
+    def __init__(self, nombre: str, reintentos: int = 10_000):
+        """
+        Constructor del LectorReplica.
+
+        Args:
+            nombre: Nombre del bloque publicado por PublicadorReplica
+            reintentos: Máximo de intentos antes de dar la lectura por fallida
+        """
+        self._memoria = _abrir_memoria(nombre)
+        self._reintentos = reintentos
+        self._lecturas_repetidas = 0
+
+    # Property para lecturas_repetidas
+    @property
+    def lecturas_repetidas(self) -> int:
+        """Obtiene cuántas copias se descartaron por escrituras concurrentes."""
+        return self._lecturas_repetidas
+
+    def instantanea(self) -> tuple:
+        """
+        Obtiene una copia consistente de la réplica.
+
+        Returns:
+            Tupla (version, ventas_totales, registros), donde cada registro es
+            (codigo, tipo, precio_total, vendidas, capacidad, estado)
+        """
+        buf = self._memoria.buf
+        for _ in range(self._reintentos):
+            secuencia = struct.unpack_from("<Q", buf, 0)[0]
+            if secuencia % 2:
+                self._lecturas_repetidas += 1
+                continue
+            _, _, cantidad, ventas = ENCABEZADO.unpack_from(buf, 0)
+            datos = bytes(buf[ENCABEZADO.size:ENCABEZADO.size + cantidad * REGISTRO.size])
+            if struct.unpack_from("<Q", buf, 0)[0] != secuencia:
+                self._lecturas_repetidas += 1
+                continue
+            registros = [(codigo.rstrip(b"\0").decode("utf-8"), TIPOS[tipo], precio, vendidas,
+                          capacidad, ESTADOS[estado])
+                         for codigo, precio, vendidas, capacidad, estado, tipo
+                         in REGISTRO.iter_unpack(datos)]
+            return secuencia // 2, ventas, registros
+        raise ValueError("No se pudo obtener una copia consistente de la réplica")
+
+    def calcular_ingresos_totales(self) -> float:
+        """
+        Equivale a GestorServicios.calcular_ingresos_totales con todos los servicios.
+
+        Returns:
+            Total de ingresos calculados
+        """
+        _, _, registros = self.instantanea()
+        return round(sum(precio * vendidas for _, _, precio, vendidas, _, _ in registros), 2)
+
+    def generar_reporte(self) -> str:
+        """
+        Genera un reporte de ocupación e ingresos a partir de la réplica.
+
+        Returns:
+            String con el reporte formateado
+        """
+        version, ventas, registros = self.instantanea()
+        reporte = f"\n{'=' * 70}\n"
+        reporte += f"REPORTE DE RÉPLICA (versión {version})\n"
+        reporte += f"{'=' * 70}\n"
+        total_ingresos = 0.0
+        for codigo, tipo, precio, vendidas, capacidad, estado in registros:
+            ingresos = precio * vendidas
+            total_ingresos += ingresos
+            reporte += (f"{codigo:<10} {tipo:<7} {estado:<11} {vendidas:>6}/{capacidad:<6} "
+                        f"${precio:>8.2f}  ${ingresos:>12.2f}\n")
+        reporte += f"{'=' * 70}\n"
+        reporte += f"TOTAL DE SERVICIOS: {len(registros)}\n"
+        reporte += f"INGRESOS TOTALES: ${total_ingresos:.2f}\n"
+        reporte += f"VENTAS REGISTRADAS: ${ventas:.2f}\n"
+        reporte += f"{'=' * 70}\n"
+        return reporte
+
+    def cerrar(self):
+        """Cierra el acceso al bloque (el escritor se encarga de eliminarlo)."""
+        self._memoria.close()
+
+    def __str__(self) -> str:
+        """Representación en string del lector."""
+        return f"LectorReplica '{self._memoria.name}': {self._lecturas_repetidas} lecturas repetidas"
+
+
+def _ingresos_en_proceso(nombre: str) -> tuple:
+    """Tarea de un proceso de reportes: lee la réplica varias veces."""
+    lector = LectorReplica(nombre)
+    resultados = [lector.calcular_ingresos_totales() for _ in range(200)]
+    version = lector.instantanea()[0]
+    lector.cerrar()
+    return version, resultados[-1], lector.lecturas_repetidas
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import multiprocessing
+    from contextlib import redirect_stdout
+    from datetime import datetime, timedelta
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+    from cliente import Cliente
+
+    print("PRUEBA DE LA RÉPLICA EN MEMORIA COMPARTIDA")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    with redirect_stdout(io.StringIO()):
+        for i in range(2000):
+            fecha = datetime(2024, 12, 1, 10, 0) + timedelta(hours=i)
+            if i % 2:
+                gestor.agregar_servicio(ServicioEvento(f"E{i:04d}", f"Evento {i}", fecha, 45.0,
+                                                       f"Artista {i}", "Concierto", 2.5, "VIP"))
+            else:
+                gestor.agregar_servicio(ServicioCine(f"C{i:04d}", f"Función {i}", fecha, 8.5,
+                                                     f"Película {i}", i % 10 + 1))
+        gestor.agregar_cliente(Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321"))
+
+    publicador = PublicadorReplica(gestor)
+    print(f"\n1. {publicador}")
+
+    print("\n2. Ventas en el proceso principal mientras 2 procesos leen la réplica:")
+    with multiprocessing.Pool(2) as pool:
+        tareas = [pool.apply_async(_ingresos_en_proceso, (publicador.nombre,)) for _ in range(2)]
+        with redirect_stdout(io.StringIO()):
+            for i in range(500):
+                gestor.realizar_venta(f"C{(i * 2) % 2000:04d}", "0912345678", 1)
+                if i % 10 == 0:
+                    publicador.publicar()
+        for tarea in tareas:
+            version, ingresos, repetidas = tarea.get()
+            print(f"   Lector: versión {version} | ingresos ${ingresos:,.2f} | "
+                  f"{repetidas} lecturas repetidas")
+
+    print(f"\n3. Publicación final: {publicador.publicar()} registros reescritos | {publicador}")
+    lector = LectorReplica(publicador.nombre)
+    print(f"   Ingresos en la réplica: ${lector.calcular_ingresos_totales():,.2f}")
+    print(f"   Ingresos en el gestor:  ${gestor.calcular_ingresos_totales(gestor._servicios):,.2f}")
+    print("\n4. Primeras líneas del reporte de la réplica:")
+    print("\n".join(lector.generar_reporte().splitlines()[:6]))
+
+    lector.cerrar()
+    publicador.cerrar()
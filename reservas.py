@@ -0,0 +1,340 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el sistema de reservas temporales (retenciones) de entradas.
+Permite retener asientos mientras el cliente paga, confirmarlos o cancelarlos,
+y libera automáticamente las retenciones vencidas usando una rueda de temporizadores.
+"""
+
+import time
+from gestor_servicios import GestorServicios
+
+
+class RuedaTemporizadores:
+    """
+    Rueda de temporizadores (hashed timing wheel).
+    Programar y cancelar cuestan O(1); al avanzar el reloj solo se revisan
+    las ranuras de los ticks transcurridos, nunca la colección completa.
+    """
+
+    def __init__(self, resolucion: float = 1.0, num_ranuras: int = 512, inicio: float = 0.0):
+        """
+        Constructor de la RuedaTemporizadores.
+
+        Args:
+            resolucion: Duración de cada tick en segundos
+            num_ranuras: Número de ranuras de la rueda
+            inicio: Instante inicial del reloj
+        """
+        if resolucion <= 0:
+            raise ValueError("La resolución debe ser positiva")
+        if num_ranuras < 1:
+            raise ValueError("La rueda debe tener al menos una ranura")
+        self._resolucion = resolucion
+        self._ranuras = [{} for _ in range(num_ranuras)]
+        self._tick_actual = int(inicio // resolucion)
+        self._ubicacion = {}  # clave -> índice de ranura
+
+    # Property para resolucion
+    @property
+    def resolucion(self) -> float:
+        """Obtiene la duración de cada tick en segundos."""
+        return self._resolucion
+
+    def __len__(self) -> int:
+        """Cantidad de temporizadores pendientes."""
+        return len(self._ubicacion)
+
+    def programar(self, clave, vencimiento: float):
+        """
+        Programa (o reprograma) un temporizador.
+
+        Args:
+            clave: Identificador del temporizador
+            vencimiento: Instante en que debe vencer
+        """
+        if clave in self._ubicacion:
+            self.cancelar(clave)
+        # Redondeo hacia arriba: un temporizador nunca vence antes de tiempo
+        tick = -int(-vencimiento // self._resolucion)
+        tick = max(tick, self._tick_actual + 1)
+        indice = tick % len(self._ranuras)
+        self._ranuras[indice][clave] = tick
+        self._ubicacion[clave] = indice
+
+    def cancelar(self, clave) -> bool:
+        """
+        Cancela un temporizador pendiente.
+
+        Args:
+            clave: Identificador del temporizador
+
+        Returns:
+            True si estaba programado, False en caso contrario
+        """
+        indice = self._ubicacion.pop(clave, None)
+        if indice is None:
+            return False
+        del self._ranuras[indice][clave]
+        return True
+
+    def avanzar(self, ahora: float) -> list:
+        """
+        Avanza el reloj de la rueda y recoge los temporizadores vencidos.
+
+        Args:
+            ahora: Instante actual
+
+        Returns:
+            Lista de claves vencidas
+        """
+        objetivo = int(ahora // self._resolucion)
+        if objetivo <= self._tick_actual:
+            return []
+
+        num_ranuras = len(self._ranuras)
+        pasos = min(objetivo - self._tick_actual, num_ranuras)
+        vencidos = []
+        for paso in range(1, pasos + 1):
+            ranura = self._ranuras[(self._tick_actual + paso) % num_ranuras]
+            if not ranura:
+                continue
+            # Las entradas de vueltas futuras permanecen en la ranura
+            listos = [clave for clave, tick in ranura.items() if tick <= objetivo]
+            for clave in listos:
+                del ranura[clave]
+                del self._ubicacion[clave]
+            vencidos.extend(listos)
+
+        self._tick_actual = objetivo
+        return vencidos
+
+
+class GestorReservas:
+    """
+    Clase que gestiona reservas temporales de entradas sobre un GestorServicios.
+    Las entradas retenidas no se pueden vender a otros clientes hasta que la
+    reserva se confirma, se cancela o vence.
+    """
+
+    TTL_PREDETERMINADO = 600  # 10 minutos
+
+    def __init__(self, gestor: GestorServicios, ttl_segundos: float = TTL_PREDETERMINADO,
+                 reloj=time.monotonic, resolucion: float = 1.0):
+        """
+        Constructor del GestorReservas.
+
+        Args:
+            gestor: Gestor de servicios sobre el que se reservan entradas
+            ttl_segundos: Tiempo de vida de cada reserva
+            reloj: Función que retorna el instante actual en segundos
+            resolucion: Resolución de la rueda de temporizadores
+        """
+        self._gestor = gestor
+        self._ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._rueda = RuedaTemporizadores(resolucion, inicio=reloj())
+        self._reservas = {}
+        self._siguiente_id = 1
+
+    # Property para ttl_segundos
+    @property
+    def ttl_segundos(self) -> float:
+        """Obtiene el tiempo de vida de las reservas."""
+        return self._ttl_segundos
+
+    @ttl_segundos.setter
+    def ttl_segundos(self, valor: float):
+        """Establece el tiempo de vida con validación."""
+        if valor <= 0:
+            raise ValueError("El tiempo de vida debe ser positivo")
+        self._ttl_segundos = valor
+
+    # Property para reservas_activas
+    @property
+    def reservas_activas(self) -> int:
+        """Obtiene la cantidad de reservas pendientes."""
+        return len(self._reservas)
+
+    def retener(self, codigo_servicio: str, cedula_cliente: str, cantidad: int,
+                zona: str = None):
+        """
+        Retiene entradas de un servicio para un cliente.
+
+        Args:
+            codigo_servicio: Código del servicio
+            cedula_cliente: Cédula del cliente
+            cantidad: Cantidad de entradas a retener
+            zona: Zona de un evento con zonas (None para la zona por defecto)
+
+        Returns:
+            Identificador de la reserva o None si no fue posible
+        """
+        self.procesar_vencimientos()
+
+        servicio = self._gestor.buscar_servicio(codigo_servicio)
+        if not servicio or not hasattr(servicio, 'retener_entradas'):
+            print(f"   Servicio '{codigo_servicio}' no admite reservas")
+            return None
+        if not self._gestor.buscar_cliente(cedula_cliente):
+            print(f"   Cliente con cédula '{cedula_cliente}' no encontrado")
+            return None
+        if getattr(servicio, 'es_multizona', False):
+            # La zona queda fijada en la reserva para venderse en la misma
+            zona = zona if zona is not None else servicio.zona
+            retenida = servicio.estado == "Disponible" and servicio.retener_entradas(cantidad, zona)
+        else:
+            zona = None
+            retenida = servicio.estado == "Disponible" and servicio.retener_entradas(cantidad)
+        if not retenida:
+            print(f"   No hay suficientes entradas disponibles para reservar")
+            return None
+
+        id_reserva = self._siguiente_id
+        self._siguiente_id += 1
+        vence = self._reloj() + self._ttl_segundos
+        self._reservas[id_reserva] = {
+            "servicio": servicio,
+            "cedula": cedula_cliente,
+            "cantidad": cantidad,
+            "zona": zona,
+            "vence": vence
+        }
+        self._rueda.programar(id_reserva, vence)
+        self._gestor.confirmar_operacion()
+        return id_reserva
+
+    def confirmar(self, id_reserva: int) -> bool:
+        """
+        Confirma una reserva convirtiéndola en venta.
+
+        Args:
+            id_reserva: Identificador de la reserva
+
+        Returns:
+            True si la venta se realizó, False en caso contrario
+        """
+        self.procesar_vencimientos()
+
+        reserva = self._quitar_reserva(id_reserva)
+        if reserva is None:
+            print(f"   La reserva #{id_reserva} no existe o ya venció")
+            return False
+        vendida = self._gestor.realizar_venta(reserva["servicio"].codigo, reserva["cedula"],
+                                              reserva["cantidad"], reserva["zona"])
+        if not vendida:
+            # Las entradas liberadas se publican y se ofrecen a la lista de espera
+            self._gestor.confirmar_operacion()
+            self._gestor.notificar_liberacion(reserva["servicio"])
+        return vendida
+
+    def cancelar(self, id_reserva: int) -> bool:
+        """
+        Cancela una reserva y libera sus entradas.
+
+        Args:
+            id_reserva: Identificador de la reserva
+
+        Returns:
+            True si la reserva existía, False en caso contrario
+        """
+        self.procesar_vencimientos()
+        reserva = self._quitar_reserva(id_reserva)
+        if reserva is None:
+            return False
+        self._gestor.confirmar_operacion()
+        self._gestor.notificar_liberacion(reserva["servicio"])
+        return True
+
+    def procesar_vencimientos(self) -> int:
+        """
+        Libera las reservas cuyo tiempo de vida expiró.
+
+        Returns:
+            Número de reservas vencidas
+        """
+        vencidas = self._rueda.avanzar(self._reloj())
+        liberados = {}
+        for id_reserva in vencidas:
+            reserva = self._reservas.pop(id_reserva)
+            self._liberar(reserva)
+            liberados[id(reserva["servicio"])] = reserva["servicio"]
+        if vencidas:
+            self._gestor.confirmar_operacion()
+
+        # Un solo aviso por servicio aunque venzan muchas reservas a la vez
+        for servicio in liberados.values():
+            self._gestor.notificar_liberacion(servicio)
+        return len(vencidas)
+
+    def _quitar_reserva(self, id_reserva: int):
+        """Elimina una reserva pendiente y libera sus entradas retenidas."""
+        reserva = self._reservas.pop(id_reserva, None)
+        if reserva is not None:
+            self._rueda.cancelar(id_reserva)
+            self._liberar(reserva)
+        return reserva
+
+    @staticmethod
+    def _liberar(reserva: dict):
+        """Devuelve al inventario las entradas retenidas por una reserva."""
+        if reserva["zona"] is None:
+            reserva["servicio"].liberar_retencion(reserva["cantidad"])
+        else:
+            reserva["servicio"].liberar_retencion(reserva["cantidad"], reserva["zona"])
+
+    def __str__(self) -> str:
+        """Representación en string del gestor de reservas."""
+        return (f"GestorReservas: {len(self._reservas)} reservas activas | "
+                f"TTL: {self._ttl_segundos} s")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    from datetime import datetime
+    from servicio_cine import ServicioCine
+    from cliente import Cliente
+
+    print("PRUEBA DEL SISTEMA DE RESERVAS")
+
+    # Reloj simulado para controlar el paso del tiempo
+    reloj_simulado = [0.0]
+
+    gestor = GestorServicios("CineMax Entertainment")
+    cine = ServicioCine("C001", "Estreno", datetime(2024, 12, 15, 20, 0),
+                        8.50, "Dune: Part Two", 1)
+    gestor.agregar_servicio(cine)
+    gestor.agregar_cliente(Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321"))
+
+    reservas = GestorReservas(gestor, ttl_segundos=300, reloj=lambda: reloj_simulado[0])
+    print(f"\n1. {reservas}")
+
+    print("\n2. Reteniendo 60 y 40 asientos...")
+    r1 = reservas.retener("C001", "0912345678", 60)
+    r2 = reservas.retener("C001", "0912345678", 40)
+    print(f"   Reservas creadas: #{r1}, #{r2}")
+    print(f"   Asientos disponibles: {cine.entradas_disponibles()}")
+    print(f"   Servicios disponibles: {len(gestor.listar_servicios_disponibles())}")
+
+    print("\n3. Intentando vender con la sala totalmente retenida...")
+    gestor.realizar_venta("C001", "0912345678", 1)
+
+    print("\n4. Confirmando la reserva #1...")
+    reservas.confirmar(r1)
+
+    print("\n5. Avanzando el reloj 301 segundos...")
+    reloj_simulado[0] = 301
+    print(f"   Reservas vencidas: {reservas.procesar_vencimientos()}")
+    print(f"   Asientos disponibles: {cine.entradas_disponibles()}")
+
+    print("\n6. Probando rueda con 1,000,000 de retenciones cortas...")
+    rueda = RuedaTemporizadores(resolucion=1.0)
+    inicio = time.perf_counter()
+    for i in range(1_000_000):
+        rueda.programar(i, (i % 900) + 1)
+    vencidas = sum(len(rueda.avanzar(t)) for t in range(1, 902))
+    print(f"   Vencidas: {vencidas} en {time.perf_counter() - inicio:.2f} s")
@@ -0,0 +1,316 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define la MatrizClientes: características de compra de todos los
+clientes calculadas en una sola pasada sobre sus historiales.
+La matriz es columnar (un array de dobles por característica y una fila por
+cliente), así que las operaciones por lote recorren memoria contigua en lugar
+de diccionarios. Sobre ella se calculan los puntajes RFM (recencia,
+frecuencia, monto), la segmentación de clientes y la reevaluación masiva
+del estado premium.
+"""
+
+from array import array
+from datetime import datetime
+from typing import List
+from cliente import Cliente
+from gestor_servicios import GestorServicios
+
+CARACTERISTICAS = ("recencia_dias", "frecuencia", "monetario", "pref_cine",
+                   "matine", "tres_d", "vip")
+
+# Segmentos según los puntajes RFM (de 1 a 5)
+SIN_COMPRAS = "Sin compras"
+CAMPEONES = "Campeones"
+LEALES = "Leales"
+PROMETEDORES = "Prometedores"
+EN_RIESGO = "En riesgo"
+PERDIDOS = "Perdidos"
+REGULARES = "Regulares"
+
+
+class MatrizClientes:
+    """
+    Clase que construye y consulta la matriz de características de los clientes.
+    Es una instantánea: refleja los historiales al momento de construirla.
+    """
+
+    def __init__(self, gestor: GestorServicios, referencia: datetime = None):
+        """
+        Constructor de la MatrizClientes.
+
+        Args:
+            gestor: Gestor con los clientes y servicios
+            referencia: Fecha desde la que se mide la recencia (None usa la actual)
+        """
+        self._gestor = gestor
+        self._referencia = referencia or datetime.now()
+        self._clientes = []
+        self._filas = {}  # cedula -> fila
+        self._columnas = {nombre: array("d") for nombre in CARACTERISTICAS}
+        self._puntajes = None
+        self.construir()
+
+    # Property para filas
+    @property
+    def filas(self) -> int:
+        """Obtiene la cantidad de clientes de la matriz."""
+        return len(self._clientes)
+
+    # Property para memoria
+    @property
+    def memoria(self) -> int:
+        """Obtiene los bytes ocupados por las columnas."""
+        return sum(columna.itemsize * len(columna) for columna in self._columnas.values())
+
+    def construir(self):
+        """
+        Recalcula la matriz recorriendo una vez cada historial.
+        Los atributos de los servicios se toman de una tabla armada antes del
+        recorrido; las compras de servicios ya archivados solo cuentan para
+        recencia, frecuencia y monto, y las movidas al archivo frío aportan su
+        monto y su última fecha guardados en el cliente.
+        """
+        atributos = {}
+        for servicio in self._gestor._servicios:
+            if hasattr(servicio, '_asientos_vendidos'):
+                atributos[servicio.codigo] = (True, servicio.es_3d, servicio.es_vip)
+            else:
+                atributos[servicio.codigo] = (False, False, servicio.zona == "VIP")
+
+        self._clientes = list(self._gestor._clientes)
+        self._filas = {}
+        for i, cliente in enumerate(self._clientes):
+            self._filas.setdefault(cliente.cedula, i)
+        self._columnas = columnas = {nombre: array("d") for nombre in CARACTERISTICAS}
+        recencia, frecuencia, monetario = (columnas["recencia_dias"], columnas["frecuencia"],
+                                           columnas["monetario"])
+        pref_cine, matine, tres_d, vip = (columnas["pref_cine"], columnas["matine"],
+                                          columnas["tres_d"], columnas["vip"])
+        referencia = self._referencia
+        for cliente in self._clientes:
+            ultima = cliente._ultima_compra_archivada
+            total = cliente._monto_archivado
+            entradas = conocidas = cine = manana = en_3d = en_vip = 0
+            for compra in cliente._historial_compras:
+                fecha, cantidad = compra["fecha"], compra["cantidad"]
+                total += compra["total"]
+                entradas += cantidad
+                if ultima is None or fecha > ultima:
+                    ultima = fecha
+                if fecha.hour < 14:
+                    manana += cantidad
+                datos = atributos.get(compra["codigo"])
+                if datos is not None:
+                    conocidas += cantidad
+                    cine += cantidad if datos[0] else 0
+                    en_3d += cantidad if datos[1] else 0
+                    en_vip += cantidad if datos[2] or compra.get("zona") == "VIP" else 0
+            recencia.append(max(0.0, (referencia - ultima).days) if ultima else float("inf"))
+            frecuencia.append(cliente.total_compras())
+            monetario.append(total)
+            matine.append(manana / entradas if entradas else 0.0)
+            pref_cine.append(cine / conocidas if conocidas else 0.0)
+            tres_d.append(en_3d / conocidas if conocidas else 0.0)
+            vip.append(en_vip / conocidas if conocidas else 0.0)
+        self._puntajes = None
+
+    def columna(self, nombre: str) -> array:
+        """
+        Obtiene una característica de todos los clientes.
+
+        Args:
+            nombre: Una de CARACTERISTICAS
+
+        Returns:
+            Array con un valor por cliente, en el orden de gestor._clientes
+        """
+        if nombre not in self._columnas:
+            raise ValueError(f"La característica debe ser una de: {CARACTERISTICAS}")
+        return self._columnas[nombre]
+
+    def fila(self, cedula: str) -> dict:
+        """
+        Obtiene las características de un cliente.
+
+        Args:
+            cedula: Cédula del cliente
+
+        Returns:
+            Diccionario característica -> valor, o None si no está en la matriz
+        """
+        i = self._filas.get(cedula)
+        if i is None:
+            return None
+        return {nombre: columna[i] for nombre, columna in self._columnas.items()}
+
+    def puntajes_rfm(self, niveles: int = 5) -> tuple:
+        """
+        Asigna a cada cliente un puntaje de 1 a `niveles` en recencia,
+        frecuencia y monto según su posición (más reciente = mayor puntaje).
+
+        Args:
+            niveles: Cantidad de niveles (5 para quintiles)
+
+        Returns:
+            Tupla de tres arrays (R, F, M)
+        """
+        if self._puntajes is not None and len(self._puntajes[0]) == self.filas \
+                and self._puntajes[3] == niveles:
+            return self._puntajes[:3]
+        r = self._niveles(self._columnas["recencia_dias"], niveles, invertir=True)
+        f = self._niveles(self._columnas["frecuencia"], niveles)
+        m = self._niveles(self._columnas["monetario"], niveles)
+        self._puntajes = (r, f, m, niveles)
+        return r, f, m
+
+    def segmentar(self) -> List[str]:
+        """
+        Clasifica a cada cliente en un segmento según sus puntajes RFM.
+
+        Returns:
+            Lista con el segmento de cada cliente
+        """
+        r, f, m = self.puntajes_rfm()
+        frecuencia = self._columnas["frecuencia"]
+        segmentos = []
+        for i in range(self.filas):
+            if not frecuencia[i]:
+                segmentos.append(SIN_COMPRAS)
+            elif r[i] >= 4 and f[i] >= 4 and m[i] >= 4:
+                segmentos.append(CAMPEONES)
+            elif f[i] >= 4:
+                segmentos.append(LEALES)
+            elif r[i] >= 4 and f[i] <= 2:
+                segmentos.append(PROMETEDORES)
+            elif r[i] <= 2 and f[i] >= 3:
+                segmentos.append(EN_RIESGO)
+            elif r[i] <= 2:
+                segmentos.append(PERDIDOS)
+            else:
+                segmentos.append(REGULARES)
+        return segmentos
+
+    def clientes_del_segmento(self, segmento: str) -> List[Cliente]:
+        """
+        Obtiene los clientes de un segmento.
+
+        Args:
+            segmento: Nombre del segmento
+
+        Returns:
+            Lista de clientes
+        """
+        return [c for c, s in zip(self._clientes, self.segmentar()) if s == segmento]
+
+    def reevaluar_premium(self, compras_minimas: int = Cliente.COMPRAS_PARA_PREMIUM,
+                          monto_minimo: float = None) -> int:
+        """
+        Recalcula el estado premium de todos los clientes a partir de la matriz.
+        Solo asigna (y notifica) a los clientes cuyo estado cambia.
+
+        Args:
+            compras_minimas: Compras necesarias para ser premium
+            monto_minimo: Monto gastado necesario (None para no exigirlo)
+
+        Returns:
+            Cantidad de clientes cuyo estado cambió
+        """
+        frecuencia, monetario = self._columnas["frecuencia"], self._columnas["monetario"]
+        cambios = 0
+        for i, cliente in enumerate(self._clientes):
+            premium = frecuencia[i] >= compras_minimas and (monto_minimo is None
+                                                            or monetario[i] >= monto_minimo)
+            if premium != cliente.es_premium:
+                cliente.es_premium = premium
+                cambios += 1
+        return cambios
+
+    @staticmethod
+    def _niveles(columna: array, niveles: int, invertir: bool = False) -> array:
+        """Puntaje por posición: los valores iguales reciben el mismo nivel."""
+        n = len(columna)
+        puntajes = array("b", bytes(n))
+        orden = sorted(range(n), key=columna.__getitem__, reverse=invertir)
+        posicion = 0
+        while posicion < n:
+            # Todos los empatados toman el nivel de la primera posición del grupo
+            valor = columna[orden[posicion]]
+            nivel = 1 + posicion * niveles // n
+            while posicion < n and columna[orden[posicion]] == valor:
+                puntajes[orden[posicion]] = nivel
+                posicion += 1
+        return puntajes
+
+    def __str__(self) -> str:
+        """Representación en string de la matriz."""
+        return (f"MatrizClientes: {self.filas} clientes x {len(CARACTERISTICAS)} características | "
+                f"{self.memoria / 1024:.0f} KiB")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import random
+    import time
+    from collections import Counter
+    from datetime import timedelta
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+
+    print("PRUEBA DE LA MATRIZ DE CLIENTES")
+
+    aleatorio = random.Random(5)
+    gestor = GestorServicios("CineMax Entertainment")
+    inicio_anio = datetime(2025, 1, 1, 10, 0)
+    for i in range(300):
+        fecha = inicio_anio + timedelta(hours=29 * i)
+        if i % 3:
+            servicio = ServicioCine(f"C{i:04d}", f"Función {i}", fecha, 8.5, f"Película {i % 30}",
+                                    i % 10 + 1, i % 4 == 0, i % 7 == 0)
+        else:
+            servicio = ServicioEvento(f"E{i:04d}", f"Evento {i}", fecha, 45.0, f"Artista {i % 12}",
+                                      "Concierto", 2.5, ["General", "Preferencial", "VIP"][i % 3])
+        gestor._servicios.append(servicio)
+
+    # Historiales sintéticos: se registran directamente para no depender de la capacidad
+    for i in range(100_000):
+        cliente = Cliente(f"09{i:08d}", "Cliente", f"N{i}", f"c{i}@email.com", "0987654321")
+        for _ in range(min(int(aleatorio.expovariate(0.35)), 20)):
+            servicio = gestor._servicios[aleatorio.randrange(300)]
+            cantidad = aleatorio.randint(1, 4)
+            cliente._historial_compras.append({"servicio": servicio.nombre, "codigo": servicio.codigo,
+                                               "cantidad": cantidad,
+                                               "total": servicio.calcular_precio_total() * cantidad,
+                                               "fecha": servicio.fecha})
+        gestor._clientes.append(cliente)
+
+    print("\n1. Construcción en una pasada:")
+    inicio = time.perf_counter()
+    matriz = MatrizClientes(gestor, referencia=datetime(2026, 1, 1))
+    print(f"   {matriz} en {time.perf_counter() - inicio:.2f} s")
+    print(f"   Cliente 0900000002: {matriz.fila('0900000002')}")
+
+    print("\n2. Segmentación RFM:")
+    inicio = time.perf_counter()
+    segmentos = Counter(matriz.segmentar())
+    print(f"   Calculada en {time.perf_counter() - inicio:.2f} s")
+    for segmento, cantidad in segmentos.most_common():
+        print(f"   {segmento:<14} {cantidad:>7}")
+
+    print("\n3. Reevaluación masiva del estado premium:")
+    inicio = time.perf_counter()
+    cambios = matriz.reevaluar_premium()
+    print(f"   Regla actual (5 compras): {cambios} cambios en {time.perf_counter() - inicio:.2f} s")
+    cambios = matriz.reevaluar_premium(monto_minimo=300.0)
+    print(f"   Con monto mínimo de $300: {cambios} cambios | "
+          f"premium: {sum(c.es_premium for c in gestor._clientes)}")
+
+    print("\n4. Validaciones:")
+    try:
+        matriz.columna("edad")
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
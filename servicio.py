@@ -11,14 +11,20 @@ Módulo que define la clase base Servicio para el sistema de gestión de cine/ev
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+from observable import Observable
 
 
-class Servicio(ABC):
+class Servicio(ABC, Observable):
     """
     Clase abstracta base que representa un servicio genérico de cine/eventos.
     Implementa encapsulamiento y define métodos polimórficos.
     """
 
+    # Constantes de la clase
+    ESTADOS = ["Disponible", "Agotado", "Cancelado", "En proceso"]
+    # Conjunto precalculado para validar sin crear una lista en cada asignación
+    _ESTADOS_VALIDOS = frozenset(ESTADOS)
+
     def __init__(self, codigo: str, nombre: str, fecha: datetime, precio_base: float):
         """
         Constructor de la clase Servicio.
@@ -46,7 +52,10 @@ class Servicio(ABC):
         """Establece el código del servicio con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El código debe ser una cadena no vacía")
+        anterior = self._codigo
         self._codigo = valor
+        if self._observadores:
+            self._notificar_cambio("codigo", anterior, valor)
 
     # Property para nombre
     @property
@@ -59,7 +68,10 @@ class Servicio(ABC):
         """Establece el nombre del servicio con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El nombre debe ser una cadena no vacía")
+        anterior = self._nombre
         self._nombre = valor
+        if self._observadores:
+            self._notificar_cambio("nombre", anterior, valor)
 
     # Property para fecha
     @property
@@ -72,7 +84,10 @@ class Servicio(ABC):
         """Establece la fecha del servicio con validación."""
         if not isinstance(valor, datetime):
             raise ValueError("La fecha debe ser un objeto datetime")
+        anterior = self._fecha
         self._fecha = valor
+        if self._observadores:
+            self._notificar_cambio("fecha", anterior, valor)
 
     # Property para precio_base
     @property
@@ -85,7 +100,10 @@ class Servicio(ABC):
         """Establece el precio base con validación."""
         if valor < 0:
             raise ValueError("El precio base no puede ser negativo")
+        anterior = self._precio_base
         self._precio_base = valor
+        if self._observadores:
+            self._notificar_cambio("precio_base", anterior, valor)
 
     # Property para estado
     @property
@@ -96,10 +114,12 @@ class Servicio(ABC):
     @estado.setter
     def estado(self, valor: str):
         """Establece el estado del servicio con validación."""
-        estados_validos = ["Disponible", "Agotado", "Cancelado", "En proceso"]
-        if valor not in estados_validos:
-            raise ValueError(f"Estado debe ser uno de: {estados_validos}")
+        if not isinstance(valor, str) or valor not in self._ESTADOS_VALIDOS:
+            raise ValueError(f"Estado debe ser uno de: {self.ESTADOS}")
+        anterior = self._estado
         self._estado = valor
+        if self._observadores:
+            self._notificar_cambio("estado", anterior, valor)
 
     @abstractmethod
     def calcular_precio_total(self) -> float:
@@ -46,6 +46,7 @@ class ServicioCine(Servicio):
         self._es_3d = es_3d
         self._es_vip = es_vip
         self._asientos_vendidos = 0
+        self._asientos_retenidos = 0
         self._capacidad_total = 100
 
     # Property para pelicula
@@ -59,7 +60,10 @@ class ServicioCine(Servicio):
         """Establece el nombre de la película con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El nombre de la película debe ser una cadena no vacía")
+        anterior = self._pelicula
         self._pelicula = valor
+        if self._observadores:
+            self._notificar_cambio("pelicula", anterior, valor)
 
     # Property para sala
     @property
@@ -72,7 +76,10 @@ class ServicioCine(Servicio):
         """Establece el número de sala con validación."""
         if valor < 1:
             raise ValueError("El número de sala debe ser positivo")
+        anterior = self._sala
         self._sala = valor
+        if self._observadores:
+            self._notificar_cambio("sala", anterior, valor)
 
     # Property para es_3d
     @property
@@ -83,7 +90,10 @@ class ServicioCine(Servicio):
     @es_3d.setter
     def es_3d(self, valor: bool):
         """Establece si la función es 3D."""
+        anterior = self._es_3d
         self._es_3d = valor
+        if self._observadores:
+            self._notificar_cambio("es_3d", anterior, valor)
 
     # Property para es_vip
     @property
@@ -94,7 +104,10 @@ class ServicioCine(Servicio):
     @es_vip.setter
     def es_vip(self, valor: bool):
         """Establece si es sala VIP."""
+        anterior = self._es_vip
         self._es_vip = valor
+        if self._observadores:
+            self._notificar_cambio("es_vip", anterior, valor)
 
     # Property para asientos_vendidos
     @property
@@ -107,7 +120,16 @@ class ServicioCine(Servicio):
         """Establece asientos vendidos con validación."""
         if valor < 0 or valor > self._capacidad_total:
             raise ValueError(f"Asientos vendidos debe estar entre 0 y {self._capacidad_total}")
+        anterior = self._asientos_vendidos
         self._asientos_vendidos = valor
+        if self._observadores:
+            self._notificar_cambio("asientos_vendidos", anterior, valor)
+
+    # Property para asientos_retenidos (solo lectura)
+    @property
+    def asientos_retenidos(self) -> int:
+        """Obtiene la cantidad de asientos retenidos por reservas pendientes."""
+        return self._asientos_retenidos
 
     def calcular_precio_total(self) -> float:
         """
@@ -131,6 +153,15 @@ class ServicioCine(Servicio):
 
         return round(precio, 2)
 
+    def calcular_ingresos(self) -> float:
+        """
+        Calcula los ingresos por asientos vendidos.
+
+        Returns:
+            Ingresos de la función
+        """
+        return self.calcular_precio_total() * self._asientos_vendidos
+
     def mostrar_info(self) -> str:
         """
         Muestra información detallada de la función de cine.
@@ -151,6 +182,8 @@ class ServicioCine(Servicio):
         info += f"Precio base: ${self._precio_base:.2f}\n"
         info += f"Precio total: ${self.calcular_precio_total():.2f}\n"
         info += f"Ocupación: {self._asientos_vendidos}/{self._capacidad_total}\n"
+        if self._asientos_retenidos:
+            info += f"Asientos retenidos: {self._asientos_retenidos}\n"
         info += f"Estado: {self._estado}\n"
         info += f"{'=' * 50}\n"
         return info
@@ -168,13 +201,79 @@ class ServicioCine(Servicio):
         if cantidad < 1:
             return False
 
-        if self._asientos_vendidos + cantidad <= self._capacidad_total:
+        if cantidad <= self.entradas_disponibles():
             self._asientos_vendidos += cantidad
+            if self._observadores:
+                self._notificar_cambio("asientos_vendidos", self._asientos_vendidos - cantidad,
+                                       self._asientos_vendidos)
             if self._asientos_vendidos == self._capacidad_total:
-                self._estado = "Agotado"
+                self.estado = "Agotado"
             return True
         return False
 
+    def devolver_entradas(self, cantidad: int) -> bool:
+        """
+        Devuelve asientos vendidos por una cancelación o reembolso.
+        Si el servicio estaba agotado, vuelve a quedar disponible.
+
+        Args:
+            cantidad: Número de asientos a devolver
+
+        Returns:
+            True si la devolución fue exitosa, False en caso contrario
+        """
+        if cantidad < 1 or cantidad > self._asientos_vendidos:
+            return False
+
+        self._asientos_vendidos -= cantidad
+        if self._observadores:
+            self._notificar_cambio("asientos_vendidos", self._asientos_vendidos + cantidad,
+                                   self._asientos_vendidos)
+        if self._estado == "Agotado":
+            self.estado = "Disponible"
+        return True
+
+    def entradas_disponibles(self) -> int:
+        """
+        Calcula los asientos libres, excluyendo los vendidos y los retenidos.
+
+        Returns:
+            Número de asientos que aún pueden venderse o retenerse
+        """
+        return self._capacidad_total - self._asientos_vendidos - self._asientos_retenidos
+
+    def retener_entradas(self, cantidad: int) -> bool:
+        """
+        Retiene asientos mientras el cliente completa el pago.
+
+        Args:
+            cantidad: Número de asientos a retener
+
+        Returns:
+            True si la retención fue posible, False en caso contrario
+        """
+        if cantidad < 1 or cantidad > self.entradas_disponibles():
+            return False
+        self._asientos_retenidos += cantidad
+        if self._observadores:
+            self._notificar_cambio("asientos_retenidos", self._asientos_retenidos - cantidad,
+                                   self._asientos_retenidos)
+        return True
+
+    def liberar_retencion(self, cantidad: int):
+        """
+        Libera asientos retenidos (por confirmación, cancelación o vencimiento).
+
+        Args:
+            cantidad: Número de asientos a liberar
+        """
+        if cantidad < 0 or cantidad > self._asientos_retenidos:
+            raise ValueError(f"Solo hay {self._asientos_retenidos} asientos retenidos")
+        self._asientos_retenidos -= cantidad
+        if self._observadores:
+            self._notificar_cambio("asientos_retenidos", self._asientos_retenidos + cantidad,
+                                   self._asientos_retenidos)
+
 
 # ============= MAIN DE PRUEBA =============
 if __name__ == "__main__":
@@ -7,6 +7,8 @@
 """
 Módulo que define la clase ServicioEvento que hereda de Servicio.
 Representa eventos especiales como conciertos, obras de teatro, etc.
+Un evento puede tener una sola zona (capacidad fija de 500) o varias zonas
+(General, Preferencial, VIP) con capacidades, precios y contadores propios.
 """
 
 from datetime import datetime
@@ -23,9 +25,14 @@ class ServicioEvento(Servicio):
     TIPOS_EVENTO = ["Concierto", "Obra de Teatro", "Stand-up Comedy", "Opera", "Ballet"]
     RECARGO_ZONA_VIP = 25.00
     RECARGO_ZONA_PREFERENCIAL = 15.00
+    ZONAS = ["General", "Preferencial", "VIP"]
+    # Conjuntos precalculados para validar sin recorrer ni crear listas
+    _TIPOS_VALIDOS = frozenset(TIPOS_EVENTO)
+    _ZONAS_VALIDAS = frozenset(ZONAS)
 
     def __init__(self, codigo: str, nombre: str, fecha: datetime, precio_base: float,
-                 artista: str, tipo_evento: str, duracion_horas: float, zona: str = "General"):
+                 artista: str, tipo_evento: str, duracion_horas: float, zona: str = "General",
+                 capacidades: dict = None):
         """
         Constructor de ServicioEvento.
 
@@ -37,7 +44,10 @@ class ServicioEvento(Servicio):
             artista: Nombre del artista o grupo
             tipo_evento: Tipo de evento (Concierto, Teatro, etc.)
             duracion_horas: Duración estimada en horas
-            zona: Zona del evento (General, Preferencial, VIP)
+            zona: Zona del evento (General, Preferencial, VIP); con varias zonas,
+                la zona por defecto de las ventas sin zona
+            capacidades: Capacidad por zona, por ejemplo {"General": 300, "VIP": 50}
+                (None para un evento de una sola zona)
         """
         super().__init__(codigo, nombre, fecha, precio_base)
         self._artista = artista
@@ -45,8 +55,20 @@ class ServicioEvento(Servicio):
         self._duracion_horas = duracion_horas
         self._zona = zona
         self._entradas_vendidas = 0
+        self._entradas_retenidas = 0
         self._capacidad_total = 500
         self._incluye_meet_and_greet = False
+        # zona -> [capacidad, vendidas, retenidas]; None en eventos de una sola zona
+        self._zonas = None
+        if capacidades is not None:
+            if not capacidades or not self._ZONAS_VALIDAS.issuperset(capacidades):
+                raise ValueError(f"Las zonas deben ser algunas de: {self.ZONAS}")
+            if any(not isinstance(c, int) or c < 1 for c in capacidades.values()):
+                raise ValueError("La capacidad de cada zona debe ser un entero positivo")
+            self._zonas = {z: [capacidades[z], 0, 0] for z in self.ZONAS if z in capacidades}
+            self._capacidad_total = sum(capacidades.values())
+            if zona not in self._zonas:
+                self._zona = next(iter(self._zonas))
 
     # Property para artista
     @property
@@ -59,7 +81,10 @@ class ServicioEvento(Servicio):
         """Establece el nombre del artista con validación."""
         if not valor or not isinstance(valor, str):
             raise ValueError("El nombre del artista debe ser una cadena no vacía")
+        anterior = self._artista
         self._artista = valor
+        if self._observadores:
+            self._notificar_cambio("artista", anterior, valor)
 
     # Property para tipo_evento
     @property
@@ -70,9 +95,12 @@ class ServicioEvento(Servicio):
     @tipo_evento.setter
     def tipo_evento(self, valor: str):
         """Establece el tipo de evento con validación."""
-        if valor not in self.TIPOS_EVENTO:
+        if not isinstance(valor, str) or valor not in self._TIPOS_VALIDOS:
             raise ValueError(f"Tipo de evento debe ser uno de: {self.TIPOS_EVENTO}")
+        anterior = self._tipo_evento
         self._tipo_evento = valor
+        if self._observadores:
+            self._notificar_cambio("tipo_evento", anterior, valor)
 
     # Property para duracion_horas
     @property
@@ -85,7 +113,10 @@ class ServicioEvento(Servicio):
         """Establece la duración con validación."""
         if valor <= 0:
             raise ValueError("La duración debe ser positiva")
+        anterior = self._duracion_horas
         self._duracion_horas = valor
+        if self._observadores:
+            self._notificar_cambio("duracion_horas", anterior, valor)
 
     # Property para zona
     @property
@@ -96,10 +127,14 @@ class ServicioEvento(Servicio):
     @zona.setter
     def zona(self, valor: str):
         """Establece la zona con validación."""
-        zonas_validas = ["General", "Preferencial", "VIP"]
-        if valor not in zonas_validas:
+        validas = self._ZONAS_VALIDAS if self._zonas is None else self._zonas
+        if not isinstance(valor, str) or valor not in validas:
+            zonas_validas = self.ZONAS if self._zonas is None else list(self._zonas)
             raise ValueError(f"La zona debe ser una de: {zonas_validas}")
+        anterior = self._zona
         self._zona = valor
+        if self._observadores:
+            self._notificar_cambio("zona", anterior, valor)
 
     # Property para entradas_vendidas
     @property
@@ -110,9 +145,20 @@ class ServicioEvento(Servicio):
     @entradas_vendidas.setter
     def entradas_vendidas(self, valor: int):
         """Establece entradas vendidas con validación."""
+        if self._zonas is not None:
+            raise ValueError("En un evento con zonas las entradas se venden por zona")
         if valor < 0 or valor > self._capacidad_total:
             raise ValueError(f"Entradas vendidas debe estar entre 0 y {self._capacidad_total}")
+        anterior = self._entradas_vendidas
         self._entradas_vendidas = valor
+        if self._observadores:
+            self._notificar_cambio("entradas_vendidas", anterior, valor)
+
+    # Property para entradas_retenidas (solo lectura)
+    @property
+    def entradas_retenidas(self) -> int:
+        """Obtiene el número de entradas retenidas por reservas pendientes."""
+        return self._entradas_retenidas
 
     # Property para incluye_meet_and_greet
     @property
@@ -123,11 +169,39 @@ class ServicioEvento(Servicio):
     @incluye_meet_and_greet.setter
     def incluye_meet_and_greet(self, valor: bool):
         """Establece si incluye meet and greet."""
+        anterior = self._incluye_meet_and_greet
         self._incluye_meet_and_greet = valor
+        if self._observadores:
+            self._notificar_cambio("incluye_meet_and_greet", anterior, valor)
+
+    # Property para es_multizona (solo lectura)
+    @property
+    def es_multizona(self) -> bool:
+        """Indica si el evento tiene inventario separado por zona."""
+        return self._zonas is not None
+
+    # Property para zonas (solo lectura)
+    @property
+    def zonas(self) -> tuple:
+        """Obtiene las zonas del evento, de menor a mayor precio."""
+        return (self._zona,) if self._zonas is None else tuple(self._zonas)
 
     def calcular_precio_total(self) -> float:
         """
         Calcula el precio total de la entrada considerando zona y extras.
+        En un evento con zonas corresponde a la zona por defecto.
+
+        Returns:
+            Precio total calculado
+        """
+        return self.precio_zona(self._zona)
+
+    def precio_zona(self, zona: str) -> float:
+        """
+        Calcula el precio de la entrada de una zona considerando extras.
+
+        Args:
+            zona: Zona del evento
 
         Returns:
             Precio total calculado
@@ -135,9 +209,9 @@ class ServicioEvento(Servicio):
         precio = self._precio_base
 
         # Agregar recargo por zona
-        if self._zona == "VIP":
+        if zona == "VIP":
             precio += self.RECARGO_ZONA_VIP
-        elif self._zona == "Preferencial":
+        elif zona == "Preferencial":
             precio += self.RECARGO_ZONA_PREFERENCIAL
 
         # Recargo adicional por meet and greet
@@ -150,6 +224,17 @@ class ServicioEvento(Servicio):
 
         return round(precio, 2)
 
+    def calcular_ingresos(self) -> float:
+        """
+        Calcula los ingresos por entradas vendidas, con el precio de cada zona.
+
+        Returns:
+            Ingresos del evento
+        """
+        if self._zonas is None:
+            return self.calcular_precio_total() * self._entradas_vendidas
+        return sum(self.precio_zona(zona) * inventario[1] for zona, inventario in self._zonas.items())
+
     def mostrar_info(self) -> str:
         """
         Muestra información detallada del evento.
@@ -167,21 +252,30 @@ class ServicioEvento(Servicio):
         info += f"Fecha: {self._fecha.strftime('%d/%m/%Y')}\n"
         info += f"Hora: {self._fecha.strftime('%H:%M')}\n"
         info += f"Duración: {self._duracion_horas} horas\n"
-        info += f"Zona: {self._zona}\n"
+        if self._zonas is None:
+            info += f"Zona: {self._zona}\n"
         info += f"Precio base: ${self._precio_base:.2f}\n"
-        info += f"Precio total: ${self.calcular_precio_total():.2f}\n"
+        if self._zonas is None:
+            info += f"Precio total: ${self.calcular_precio_total():.2f}\n"
+        else:
+            for zona, (capacidad, vendidas, _) in self._zonas.items():
+                info += f"Zona {zona}: ${self.precio_zona(zona):.2f} | {vendidas}/{capacidad} vendidas\n"
         info += f"Meet & Greet: {'Sí' if self._incluye_meet_and_greet else 'No'}\n"
         info += f"Entradas vendidas: {self._entradas_vendidas}/{self._capacidad_total}\n"
+        if self._entradas_retenidas:
+            info += f"Entradas retenidas: {self._entradas_retenidas}\n"
         info += f"Estado: {self._estado}\n"
         info += f"{'=' * 50}\n"
         return info
 
-    def vender_entradas(self, cantidad: int) -> bool:
+    def vender_entradas(self, cantidad: int, zona: str = None) -> bool:
         """
         Vende una cantidad de entradas si hay disponibilidad.
+        En un evento con zonas, la zona y el total se actualizan juntos.
 
         Args:
             cantidad: Número de entradas a vender
+            zona: Zona de las entradas (None para la zona por defecto)
 
         Returns:
             True si la venta fue exitosa, False en caso contrario
@@ -189,13 +283,130 @@ class ServicioEvento(Servicio):
         if cantidad < 1:
             return False
 
-        if self._entradas_vendidas + cantidad <= self._capacidad_total:
+        if cantidad <= self.entradas_disponibles(zona):
+            if self._zonas is not None:
+                self._inventario(zona)[1] += cantidad
             self._entradas_vendidas += cantidad
+            if self._observadores:
+                self._notificar_cambio("entradas_vendidas", self._entradas_vendidas - cantidad,
+                                       self._entradas_vendidas)
             if self._entradas_vendidas == self._capacidad_total:
-                self._estado = "Agotado"
+                self.estado = "Agotado"
             return True
         return False
 
+    def devolver_entradas(self, cantidad: int, zona: str = None) -> bool:
+        """
+        Devuelve entradas vendidas por una cancelación o reembolso.
+        Si el servicio estaba agotado, vuelve a quedar disponible.
+
+        Args:
+            cantidad: Número de entradas a devolver
+            zona: Zona de las entradas (None para la zona por defecto)
+
+        Returns:
+            True si la devolución fue exitosa, False en caso contrario
+        """
+        if self._zonas is None:
+            vendidas = self._entradas_vendidas
+        else:
+            inventario = self._inventario(zona)
+            vendidas = inventario[1]
+        if cantidad < 1 or cantidad > vendidas:
+            return False
+
+        if self._zonas is not None:
+            inventario[1] -= cantidad
+        self._entradas_vendidas -= cantidad
+        if self._observadores:
+            self._notificar_cambio("entradas_vendidas", self._entradas_vendidas + cantidad,
+                                   self._entradas_vendidas)
+        if self._estado == "Agotado":
+            self.estado = "Disponible"
+        return True
+
+    def entradas_disponibles(self, zona: str = None) -> int:
+        """
+        Calcula las entradas libres, excluyendo las vendidas y las retenidas.
+
+        Args:
+            zona: Zona a consultar (None para la zona por defecto)
+
+        Returns:
+            Número de entradas que aún pueden venderse o retenerse
+        """
+        if self._zonas is None:
+            return self._capacidad_total - self._entradas_vendidas - self._entradas_retenidas
+        capacidad, vendidas, retenidas = self._inventario(zona)
+        return capacidad - vendidas - retenidas
+
+    def mejor_zona(self, cantidad: int):
+        """
+        Busca la zona de mayor categoría con lugar para todas las entradas.
+
+        Args:
+            cantidad: Número de entradas pedidas
+
+        Returns:
+            Nombre de la zona, o None si ninguna tiene lugar
+        """
+        for zona in reversed(self.zonas):
+            if self.entradas_disponibles(zona) >= cantidad:
+                return zona
+        return None
+
+    def ocupacion_zonas(self) -> dict:
+        """
+        Obtiene la ocupación de cada zona.
+
+        Returns:
+            Diccionario zona -> (vendidas, capacidad, porcentaje)
+        """
+        if self._zonas is None:
+            return {self._zona: (self._entradas_vendidas, self._capacidad_total,
+                                 self.calcular_ocupacion_porcentaje())}
+        return {zona: (vendidas, capacidad, round(vendidas / capacidad * 100, 2))
+                for zona, (capacidad, vendidas, _) in self._zonas.items()}
+
+    def retener_entradas(self, cantidad: int, zona: str = None) -> bool:
+        """
+        Retiene entradas mientras el cliente completa el pago.
+
+        Args:
+            cantidad: Número de entradas a retener
+            zona: Zona de las entradas (None para la zona por defecto)
+
+        Returns:
+            True si la retención fue posible, False en caso contrario
+        """
+        if cantidad < 1 or cantidad > self.entradas_disponibles(zona):
+            return False
+        if self._zonas is not None:
+            self._inventario(zona)[2] += cantidad
+        self._entradas_retenidas += cantidad
+        if self._observadores:
+            self._notificar_cambio("entradas_retenidas", self._entradas_retenidas - cantidad,
+                                   self._entradas_retenidas)
+        return True
+
+    def liberar_retencion(self, cantidad: int, zona: str = None):
+        """
+        Libera entradas retenidas (por confirmación, cancelación o vencimiento).
+
+        Args:
+            cantidad: Número de entradas a liberar
+            zona: Zona de las entradas (None para la zona por defecto)
+        """
+        retenidas = self._entradas_retenidas if self._zonas is None else self._inventario(zona)[2]
+        if cantidad < 0 or cantidad > retenidas:
+            raise ValueError(f"Solo hay {retenidas} entradas retenidas")
+        if self._zonas is not None:
+            self._inventario(zona)[2] -= cantidad
+        self._entradas_retenidas -= cantidad
+        if self._observadores:
+            self._notificar_cambio("entradas_retenidas", self._entradas_retenidas + cantidad,
+                                   self._entradas_retenidas)
+
     def calcular_ocupacion_porcentaje(self) -> float:
         """
         Calcula el porcentaje de ocupación del evento.
@@ -205,6 +416,13 @@ class ServicioEvento(Servicio):
         """
         return round((self._entradas_vendidas / self._capacidad_total) * 100, 2)
 
+    def _inventario(self, zona: str) -> list:
+        """Obtiene el inventario [capacidad, vendidas, retenidas] de una zona."""
+        inventario = self._zonas.get(self._zona if zona is None else zona)
+        if inventario is None:
+            raise ValueError(f"La zona debe ser una de: {list(self._zonas)}")
+        return inventario
+
 
 # ============= MAIN DE PRUEBA =============
 if __name__ == "__main__":
@@ -286,4 +504,22 @@ if __name__ == "__main__":
     try:
         evento1.duracion_horas = -2  # Duración negativa
     except ValueError as e:
-        print(f"   Validación correcta: {e}")
\ No newline at end of file
+        print(f"   Validación correcta: {e}")
+    # Probar evento con varias zonas
+    print("\n7. Probando un evento con varias zonas:")
+    festival = ServicioEvento("E004", "Festival de Verano", datetime(2025, 1, 18, 18, 0), 40.00,
+                              "Varios Artistas", "Concierto", 3.0,
+                              capacidades={"General": 800, "Preferencial": 300, "VIP": 100})
+    festival.vender_entradas(100, "VIP")
+    festival.vender_entradas(120, "Preferencial")
+    festival.vender_entradas(500)
+    print(f"   Vendiendo 1 entrada VIP (agotada): {festival.vender_entradas(1, 'VIP')}")
+    print(f"   Mejor zona para 4 entradas: {festival.mejor_zona(4)}")
+    for zona, (vendidas, capacidad, porcentaje) in festival.ocupacion_zonas().items():
+        print(f"   {zona}: {vendidas}/{capacidad} ({porcentaje}%) a ${festival.precio_zona(zona):.2f}")
+    print(f"   Ocupación total: {festival.calcular_ocupacion_porcentaje()}% | "
+          f"ingresos: ${festival.calcular_ingresos():,.2f}")
+    try:
+        festival.vender_entradas(1, "Palco")
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
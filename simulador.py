@@ -0,0 +1,485 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo de simulación determinista de cargas de venta.
+Genera con semilla fija secuencias de comandos (ver comandos.py) para tres
+escenarios: noche de estreno, matinés y eventos VIP con zonas. Las reproduce
+a máxima velocidad sobre un gestor nuevo, mide rendimiento y percentiles de
+latencia por operación y calcula una huella del estado final. Guardando la
+carga una vez y reproduciéndola en distintas versiones del código se puede
+buscar con `git bisect run` el commit que introdujo una regresión.
+
+Uso:
+    python simulador.py --ventas 5000 --guardar-cargas cargas/
+    python simulador.py --cargas cargas/*.jsonl --salida base.json
+    git bisect run python simulador.py --cargas cargas/*.jsonl --comparar base.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from typing import List
+from comandos import BitacoraComandos, Comando, aplicar, cargar_comandos, guardar_comandos
+from gestor_servicios import GestorServicios
+
+NOMBRES = ["Juan", "María", "José", "Lucía", "Andrés", "Sofía", "Martín", "Valeria"]
+APELLIDOS = ["Pérez", "González", "Castillo", "Santamaría", "Soriano", "Gómez"]
+FECHA_BASE = datetime(2025, 3, 7, 10, 0)
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class _Carga:
+    """Acumula los comandos de un escenario con numeración consecutiva."""
+
+    def __init__(self):
+        self.comandos = []
+
+    def agregar(self, operacion: str, *argumentos):
+        self.comandos.append(Comando(len(self.comandos) + 1, operacion, argumentos, None))
+
+
+def _agregar_clientes(carga: _Carga, cantidad: int, generador: random.Random) -> list:
+    """Agrega los comandos de alta de clientes y devuelve sus cédulas."""
+    cedulas = []
+    for i in range(cantidad):
+        cedula = f"17{i:08d}"
+        carga.agregar("agregar_cliente", {
+            "cedula": cedula, "nombre": generador.choice(NOMBRES),
+            "apellido": generador.choice(APELLIDOS), "email": f"cliente{i}@email.com",
+            "telefono": f"09{generador.randrange(10**8):08d}"})
+        cedulas.append(cedula)
+    return cedulas
+
+
+def _servicio_cine(codigo: str, nombre: str, fecha: datetime, precio: float, pelicula: str,
+                   sala: int, es_3d: bool = False, es_vip: bool = False) -> dict:
+    """Descripción de un ServicioCine para un comando agregar_servicio."""
+    return {"tipo": "cine", "codigo": codigo, "nombre": nombre, "fecha": fecha,
+            "precio_base": precio, "estado": "Disponible", "pelicula": pelicula, "sala": sala,
+            "es_3d": es_3d, "es_vip": es_vip}
+
+
+def _cancelar_alguna(carga: _Carga, ventas: list, generador: random.Random):
+    """Agrega la cancelación de parte de una venta anterior (puede haber fallado)."""
+    codigo, cedula, cantidad = generador.choice(ventas)
+    carga.agregar("cancelar_venta", codigo, cedula, generador.randint(1, cantidad))
+
+
+# ========== ESCENARIOS ==========
+
+def generar_estreno(ventas: int, semilla: int = 0) -> List[Comando]:
+    """
+    Noche de estreno: ocho funciones de la misma película en la noche y
+    demanda concentrada en las de 20:00 y 21:00. Las funciones se agotan y
+    buena parte de los pedidos falla; a mitad de la noche sube el precio.
+
+    Args:
+        ventas: Cantidad de pedidos de compra
+        semilla: Semilla del generador
+
+    Returns:
+        Lista de comandos
+    """
+    generador = random.Random(semilla)
+    carga = _Carga()
+    estreno = FECHA_BASE.replace(hour=18)
+    funciones = []
+    for sala in range(1, 9):
+        codigo = f"EST{sala:02d}"
+        fecha = estreno + timedelta(minutes=30 * (sala - 1))
+        carga.agregar("agregar_servicio", _servicio_cine(codigo, f"Estreno Dune {sala}", fecha, 9.0,
+                                                         "Dune: Parte Tres", sala, sala % 3 == 0,
+                                                         sala == 8))
+        funciones.append(codigo)
+    for i, pelicula in enumerate(("Wicked", "Moana 2", "Gladiator II")):
+        codigo = f"CAR{i:02d}"
+        carga.agregar("agregar_servicio", _servicio_cine(codigo, f"Cartelera {pelicula}",
+                                                         estreno + timedelta(hours=i), 7.5,
+                                                         pelicula, 9 + i))
+        funciones.append(codigo)
+    cedulas = _agregar_clientes(carga, max(ventas // 3, 10), generador)
+
+    # Peso de cada función: las de 20:00 a 21:30 concentran la demanda
+    pesos = [2, 3, 5, 9, 9, 8, 6, 4, 1, 1, 1]
+    hechas = []
+    for numero in range(ventas):
+        if numero == ventas // 2:
+            for codigo in funciones[:8]:
+                carga.agregar("asignar", "servicio", codigo, "precio_base", 9.0, 10.5)
+        if hechas and generador.random() < 0.03:
+            _cancelar_alguna(carga, hechas, generador)
+        codigo = generador.choices(funciones, pesos)[0]
+        cedula = generador.choice(cedulas)
+        cantidad = generador.choices((1, 2, 3, 4, 6), (15, 45, 15, 18, 7))[0]
+        carga.agregar("realizar_venta", codigo, cedula, cantidad, None)
+        hechas.append((codigo, cedula, cantidad))
+    return carga.comandos
+
+
+def generar_matine(ventas: int, semilla: int = 0) -> List[Comando]:
+    """
+    Matinés de una semana: muchas funciones de mañana con demanda repartida,
+    compras familiares de 2 a 5 entradas, descuentos a mitad de semana y
+    algunas devoluciones.
+
+    Args:
+        ventas: Cantidad de pedidos de compra
+        semilla: Semilla del generador
+
+    Returns:
+        Lista de comandos
+    """
+    generador = random.Random(semilla + 1)
+    carga = _Carga()
+    peliculas = ["Moana 2", "Intensamente 2", "Mufasa", "Sonic 3", "Paddington", "Robot Salvaje"]
+    funciones = []
+    for dia in range(7):
+        for sala in range(1, 11):
+            codigo = f"MAT{dia}{sala:02d}"
+            fecha = FECHA_BASE + timedelta(days=dia, minutes=20 * (sala % 4))
+            pelicula = peliculas[(dia + sala) % len(peliculas)]
+            carga.agregar("agregar_servicio", _servicio_cine(codigo, f"Matiné {pelicula}", fecha, 5.5,
+                                                             pelicula, sala, sala % 4 == 0))
+            funciones.append(codigo)
+    cedulas = _agregar_clientes(carga, max(ventas // 4, 10), generador)
+
+    hechas = []
+    for numero in range(ventas):
+        if numero == ventas // 3:
+            # Descuento de mitad de semana
+            for codigo in funciones[20:50]:
+                carga.agregar("asignar", "servicio", codigo, "precio_base", 5.5, 4.5)
+        if hechas and generador.random() < 0.05:
+            _cancelar_alguna(carga, hechas, generador)
+        codigo = generador.choice(funciones)
+        cedula = generador.choice(cedulas)
+        cantidad = generador.choices((1, 2, 3, 4, 5), (5, 25, 30, 30, 10))[0]
+        carga.agregar("realizar_venta", codigo, cedula, cantidad, None)
+        hechas.append((codigo, cedula, cantidad))
+    return carga.comandos
+
+
+def generar_vip(ventas: int, semilla: int = 0) -> List[Comando]:
+    """
+    Eventos VIP con zonas: conciertos con inventario General, Preferencial y
+    VIP, pedidos con zona elegida o asignada, meet & greet agregado después de
+    la salida a la venta, clientes ascendidos a premium y un evento cancelado
+    con reembolso a todos sus compradores.
+
+    Args:
+        ventas: Cantidad de pedidos de compra
+        semilla: Semilla del generador
+
+    Returns:
+        Lista de comandos
+    """
+    generador = random.Random(semilla + 2)
+    carga = _Carga()
+    artistas = ["Los Rockeros", "Orquesta Sinfónica", "Ballet Nacional", "Comediantes Unidos",
+                "Metal Andino", "Coro de Quito"]
+    tipos = ["Concierto", "Concierto", "Ballet", "Stand-up Comedy", "Concierto", "Opera"]
+    eventos = []
+    for i, (artista, tipo) in enumerate(zip(artistas, tipos)):
+        codigo = f"VIP{i:02d}"
+        carga.agregar("agregar_servicio", {
+            "tipo": "evento", "codigo": codigo, "nombre": f"Gala {artista}",
+            "fecha": FECHA_BASE + timedelta(days=i, hours=10), "precio_base": 40.0 + 5 * i,
+            "estado": "Disponible", "artista": artista, "tipo_evento": tipo,
+            "duracion_horas": 2.5, "zona": "General",
+            "capacidades": {"General": 400, "Preferencial": 150, "VIP": 50},
+            "incluye_meet_and_greet": False})
+        eventos.append(codigo)
+    cedulas = _agregar_clientes(carga, max(ventas // 3, 10), generador)
+    for cedula in cedulas[:len(cedulas) // 20]:
+        carga.agregar("asignar", "cliente", cedula, "es_premium", False, True)
+
+    hechas = []
+    for numero in range(ventas):
+        if numero == ventas // 4:
+            carga.agregar("asignar", "servicio", eventos[0], "incluye_meet_and_greet", False, True)
+            carga.agregar("asignar", "servicio", eventos[4], "incluye_meet_and_greet", False, True)
+        if numero == ventas * 3 // 4:
+            carga.agregar("cancelar_servicio", eventos[5])
+        if hechas and generador.random() < 0.02:
+            _cancelar_alguna(carga, hechas, generador)
+        codigo = generador.choices(eventos, (30, 15, 10, 10, 25, 10))[0]
+        cedula = generador.choice(cedulas)
+        cantidad = generador.choices((1, 2, 3, 4), (30, 45, 10, 15))[0]
+        zona = generador.choices((None, "VIP", "Preferencial", "General"), (50, 20, 20, 10))[0]
+        carga.agregar("realizar_venta", codigo, cedula, cantidad, zona)
+        hechas.append((codigo, cedula, cantidad))
+    return carga.comandos
+
+
+ESCENARIOS = {
+    "estreno": generar_estreno,
+    "matine": generar_matine,
+    "vip": generar_vip,
+}
+
+
+# ========== EJECUCIÓN ==========
+
+def grabar_carga(comandos: List[Comando]) -> List[Comando]:
+    """
+    Ejecuta una carga generada con una BitacoraComandos activa, de modo que
+    los comandos quedan con los resultados esperados (para detectar cambios
+    de comportamiento al reproducirla en otra versión).
+
+    Args:
+        comandos: Comandos generados (con resultado None)
+
+    Returns:
+        Comandos grabados por la bitácora
+    """
+    gestor = GestorServicios("CineMax Entertainment")
+    bitacora = BitacoraComandos(gestor)
+    bitacora.activar()
+    try:
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            for comando in comandos:
+                aplicar(gestor, comando)
+    finally:
+        bitacora.desactivar()
+    return bitacora.comandos
+
+
+def huella_carga(comandos: List[Comando]) -> str:
+    """
+    Calcula una huella de la carga para no comparar cargas distintas.
+
+    Args:
+        comandos: Comandos de la carga
+
+    Returns:
+        Primeros 16 dígitos hexadecimales del SHA-256
+    """
+    resumen = hashlib.sha256()
+    for comando in comandos:
+        resumen.update(repr(comando[:3]).encode("utf-8"))
+    return resumen.hexdigest()[:16]
+
+
+def huella_estado(gestor: GestorServicios) -> str:
+    """
+    Calcula una huella del estado del gestor: dos versiones que procesan la
+    misma carga deben terminar con la misma huella.
+
+    Args:
+        gestor: Gestor después de la carga
+
+    Returns:
+        Primeros 16 dígitos hexadecimales del SHA-256
+    """
+    resumen = hashlib.sha256(f"{gestor.ventas_totales:.2f}".encode("utf-8"))
+    for servicio in gestor._servicios:
+        vendidas = (servicio.asientos_vendidos if hasattr(servicio, '_asientos_vendidos')
+                    else servicio.entradas_vendidas)
+        resumen.update(f"|{servicio.codigo}:{servicio.estado}:{vendidas}".encode("utf-8"))
+    for cliente in gestor._clientes:
+        resumen.update(f"|{cliente.cedula}:{cliente.total_compras()}:{cliente.puntos_acumulados}:"
+                       f"{cliente.es_premium}".encode("utf-8"))
+    return resumen.hexdigest()[:16]
+
+
+def _percentil(ordenados: list, p: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada."""
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+def ejecutar_carga(comandos: List[Comando], repeticiones: int = 3) -> dict:
+    """
+    Reproduce una carga a máxima velocidad, cada repetición sobre un gestor nuevo.
+
+    Args:
+        comandos: Comandos de la carga
+        repeticiones: Repeticiones (las latencias de todas se juntan)
+
+    Returns:
+        Diccionario con rendimiento, percentiles por operación, huella del
+        estado final y cantidad de resultados distintos de los grabados
+    """
+    reloj = time.perf_counter_ns
+    latencias = {}
+    rendimientos = []
+    diferencias = 0
+    huella = None
+    with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+        for _ in range(repeticiones):
+            gestor = GestorServicios("CineMax Entertainment")
+            diferencias = 0
+            inicio_carga = reloj()
+            for comando in comandos:
+                inicio = reloj()
+                resultado = aplicar(gestor, comando)
+                latencias.setdefault(comando.operacion, []).append(reloj() - inicio)
+                if comando.resultado is not None and resultado != comando.resultado:
+                    diferencias += 1
+            rendimientos.append(len(comandos) / ((reloj() - inicio_carga) / 1e9))
+            huella = huella_estado(gestor)
+
+    operaciones = {}
+    for operacion, tiempos in latencias.items():
+        tiempos.sort()
+        medicion = {"operaciones": len(tiempos) // repeticiones,
+                    "mediana_s": statistics.median(tiempos) / 1e9}
+        for p in PERCENTILES:
+            medicion[f"p{p:g}_s"] = _percentil(tiempos, p) / 1e9
+        medicion["maximo_s"] = tiempos[-1] / 1e9
+        operaciones[operacion] = medicion
+    return {
+        "comandos": len(comandos),
+        "huella_carga": huella_carga(comandos),
+        "huella_estado": huella,
+        "diferencias": diferencias,
+        "ops_por_s": statistics.median(rendimientos),
+        "operaciones": operaciones,
+    }
+
+
+def ejecutar(cargas: dict, repeticiones: int = 3) -> dict:
+    """
+    Ejecuta varias cargas.
+
+    Args:
+        cargas: Diccionario nombre -> lista de comandos
+        repeticiones: Repeticiones por carga
+
+    Returns:
+        Diccionario con metadatos y resultados por carga
+    """
+    resultados = {}
+    for nombre, comandos in cargas.items():
+        resultado = resultados[nombre] = ejecutar_carga(comandos, repeticiones)
+        print(f"   {nombre:<10} {resultado['comandos']:>7} comandos | "
+              f"{resultado['ops_por_s']:>9,.0f} ops/s | estado {resultado['huella_estado']} | "
+              f"{resultado['diferencias']} diferencias")
+        for operacion, medicion in resultado["operaciones"].items():
+            print(f"      {operacion:<18} x{medicion['operaciones']:<6} "
+                  f"p50 {medicion['p50_s'] * 1e6:>8.1f} µs | p90 {medicion['p90_s'] * 1e6:>8.1f} µs | "
+                  f"p99 {medicion['p99_s'] * 1e6:>8.1f} µs | máx {medicion['maximo_s'] * 1e6:>9.1f} µs")
+    return {
+        "metadatos": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "plataforma": platform.platform(),
+            "repeticiones": repeticiones,
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(base: dict, actual: dict, umbral: float = 0.10,
+             metricas: tuple = ("mediana_s", "p99_s"), minimo_operaciones: int = 100) -> list:
+    """
+    Compara dos ejecuciones de las mismas cargas.
+
+    Args:
+        base: Resultados de referencia
+        actual: Resultados nuevos
+        umbral: Aumento relativo considerado regresión
+        metricas: Métricas de latencia comparadas por operación
+        minimo_operaciones: Las operaciones con menos muestras no se comparan
+            (sus percentiles son demasiado ruidosos)
+
+    Returns:
+        Lista de tuplas (carga, operación, métrica, valor base, valor actual, cambio
+        relativo); un estado final distinto se reporta con la métrica "huella_estado"
+        y una caída del rendimiento con la métrica "ops_por_s"
+    """
+    regresiones = []
+    for nombre, resultado in actual["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            continue
+        if anterior["huella_carga"] != resultado["huella_carga"]:
+            raise ValueError(f"La carga '{nombre}' no es la misma que la de referencia")
+        if anterior["huella_estado"] != resultado["huella_estado"]:
+            regresiones.append((nombre, "*", "huella_estado", anterior["huella_estado"],
+                                resultado["huella_estado"], None))
+        caida = anterior["ops_por_s"] / resultado["ops_por_s"] - 1
+        if caida > umbral:
+            regresiones.append((nombre, "*", "ops_por_s", anterior["ops_por_s"],
+                                resultado["ops_por_s"], caida))
+        for operacion, medicion in resultado["operaciones"].items():
+            previa = anterior["operaciones"].get(operacion)
+            if previa is None or medicion["operaciones"] < minimo_operaciones:
+                continue
+            for metrica in metricas:
+                if previa[metrica] > 0:
+                    cambio = medicion[metrica] / previa[metrica] - 1
+                    if cambio > umbral:
+                        regresiones.append((nombre, operacion, metrica, previa[metrica],
+                                            medicion[metrica], cambio))
+    return regresiones
+
+
+def main(argumentos=None) -> int:
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Simulación determinista de cargas de venta")
+    parser.add_argument("--escenarios", nargs="+", choices=sorted(ESCENARIOS),
+                        default=sorted(ESCENARIOS))
+    parser.add_argument("--ventas", type=int, default=5000, help="pedidos de compra por escenario")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--cargas", nargs="+", help="archivos JSON Lines con cargas grabadas")
+    parser.add_argument("--guardar-cargas", help="directorio donde guardar las cargas generadas")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="archivo JSON de referencia para detectar regresiones")
+    parser.add_argument("--umbral", type=float, default=0.25,
+                        help="aumento relativo considerado regresión (0.25 = 25%%)")
+    opciones = parser.parse_args(argumentos)
+
+    print("SIMULACIÓN DE CARGAS DE VENTA")
+    if opciones.cargas:
+        cargas = {os.path.splitext(os.path.basename(ruta))[0]: cargar_comandos(ruta)
+                  for ruta in opciones.cargas}
+    else:
+        cargas = {nombre: grabar_carga(ESCENARIOS[nombre](opciones.ventas, opciones.semilla))
+                  for nombre in opciones.escenarios}
+    if opciones.guardar_cargas:
+        os.makedirs(opciones.guardar_cargas, exist_ok=True)
+        for nombre, comandos in cargas.items():
+            guardar_comandos(comandos, os.path.join(opciones.guardar_cargas, f"{nombre}.jsonl"))
+        print(f"   Cargas guardadas en {opciones.guardar_cargas}")
+
+    resultados = ejecutar(cargas, opciones.repeticiones)
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"   Resultados guardados en {opciones.salida}")
+
+    if opciones.comparar:
+        with open(opciones.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base, resultados, opciones.umbral)
+        if regresiones:
+            print(f"\n   REGRESIONES (umbral {opciones.umbral:.0%}):")
+            for nombre, operacion, metrica, anterior, actual, cambio in regresiones:
+                if cambio is None:
+                    print(f"   {nombre:<10} estado final distinto: {anterior} -> {actual}")
+                elif metrica == "ops_por_s":
+                    print(f"   {nombre:<10} rendimiento {anterior:,.0f} -> {actual:,.0f} ops/s "
+                          f"({-cambio / (1 + cambio):+.0%})")
+                else:
+                    print(f"   {nombre:<10} {operacion:<18} {metrica:<10} "
+                          f"{anterior * 1e6:.1f} -> {actual * 1e6:.1f} µs ({cambio:+.0%})")
+            return 1
+        print("\n   Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
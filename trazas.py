@@ -0,0 +1,264 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define el modo de trazas de las operaciones del GestorServicios.
+Registra árboles de tramos (spans) con sus duraciones, por ejemplo
+realizar_venta -> buscar_servicio -> vender_entradas -> calcular_precio_total
+-> registrar_compra, en un búfer circular de tamaño fijo, con muestreo de
+1 de cada N operaciones y volcado al formato JSON de Chrome (chrome://tracing).
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from itertools import count
+from servicio_cine import ServicioCine
+from servicio_evento import ServicioEvento
+from cliente import Cliente
+from gestor_servicios import GestorServicios
+from metricas import quitar_envoltura
+
+# Operaciones que inician una traza (se les aplica el muestreo)
+PUNTOS_RAIZ = (
+    (GestorServicios, "realizar_venta"),
+    # Raíz en las listas de espera; dentro de realizar_venta es un tramo hijo
+    (GestorServicios, "_vender"),
+    (GestorServicios, "cancelar_venta"),
+    (GestorServicios, "cancelar_servicio"),
+    (GestorServicios, "generar_reporte_servicios"),
+    (GestorServicios, "calcular_ingresos_totales"),
+    (GestorServicios, "obtener_estadisticas"),
+)
+
+# Operaciones que solo se registran dentro de una traza muestreada
+PUNTOS_INTERNOS = (
+    (GestorServicios, "buscar_servicio"),
+    (GestorServicios, "buscar_cliente"),
+    (ServicioCine, "vender_entradas"),
+    (ServicioEvento, "vender_entradas"),
+    (ServicioCine, "calcular_precio_total"),
+    (ServicioEvento, "calcular_precio_total"),
+    (ServicioCine, "mostrar_info"),
+    (ServicioEvento, "mostrar_info"),
+    (Cliente, "calcular_descuento"),
+    (Cliente, "registrar_compra"),
+    (Cliente, "registrar_devolucion"),
+)
+
+
+class Trazador:
+    """
+    Clase que registra trazas de las operaciones del sistema.
+    Los tramos terminados se guardan en un búfer circular, así que la memoria
+    queda acotada por la capacidad. Al igual que el registro de métricas,
+    envuelve los métodos al activarse y quita sus envolturas al desactivarse;
+    ambos se pueden activar y desactivar en cualquier orden.
+    """
+
+    def __init__(self, capacidad: int = 10_000, muestreo: int = 1):
+        """
+        Constructor del Trazador.
+
+        Args:
+            capacidad: Máximo de tramos guardados (se descartan los más antiguos)
+            muestreo: Se traza 1 de cada `muestreo` operaciones raíz
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser positiva")
+        self._tramos = deque(maxlen=capacidad)
+        self._muestreo = 1
+        self.muestreo = muestreo
+        self._raices_vistas = count()
+        self._ids = count(1)
+        self._local = threading.local()
+        self._envolturas = []
+
+    # Property para muestreo
+    @property
+    def muestreo(self) -> int:
+        """Obtiene la tasa de muestreo (1 de cada N)."""
+        return self._muestreo
+
+    @muestreo.setter
+    def muestreo(self, valor: int):
+        """Establece la tasa de muestreo con validación."""
+        if not isinstance(valor, int) or valor < 1:
+            raise ValueError("El muestreo debe ser un entero positivo")
+        self._muestreo = valor
+
+    # Property para activo
+    @property
+    def activo(self) -> bool:
+        """Indica si el trazador está instrumentando los métodos."""
+        return bool(self._envolturas)
+
+    def __len__(self) -> int:
+        """Cantidad de tramos guardados."""
+        return len(self._tramos)
+
+    def activar(self):
+        """Envuelve los métodos de PUNTOS_RAIZ y PUNTOS_INTERNOS."""
+        if self._envolturas:
+            return
+        for puntos, es_raiz in ((PUNTOS_RAIZ, True), (PUNTOS_INTERNOS, False)):
+            for clase, metodo in puntos:
+                original = clase.__dict__[metodo]
+                nombre = f"{clase.__name__}.{metodo}"
+                envoltura = self._envolver(original, nombre, es_raiz)
+                setattr(clase, metodo, envoltura)
+                self._envolturas.append((clase, metodo, envoltura))
+
+    def desactivar(self):
+        """Quita las envolturas del trazador (las de otras capas se conservan)."""
+        for clase, metodo, envoltura in reversed(self._envolturas):
+            quitar_envoltura(clase, metodo, envoltura)
+        self._envolturas.clear()
+
+    def limpiar(self):
+        """Descarta los tramos guardados."""
+        self._tramos.clear()
+
+    def trazas(self) -> list:
+        """
+        Reconstruye los árboles de tramos guardados.
+
+        Returns:
+            Lista de árboles; cada nodo es un diccionario con nombre,
+            inicio_ns, duracion_ns e hijos
+        """
+        nodos = {}
+        raices = []
+        # Los hijos terminan antes que sus padres, así que se recorre al revés
+        for nombre, inicio, duracion, id_traza, id_tramo, id_padre, hilo in reversed(self._tramos):
+            nodos[id_tramo] = {"nombre": nombre, "inicio_ns": inicio,
+                               "duracion_ns": duracion, "hijos": []}
+        for nombre, inicio, duracion, id_traza, id_tramo, id_padre, hilo in self._tramos:
+            padre = nodos.get(id_padre)
+            if padre is not None:
+                padre["hijos"].append(nodos[id_tramo])
+            elif id_padre is None:
+                raices.append(nodos[id_tramo])
+        for nodo in nodos.values():
+            nodo["hijos"].sort(key=lambda hijo: hijo["inicio_ns"])
+        return raices
+
+    def volcar_chrome(self, ruta: str) -> int:
+        """
+        Escribe los tramos en el formato de eventos de traza de Chrome.
+
+        Args:
+            ruta: Ruta del archivo JSON
+
+        Returns:
+            Cantidad de eventos escritos
+        """
+        proceso = os.getpid()
+        eventos = [{"name": nombre, "cat": "cinemax", "ph": "X",
+                    "ts": inicio / 1000, "dur": duracion / 1000,
+                    "pid": proceso, "tid": hilo,
+                    "args": {"traza": id_traza, "tramo": id_tramo, "padre": id_padre}}
+                   for nombre, inicio, duracion, id_traza, id_tramo, id_padre, hilo in self._tramos]
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, archivo)
+        return len(eventos)
+
+    def _envolver(self, original, nombre: str, es_raiz: bool):
+        """Crea la envoltura que registra el tramo de un método."""
+        local = self._local
+        tramos = self._tramos
+        ids = self._ids
+        reloj = time.perf_counter_ns
+
+        @wraps(original)
+        def envoltura(*args, **kwargs):
+            # El método interior se llama por __wrapped__ (ver quitar_envoltura)
+            pila = getattr(local, "pila", None)
+            if pila is None:
+                pila = local.pila = []
+
+            if pila:
+                padre = pila[-1]
+                if padre is None:
+                    # Dentro de una operación no muestreada
+                    return envoltura.__wrapped__(*args, **kwargs)
+                id_padre, id_traza = padre
+            elif es_raiz:
+                if next(self._raices_vistas) % self._muestreo:
+                    pila.append(None)
+                    try:
+                        return envoltura.__wrapped__(*args, **kwargs)
+                    finally:
+                        pila.pop()
+                id_padre = id_traza = None
+            else:
+                return envoltura.__wrapped__(*args, **kwargs)
+
+            id_tramo = next(ids)
+            if id_traza is None:
+                id_traza = id_tramo
+            pila.append((id_tramo, id_traza))
+            inicio = reloj()
+            try:
+                return envoltura.__wrapped__(*args, **kwargs)
+            finally:
+                duracion = reloj() - inicio
+                pila.pop()
+                tramos.append((nombre, inicio, duracion, id_traza, id_tramo, id_padre,
+                               threading.get_ident()))
+
+        return envoltura
+
+    def __str__(self) -> str:
+        """Representación en string del trazador."""
+        estado = "activo" if self.activo else "inactivo"
+        return (f"Trazador ({estado}): {len(self._tramos)}/{self._tramos.maxlen} tramos | "
+                f"muestreo 1/{self._muestreo}")
+
+
+def _imprimir_arbol(nodo: dict, nivel: int = 0):
+    """Imprime un árbol de tramos con sangría."""
+    print(f"   {'  ' * nivel}{nodo['nombre']} ({nodo['duracion_ns'] / 1000:.1f} µs)")
+    for hijo in nodo["hijos"]:
+        _imprimir_arbol(hijo, nivel + 1)
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import tempfile
+    from contextlib import redirect_stdout
+    from datetime import datetime
+
+    print("PRUEBA DEL MODO DE TRAZAS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    with redirect_stdout(io.StringIO()):
+        gestor.agregar_servicio(ServicioCine("C001", "Estreno", datetime(2024, 12, 15, 20, 0),
+                                             8.50, "Dune: Part Two", 1))
+        gestor.agregar_cliente(Cliente("0912345678", "Juan", "Pérez", "juan@email.com", "0987654321"))
+
+    trazador = Trazador(capacidad=1000, muestreo=10)
+    trazador.activar()
+    print(f"\n1. {trazador}")
+
+    print("\n2. Realizando 50 ventas (se trazan 5)...")
+    with redirect_stdout(io.StringIO()):
+        for _ in range(50):
+            gestor.realizar_venta("C001", "0912345678", 1)
+    print(f"   {trazador}")
+
+    print("\n3. Árbol de la primera venta trazada:")
+    _imprimir_arbol(trazador.trazas()[0])
+
+    ruta = os.path.join(tempfile.gettempdir(), "cinemax_trazas.json")
+    print(f"\n4. Volcando {trazador.volcar_chrome(ruta)} eventos a {ruta}")
+
+    trazador.desactivar()
+    print(f"   {trazador}")
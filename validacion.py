@@ -0,0 +1,427 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo de validación por esquemas para crear y actualizar servicios y clientes en lote.
+Cada atributo tiene una Regla con el mismo criterio y mensaje que su setter,
+precompilada una sola vez (las opciones válidas son conjuntos congelados).
+Una regla sabe validar un valor y también una columna completa con una
+pasada hecha por funciones de C (min, map, issuperset); solo si la columna
+falla se recorre fila por fila para ubicar los errores.
+Los datos ya validados (por ejemplo, los que vienen de un catálogo o de
+una réplica propios) se construyen por el camino de confianza, sin volver a
+validarlos.
+"""
+
+import operator
+from datetime import datetime
+from itertools import repeat
+from typing import Dict, List, NamedTuple
+from servicio import Servicio
+from servicio_cine import ServicioCine
+from servicio_evento import ServicioEvento
+from cliente import Cliente
+
+
+class Regla(NamedTuple):
+    """Validación de un atributo: por valor y por columna completa."""
+    mensaje: str
+    valido: object
+    columna: object
+
+
+# ========== CONSTRUCTORES DE REGLAS ==========
+
+def regla_texto(mensaje: str) -> Regla:
+    """Cadena no vacía."""
+    return Regla(mensaje, lambda v: isinstance(v, str) and v != "",
+                 lambda columna: set(map(type, columna)) <= {str} and "" not in columna)
+
+
+def regla_instancia(tipo: type, mensaje: str) -> Regla:
+    """Instancia de un tipo."""
+    return Regla(mensaje, lambda v: isinstance(v, tipo),
+                 lambda columna: set(map(type, columna)) <= {tipo})
+
+
+def regla_minimo(limite: float, mensaje: str, estricto: bool = False) -> Regla:
+    """Número mayor o igual (o estrictamente mayor) que un límite (misma comparación que los setters)."""
+    if estricto:
+        return Regla(mensaje, lambda v: not v <= limite, lambda columna: not min(columna) <= limite)
+    return Regla(mensaje, lambda v: not v < limite, lambda columna: not min(columna) < limite)
+
+
+def regla_opciones(opciones, mensaje: str) -> Regla:
+    """Uno de un conjunto fijo de valores."""
+    validas = frozenset(opciones)
+    return Regla(mensaje, validas.__contains__, validas.issuperset)
+
+
+def regla_longitud(minima: int, mensaje: str) -> Regla:
+    """Valor no vacío con una longitud mínima."""
+    return Regla(mensaje, lambda v: bool(v) and len(v) >= minima,
+                 lambda columna: min(map(len, columna)) >= minima)
+
+
+def regla_contiene(texto: str, mensaje: str) -> Regla:
+    """Cadena no vacía que contiene un texto."""
+    return Regla(mensaje, lambda v: bool(v) and texto in v,
+                 lambda columna: all(map(operator.contains, columna, repeat(texto))))
+
+
+# ========== ESQUEMAS ==========
+
+REGLAS_SERVICIO = {
+    "codigo": regla_texto("El código debe ser una cadena no vacía"),
+    "nombre": regla_texto("El nombre debe ser una cadena no vacía"),
+    "fecha": regla_instancia(datetime, "La fecha debe ser un objeto datetime"),
+    "precio_base": regla_minimo(0, "El precio base no puede ser negativo"),
+    "estado": regla_opciones(Servicio.ESTADOS, f"Estado debe ser uno de: {Servicio.ESTADOS}"),
+}
+
+REGLAS_CINE = {
+    **REGLAS_SERVICIO,
+    "pelicula": regla_texto("El nombre de la película debe ser una cadena no vacía"),
+    "sala": regla_minimo(1, "El número de sala debe ser positivo"),
+}
+
+REGLAS_EVENTO = {
+    **REGLAS_SERVICIO,
+    "artista": regla_texto("El nombre del artista debe ser una cadena no vacía"),
+    "tipo_evento": regla_opciones(ServicioEvento.TIPOS_EVENTO,
+                                  f"Tipo de evento debe ser uno de: {ServicioEvento.TIPOS_EVENTO}"),
+    "duracion_horas": regla_minimo(0, "La duración debe ser positiva", estricto=True),
+    # Al construir; al asignar depende de las zonas del evento (ver CONTEXTUALES)
+    "zona": regla_opciones(ServicioEvento.ZONAS, f"La zona debe ser una de: {ServicioEvento.ZONAS}"),
+}
+
+REGLAS_CLIENTE = {
+    "cedula": regla_longitud(10, "La cédula debe tener al menos 10 caracteres"),
+    "nombre": regla_texto("El nombre debe ser una cadena no vacía"),
+    "apellido": regla_texto("El apellido debe ser una cadena no vacía"),
+    "email": regla_contiene("@", "El email debe ser válido y contener @"),
+    "telefono": regla_longitud(10, "El teléfono debe tener al menos 10 dígitos"),
+    "puntos_acumulados": regla_minimo(0, "Los puntos no pueden ser negativos"),
+}
+
+REGLAS = {ServicioCine: REGLAS_CINE, ServicioEvento: REGLAS_EVENTO, Cliente: REGLAS_CLIENTE}
+
+# Argumentos de cada constructor, en orden
+CAMPOS = {
+    ServicioCine: ("codigo", "nombre", "fecha", "precio_base", "pelicula", "sala", "es_3d", "es_vip"),
+    ServicioEvento: ("codigo", "nombre", "fecha", "precio_base", "artista", "tipo_evento",
+                     "duracion_horas", "zona", "capacidades"),
+    Cliente: ("cedula", "nombre", "apellido", "email", "telefono"),
+}
+
+# Valores por defecto de los argumentos opcionales de los constructores
+OPCIONALES = {"es_3d": False, "es_vip": False, "zona": "General", "capacidades": None}
+
+# Atributos cuya validez depende del objeto (capacidad, zonas del evento):
+# asignar_lote siempre los asigna con el setter
+CONTEXTUALES = frozenset({"zona", "asientos_vendidos", "entradas_vendidas"})
+
+
+# ========== VALIDACIÓN ==========
+
+def validar_columna(regla: Regla, columna: list) -> List[int]:
+    """
+    Valida una columna completa.
+
+    Args:
+        regla: Regla del atributo
+        columna: Valores a validar
+
+    Returns:
+        Posiciones de los valores inválidos (vacía si todos son válidos)
+    """
+    if not columna:
+        return []
+    try:
+        if regla.columna(columna):
+            return []
+    except TypeError:
+        pass
+    # Camino lento: solo cuando la comprobación por columna falla
+    invalidos = []
+    for i, valor in enumerate(columna):
+        try:
+            if not regla.valido(valor):
+                invalidos.append(i)
+        except TypeError:
+            invalidos.append(i)
+    return invalidos
+
+
+def validar_columnas(clase: type, columnas: Dict[str, list]) -> List[tuple]:
+    """
+    Valida columnas de atributos de una clase.
+
+    Args:
+        clase: ServicioCine, ServicioEvento o Cliente
+        columnas: Diccionario atributo -> lista de valores
+
+    Returns:
+        Lista de tuplas (fila, atributo, valor, mensaje), ordenada por fila
+    """
+    reglas = _reglas(clase)
+    errores = []
+    for atributo, columna in columnas.items():
+        regla = reglas.get(atributo)
+        if regla is None:
+            if atributo in CAMPOS[clase]:
+                continue
+            raise ValueError(f"{clase.__name__} no tiene el atributo '{atributo}'")
+        for fila in validar_columna(regla, columna):
+            errores.append((fila, atributo, columna[fila], regla.mensaje))
+    errores.sort(key=operator.itemgetter(0))
+    return errores
+
+
+def validar_registros(clase: type, registros: List[dict]) -> List[tuple]:
+    """
+    Valida registros (un diccionario por objeto) pasándolos a columnas.
+
+    Args:
+        clase: ServicioCine, ServicioEvento o Cliente
+        registros: Lista de diccionarios atributo -> valor
+
+    Returns:
+        Lista de tuplas (fila, atributo, valor, mensaje), ordenada por fila
+    """
+    return validar_columnas(clase, _a_columnas(registros))
+
+
+def crear_lote(clase: type, columnas: Dict[str, list], confiable: bool = False) -> list:
+    """
+    Crea objetos a partir de columnas de argumentos del constructor.
+
+    Args:
+        clase: ServicioCine, ServicioEvento o Cliente
+        columnas: Diccionario argumento -> lista de valores (los opcionales
+            que falten toman su valor por defecto)
+        confiable: True si los datos ya fueron validados (no se vuelven a validar)
+
+    Returns:
+        Lista de objetos creados
+    """
+    _reglas(clase)
+    largos = {len(columna) for columna in columnas.values()}
+    if len(largos) > 1:
+        raise ValueError("Todas las columnas deben tener el mismo largo")
+    argumentos = []
+    for campo in CAMPOS[clase]:
+        if campo in columnas:
+            argumentos.append(columnas[campo])
+        elif campo in OPCIONALES:
+            argumentos.append(repeat(OPCIONALES[campo]))
+        else:
+            raise ValueError(f"Falta la columna '{campo}' para crear {clase.__name__}")
+    if not confiable:
+        _exigir_validos(validar_columnas(clase, columnas))
+    return list(map(clase, *argumentos))
+
+
+def crear_desde_registros(clase: type, registros: List[dict], confiable: bool = False) -> list:
+    """
+    Crea objetos a partir de registros (un diccionario por objeto).
+
+    Args:
+        clase: ServicioCine, ServicioEvento o Cliente
+        registros: Lista de diccionarios argumento -> valor
+        confiable: True si los datos ya fueron validados
+
+    Returns:
+        Lista de objetos creados
+    """
+    return crear_lote(clase, _a_columnas(registros), confiable)
+
+
+def asignar_lote(objetos: list, atributo: str, valores: list, confiable: bool = False) -> int:
+    """
+    Asigna un atributo a muchos objetos de la misma clase validando la columna una vez.
+    Salvo los atributos CONTEXTUALES, el valor se escribe sin pasar por el
+    setter (los suscriptores sí son notificados), así que las envolturas de
+    setters como la BitacoraComandos no ven estas asignaciones.
+
+    Args:
+        objetos: Servicios o clientes
+        atributo: Atributo a asignar
+        valores: Un valor por objeto
+        confiable: True si los valores ya fueron validados
+
+    Returns:
+        Cantidad de objetos cuyo valor cambió
+    """
+    if len(objetos) != len(valores):
+        raise ValueError("Debe haber un valor por objeto")
+    if not objetos:
+        return 0
+    if atributo in CONTEXTUALES:
+        cambios = 0
+        for objeto, valor in zip(objetos, valores):
+            if getattr(objeto, atributo) != valor:
+                setattr(objeto, atributo, valor)
+                cambios += 1
+        return cambios
+
+    clase = type(objetos[0])
+    privado = "_" + atributo
+    if not hasattr(objetos[0], privado) or not isinstance(getattr(clase, atributo, None), property):
+        raise ValueError(f"{clase.__name__} no tiene el atributo '{atributo}'")
+    regla = _reglas(clase).get(atributo)
+    if regla is not None and not confiable:
+        _exigir_validos([(fila, atributo, valores[fila], regla.mensaje)
+                         for fila in validar_columna(regla, valores)])
+    cambios = 0
+    for objeto, valor in zip(objetos, valores):
+        anterior = getattr(objeto, privado)
+        if anterior != valor:
+            setattr(objeto, privado, valor)
+            cambios += 1
+            if objeto._observadores:
+                objeto._notificar_cambio(atributo, anterior, valor)
+    return cambios
+
+
+def _reglas(clase: type) -> dict:
+    """Obtiene las reglas de una clase validable."""
+    reglas = REGLAS.get(clase)
+    if reglas is None:
+        raise ValueError(f"No hay esquema para {clase.__name__}")
+    return reglas
+
+
+def _a_columnas(registros: List[dict]) -> Dict[str, list]:
+    """Convierte registros en columnas (todas con el mismo largo)."""
+    atributos = {}
+    for registro in registros:
+        atributos.update(dict.fromkeys(registro))
+    faltante = object()
+    columnas = {atributo: [registro.get(atributo, faltante) for registro in registros]
+                for atributo in atributos}
+    for atributo, columna in columnas.items():
+        if faltante in columna:
+            raise ValueError(f"El atributo '{atributo}' falta en algunos registros")
+    return columnas
+
+
+def _exigir_validos(errores: List[tuple]):
+    """Lanza ValueError con el primer error si hay alguno."""
+    if errores:
+        fila, atributo, valor, mensaje = errores[0]
+        raise ValueError(f"{len(errores)} valor(es) inválido(s); fila {fila}, "
+                         f"{atributo}={valor!r}: {mensaje}")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import gc
+    import random
+    import time
+    from datetime import timedelta
+
+    print("PRUEBA DE LA VALIDACIÓN POR ESQUEMAS")
+
+    def medir(funcion, repeticiones: int = 3) -> tuple:
+        """Mejor tiempo de varias ejecuciones y el último resultado."""
+        mejor = float("inf")
+        for _ in range(repeticiones):
+            gc.collect()
+            inicio = time.perf_counter()
+            resultado = funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        return mejor, resultado
+
+    n = 100_000
+    aleatorio = random.Random(4)
+    columnas_clientes = {
+        "cedula": [f"09{i:08d}" for i in range(n)],
+        "nombre": [aleatorio.choice(["Ana", "Luis", "Eva", "Juan"]) for _ in range(n)],
+        "apellido": [aleatorio.choice(["Pérez", "Soto", "Ríos"]) for _ in range(n)],
+        "email": [f"c{i}@email.com" for i in range(n)],
+        "telefono": [f"09{aleatorio.randrange(10**8):08d}" for _ in range(n)],
+    }
+    inicio_fechas = datetime(2025, 4, 1, 10, 0)
+    columnas_eventos = {
+        "codigo": [f"E{i:06d}" for i in range(n)],
+        "nombre": [f"Evento {i}" for i in range(n)],
+        "fecha": [inicio_fechas + timedelta(hours=i) for i in range(n)],
+        "precio_base": [40.0 + i % 20 for i in range(n)],
+        "artista": [f"Artista {i % 300}" for i in range(n)],
+        "tipo_evento": [ServicioEvento.TIPOS_EVENTO[i % 5] for i in range(n)],
+        "duracion_horas": [1.5 + i % 3 for i in range(n)],
+        "zona": [ServicioEvento.ZONAS[i % 3] for i in range(n)],
+    }
+
+    print(f"\n1. Validación de {n} clientes y {n} eventos:")
+    for clase, columnas in ((Cliente, columnas_clientes), (ServicioEvento, columnas_eventos)):
+        reglas = REGLAS[clase]
+        t_valor, _ = medir(lambda: [[v for v in columna if not reglas[atributo].valido(v)]
+                                    for atributo, columna in columnas.items()])
+        t_columna, errores = medir(lambda: validar_columnas(clase, columnas))
+        print(f"   {clase.__name__:<15} valor por valor {t_valor * 1000:6.1f} ms | "
+              f"por columnas {t_columna * 1000:5.1f} ms | errores: {len(errores)}")
+
+    print("\n2. Construcción en lote:")
+    registros = [dict(zip(columnas_clientes, fila)) for fila in zip(*columnas_clientes.values())]
+
+    def con_setters() -> list:
+        """Validación con los setters, uno por uno."""
+        clientes = []
+        for registro in registros:
+            cliente = Cliente("0000000000", "x", "x", "x@x", "0000000000")
+            for atributo, valor in registro.items():
+                setattr(cliente, atributo, valor)
+            clientes.append(cliente)
+        return clientes
+
+    t_setters, uno_a_uno = medir(con_setters)
+    t_validado, validados = medir(lambda: crear_lote(Cliente, columnas_clientes))
+    t_confiable, _ = medir(lambda: crear_lote(Cliente, columnas_clientes, confiable=True))
+    print(f"   Con setters: {t_setters * 1000:.0f} ms | lote validado: {t_validado * 1000:.0f} ms | "
+          f"lote confiable: {t_confiable * 1000:.0f} ms")
+    print(f"   Mismos datos: {[c.email for c in validados] == [c.email for c in uno_a_uno]}")
+    eventos = crear_lote(ServicioEvento, columnas_eventos)
+    print(f"   Eventos creados: {len(eventos)} | {eventos[7].tipo_evento} en zona {eventos[7].zona}")
+
+    print("\n3. Actualización en lote:")
+    nuevos = [ServicioEvento.ESTADOS[i % 2] for i in range(n)]
+
+    def con_setter():
+        for evento, estado in zip(eventos, nuevos):
+            evento.estado = estado
+
+    t_setter, _ = medir(con_setter)
+    for evento in eventos:
+        evento.estado = "Disponible"
+    notificados = []
+    eventos[1].suscribir_cambios(lambda objeto, atributo, anterior, nuevo: notificados.append(nuevo))
+    inicio = time.perf_counter()
+    cambios = asignar_lote(eventos, "estado", nuevos)
+    t_lote = time.perf_counter() - inicio
+    print(f"   Setter uno por uno: {t_setter * 1000:.0f} ms | asignar_lote: {t_lote * 1000:.0f} ms | "
+          f"cambios: {cambios} | notificado: {notificados}")
+    print(f"   Zonas (contextual, por setter): {asignar_lote(eventos[:3], 'zona', ['VIP'] * 3)} cambios")
+
+    print("\n4. Validaciones:")
+    registros[10]["email"] = "sin-arroba"
+    registros[42]["cedula"] = "123"
+    registros[77]["nombre"] = ""
+    for error in validar_registros(Cliente, registros):
+        print(f"   Error detectado: {error}")
+    try:
+        crear_desde_registros(Cliente, registros)
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
+    try:
+        asignar_lote(eventos[:2], "tipo_evento", ["Concierto", "Circo"])
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
+    try:
+        crear_lote(ServicioCine, {"codigo": ["C1"], "nombre": ["Función"]})
+    except ValueError as e:
+        print(f"   Validación correcta: {e}")
@@ -0,0 +1,280 @@
+# Integrantes:
+# - [Agusto Gómez Javier Rodolfo]
+# - [Castillo Sánchez Marco Elías]
+# - [Santamaría Cevallos Viviana Sofía]
+# - [Luis Miguel Soriano Arias]
+
+"""
+Módulo que define las VistasMaterializadas del menú principal.
+Guarda el texto ya generado de cada servicio y cliente, y solo vuelve a
+generar el bloque de un objeto cuando este notifica un cambio. Las
+estadísticas salen de contadores que se ajustan con cada notificación.
+"""
+
+from gestor_servicios import GestorServicios
+
+
+def _esta_disponible(servicio) -> bool:
+    """Mismo criterio que GestorServicios.listar_servicios_disponibles."""
+    return (servicio.estado == "Disponible"
+            and (not hasattr(servicio, 'entradas_disponibles') or servicio.entradas_disponibles() > 0))
+
+
+class VistasMaterializadas:
+    """
+    Clase que mantiene las vistas de las opciones 1, 4, 5 y 7 del menú.
+    Cada bloque se genera al consultarse por primera vez después de un
+    cambio, así que consultar repetidamente un catálogo sin cambios no
+    vuelve a llamar a mostrar_info().
+    """
+
+    def __init__(self, gestor: GestorServicios):
+        """
+        Constructor de VistasMaterializadas.
+
+        Args:
+            gestor: Gestor cuyos servicios y clientes se observan
+        """
+        self._gestor = gestor
+        # Bloques en el mismo orden que el gestor (None = pendiente de generar)
+        self._servicios = []
+        self._info_servicios = []
+        self._reporte_servicios = []
+        self._posicion_servicio = {}
+        self._sucios_servicios = set()
+        self._disponible = []
+        self._clientes = []
+        self._info_clientes = []
+        self._posicion_cliente = {}
+        self._sucios_clientes = set()
+        self._premium = []
+        self._servicios_disponibles = 0
+        self._clientes_premium = 0
+        self._renderizados = 0
+
+        for servicio in gestor._servicios:
+            self._agregar_servicio(servicio)
+        for cliente in gestor._clientes:
+            self._agregar_cliente(cliente)
+        gestor.suscribir_altas(self._al_agregar)
+        gestor.suscribir_bajas(self._al_retirar)
+
+    # Property para servicios_disponibles
+    @property
+    def servicios_disponibles(self) -> int:
+        """Obtiene la cantidad de servicios disponibles (contador mantenido)."""
+        return self._servicios_disponibles
+
+    # Property para clientes_premium
+    @property
+    def clientes_premium(self) -> int:
+        """Obtiene la cantidad de clientes premium (contador mantenido)."""
+        return self._clientes_premium
+
+    # Property para renderizados
+    @property
+    def renderizados(self) -> int:
+        """Obtiene cuántos bloques se han generado desde la creación."""
+        return self._renderizados
+
+    def texto_servicios(self) -> str:
+        """
+        Vista de la opción 1: la información de todos los servicios.
+
+        Returns:
+            Los bloques de mostrar_info() separados por saltos de línea
+        """
+        self._actualizar_servicios()
+        return "\n".join(self._info_servicios)
+
+    def texto_clientes(self) -> str:
+        """
+        Vista de la opción 4: la información de todos los clientes.
+
+        Returns:
+            Los bloques de mostrar_info() separados por saltos de línea
+        """
+        if self._sucios_clientes:
+            for posicion in self._sucios_clientes:
+                self._info_clientes[posicion] = self._clientes[posicion].mostrar_info()
+                self._renderizados += 1
+            self._sucios_clientes.clear()
+        return "\n".join(self._info_clientes)
+
+    def reporte_servicios(self) -> str:
+        """
+        Vista de la opción 5: igual a generar_reporte_servicios con todos los servicios.
+
+        Returns:
+            String con el reporte formateado
+        """
+        self._actualizar_servicios()
+        gestor = self._gestor
+        reporte = gestor._encabezado_reporte()
+        if not self._servicios:
+            return reporte + "No hay servicios registrados.\n"
+
+        partes = [reporte]
+        total_ingresos = 0.0
+        for i, (bloque, ingresos) in enumerate(self._reporte_servicios, 1):
+            partes.append(f"{i}. ")
+            partes.append(bloque)
+            total_ingresos += ingresos
+        partes.append(gestor._pie_reporte(len(self._servicios), total_ingresos))
+        return "".join(partes)
+
+    def estadisticas(self) -> str:
+        """
+        Vista de la opción 7: igual a obtener_estadisticas, sin recorrer las listas.
+
+        Returns:
+            String con las estadísticas
+        """
+        return self._gestor._formatear_estadisticas(self._servicios_disponibles,
+                                                    self._clientes_premium)
+
+    def _actualizar_servicios(self):
+        """Genera de nuevo solo los bloques de servicios que cambiaron."""
+        if not self._sucios_servicios:
+            return
+        for posicion in self._sucios_servicios:
+            servicio = self._servicios[posicion]
+            self._info_servicios[posicion] = servicio.mostrar_info()
+            self._reporte_servicios[posicion] = self._gestor._bloque_reporte(servicio)
+            self._renderizados += 1
+        self._sucios_servicios.clear()
+
+    def _al_agregar(self, objeto):
+        """Incorpora un servicio o cliente recién agregado al gestor."""
+        if hasattr(objeto, 'calcular_precio_total'):
+            self._agregar_servicio(objeto)
+        else:
+            self._agregar_cliente(objeto)
+
+    def _al_retirar(self, servicios: list):
+        """Elimina los bloques de los servicios quitados del gestor."""
+        quitar = {self._posicion_servicio.pop(id(s)) for s in servicios}
+        for servicio in servicios:
+            servicio.cancelar_suscripcion(self._al_cambiar_servicio)
+        self._servicios_disponibles -= sum(self._disponible[p] for p in quitar)
+        quedan = [p for p in range(len(self._servicios)) if p not in quitar]
+        nueva_posicion = {anterior: nueva for nueva, anterior in enumerate(quedan)}
+        self._servicios = [self._servicios[p] for p in quedan]
+        self._info_servicios = [self._info_servicios[p] for p in quedan]
+        self._reporte_servicios = [self._reporte_servicios[p] for p in quedan]
+        self._disponible = [self._disponible[p] for p in quedan]
+        self._posicion_servicio = {id(s): p for p, s in enumerate(self._servicios)}
+        self._sucios_servicios = {nueva_posicion[p] for p in self._sucios_servicios if p in nueva_posicion}
+
+    def _agregar_servicio(self, servicio):
+        """Reserva el bloque del servicio y empieza a observarlo."""
+        posicion = len(self._servicios)
+        self._servicios.append(servicio)
+        self._info_servicios.append(None)
+        self._reporte_servicios.append(None)
+        self._posicion_servicio[id(servicio)] = posicion
+        self._sucios_servicios.add(posicion)
+        disponible = _esta_disponible(servicio)
+        self._disponible.append(disponible)
+        self._servicios_disponibles += disponible
+        servicio.suscribir_cambios(self._al_cambiar_servicio)
+
+    def _agregar_cliente(self, cliente):
+        """Reserva el bloque del cliente y empieza a observarlo."""
+        posicion = len(self._clientes)
+        self._clientes.append(cliente)
+        self._info_clientes.append(None)
+        self._posicion_cliente[id(cliente)] = posicion
+        self._sucios_clientes.add(posicion)
+        self._premium.append(cliente.es_premium)
+        self._clientes_premium += cliente.es_premium
+        cliente.suscribir_cambios(self._al_cambiar_cliente)
+
+    def _al_cambiar_servicio(self, servicio, atributo: str, anterior, nuevo):
+        """Invalida el bloque del servicio y ajusta el contador de disponibles."""
+        posicion = self._posicion_servicio[id(servicio)]
+        self._sucios_servicios.add(posicion)
+        disponible = _esta_disponible(servicio)
+        if disponible != self._disponible[posicion]:
+            self._disponible[posicion] = disponible
+            self._servicios_disponibles += 1 if disponible else -1
+
+    def _al_cambiar_cliente(self, cliente, atributo: str, anterior, nuevo):
+        """Invalida el bloque del cliente y ajusta el contador de premium."""
+        posicion = self._posicion_cliente[id(cliente)]
+        self._sucios_clientes.add(posicion)
+        if atributo == "es_premium" and nuevo != self._premium[posicion]:
+            self._premium[posicion] = nuevo
+            self._clientes_premium += 1 if nuevo else -1
+
+    def __str__(self) -> str:
+        """Representación en string de las vistas."""
+        return (f"VistasMaterializadas: {len(self._servicios)} servicios | "
+                f"{len(self._clientes)} clientes | "
+                f"{len(self._sucios_servicios) + len(self._sucios_clientes)} pendientes | "
+                f"{self._renderizados} bloques generados")
+
+
+# ============= MAIN DE PRUEBA =============
+if __name__ == "__main__":
+    import io
+    import time
+    from contextlib import redirect_stdout
+    from datetime import datetime, timedelta
+    from servicio_cine import ServicioCine
+    from servicio_evento import ServicioEvento
+    from cliente import Cliente
+
+    print("PRUEBA DE LAS VISTAS MATERIALIZADAS")
+
+    gestor = GestorServicios("CineMax Entertainment")
+    inicio_fechas = datetime(2024, 12, 1, 10, 0)
+    with redirect_stdout(io.StringIO()):
+        for i in range(5000):
+            fecha = inicio_fechas + timedelta(hours=i)
+            if i % 2:
+                gestor.agregar_servicio(ServicioEvento(f"E{i:05d}", f"Evento {i}", fecha, 45.0,
+                                                       f"Artista {i}", "Concierto", 2.5, "VIP"))
+            else:
+                gestor.agregar_servicio(ServicioCine(f"C{i:05d}", f"Función {i}", fecha, 8.5,
+                                                     f"Película {i}", i % 10 + 1))
+        for i in range(2000):
+            gestor.agregar_cliente(Cliente(f"09{i:08d}", "Cliente", f"N{i}",
+                                           f"c{i}@email.com", "0987654321"))
+
+    vistas = VistasMaterializadas(gestor)
+    print(f"\n1. {vistas}")
+
+    print("\n2. Comparando con el cálculo completo del gestor:")
+    iguales = (vistas.texto_servicios() == "\n".join(s.mostrar_info() for s in gestor._servicios)
+               and vistas.texto_clientes() == "\n".join(c.mostrar_info() for c in gestor._clientes)
+               and vistas.estadisticas() == gestor.obtener_estadisticas())
+    print(f"   Vistas idénticas: {iguales}")
+    print(f"   {vistas}")
+
+    print("\n3. Ventas y cambios (solo se invalidan los objetos afectados):")
+    with redirect_stdout(io.StringIO()):
+        for _ in range(5):
+            gestor.realizar_venta("C00000", "0900000000", 20)
+    gestor._servicios[1].zona = "General"
+    print(f"   {vistas}")
+    print(vistas.estadisticas())
+    print(f"   Estadísticas idénticas: {vistas.estadisticas() == gestor.obtener_estadisticas()}\n")
+
+    print("4. Tiempos de consulta repetida:")
+    for nombre, vista, completo in (
+            ("Opción 1", vistas.texto_servicios,
+             lambda: "\n".join(s.mostrar_info() for s in gestor._servicios)),
+            ("Opción 5", vistas.reporte_servicios,
+             lambda: gestor.generar_reporte_servicios(gestor._servicios)),
+            ("Opción 7", vistas.estadisticas, gestor.obtener_estadisticas)):
+        inicio = time.perf_counter()
+        vista()
+        t_vista = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        completo()
+        t_completo = time.perf_counter() - inicio
+        print(f"   {nombre}: vista {t_vista * 1000:.2f} ms | completo {t_completo * 1000:.2f} ms")
+
+    print(f"\n   Reporte idéntico al del gestor: "
+          f"{vistas.reporte_servicios() == gestor.generar_reporte_servicios(gestor._servicios)}")